@@ -0,0 +1,27 @@
+-- ============================================================
+-- Audit log keyset index — Raw PostgreSQL DDL
+-- Execute directly on the database cluster.
+-- No Django migration required (same convention as add_petty_cash_table.sql).
+--
+-- GET /api/audit-logs/ pages through the audit log newest-first with a
+-- keyset cursor on (timestamp, audit_id):
+--     WHERE ("timestamp", audit_id) < (:ts, :id)
+--     ORDER BY "timestamp" DESC, audit_id DESC LIMIT :n
+-- This composite index serves that as one backward index range scan, and
+-- the streamed export (/api/audit-logs/export/) reads in the same order.
+-- Fully re-runnable.
+-- ============================================================
+
+-- 1. Keyset index
+-- ============================================================
+CREATE INDEX IF NOT EXISTS idx_auditlog_ts_id
+    ON audit_log ("timestamp", audit_id);
+
+-- 2. Refresh planner statistics
+-- ============================================================
+ANALYZE audit_log;
+
+-- Verify
+SELECT indexname, indexdef
+FROM pg_indexes
+WHERE tablename = 'audit_log' AND indexname = 'idx_auditlog_ts_id';
@@ -0,0 +1,43 @@
+-- ============================================================
+-- Audit log full-text search — Raw PostgreSQL DDL
+-- Execute directly on the database cluster.
+-- No Django migration required (same convention as add_petty_cash_table.sql).
+--
+-- idx_auditlog_description was a plain B-tree on the free-text (mostly
+-- Hebrew) description. A B-tree cannot serve "contains" searches, and every
+-- audit INSERT paid to maintain it (long values, random insert positions).
+--
+-- It is replaced by ONE GIN index over a tsvector of description +
+-- error_message + additional_data. The 'simple' configuration is used on
+-- purpose: no stemming / stop words (there is no Hebrew dictionary), every
+-- word is indexed as-is, and the search endpoint matches word prefixes
+-- (GET /api/audit-logs/search/?q=...). No extension is required.
+--
+-- The expression below MUST stay identical to AUDIT_SEARCH_VECTOR_SQL in
+-- childsmile_app/audit_query_utils.py, otherwise the planner won't use it.
+-- Fully re-runnable.
+-- ============================================================
+
+-- 1. Drop the useless B-tree on description
+-- ============================================================
+DROP INDEX IF EXISTS idx_auditlog_description;
+
+-- 2. Full-text GIN index
+-- ============================================================
+CREATE INDEX IF NOT EXISTS idx_auditlog_search
+    ON audit_log USING GIN (
+        to_tsvector('simple',
+            coalesce(description, '') || ' ' ||
+            coalesce(error_message, '') || ' ' ||
+            coalesce(additional_data::text, ''))
+    );
+
+-- 3. Refresh planner statistics
+-- ============================================================
+ANALYZE audit_log;
+
+-- Verify
+SELECT indexname, indexdef
+FROM pg_indexes
+WHERE tablename = 'audit_log'
+  AND indexname IN ('idx_auditlog_description', 'idx_auditlog_search');
@@ -0,0 +1,63 @@
+-- ============================================================
+-- Audit statistics rollup — Raw PostgreSQL DDL
+-- Execute directly on the database cluster.
+-- No Django migration required (same convention as add_petty_cash_table.sql).
+--
+-- GET /api/audit-statistics/ used to run count() plus two GROUP BYs over the
+-- whole audit_log table on every call. It now reads this table: one row per
+-- (hour, action, user_email, success, endpoint) with the number of audit rows.
+--
+-- Rows are written by audit_stats_utils.refresh_audit_rollups() (scheduler,
+-- every AUDIT_ROLLUP_INTERVAL seconds) for CLOSED hours only. The watermark up
+-- to which hours are rolled up is the JobRun row 'audit_rollup'; the still-open
+-- tail after it is counted live from audit_log (a short timestamp-index range),
+-- so the statistics stay exact. purge_old_audit_logs drops the rolled-up hours
+-- it deletes.
+-- REQUIRES: add_job_run_table.sql (watermark row).
+-- Fully re-runnable.
+-- ============================================================
+
+-- 1. Create the table
+-- ============================================================
+CREATE TABLE IF NOT EXISTS childsmile_app_auditstatsrollup (
+    id          BIGSERIAL PRIMARY KEY,
+    bucket      TIMESTAMP WITH TIME ZONE NOT NULL,   -- start of the hour (UTC)
+    action      VARCHAR(100) NOT NULL,
+    user_email  VARCHAR(255) NOT NULL,
+    success     BOOLEAN NOT NULL,
+    endpoint    VARCHAR(255) NOT NULL,
+    count       INTEGER NOT NULL
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_auditstatsrollup_key
+    ON childsmile_app_auditstatsrollup (bucket, action, user_email, success, endpoint);
+
+-- 2. Initial backfill of every closed hour (re-run: rebuilds from scratch)
+-- ============================================================
+BEGIN;
+
+DELETE FROM childsmile_app_auditstatsrollup;
+
+INSERT INTO childsmile_app_auditstatsrollup (bucket, action, user_email, success, endpoint, count)
+SELECT date_trunc('hour', "timestamp"), action, user_email, success, endpoint, COUNT(*)
+FROM audit_log
+WHERE "timestamp" < date_trunc('hour', NOW() - INTERVAL '5 minutes')
+GROUP BY 1, 2, 3, 4, 5;
+
+INSERT INTO childsmile_app_jobrun (job_name, last_run_date, last_run_at, last_result)
+VALUES (
+    'audit_rollup', CURRENT_DATE, NOW(),
+    jsonb_build_object('rolled_up_to', to_char(date_trunc('hour', NOW() - INTERVAL '5 minutes') AT TIME ZONE 'UTC',
+                                               'YYYY-MM-DD"T"HH24:MI:SS"+00:00"'))
+)
+ON CONFLICT (job_name) DO UPDATE
+    SET last_run_date = EXCLUDED.last_run_date,
+        last_run_at   = EXCLUDED.last_run_at,
+        last_result   = EXCLUDED.last_result;
+
+COMMIT;
+
+-- Verify
+SELECT COUNT(*) AS rollup_rows, SUM(count) AS rolled_up_audit_rows,
+       (SELECT last_result FROM childsmile_app_jobrun WHERE job_name = 'audit_rollup') AS watermark
+FROM childsmile_app_auditstatsrollup;
@@ -29,6 +29,11 @@ INSERT INTO public.childsmile_app_audittranslation (action, hebrew_translation)
     ('USER_REGISTRATION_FAILED',      'כישלון בהרשמת משתמש'),
     ('UNAUTHORIZED_ACCESS_ATTEMPT',   'ניסיון גישה לא מורשה'),
     ('VIEW_AUDIT_LOGS',               'צפייה ביומן הביקורת'),
+    ('EXPORT_AUDIT_LOGS',             'ייצוא יומן הביקורת'),
+    ('SEARCH_AUDIT_LOGS',             'חיפוש ביומן הביקורת'),
+    ('PURGE_AUDIT_LOGS',              'ארכוב ומחיקת יומן ביקורת ישן'),
+    ('VIEW_AUDIT_ARCHIVES',           'צפייה בארכיוני יומן הביקורת'),
+    ('DOWNLOAD_AUDIT_ARCHIVE',        'הורדת ארכיון יומן הביקורת'),
 
     -- Tutorships
     ('CREATE_TUTORSHIP_SUCCESS',      'יצירת חונכות הצליחה'),
@@ -303,3 +308,11 @@ INSERT INTO public.childsmile_app_audittranslation (action, hebrew_translation)
 ON CONFLICT (action) DO UPDATE
     SET hebrew_translation = EXCLUDED.hebrew_translation;
 
+-- Background import jobs — cancel / resume (import_views.py)
+INSERT INTO public.childsmile_app_audittranslation (action, hebrew_translation) VALUES
+    ('CANCEL_IMPORT_JOB',                'ביטול ייבוא ברקע'),
+    ('CANCEL_IMPORT_JOB_FAILED',         'כישלון בביטול ייבוא ברקע'),
+    ('RESUME_IMPORT_JOB',                'המשך ייבוא ברקע'),
+    ('RESUME_IMPORT_JOB_FAILED',         'כישלון בהמשך ייבוא ברקע')
+ON CONFLICT (action) DO UPDATE
+    SET hebrew_translation = EXCLUDED.hebrew_translation;
@@ -0,0 +1,77 @@
+-- ============================================================
+-- City Location gazetteer — Raw PostgreSQL DDL
+-- Execute directly on the database cluster.
+-- No Django migration required (same convention as add_petty_cash_table.sql).
+--
+-- Dedicated city -> coordinates table. Replaces the "dummy" CityGeoDistance
+-- rows (city2 = '') that get_or_update_city_location() used to write after a
+-- synchronous Nominatim call on the request path. Request paths now only do a
+-- primary-key lookup here; cities with NULL coordinates are geocoded in the
+-- background (geo_utils.geocode_pending_cities — scheduler job /
+-- python manage.py geocode_city_locations).
+--
+-- Fully re-runnable (ON CONFLICT DO NOTHING everywhere).
+-- ============================================================
+
+-- 1. Create the table
+-- ============================================================
+CREATE TABLE IF NOT EXISTS childsmile_app_citylocation (
+    city_name             VARCHAR(255) PRIMARY KEY,
+    latitude              DOUBLE PRECISION NULL,
+    longitude             DOUBLE PRECISION NULL,
+    source                VARCHAR(20) NOT NULL DEFAULT 'request',
+    geocode_attempts      INTEGER NOT NULL DEFAULT 0,
+    last_geocode_attempt  TIMESTAMP WITH TIME ZONE NULL,
+    updated_at            TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+-- 2. Index for the background geocoder (only the pending rows)
+-- ============================================================
+CREATE INDEX IF NOT EXISTS idx_citylocation_pending
+    ON childsmile_app_citylocation (geocode_attempts)
+    WHERE latitude IS NULL;
+
+-- 3. Seed coordinates already known to CityGeoDistance (both sides of every row)
+-- ============================================================
+INSERT INTO childsmile_app_citylocation (city_name, latitude, longitude, source)
+SELECT DISTINCT ON (city) city, lat, lon, 'citygeodistance'
+FROM (
+    SELECT TRIM(city1) AS city, city1_latitude AS lat, city1_longitude AS lon, updated_at
+    FROM childsmile_app_citygeodistance
+    WHERE TRIM(city1) <> '' AND city1_latitude IS NOT NULL AND city1_longitude IS NOT NULL
+    UNION ALL
+    SELECT TRIM(city2), city2_latitude, city2_longitude, updated_at
+    FROM childsmile_app_citygeodistance
+    WHERE TRIM(city2) <> '' AND city2_latitude IS NOT NULL AND city2_longitude IS NOT NULL
+) known
+ORDER BY city, updated_at DESC
+ON CONFLICT (city_name) DO NOTHING;
+
+-- 4. Register every settlement (getcities.py / getstreets.py data, loaded into
+--    childsmile_app_settlementsstreets) and every city already used by a family
+--    or volunteer — coordinates NULL, the background geocoder fills them in
+-- ============================================================
+INSERT INTO childsmile_app_citylocation (city_name, source)
+SELECT DISTINCT TRIM(city_name), 'settlements'
+FROM childsmile_app_settlementsstreets
+WHERE TRIM(city_name) <> ''
+ON CONFLICT (city_name) DO NOTHING;
+
+INSERT INTO childsmile_app_citylocation (city_name, source)
+SELECT DISTINCT TRIM(city), 'request'
+FROM (
+    SELECT city FROM childsmile_app_children
+    UNION
+    SELECT city FROM childsmile_app_signedup
+) used
+WHERE TRIM(city) <> ''
+ON CONFLICT (city_name) DO NOTHING;
+
+-- 5. Verify
+-- ============================================================
+SELECT source,
+       COUNT(*) AS cities,
+       COUNT(*) FILTER (WHERE latitude IS NOT NULL) AS with_coordinates
+FROM childsmile_app_citylocation
+GROUP BY source
+ORDER BY source;
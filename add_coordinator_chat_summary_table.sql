@@ -0,0 +1,164 @@
+-- ============================================================
+-- Coordinator chat summary — Raw PostgreSQL DDL
+-- Execute directly on the database cluster.
+-- No Django migration required (same convention as add_petty_cash_table.sql).
+--
+-- The admin coordinator inbox (GET /api/coordinator-chat/conversations/) used
+-- to run four queries per coordinator (latest message, unread count, total
+-- count, exists). It now reads one row per coordinator from this table,
+-- joined to the coordinators and their latest message in a single query.
+--
+-- The rows are maintained by statement-level triggers on
+-- childsmile_app_coordinatorchatmessage for EVERY write path (admin sends /
+-- broadcasts, weekly requests, webhook replies, mark-as-read, deletes, raw SQL):
+--   INSERT          → counts incremented from the inserted rows
+--   UPDATE / DELETE → the affected coordinators are recomputed
+-- unread_count counts coordinator replies the admins have not read yet.
+-- Fully re-runnable (section 4 re-syncs every row).
+-- ============================================================
+
+-- 1. Create the table
+-- ============================================================
+CREATE TABLE IF NOT EXISTS childsmile_app_coordinator_chat_summary (
+    coordinator_id      INTEGER PRIMARY KEY
+                        REFERENCES childsmile_app_staff (staff_id) ON DELETE CASCADE,
+    total_messages      INTEGER NOT NULL DEFAULT 0,
+    unread_count        INTEGER NOT NULL DEFAULT 0,
+    last_message_id     INTEGER,                             -- no FK: kept in sync by the triggers
+    last_message_at     TIMESTAMP WITH TIME ZONE,
+    updated_at          TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+-- 2. Recompute helper (UPDATE / DELETE paths and the initial sync)
+-- ============================================================
+CREATE OR REPLACE FUNCTION refresh_coordinator_chat_summary(coordinator_ids INTEGER[])
+RETURNS VOID AS $$
+BEGIN
+    -- Lock the summary rows in statements of their own before recomputing.
+    -- A concurrent insert's trigger update is waited for here, and the
+    -- recompute below then takes a fresh snapshot that includes its messages.
+    -- Under READ COMMITTED a lone INSERT ... ON CONFLICT would overwrite that
+    -- update with counts read before it. Missing rows are created first so
+    -- they can be locked too; rows are locked in id order (no deadlocks).
+    INSERT INTO childsmile_app_coordinator_chat_summary (coordinator_id)
+    SELECT st.staff_id
+    FROM childsmile_app_staff st
+    WHERE st.staff_id = ANY(coordinator_ids)
+    ORDER BY st.staff_id
+    ON CONFLICT (coordinator_id) DO NOTHING;
+
+    PERFORM 1
+    FROM childsmile_app_coordinator_chat_summary
+    WHERE coordinator_id = ANY(coordinator_ids)
+    ORDER BY coordinator_id
+    FOR UPDATE;
+
+    INSERT INTO childsmile_app_coordinator_chat_summary
+        (coordinator_id, total_messages, unread_count, last_message_id, last_message_at, updated_at)
+    SELECT c.coordinator_id,
+           COALESCE(s.total_messages, 0),
+           COALESCE(s.unread_count, 0),
+           l.id,
+           l.created_at,
+           NOW()
+    FROM (SELECT DISTINCT unnest(coordinator_ids) AS coordinator_id) c
+    JOIN childsmile_app_staff st ON st.staff_id = c.coordinator_id
+    LEFT JOIN LATERAL (
+        SELECT COUNT(*) AS total_messages,
+               COUNT(*) FILTER (WHERE NOT m.is_read AND m.sender_type = 'coordinator') AS unread_count
+        FROM childsmile_app_coordinatorchatmessage m
+        WHERE m.coordinator_id = c.coordinator_id
+    ) s ON TRUE
+    LEFT JOIN LATERAL (
+        SELECT m.id, m.created_at
+        FROM childsmile_app_coordinatorchatmessage m
+        WHERE m.coordinator_id = c.coordinator_id
+        ORDER BY m.created_at DESC, m.id DESC
+        LIMIT 1
+    ) l ON TRUE
+    ON CONFLICT (coordinator_id) DO UPDATE SET
+        total_messages  = EXCLUDED.total_messages,
+        unread_count    = EXCLUDED.unread_count,
+        last_message_id = EXCLUDED.last_message_id,
+        last_message_at = EXCLUDED.last_message_at,
+        updated_at      = EXCLUDED.updated_at;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 3. Triggers (statement-level, transition tables)
+-- ============================================================
+CREATE OR REPLACE FUNCTION coordinator_chat_summary_on_insert()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO childsmile_app_coordinator_chat_summary AS cs
+        (coordinator_id, total_messages, unread_count, last_message_id, last_message_at, updated_at)
+    SELECT coordinator_id,
+           COUNT(*),
+           COUNT(*) FILTER (WHERE NOT is_read AND sender_type = 'coordinator'),
+           (array_agg(id ORDER BY created_at DESC, id DESC))[1],
+           MAX(created_at),
+           NOW()
+    FROM new_messages
+    GROUP BY coordinator_id
+    ON CONFLICT (coordinator_id) DO UPDATE SET
+        total_messages  = cs.total_messages + EXCLUDED.total_messages,
+        unread_count    = cs.unread_count + EXCLUDED.unread_count,
+        last_message_id = CASE WHEN cs.last_message_at IS NULL OR EXCLUDED.last_message_at >= cs.last_message_at
+                               THEN EXCLUDED.last_message_id ELSE cs.last_message_id END,
+        last_message_at = GREATEST(cs.last_message_at, EXCLUDED.last_message_at),
+        updated_at      = EXCLUDED.updated_at;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION coordinator_chat_summary_on_update()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM refresh_coordinator_chat_summary(ARRAY(
+        SELECT coordinator_id FROM new_messages
+        UNION
+        SELECT coordinator_id FROM old_messages
+    ));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION coordinator_chat_summary_on_delete()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM refresh_coordinator_chat_summary(ARRAY(SELECT DISTINCT coordinator_id FROM old_messages));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_coordinator_chat_summary_insert ON childsmile_app_coordinatorchatmessage;
+CREATE TRIGGER trigger_coordinator_chat_summary_insert
+AFTER INSERT ON childsmile_app_coordinatorchatmessage
+REFERENCING NEW TABLE AS new_messages
+FOR EACH STATEMENT
+EXECUTE FUNCTION coordinator_chat_summary_on_insert();
+
+DROP TRIGGER IF EXISTS trigger_coordinator_chat_summary_update ON childsmile_app_coordinatorchatmessage;
+CREATE TRIGGER trigger_coordinator_chat_summary_update
+AFTER UPDATE ON childsmile_app_coordinatorchatmessage
+REFERENCING NEW TABLE AS new_messages OLD TABLE AS old_messages
+FOR EACH STATEMENT
+EXECUTE FUNCTION coordinator_chat_summary_on_update();
+
+DROP TRIGGER IF EXISTS trigger_coordinator_chat_summary_delete ON childsmile_app_coordinatorchatmessage;
+CREATE TRIGGER trigger_coordinator_chat_summary_delete
+AFTER DELETE ON childsmile_app_coordinatorchatmessage
+REFERENCING OLD TABLE AS old_messages
+FOR EACH STATEMENT
+EXECUTE FUNCTION coordinator_chat_summary_on_delete();
+
+-- 4. Initial sync (every coordinator that has messages)
+-- ============================================================
+SELECT refresh_coordinator_chat_summary(ARRAY(
+    SELECT DISTINCT coordinator_id FROM childsmile_app_coordinatorchatmessage
+));
+
+-- 5. Verify
+-- ============================================================
+SELECT COUNT(*) AS conversations, SUM(total_messages) AS messages, SUM(unread_count) AS unread
+FROM childsmile_app_coordinator_chat_summary;
@@ -0,0 +1,45 @@
+-- ============================================================
+-- Email outbox — Raw PostgreSQL DDL
+-- Execute directly on the database cluster.
+-- No Django migration required (same convention as add_petty_cash_table.sql).
+--
+-- Notification emails (new volunteer / new family coordinator notifications,
+-- meeting reminders and events, the weekly digest) used to be sent with one
+-- send_mail() call per recipient — one SMTP connection, TLS handshake and
+-- login per message, often from a fresh thread per event. They are now
+-- INSERTed here (one row per recipient, in the caller's transaction) and sent
+-- by email_outbox's dispatcher threads: up to EMAIL_BATCH_SIZE due rows are
+-- claimed with FOR UPDATE SKIP LOCKED and sent over ONE SMTP connection,
+-- with exponential backoff on temporary (4xx / connection) errors.
+--
+-- Rows are deleted EMAIL_OUTBOX_RETENTION_DAYS after they are sent / failed.
+-- Fully re-runnable.
+-- ============================================================
+
+-- 1. Create the table
+-- ============================================================
+CREATE TABLE IF NOT EXISTS childsmile_app_email_outbox (
+    id                  BIGSERIAL PRIMARY KEY,
+    to_email            VARCHAR(254) NOT NULL,
+    from_email          VARCHAR(254) NOT NULL,
+    subject             TEXT NOT NULL,
+    body                TEXT NOT NULL DEFAULT '',            -- plain-text part
+    html_body           TEXT,                                -- optional HTML alternative
+    source              VARCHAR(50),                         -- caller, for the logs
+    status              VARCHAR(20) NOT NULL DEFAULT 'queued', -- queued | sending | sent | failed
+    attempts            INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at     TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    locked_at           TIMESTAMP WITH TIME ZONE,
+    last_error          TEXT,
+    created_at          TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    sent_at             TIMESTAMP WITH TIME ZONE
+);
+
+-- 2. Indexes
+-- ============================================================
+-- Dispatcher claim order (queued rows due for an attempt)
+CREATE INDEX IF NOT EXISTS idx_email_outbox_due
+    ON childsmile_app_email_outbox (status, next_attempt_at);
+
+-- Verify
+SELECT status, COUNT(*) FROM childsmile_app_email_outbox GROUP BY status;
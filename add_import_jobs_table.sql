@@ -0,0 +1,51 @@
+-- ============================================================
+-- Background Excel import jobs (families / volunteers) — Raw PostgreSQL DDL
+-- Execute directly on the database cluster.
+-- No Django migration required (same convention as add_petty_cash_table.sql).
+--
+-- POST /api/import/families/ and /api/import/volunteers/ used to validate,
+-- insert and build the result workbook inside the HTTP request, so large
+-- files hit the proxy timeout. They now store the upload in a row here and
+-- return a job id; import_jobs' worker pool claims the row (FOR UPDATE SKIP
+-- LOCKED) and processes the sheet in chunks. Each chunk's inserts and its
+-- checkpoint (processed_rows, counts, results) commit in ONE transaction, so
+-- a job whose worker died is resumed from the last committed chunk.
+--
+-- Dry runs (previews) use the same pipeline without the inserts.
+-- Rows are deleted IMPORT_JOB_RETENTION_HOURS after they finish (they hold
+-- the uploaded personal data).
+-- Fully re-runnable.
+-- ============================================================
+
+-- 1. Create the table
+-- ============================================================
+CREATE TABLE IF NOT EXISTS childsmile_app_importjob (
+    job_id            VARCHAR(36) PRIMARY KEY,
+    kind              VARCHAR(20) NOT NULL,                -- 'families' | 'volunteers'
+    dry_run           BOOLEAN NOT NULL DEFAULT FALSE,
+    status            VARCHAR(20) NOT NULL DEFAULT 'queued', -- queued | running | completed | failed | cancelled
+    file_name         VARCHAR(255) NOT NULL,
+    upload            BYTEA NOT NULL,
+    total_rows        INTEGER NOT NULL DEFAULT 0,
+    processed_rows    INTEGER NOT NULL DEFAULT 0,
+    counts            JSONB NOT NULL DEFAULT '{}'::jsonb,
+    results           JSONB NOT NULL DEFAULT '[]'::jsonb,
+    result_file       BYTEA,
+    audit_context     JSONB NOT NULL DEFAULT '{}'::jsonb,
+    error             TEXT,
+    cancel_requested  BOOLEAN NOT NULL DEFAULT FALSE,
+    attempt           INTEGER NOT NULL DEFAULT 0,
+    requested_by      INTEGER,                             -- staff_id
+    created_at        TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    started_at        TIMESTAMP WITH TIME ZONE,
+    heartbeat_at      TIMESTAMP WITH TIME ZONE,
+    finished_at       TIMESTAMP WITH TIME ZONE
+);
+
+-- 2. Index (queue claim order, stale-job lookup, retention sweep)
+-- ============================================================
+CREATE INDEX IF NOT EXISTS idx_importjob_status
+    ON childsmile_app_importjob (status, created_at);
+
+-- Verify
+SELECT status, kind, dry_run, COUNT(*) FROM childsmile_app_importjob GROUP BY status, kind, dry_run;
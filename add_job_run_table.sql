@@ -0,0 +1,25 @@
+-- ============================================================
+-- Job Run markers — Raw PostgreSQL DDL
+-- Execute directly on the database cluster.
+-- No Django migration required (same convention as add_petty_cash_table.sql).
+--
+-- One row per periodic maintenance job with the date/time of its last
+-- successful run. Request paths read it to skip work that already ran today
+-- (first user: the daily age refresh — utils.ensure_ages_refreshed_today()).
+-- Fully re-runnable.
+-- ============================================================
+
+-- 1. Create the table
+-- ============================================================
+CREATE TABLE IF NOT EXISTS childsmile_app_jobrun (
+    job_name       VARCHAR(100) PRIMARY KEY,
+    last_run_date  DATE NOT NULL,
+    last_run_at    TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    last_result    JSONB NOT NULL DEFAULT '{}'::jsonb
+);
+
+-- 2. Verify
+-- ============================================================
+SELECT job_name, last_run_date, last_run_at, last_result
+FROM childsmile_app_jobrun
+ORDER BY job_name;
@@ -0,0 +1,39 @@
+-- ============================================================
+-- PossibleMatches — incremental maintenance support
+-- Raw PostgreSQL DDL. Execute directly on the database cluster.
+-- No Django migration required (same convention as add_petty_cash_table.sql).
+--
+-- matching_utils.sync_possible_matches() keeps childsmile_app_possiblematches
+-- up to date with INSERT ... ON CONFLICT (child_id, tutor_id) DO UPDATE instead
+-- of TRUNCATE + re-insert on every wizard run. ON CONFLICT needs a unique
+-- index on the pair, and the per-tutor sync (tutorship / Staff.is_active
+-- changes) needs an index on tutor_id (child_id is covered by the pair index).
+--
+-- RUN THIS BEFORE deploying the incremental matching code.
+-- Fully re-runnable.
+-- ============================================================
+
+-- 1. Remove duplicate pairs, if any (keep the lowest match_id per pair)
+-- ============================================================
+DELETE FROM childsmile_app_possiblematches pm
+USING childsmile_app_possiblematches dup
+WHERE pm.child_id = dup.child_id
+  AND pm.tutor_id = dup.tutor_id
+  AND pm.match_id > dup.match_id;
+
+-- 2. Unique pair constraint (ON CONFLICT target)
+-- ============================================================
+CREATE UNIQUE INDEX IF NOT EXISTS uq_possiblematches_child_tutor
+    ON childsmile_app_possiblematches (child_id, tutor_id);
+
+-- 3. Per-tutor scope index
+-- ============================================================
+CREATE INDEX IF NOT EXISTS idx_possiblematches_tutor
+    ON childsmile_app_possiblematches (tutor_id);
+
+-- 4. Verify
+-- ============================================================
+SELECT indexname, indexdef
+FROM pg_indexes
+WHERE tablename = 'childsmile_app_possiblematches'
+ORDER BY indexname;
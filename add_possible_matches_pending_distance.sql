@@ -0,0 +1,47 @@
+-- ============================================================
+-- PossibleMatches — unknown distances stored as NULL
+-- Raw PostgreSQL DDL. Execute directly on the database cluster.
+-- No Django migration required (same convention as add_petty_cash_table.sql).
+--
+-- Pairs whose city-to-city distance is not known yet (a city still waiting
+-- for the background geocoder) used to be stored with distance 0 / grade 100:
+-- they passed the 50 km cutoff and ranked FIRST in the wizard and the top-K
+-- API. matching_utils now stores them with distance NULL and grade 0 (below
+-- every pair within 50 km); the top-K distance cutoff excludes them and the
+-- UI shows them as pending. apply_pair_distance() fills them in once the
+-- distance is stored.
+--
+-- RUN THIS BEFORE deploying the matching code that writes NULL distances.
+-- Fully re-runnable.
+-- ============================================================
+
+-- 1. Allow NULL distances
+-- ============================================================
+ALTER TABLE childsmile_app_possiblematches
+    ALTER COLUMN distance_between_cities DROP NOT NULL;
+
+-- 2. Existing placeholder rows: distance 0 between two different cities with
+--    no cached distance → pending
+-- ============================================================
+UPDATE childsmile_app_possiblematches pm
+SET distance_between_cities = NULL, grade = 0
+WHERE pm.distance_between_cities = 0
+  AND TRIM(pm.child_city) <> TRIM(pm.tutor_city)
+  AND NOT EXISTS (
+      SELECT 1 FROM childsmile_app_citygeodistance geo
+      WHERE geo.distance IS NOT NULL
+      AND (
+          (geo.city1 = TRIM(pm.child_city) AND geo.city2 = TRIM(pm.tutor_city))
+          OR (geo.city1 = TRIM(pm.tutor_city) AND geo.city2 = TRIM(pm.child_city))
+      )
+  );
+
+-- 3. Verify
+-- ============================================================
+SELECT is_nullable
+FROM information_schema.columns
+WHERE table_name = 'childsmile_app_possiblematches'
+  AND column_name = 'distance_between_cities';
+SELECT COUNT(*) AS pending_distances
+FROM childsmile_app_possiblematches
+WHERE distance_between_cities IS NULL;
@@ -0,0 +1,119 @@
+-- ============================================================
+-- Realtime change feed — Raw PostgreSQL DDL
+-- Execute directly on the database cluster.
+-- No Django migration required (same convention as add_petty_cash_table.sql).
+--
+-- The admin chat and the notification bell used to poll their full endpoints
+-- every few seconds (conversation list + chat history every 3-5 s, the whole
+-- notification list every 5 min). They now long-poll
+-- GET /api/updates/?cursor=<id> (realtime_views.realtime_updates), which
+-- only returns what changed after the cursor.
+--
+-- Every INSERT / UPDATE / DELETE of a coordinator chat message (admin sends,
+-- incoming WhatsApp replies stored by whatsapp_webhook, read marks, deletes)
+-- and of a notification message appends one row per changed row here, from
+-- statement-level triggers (transition tables) — whatever the write path
+-- (views, scheduler, raw SQL). The BIGSERIAL id is the client's cursor.
+-- realtime_events.prune_realtime_events() (scheduler) deletes rows older than
+-- REALTIME_EVENT_RETENTION_HOURS; a client whose cursor is older than that
+-- gets a full reload.
+-- Fully re-runnable.
+-- ============================================================
+
+-- 1. Create the table
+-- ============================================================
+CREATE TABLE IF NOT EXISTS childsmile_app_realtime_event (
+    id              BIGSERIAL PRIMARY KEY,
+    stream          VARCHAR(20) NOT NULL,               -- chat | notification
+    object_id       INTEGER NOT NULL,                   -- changed message id
+    action          VARCHAR(10) NOT NULL,               -- insert | update | delete
+    coordinator_id  INTEGER NULL,                       -- chat: conversation of the message
+    created_at      TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+-- 2. Indexes
+-- ============================================================
+-- Retention pruning and the commit-overlap re-send window
+CREATE INDEX IF NOT EXISTS idx_realtime_event_created_at
+    ON childsmile_app_realtime_event (created_at);
+
+-- 3. Triggers: coordinator chat messages
+-- ============================================================
+CREATE OR REPLACE FUNCTION record_chat_realtime_events()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        INSERT INTO childsmile_app_realtime_event (stream, object_id, action, coordinator_id)
+        SELECT 'chat', id, 'delete', coordinator_id FROM old_messages ORDER BY id;
+    ELSE
+        INSERT INTO childsmile_app_realtime_event (stream, object_id, action, coordinator_id)
+        SELECT 'chat', id, LOWER(TG_OP), coordinator_id FROM new_messages ORDER BY id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_chat_realtime_insert ON childsmile_app_coordinatorchatmessage;
+CREATE TRIGGER trigger_chat_realtime_insert
+AFTER INSERT ON childsmile_app_coordinatorchatmessage
+REFERENCING NEW TABLE AS new_messages
+FOR EACH STATEMENT
+EXECUTE FUNCTION record_chat_realtime_events();
+
+DROP TRIGGER IF EXISTS trigger_chat_realtime_update ON childsmile_app_coordinatorchatmessage;
+CREATE TRIGGER trigger_chat_realtime_update
+AFTER UPDATE ON childsmile_app_coordinatorchatmessage
+REFERENCING NEW TABLE AS new_messages
+FOR EACH STATEMENT
+EXECUTE FUNCTION record_chat_realtime_events();
+
+DROP TRIGGER IF EXISTS trigger_chat_realtime_delete ON childsmile_app_coordinatorchatmessage;
+CREATE TRIGGER trigger_chat_realtime_delete
+AFTER DELETE ON childsmile_app_coordinatorchatmessage
+REFERENCING OLD TABLE AS old_messages
+FOR EACH STATEMENT
+EXECUTE FUNCTION record_chat_realtime_events();
+
+-- 4. Triggers: notification messages
+-- ============================================================
+CREATE OR REPLACE FUNCTION record_notification_realtime_events()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        INSERT INTO childsmile_app_realtime_event (stream, object_id, action)
+        SELECT 'notification', id, 'delete' FROM old_messages ORDER BY id;
+    ELSE
+        INSERT INTO childsmile_app_realtime_event (stream, object_id, action)
+        SELECT 'notification', id, LOWER(TG_OP) FROM new_messages ORDER BY id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_notification_realtime_insert ON childsmile_app_notification_message;
+CREATE TRIGGER trigger_notification_realtime_insert
+AFTER INSERT ON childsmile_app_notification_message
+REFERENCING NEW TABLE AS new_messages
+FOR EACH STATEMENT
+EXECUTE FUNCTION record_notification_realtime_events();
+
+DROP TRIGGER IF EXISTS trigger_notification_realtime_update ON childsmile_app_notification_message;
+CREATE TRIGGER trigger_notification_realtime_update
+AFTER UPDATE ON childsmile_app_notification_message
+REFERENCING NEW TABLE AS new_messages
+FOR EACH STATEMENT
+EXECUTE FUNCTION record_notification_realtime_events();
+
+DROP TRIGGER IF EXISTS trigger_notification_realtime_delete ON childsmile_app_notification_message;
+CREATE TRIGGER trigger_notification_realtime_delete
+AFTER DELETE ON childsmile_app_notification_message
+REFERENCING OLD TABLE AS old_messages
+FOR EACH STATEMENT
+EXECUTE FUNCTION record_notification_realtime_events();
+
+-- 5. Verify
+-- ============================================================
+SELECT tgname, tgenabled
+FROM pg_trigger
+WHERE tgname LIKE 'trigger_%_realtime_%'
+ORDER BY tgname;
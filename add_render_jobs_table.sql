@@ -0,0 +1,45 @@
+-- ============================================================
+-- Background render jobs (AI video / PPT) — Raw PostgreSQL DDL
+-- Execute directly on the database cluster.
+-- No Django migration required (same convention as add_petty_cash_table.sql).
+--
+-- POST /api/dashboard/generate-video/ and /export-ppt/ used to render the
+-- file inside the HTTP request (gTTS + slides + a libx264 encode: 30-60 s
+-- holding a gunicorn worker). They now insert a row here and return at once;
+-- render_jobs' bounded worker pool claims queued rows (FOR UPDATE SKIP
+-- LOCKED), renders them and records the result. The status / download
+-- endpoints read the row, so any worker can answer them, and queued jobs
+-- survive a restart.
+--
+-- dedup_key = sha256 of (kind, timeframe, style, pages): an identical request
+-- while a job is queued / running / recently completed returns that job.
+-- Fully re-runnable.
+-- ============================================================
+
+-- 1. Create the table
+-- ============================================================
+CREATE TABLE IF NOT EXISTS childsmile_app_renderjob (
+    job_id        VARCHAR(36) PRIMARY KEY,
+    kind          VARCHAR(10) NOT NULL,                -- 'video' | 'ppt'
+    params        JSONB NOT NULL DEFAULT '{}'::jsonb,
+    dedup_key     VARCHAR(64) NOT NULL,
+    status        VARCHAR(20) NOT NULL DEFAULT 'queued', -- queued | running | completed | failed | expired
+    file_path     VARCHAR(500),
+    file_size     BIGINT,
+    error         TEXT,
+    requested_by  INTEGER,                             -- staff_id
+    created_at    TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    started_at    TIMESTAMP WITH TIME ZONE,
+    finished_at   TIMESTAMP WITH TIME ZONE
+);
+
+-- 2. Indexes (queue claim order, dedup lookup)
+-- ============================================================
+CREATE INDEX IF NOT EXISTS idx_renderjob_status
+    ON childsmile_app_renderjob (status, created_at);
+
+CREATE INDEX IF NOT EXISTS idx_renderjob_dedup
+    ON childsmile_app_renderjob (dedup_key, created_at);
+
+-- Verify
+SELECT status, kind, COUNT(*) FROM childsmile_app_renderjob GROUP BY status, kind;
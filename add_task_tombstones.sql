@@ -0,0 +1,101 @@
+-- ============================================================
+-- Task tombstones — Raw PostgreSQL DDL
+-- Execute directly on the database cluster.
+-- No Django migration required (same convention as add_petty_cash_table.sql).
+--
+-- The task board can poll in delta mode (GET /api/tasks/?since=<watermark>)
+-- and only receive tasks changed since its last sync. Deleted tasks can't be
+-- found by updated_at, so every delete leaves a tombstone row here. A
+-- statement-level trigger records them for EVERY delete path (delete_task,
+-- cleanup_old_tasks, the approval flows' bulk .delete(), raw SQL) in one INSERT
+-- per statement. A task reassigned to someone else is gone from the previous
+-- assignee's board just the same, so reassignments leave a tombstone for the
+-- PREVIOUS assignee too (one row per task + assignee).
+-- cleanup_old_tasks prunes tombstones after 30 days; a client whose watermark
+-- is older than that gets a full resync.
+-- Fully re-runnable (also upgrades the first version of the table, which
+-- had task_id as its primary key).
+-- ============================================================
+
+-- 1. Create the table
+-- ============================================================
+CREATE TABLE IF NOT EXISTS childsmile_app_task_tombstones (
+    id              BIGSERIAL PRIMARY KEY,
+    task_id         INTEGER NOT NULL,
+    assigned_to_id  INTEGER NULL,                       -- assignee the task disappeared for
+    task_type_id    INTEGER NULL,
+    deleted_at      TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()   -- deleted / reassigned at
+);
+
+-- First version: task_id was the primary key (one row per task)
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'childsmile_app_task_tombstones' AND column_name = 'id'
+    ) THEN
+        ALTER TABLE childsmile_app_task_tombstones DROP CONSTRAINT IF EXISTS childsmile_app_task_tombstones_pkey;
+        ALTER TABLE childsmile_app_task_tombstones ADD COLUMN id BIGSERIAL PRIMARY KEY;
+    END IF;
+END $$;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_task_tombstones_task_assignee
+    ON childsmile_app_task_tombstones (task_id, (COALESCE(assigned_to_id, 0)));
+
+CREATE INDEX IF NOT EXISTS idx_task_tombstones_deleted_at
+    ON childsmile_app_task_tombstones (deleted_at);
+
+-- 2. Trigger: one tombstone per deleted task (statement-level, transition table)
+-- ============================================================
+CREATE OR REPLACE FUNCTION record_task_tombstones()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO childsmile_app_task_tombstones (task_id, assigned_to_id, task_type_id, deleted_at)
+    SELECT task_id, assigned_to_id, task_type_id, NOW()
+    FROM deleted_tasks
+    ON CONFLICT (task_id, (COALESCE(assigned_to_id, 0)))
+    DO UPDATE SET deleted_at = EXCLUDED.deleted_at, task_type_id = EXCLUDED.task_type_id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_record_task_tombstones ON childsmile_app_tasks;
+CREATE TRIGGER trigger_record_task_tombstones
+AFTER DELETE ON childsmile_app_tasks
+REFERENCING OLD TABLE AS deleted_tasks
+FOR EACH STATEMENT
+EXECUTE FUNCTION record_task_tombstones();
+
+-- 3. Trigger: tombstone for the previous assignee of a reassigned task
+-- ============================================================
+CREATE OR REPLACE FUNCTION record_task_reassignment_tombstones()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO childsmile_app_task_tombstones (task_id, assigned_to_id, task_type_id, deleted_at)
+    SELECT old_task.task_id, old_task.assigned_to_id, old_task.task_type_id, NOW()
+    FROM old_tasks old_task
+    JOIN new_tasks new_task ON new_task.task_id = old_task.task_id
+    WHERE new_task.assigned_to_id IS DISTINCT FROM old_task.assigned_to_id
+    ON CONFLICT (task_id, (COALESCE(assigned_to_id, 0)))
+    DO UPDATE SET deleted_at = EXCLUDED.deleted_at, task_type_id = EXCLUDED.task_type_id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_record_task_reassignment_tombstones ON childsmile_app_tasks;
+CREATE TRIGGER trigger_record_task_reassignment_tombstones
+AFTER UPDATE ON childsmile_app_tasks
+REFERENCING OLD TABLE AS old_tasks NEW TABLE AS new_tasks
+FOR EACH STATEMENT
+EXECUTE FUNCTION record_task_reassignment_tombstones();
+
+-- 4. Delta sync index (changed-since scans)
+-- ============================================================
+CREATE INDEX IF NOT EXISTS idx_tasks_updated_at
+    ON childsmile_app_tasks (updated_at);
+
+-- 5. Verify
+-- ============================================================
+SELECT tgname, tgenabled
+FROM pg_trigger
+WHERE tgname IN ('trigger_record_task_tombstones', 'trigger_record_task_reassignment_tombstones');
@@ -0,0 +1,55 @@
+-- ============================================================
+-- WhatsApp outbox — Raw PostgreSQL DDL
+-- Execute directly on the database cluster.
+-- No Django migration required (same convention as add_petty_cash_table.sql).
+--
+-- Bulk WhatsApp notifications (meeting reminders / events, coordinator chat
+-- broadcasts, weekly coordinator requests, refund notifications, security
+-- alerts) used to be sent with one blocking Twilio request per recipient
+-- inside the HTTP request or scheduler thread. They are now INSERTed here
+-- (in the caller's transaction) and sent by whatsapp_outbox's dispatcher
+-- threads: claimed with FOR UPDATE SKIP LOCKED, sent concurrently over a
+-- pooled HTTP session under WHATSAPP_RATE_LIMIT, retried with exponential
+-- backoff on 429 / 5xx / network errors.
+--
+-- delivery_status is Twilio's message status (queued / sent / delivered /
+-- read / undelivered / failed), updated by the status callback webhook when
+-- WHATSAPP_STATUS_CALLBACK_URL is set.
+-- Rows are deleted WHATSAPP_OUTBOX_RETENTION_DAYS after they are sent / failed.
+-- Fully re-runnable.
+-- ============================================================
+
+-- 1. Create the table
+-- ============================================================
+CREATE TABLE IF NOT EXISTS childsmile_app_whatsapp_outbox (
+    id                  BIGSERIAL PRIMARY KEY,
+    to_phone            VARCHAR(32) NOT NULL,                -- whatsapp:+972...
+    body                TEXT,                                -- plain text messages
+    template_sid        VARCHAR(64),                         -- content template messages
+    template_variables  JSONB,
+    source              VARCHAR(50),                         -- caller, for the logs
+    status              VARCHAR(20) NOT NULL DEFAULT 'queued', -- queued | sending | sent | failed
+    attempts            INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at     TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    locked_at           TIMESTAMP WITH TIME ZONE,
+    message_sid         VARCHAR(64),
+    delivery_status     VARCHAR(20),
+    error_code          VARCHAR(20),
+    last_error          TEXT,
+    created_at          TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    sent_at             TIMESTAMP WITH TIME ZONE
+);
+
+-- 2. Indexes
+-- ============================================================
+-- Dispatcher claim order (queued rows due for an attempt)
+CREATE INDEX IF NOT EXISTS idx_whatsapp_outbox_due
+    ON childsmile_app_whatsapp_outbox (status, next_attempt_at);
+
+-- Status callback lookup
+CREATE INDEX IF NOT EXISTS idx_whatsapp_outbox_sid
+    ON childsmile_app_whatsapp_outbox (message_sid)
+    WHERE message_sid IS NOT NULL;
+
+-- Verify
+SELECT status, delivery_status, COUNT(*) FROM childsmile_app_whatsapp_outbox GROUP BY status, delivery_status;
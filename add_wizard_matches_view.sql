@@ -0,0 +1,59 @@
+-- ============================================================
+-- PossibleMatches — wizard view + keyset pagination index
+-- Raw PostgreSQL DDL. Execute directly on the database cluster.
+-- No Django migration required (same convention as add_petty_cash_table.sql).
+--
+-- childsmile_app_wizard_matches is the pre-filtered list the tutorship wizard
+-- pages through: only children with NO active/pending tutorship, plus the
+-- gender group the wizard sorts by (0 = male/male, 1 = female/female,
+-- 2 = cross). matching_utils.get_wizard_page() reads it with a keyset cursor:
+--     WHERE (gender_group, -grade, match_id) > (last row)
+--     ORDER BY gender_group, -grade, match_id LIMIT n
+-- which the expression index below serves as one index range scan — no
+-- OFFSET, no COUNT(*), no Python-side filtering of the page.
+--
+-- The CASE expression must stay identical to _GENDER_GROUP_SQL in
+-- matching_utils.py or the planner will not use the index.
+--
+-- RUN AFTER add_possible_matches_pair_index.sql. Fully re-runnable.
+-- ============================================================
+
+-- 1. Wizard ordering index (gender group, best grade first, stable tiebreak)
+-- ============================================================
+CREATE INDEX IF NOT EXISTS idx_possiblematches_wizard_order
+    ON childsmile_app_possiblematches (
+        (CASE WHEN child_gender = FALSE AND tutor_gender = FALSE THEN 0
+              WHEN child_gender = TRUE AND tutor_gender = TRUE THEN 1 ELSE 2 END),
+        (-grade),
+        match_id
+    );
+
+-- 2. Active/pending tutorships per child (the view's anti-join probe)
+-- ============================================================
+CREATE INDEX IF NOT EXISTS idx_tutorships_child_not_inactive
+    ON childsmile_app_tutorships (child_id)
+    WHERE tutorship_activation <> 'inactive';
+
+-- 3. Wizard view
+-- ============================================================
+CREATE OR REPLACE VIEW childsmile_app_wizard_matches AS
+SELECT
+    pm.*,
+    CASE WHEN pm.child_gender = FALSE AND pm.tutor_gender = FALSE THEN 0
+         WHEN pm.child_gender = TRUE AND pm.tutor_gender = TRUE THEN 1 ELSE 2 END AS gender_group
+FROM childsmile_app_possiblematches pm
+WHERE NOT EXISTS (
+    SELECT 1
+    FROM childsmile_app_tutorships tutorship
+    WHERE tutorship.child_id = pm.child_id
+    AND tutorship.tutorship_activation <> 'inactive'
+);
+
+-- 4. Verify
+-- ============================================================
+SELECT indexname, indexdef
+FROM pg_indexes
+WHERE indexname IN ('idx_possiblematches_wizard_order', 'idx_tutorships_child_not_inactive');
+-- EXPLAIN SELECT * FROM childsmile_app_wizard_matches
+--   WHERE (gender_group, -grade, match_id) > (0, -80, 123)
+--   ORDER BY gender_group, -grade, match_id LIMIT 100;
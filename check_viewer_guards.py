@@ -32,6 +32,7 @@ ALLOWLIST = {
     "register_verify_totp",
     "audit_action",
     "whatsapp_incoming",
+    "whatsapp_status_callback",
     "submit_activity_request",
     "submit_voucher_questionnaire",
 }
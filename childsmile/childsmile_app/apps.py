@@ -9,7 +9,19 @@ class ChildsmileAppConfig(AppConfig):
         """
         Initialize background scheduler when Django app is ready.
         This will run the monthly task check at 4:00 AM Israel time daily.
+        Also connects the signals that keep PossibleMatches incrementally in sync
+        and that drop the cached dashboard snapshot / settlements index when
+        their data changes.
         """
+        from .matching_utils import connect_matching_signals
+        connect_matching_signals()
+
+        from .dashboard_metrics import connect_dashboard_signals
+        connect_dashboard_signals()
+
+        from .settlements_index import connect_settlements_signals
+        connect_settlements_signals()
+
         try:
             from .scheduler import start_scheduler
             start_scheduler()
@@ -0,0 +1,329 @@
+"""
+audit_archive_utils.py
+
+Month-partitioned audit log retention with a server-side archive.
+
+The old purge flow exported the rows to CSV in the browser (the whole table
+loaded into browser memory) and then purge_old_audit_logs ran count(),
+first(), last() and one long ORM DELETE of everything older than 90 days.
+
+audit_log is now partitioned by month (partition_audit_log_by_month.sql),
+one partition per calendar month in UTC, named audit_log_pYYYY_MM.
+Retention works on whole partitions:
+
+  1. archive_audit_range() streams the month (server-side cursor) into
+     AUDIT_ARCHIVE_DIR/audit_log_YYYY_MM.ndjson.gz — one JSON object per line,
+     the same columns as the NDJSON export — plus a .json manifest (row
+     count, first/last timestamp, sha256 of the .gz). The file is written
+     to a temp name and renamed only when complete.
+  2. ALTER TABLE audit_log DETACH PARTITION + DROP TABLE: a metadata change,
+     O(1) however many rows the month holds; no table-wide DELETE, no bloat.
+
+A month is purged once ALL of it is older than the retention cutoff, so rows
+are kept between AUDIT_RETENTION_DAYS and AUDIT_RETENTION_DAYS + one month.
+
+ensure_audit_partitions() creates the partitions for the next months ahead
+of time (scheduler, AUDIT_PARTITION_TIME); rows outside every partition land
+in audit_log_default, which the purge never drops.
+
+If partition_audit_log_by_month.sql has not been applied yet, the purge falls
+back to archiving the expired rows and deleting them with one SQL DELETE.
+
+Archives are listed / downloaded by admins through audit_views
+(api/audit-archives/); the purge response links to the new ones. On Azure the
+code runs from a temporary extract under /tmp that is replaced on every
+restart and deploy, so archives default to the persistent /home share there.
+Environment:
+  AUDIT_ARCHIVE_DIR   where archives are written (default /home/audit_archive
+                      on Azure, <BASE_DIR>/audit_archive elsewhere)
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+from datetime import datetime, timezone as dt_timezone
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.db.models import Count, Max, Min, Q
+from django.utils import timezone
+from .audit_query_utils import (
+    AUDIT_EXPORT_CHUNK_SIZE,
+    AUDIT_FIELDS,
+    audit_queryset,
+    serialize_audit_row,
+)
+from .audit_stats_utils import forget_audit_rollups_before
+from .models import AuditLog
+from .logger import IS_AZURE, api_logger
+
+AUDIT_TABLE = 'audit_log'
+AUDIT_PARTITION_MONTHS_AHEAD = 3
+
+_PARTITION_NAME_RE = re.compile(r'^audit_log_p(\d{4})_(\d{2})$')
+ARCHIVE_NAME_RE = re.compile(r'^audit_log_[0-9A-Za-z_]+\.(ndjson\.gz|json)$')
+
+
+def get_archive_dir():
+    """Directory for audit archives (created on first use)."""
+    default = '/home/audit_archive' if IS_AZURE else os.path.join(settings.BASE_DIR, 'audit_archive')
+    path = os.environ.get('AUDIT_ARCHIVE_DIR') or default
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _month_start(year, month):
+    return datetime(year, month, 1, tzinfo=dt_timezone.utc)
+
+
+def _next_month(moment):
+    if moment.month == 12:
+        return _month_start(moment.year + 1, 1)
+    return _month_start(moment.year, moment.month + 1)
+
+
+def audit_log_is_partitioned():
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT 1 FROM pg_partitioned_table pt
+            JOIN pg_class c ON c.oid = pt.partrelid
+            WHERE c.relname = %s AND c.relnamespace = current_schema()::regnamespace
+            """,
+            [AUDIT_TABLE],
+        )
+        return cursor.fetchone() is not None
+
+
+def list_audit_partitions():
+    """
+    Monthly partitions of audit_log, oldest first:
+    [{'name', 'start', 'end'}] (bounds are UTC month starts).
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = %s::regclass
+            """,
+            [AUDIT_TABLE],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+
+    partitions = []
+    for name in names:
+        match = _PARTITION_NAME_RE.match(name)
+        if match:
+            start = _month_start(int(match.group(1)), int(match.group(2)))
+            partitions.append({'name': name, 'start': start, 'end': _next_month(start)})
+    return sorted(partitions, key=lambda partition: partition['start'])
+
+
+def ensure_audit_partitions(months_ahead=AUDIT_PARTITION_MONTHS_AHEAD):
+    """
+    Create the monthly partitions from the current month up to `months_ahead`
+    months ahead. Idempotent; a no-op while audit_log is not partitioned.
+    :return: list of partition names created
+    """
+    if not audit_log_is_partitioned():
+        return []
+    existing = {partition['name'] for partition in list_audit_partitions()}
+    now = timezone.now()
+    start = _month_start(now.year, now.month)
+    created = []
+    for _ in range(months_ahead + 1):
+        end = _next_month(start)
+        name = f"audit_log_p{start:%Y_%m}"
+        if name not in existing:
+            try:
+                with transaction.atomic(), connection.cursor() as cursor:
+                    cursor.execute(
+                        f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF {AUDIT_TABLE} '
+                        f'FOR VALUES FROM (%s) TO (%s)',
+                        [start, end],
+                    )
+                created.append(name)
+            except Exception as e:
+                # e.g. audit_log_default already holds rows of that month
+                api_logger.error(f"Could not create audit partition {name}: {str(e)[:200]}")
+        start = end
+    if created:
+        api_logger.info(f"🗂️ Created audit log partitions: {', '.join(created)}")
+    return created
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as archive_file:
+        for block in iter(lambda: archive_file.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def archive_audit_range(start, end, name):
+    """
+    Stream every audit row with start <= timestamp < end (either bound may be
+    None) into <archive dir>/<name>.ndjson.gz and write its manifest.
+    :return: manifest dict ('file', 'rows', 'first_timestamp', 'last_timestamp', 'sha256', ...)
+    """
+    archive_dir = get_archive_dir()
+    final_path = os.path.join(archive_dir, f"{name}.ndjson.gz")
+    temp_path = final_path + '.tmp'
+
+    filters = Q()
+    if start is not None:
+        filters &= Q(timestamp__gte=start)
+    if end is not None:
+        filters &= Q(timestamp__lt=end)
+    fields = list(AUDIT_FIELDS)
+    rows = (
+        audit_queryset(filters, fields)
+        .order_by('timestamp', 'audit_id')
+        .iterator(chunk_size=AUDIT_EXPORT_CHUNK_SIZE)
+    )
+
+    count, first_timestamp, last_timestamp = 0, None, None
+    with gzip.open(temp_path, 'wt', encoding='utf-8') as archive_file:
+        for row in rows:
+            archive_file.write(json.dumps(serialize_audit_row(row, fields), cls=DjangoJSONEncoder, ensure_ascii=False))
+            archive_file.write('\n')
+            if first_timestamp is None:
+                first_timestamp = row['timestamp']
+            last_timestamp = row['timestamp']
+            count += 1
+    os.replace(temp_path, final_path)
+
+    manifest = {
+        'file': os.path.basename(final_path),
+        'rows': count,
+        'range_start': start.isoformat() if start else None,
+        'range_end': end.isoformat() if end else None,
+        'first_timestamp': first_timestamp.isoformat() if first_timestamp else None,
+        'last_timestamp': last_timestamp.isoformat() if last_timestamp else None,
+        'sha256': _sha256(final_path),
+        'archived_at': timezone.now().isoformat(),
+    }
+    with open(os.path.join(archive_dir, f"{name}.json"), 'w', encoding='utf-8') as manifest_file:
+        json.dump(manifest, manifest_file, ensure_ascii=False, indent=2)
+
+    api_logger.info(f"📦 Archived {count} audit logs to {final_path}")
+    return manifest
+
+
+def _drop_partition(name):
+    """Detach + drop one monthly partition — catalog-only, no row is touched."""
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE {AUDIT_TABLE} DETACH PARTITION "{name}"')
+        cursor.execute(f'DROP TABLE "{name}"')
+
+
+def _summarize_range(start, end):
+    """Row count and first / last timestamp of the audit rows with start <= timestamp < end."""
+    filters = Q()
+    if start is not None:
+        filters &= Q(timestamp__gte=start)
+    if end is not None:
+        filters &= Q(timestamp__lt=end)
+    summary = AuditLog.objects.filter(filters).aggregate(
+        rows=Count('audit_id'), first=Min('timestamp'), last=Max('timestamp'),
+    )
+    return {
+        'rows': summary['rows'],
+        'first_timestamp': summary['first'].isoformat() if summary['first'] else None,
+        'last_timestamp': summary['last'].isoformat() if summary['last'] else None,
+    }
+
+
+def purge_expired_audit_partitions(cutoff, dry_run=False):
+    """
+    Archive and drop every monthly partition that lies entirely before
+    `cutoff`. Falls back to archive + one DELETE when audit_log is not
+    partitioned yet.
+
+    :param cutoff: rows older than this are expired (retention_cutoff())
+    :param dry_run: only count what would be archived / dropped — the purge
+                    preview, so it matches what a purge right now deletes
+    :return: Dictionary with 'partitioned', 'deleted_count', 'archives'
+             (manifests; row summaries on a dry run), 'first_log_date',
+             'last_log_date'
+    """
+    result = {
+        'partitioned': audit_log_is_partitioned(),
+        'deleted_count': 0,
+        'archives': [],
+        'first_log_date': None,
+        'last_log_date': None,
+    }
+
+    if result['partitioned']:
+        expired = [partition for partition in list_audit_partitions() if partition['end'] <= cutoff]
+        for partition in expired:
+            if dry_run:
+                manifest = _summarize_range(partition['start'], partition['end'])
+            else:
+                manifest = archive_audit_range(
+                    partition['start'], partition['end'], f"audit_log_{partition['start']:%Y_%m}",
+                )
+                _drop_partition(partition['name'])
+                forget_audit_rollups_before(partition['end'])
+                api_logger.warning(f"🗑️ Dropped audit partition {partition['name']} ({manifest['rows']} logs)")
+            manifest['partition'] = partition['name']
+            result['archives'].append(manifest)
+            result['deleted_count'] += manifest['rows']
+    elif dry_run:
+        summary = _summarize_range(None, cutoff)
+        if summary['rows']:
+            result['archives'].append(summary)
+            result['deleted_count'] = summary['rows']
+    else:
+        name = f"audit_log_until_{cutoff:%Y_%m_%d}_{timezone.now():%H%M%S}"
+        manifest = archive_audit_range(None, cutoff, name)
+        if manifest['rows']:
+            with connection.cursor() as cursor:
+                cursor.execute(f'DELETE FROM {AUDIT_TABLE} WHERE "timestamp" < %s', [cutoff])
+                result['deleted_count'] = cursor.rowcount
+            forget_audit_rollups_before(cutoff)
+            result['archives'].append(manifest)
+        else:
+            _remove_archive(manifest['file'])
+
+    archived = [archive for archive in result['archives'] if archive.get('rows')]
+    if archived:
+        result['first_log_date'] = archived[0]['first_timestamp']
+        result['last_log_date'] = archived[-1]['last_timestamp']
+    return result
+
+
+def _remove_archive(file_name):
+    archive_dir = get_archive_dir()
+    for path in (os.path.join(archive_dir, file_name),
+                 os.path.join(archive_dir, file_name.replace('.ndjson.gz', '.json'))):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def list_audit_archives():
+    """Manifests of every archive in the archive directory, newest first."""
+    archive_dir = get_archive_dir()
+    manifests = []
+    for file_name in os.listdir(archive_dir):
+        if not (file_name.endswith('.json') and ARCHIVE_NAME_RE.match(file_name)):
+            continue
+        try:
+            with open(os.path.join(archive_dir, file_name), encoding='utf-8') as manifest_file:
+                manifests.append(json.load(manifest_file))
+        except (OSError, ValueError) as e:
+            api_logger.error(f"Unreadable audit archive manifest {file_name}: {e}")
+    return sorted(manifests, key=lambda manifest: manifest.get('archived_at') or '', reverse=True)
+
+
+def get_archive_path(file_name):
+    """Absolute path of an archive file, or None if the name is invalid / missing."""
+    if not ARCHIVE_NAME_RE.match(file_name or ''):
+        return None
+    path = os.path.join(get_archive_dir(), file_name)
+    return path if os.path.isfile(path) else None
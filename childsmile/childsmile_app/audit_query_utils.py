@@ -0,0 +1,359 @@
+"""
+audit_query_utils.py
+
+Server-side querying of the audit log (audit_log table).
+
+get_audit_logs used to load EVERY AuditLog row — user_agent, additional_data
+and the long description included — into one Python list and one JSON
+response, so 90 days of traffic meant a multi-megabyte payload that the
+browser then filtered and paginated by itself.
+
+This module gives the audit screens a real query API instead:
+
+  - parse_audit_filters(params) turns request query parameters into a
+    QuerySet filter (action / user / success / entity / status / date range),
+    so filtering happens in Postgres on the existing indexes.
+  - parse_audit_fields(value) is the column projection — only the requested
+    columns are SELECTed (heavy text / JSON columns are opt-in).
+  - get_audit_page(...) is keyset (cursor) pagination on
+    (timestamp DESC, audit_id DESC): every page is one range scan of
+    idx_auditlog_ts_id (add_audit_log_keyset_index.sql), and rows written
+    while the admin is paging never shift or duplicate rows between pages.
+  - stream_audit_ndjson / stream_audit_csv serve an export of any filter
+    (e.g. everything older than the retention window before a purge) as a
+    stream read through a server-side cursor, never as one in-memory list.
+  - the `q` filter is full-text search over description / error_message /
+    additional_data, served by the idx_auditlog_search GIN index
+    (add_audit_log_search_index.sql).
+
+Query parameters understood by parse_audit_filters:
+  action       one action or a comma-separated list (exact match)
+  user         user_email or username (exact match)
+  success      true | false
+  entity_type  exact entity type
+  entity_id    rows whose entity_ids contain this id
+  status_code  exact HTTP status code
+  from, to     ISO date (YYYY-MM-DD, Israel day, `to` inclusive) or datetime
+  expired      true → only rows older than AUDIT_RETENTION_DAYS (purge candidates)
+  q            search words; a row matches when it contains a word starting
+               with EACH of them (e.g. "עדכן סטטוס", "admin@", "12345")
+
+Sort order (parse_audit_order): order=desc (default, newest first) | asc.
+"""
+
+import base64
+import csv
+import json
+import re
+from datetime import datetime, time, timedelta
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import BooleanField, DateTimeField, ExpressionWrapper, F, Q, Value
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from .models import AuditLog
+from .logger import api_logger
+
+# Audit logs older than this are exported and purged (purge_old_audit_logs)
+AUDIT_RETENTION_DAYS = 90
+
+AUDIT_PAGE_SIZE = 100
+AUDIT_PAGE_MAX = 1000
+AUDIT_EXPORT_CHUNK_SIZE = 2000
+
+# Response key → AuditLog field (response keys match the legacy payload)
+AUDIT_FIELDS = {
+    'id': 'audit_id',
+    'user_email': 'user_email',
+    'username': 'username',
+    'timestamp': 'timestamp',
+    'action': 'action',
+    'endpoint': 'endpoint',
+    'method': 'method',
+    'resource': 'affected_tables',
+    'user_roles': 'user_roles',
+    'permissions': 'permissions',
+    'entity_type': 'entity_type',
+    'entity_ids': 'entity_ids',
+    'ip_address': 'ip_address',
+    'user_agent': 'user_agent',
+    'status_code': 'status_code',
+    'success': 'success',
+    'error_message': 'error_message',
+    'additional_data': 'additional_data',
+    'report_name': 'report_name',
+    'description': 'description',
+}
+
+# Default projection for the paginated list: everything the table shows,
+# without the heavy user_agent / permissions / additional_data columns.
+AUDIT_LIST_FIELDS = [
+    'id', 'timestamp', 'user_email', 'username', 'action', 'endpoint', 'method',
+    'resource', 'user_roles', 'entity_type', 'entity_ids', 'ip_address',
+    'status_code', 'success', 'error_message', 'report_name', 'description',
+]
+
+# Must match the idx_auditlog_search expression in add_audit_log_search_index.sql
+AUDIT_SEARCH_VECTOR_SQL = (
+    "to_tsvector('simple', "
+    "coalesce(description, '') || ' ' || "
+    "coalesce(error_message, '') || ' ' || "
+    "coalesce(additional_data::text, ''))"
+)
+AUDIT_SEARCH_MAX_TERMS = 8
+
+_TRUE_VALUES = ('true', '1', 'yes')
+_FALSE_VALUES = ('false', '0', 'no')
+
+
+def _parse_bool(name, value):
+    value = value.strip().lower()
+    if value in _TRUE_VALUES:
+        return True
+    if value in _FALSE_VALUES:
+        return False
+    raise ValueError(f"Invalid value for '{name}': expected true or false")
+
+
+def _parse_bound(name, value, end_of_range=False):
+    """
+    ISO datetime, or ISO date interpreted as an Israel calendar day.
+    For `to`, a plain date includes the whole day (returned as the next midnight).
+    """
+    value = value.strip()
+    moment = parse_datetime(value)
+    if moment is not None:
+        if timezone.is_naive(moment):
+            moment = timezone.make_aware(moment)
+        return moment
+    day = parse_date(value)
+    if day is None:
+        raise ValueError(f"Invalid value for '{name}': expected YYYY-MM-DD or an ISO datetime")
+    if end_of_range:
+        day += timedelta(days=1)
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def build_search_tsquery(text):
+    """
+    to_tsquery('simple', ...) source for free search text: every word becomes
+    a quoted prefix term ('word':*), all ANDed. Quoting keeps tsquery operator
+    characters in the input from being interpreted.
+    """
+    terms = [term for term in re.split(r"[\s'\\&|!():*<>]+", text) if term][:AUDIT_SEARCH_MAX_TERMS]
+    if not terms:
+        raise ValueError("Search text is empty")
+    return " & ".join(f"'{term}':*" for term in terms)
+
+
+def is_search(params):
+    """True when the request carries a full-text `q` filter."""
+    return bool(params.get('q', '').strip())
+
+
+def retention_cutoff():
+    """Rows with timestamp before this are past the retention window."""
+    return timezone.now() - timedelta(days=AUDIT_RETENTION_DAYS)
+
+
+def parse_audit_filters(params):
+    """
+    Q object for the filters in `params` (request.GET).
+    Raises ValueError with a user-facing message on malformed values.
+    """
+    query = Q()
+
+    actions = [a.strip() for a in params.get('action', '').split(',') if a.strip()]
+    if len(actions) == 1:
+        query &= Q(action=actions[0])
+    elif actions:
+        query &= Q(action__in=actions)
+
+    user = params.get('user', '').strip()
+    if user:
+        query &= Q(user_email=user) | Q(username=user)
+
+    if params.get('success', '').strip():
+        query &= Q(success=_parse_bool('success', params['success']))
+
+    entity_type = params.get('entity_type', '').strip()
+    if entity_type:
+        query &= Q(entity_type=entity_type)
+
+    entity_id = params.get('entity_id', '').strip()
+    if entity_id:
+        # entity_ids holds ints for most entities and strings for some — match both
+        entity_query = Q(entity_ids__contains=[entity_id])
+        if entity_id.lstrip('-').isdigit():
+            entity_query |= Q(entity_ids__contains=[int(entity_id)])
+        query &= entity_query
+
+    status_code = params.get('status_code', '').strip()
+    if status_code:
+        if not status_code.isdigit():
+            raise ValueError("Invalid value for 'status_code': expected a number")
+        query &= Q(status_code=int(status_code))
+
+    if params.get('from', '').strip():
+        query &= Q(timestamp__gte=_parse_bound('from', params['from']))
+    if params.get('to', '').strip():
+        query &= Q(timestamp__lt=_parse_bound('to', params['to'], end_of_range=True))
+
+    if params.get('expired', '').strip() and _parse_bool('expired', params['expired']):
+        query &= Q(timestamp__lt=retention_cutoff())
+
+    if params.get('q', '').strip():
+        query &= Q(RawSQL(
+            f"{AUDIT_SEARCH_VECTOR_SQL} @@ to_tsquery('simple', %s)",
+            (build_search_tsquery(params['q']),),
+            output_field=BooleanField(),
+        ))
+
+    return query
+
+
+def parse_audit_order(params):
+    """True for ?order=asc (oldest first); newest first otherwise."""
+    order = params.get('order', '').strip().lower() or 'desc'
+    if order not in ('asc', 'desc'):
+        raise ValueError("Invalid value for 'order': expected asc or desc")
+    return order == 'asc'
+
+
+def parse_audit_fields(value, default=None):
+    """
+    Validated list of response keys for a `fields=` projection.
+    Empty → `default` (AUDIT_LIST_FIELDS), "all" → every column.
+    'id' and 'timestamp' are always included (the keyset needs them).
+    """
+    if not value or not value.strip():
+        return list(default or AUDIT_LIST_FIELDS)
+    if value.strip().lower() == 'all':
+        return list(AUDIT_FIELDS)
+    fields = []
+    for name in value.split(','):
+        name = name.strip()
+        if not name:
+            continue
+        if name not in AUDIT_FIELDS:
+            raise ValueError(f"Unknown audit field '{name}'")
+        if name not in fields:
+            fields.append(name)
+    for required in ('timestamp', 'id'):
+        if required not in fields:
+            fields.insert(0, required)
+    return fields
+
+
+def audit_queryset(filters, fields, search=False, ascending=False):
+    """
+    Filtered queryset of dicts with only the projected columns, newest first
+    (oldest first with ascending=True).
+
+    With search=True (a `q` filter is present) the sort key is wrapped in a
+    no-op expression. Postgres can't estimate prefix tsquery selectivity and,
+    given a LIMIT, would walk the timestamp index backwards filtering every
+    row; hiding the index order makes it use idx_auditlog_search (bitmap
+    scan of the matches) and sort only those.
+    """
+    timestamp_order = 'timestamp' if ascending else '-timestamp'
+    if search:
+        timestamp_key = ExpressionWrapper(
+            F('timestamp') + Value(timedelta(0)), output_field=DateTimeField(),
+        )
+        timestamp_order = timestamp_key.asc() if ascending else timestamp_key.desc()
+    return (
+        AuditLog.objects.filter(filters)
+        .order_by(timestamp_order, 'audit_id' if ascending else '-audit_id')
+        .values(*[AUDIT_FIELDS[name] for name in fields])
+    )
+
+
+def serialize_audit_row(row, fields):
+    """DB row dict → response dict keyed by the public field names."""
+    return {name: row[AUDIT_FIELDS[name]] for name in fields}
+
+
+def encode_audit_cursor(row):
+    """Opaque cursor pointing just after the given row (timestamp, audit_id)."""
+    raw = f"{row['timestamp'].isoformat()}|{row['audit_id']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_audit_cursor(cursor):
+    """(timestamp, audit_id) from a cursor; ValueError if malformed."""
+    try:
+        raw_timestamp, audit_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        timestamp = parse_datetime(raw_timestamp)
+        if timestamp is None:
+            raise ValueError
+        return timestamp, int(audit_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def get_audit_page(filters, fields, cursor=None, limit=AUDIT_PAGE_SIZE, search=False, ascending=False):
+    """
+    One page of audit logs, newest first (oldest first with ascending=True).
+
+    Keyset pagination on (timestamp, audit_id): the row comparison below is a
+    single range condition on idx_auditlog_ts_id, so page N costs the same as
+    page 1 (no OFFSET scan).
+
+    :param filters: Q from parse_audit_filters
+    :param fields: response keys from parse_audit_fields
+    :param cursor: next_cursor of the previous page (None = first page)
+    :param limit: page size (capped at AUDIT_PAGE_MAX)
+    :param search: the filters include a `q` full-text search (see audit_queryset)
+    :param ascending: oldest first (parse_audit_order)
+    :return: (logs, next_cursor) — next_cursor is None on the last page
+    """
+    limit = max(1, min(int(limit), AUDIT_PAGE_MAX))
+    logs = audit_queryset(filters, fields, search=search, ascending=ascending)
+    if cursor:
+        timestamp, audit_id = decode_audit_cursor(cursor)
+        logs = logs.filter(RawSQL(
+            f'("timestamp", "audit_id") {">" if ascending else "<"} (%s, %s)', (timestamp, audit_id),
+            output_field=BooleanField(),
+        ))
+
+    rows = list(logs[:limit + 1])
+    next_cursor = encode_audit_cursor(rows[limit - 1]) if len(rows) > limit else None
+    rows = rows[:limit]
+    api_logger.debug(f"DEBUG: Audit page of {len(rows)} logs, more: {next_cursor is not None}")
+    return [serialize_audit_row(row, fields) for row in rows], next_cursor
+
+
+def stream_audit_ndjson(filters, fields, search=False):
+    """Yield one JSON object per line for every matching row."""
+    count = 0
+    for row in audit_queryset(filters, fields, search=search).iterator(chunk_size=AUDIT_EXPORT_CHUNK_SIZE):
+        yield json.dumps(serialize_audit_row(row, fields), cls=DjangoJSONEncoder, ensure_ascii=False) + "\n"
+        count += 1
+    api_logger.info(f"📤 Streamed {count} audit logs (NDJSON)")
+
+
+class _EchoBuffer:
+    """csv.writer target that hands each formatted line straight back."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_value(value):
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def stream_audit_csv(filters, fields, search=False):
+    """Yield a CSV (header + one line per matching row), BOM-prefixed for Excel."""
+    writer = csv.writer(_EchoBuffer())
+    yield "\ufeff" + writer.writerow(fields)
+    count = 0
+    for row in audit_queryset(filters, fields, search=search).iterator(chunk_size=AUDIT_EXPORT_CHUNK_SIZE):
+        yield writer.writerow([_csv_value(row[AUDIT_FIELDS[name]]) for name in fields])
+        count += 1
+    api_logger.info(f"📤 Streamed {count} audit logs (CSV)")
@@ -0,0 +1,186 @@
+"""
+audit_stats_utils.py
+
+Pre-aggregated audit statistics.
+
+get_audit_statistics used to run a count() and two GROUP BYs over the whole
+audit_log table on every call, so its latency grew with the log.
+
+childsmile_app_auditstatsrollup (add_audit_stats_rollup_table.sql) holds one
+row per (hour, action, user_email, success, endpoint) with the number of audit
+rows. refresh_audit_rollups() — a scheduler job every AUDIT_ROLLUP_INTERVAL
+seconds — aggregates every CLOSED hour since the last run and moves the
+watermark (JobRun 'audit_rollup') forward.
+
+get_audit_stats() reads the rollups below the watermark and counts only the
+open tail after it (plus the one partial hour at the start of the "recent"
+window) live from audit_log, so the numbers are exact while the work per call
+stays flat: at most ~24 × distinct-keys rollup rows per day of history, and a
+short timestamp-index range of raw rows.
+
+purge_old_audit_logs calls forget_audit_rollups_before() so the rollups never
+count rows that were deleted.
+"""
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from .models import JobRun
+from .logger import api_logger
+
+AUDIT_ROLLUP_JOB = 'audit_rollup'
+AUDIT_ROLLUP_TABLE = 'childsmile_app_auditstatsrollup'
+
+# Hours are rolled up this long after they close, so audit rows still queued
+# in the async writer (audit_writer.AUDIT_FLUSH_INTERVAL) land first.
+AUDIT_ROLLUP_LAG = timedelta(minutes=5)
+
+AUDIT_STATS_TOP = 10
+
+# Before the first rollup everything is counted live
+_NO_WATERMARK = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+_ROLLUP_INSERT_SQL = f"""
+    INSERT INTO {AUDIT_ROLLUP_TABLE} (bucket, action, user_email, success, endpoint, count)
+    SELECT date_trunc('hour', "timestamp"), action, user_email, success, endpoint, COUNT(*)
+    FROM audit_log
+    WHERE "timestamp" >= %s AND "timestamp" < %s
+    GROUP BY 1, 2, 3, 4, 5
+    ON CONFLICT (bucket, action, user_email, success, endpoint)
+    DO UPDATE SET count = EXCLUDED.count
+"""
+
+# Rollups below the watermark (except the partial first hour of the "recent"
+# window) + raw rows for that partial hour and for the open tail, aggregated
+# for every dimension in one pass with GROUPING SETS.
+_AUDIT_STATS_SQL = f"""
+    WITH combined AS (
+        SELECT bucket AS ts, action, user_email, success, endpoint, count AS n
+        FROM {AUDIT_ROLLUP_TABLE}
+        WHERE bucket < %(watermark)s AND bucket <> %(since_hour)s
+        UNION ALL
+        SELECT "timestamp", action, user_email, success, endpoint, 1
+        FROM audit_log
+        WHERE "timestamp" >= %(watermark)s
+           OR ("timestamp" >= %(since_hour)s
+               AND "timestamp" < LEAST(%(since_hour_end)s, %(watermark)s))
+    )
+    SELECT GROUPING(action), GROUPING(user_email), GROUPING(endpoint),
+           action, user_email, endpoint,
+           COALESCE(SUM(n), 0),
+           COALESCE(SUM(n) FILTER (WHERE ts >= %(since)s), 0),
+           COALESCE(SUM(n) FILTER (WHERE ts >= %(since)s AND NOT success), 0)
+    FROM combined
+    GROUP BY GROUPING SETS ((), (action), (user_email), (endpoint))
+"""
+
+
+def _hour_floor(moment):
+    return moment.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def _watermark_from(last_result):
+    value = (last_result or {}).get('rolled_up_to')
+    return parse_datetime(value) if value else None
+
+
+def get_rollup_watermark():
+    """End of the last rolled-up hour (None before the first rollup)."""
+    last_result = (
+        JobRun.objects.filter(job_name=AUDIT_ROLLUP_JOB)
+        .values_list('last_result', flat=True)
+        .first()
+    )
+    return _watermark_from(last_result)
+
+
+def refresh_audit_rollups():
+    """
+    Aggregate every closed hour after the watermark into the rollup table.
+    Idempotent (upsert per key) and serialized on the JobRun row, so the
+    schedulers of several workers can't roll the same hours twice.
+    :return: Dictionary with the new watermark and rollup rows written.
+    """
+    from .utils import israel_today
+
+    end = _hour_floor(timezone.now() - AUDIT_ROLLUP_LAG)
+    with transaction.atomic():
+        run = JobRun.objects.select_for_update().filter(job_name=AUDIT_ROLLUP_JOB).first()
+        start = _watermark_from(run.last_result if run else None) or _NO_WATERMARK
+        if start >= end:
+            return {'rolled_up_to': start.isoformat(), 'rows': 0}
+
+        with connection.cursor() as cursor:
+            cursor.execute(_ROLLUP_INSERT_SQL, [start, end])
+            rows = cursor.rowcount
+
+        result = {'rolled_up_to': end.isoformat(), 'rows': rows}
+        JobRun.objects.update_or_create(
+            job_name=AUDIT_ROLLUP_JOB,
+            defaults={'last_run_date': israel_today(), 'last_result': result},
+        )
+
+    api_logger.debug(f"DEBUG: Audit rollup {start.isoformat()} → {end.isoformat()}: {rows} rows")
+    return result
+
+
+def forget_audit_rollups_before(cutoff):
+    """
+    Keep the rollups in line with a purge of every audit row before `cutoff`:
+    fully purged hours are dropped, the hour containing the cutoff is
+    re-aggregated from the rows that are left.
+    """
+    cutoff_hour = _hour_floor(cutoff)
+    watermark = get_rollup_watermark()
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {AUDIT_ROLLUP_TABLE} WHERE bucket <= %s", [cutoff_hour])
+        deleted = cursor.rowcount
+        if watermark is not None and cutoff_hour < watermark:
+            cursor.execute(_ROLLUP_INSERT_SQL, [cutoff_hour, cutoff_hour + timedelta(hours=1)])
+    api_logger.debug(f"DEBUG: Dropped {deleted} audit rollup rows up to {cutoff_hour.isoformat()}")
+    return deleted
+
+
+def get_audit_stats(since, top=AUDIT_STATS_TOP):
+    """
+    Exact audit statistics in one query over the rollups + the live tail.
+
+    :param since: start of the "recent" window (e.g. now - 24h)
+    :param top: number of top actions / users / endpoints to return
+    :return: Dictionary in the get_audit_statistics response shape
+    """
+    since_hour = _hour_floor(since)
+    params = {
+        'watermark': get_rollup_watermark() or _NO_WATERMARK,
+        'since': since,
+        'since_hour': since_hour,
+        'since_hour_end': since_hour + timedelta(hours=1),
+    }
+    with connection.cursor() as cursor:
+        cursor.execute(_AUDIT_STATS_SQL, params)
+        rows = cursor.fetchall()
+
+    totals = (0, 0, 0)
+    by_action, by_user, by_endpoint = [], [], []
+    for g_action, g_user, g_endpoint, action, user_email, endpoint, total, recent, failed in rows:
+        if g_action and g_user and g_endpoint:
+            totals = (total, recent, failed)
+        elif not g_action:
+            by_action.append({'action': action, 'count': total})
+        elif not g_user:
+            by_user.append({'user_email': user_email, 'count': total})
+        else:
+            by_endpoint.append({'endpoint': endpoint, 'count': total})
+
+    def _top(items):
+        return sorted(items, key=lambda item: -item['count'])[:top]
+
+    return {
+        'total_logs': totals[0],
+        'recent_logs': totals[1],
+        'failed_recent': totals[2],
+        'top_actions': _top(by_action),
+        'top_users': _top(by_user),
+        'top_endpoints': _top(by_endpoint),
+    }
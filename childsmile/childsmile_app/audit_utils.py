@@ -5,6 +5,7 @@ from django.db import transaction
 from .models import AuditLog, Staff
 from django.http import JsonResponse
 from .logger import api_logger
+from .audit_writer import get_audit_writer, async_audit_enabled
 
 def get_client_ip(request):
     """Get client IP address from request - handles Azure proxies"""
@@ -46,20 +47,31 @@ def get_user_info(request):
     user_id = request.session.get("user_id")
     if not user_id:
         return None, None, [], []
-    
-    try:
-        staff = Staff.objects.get(staff_id=user_id)
-        user_roles = [role.role_name for role in staff.roles.all()]
-        
-        # Simple permission check - you can enhance this based on your permission system
-        user_permissions = []
-        for role in staff.roles.all():
-            if hasattr(role, 'permissions'):
-                user_permissions.extend([perm.permission_name for perm in role.permissions.all()])
-        
-        return staff.email, staff.username, user_roles, user_permissions
-    except Staff.DoesNotExist:
+
+    users = _get_users_info([user_id])
+    if user_id not in users:
         return None, None, [], []
+    return users[user_id]
+
+
+def _get_users_info(user_ids):
+    """
+    {staff_id: (email, username, roles, permissions)} for many users at once —
+    one Staff query + one roles prefetch. Roles have no direct permissions
+    relation, so the permissions list stays empty (as it always has).
+    """
+    users = {}
+    staff_members = Staff.objects.filter(staff_id__in=set(user_ids)).only(
+        "staff_id", "email", "username"
+    ).prefetch_related("roles")
+    for staff in staff_members:
+        users[staff.staff_id] = (
+            staff.email,
+            staff.username,
+            [role.role_name for role in staff.roles.all()],
+            [],
+        )
+    return users
 
 # NOTE (F18): the divergent is_admin() that used to live here — which also accepted
 # the non-seed role names 'Admin' and 'SuperAdmin' — has been REMOVED. There is now
@@ -1038,6 +1050,13 @@ def generate_audit_description(user_email, username, action, timestamp, user_rol
     
     return description
 
+REGISTRATION_ACTIONS = [
+    'USER_REGISTRATION_SUCCESS', 'USER_REGISTRATION_FAILED',
+    'CREATE_PENDING_TUTOR_SUCCESS', 'CREATE_PENDING_TUTOR_FAILED',
+    'CREATE_VOLUNTEER_SUCCESS', 'CREATE_VOLUNTEER_FAILED',
+]
+
+
 def log_api_action(
     request,
     action,
@@ -1052,23 +1071,89 @@ def log_api_action(
 ):
     """
     Log an API action to the audit log - ENHANCED with better descriptions
+
+    Only captures the request details here; the user lookup, description and
+    INSERT happen in the background audit writer (audit_writer.py), batched.
     """
     try:
-        # Get user information
-        user_email, username, user_roles, user_permissions = get_user_info(request)
-        
+        event = capture_audit_event(
+            request,
+            action,
+            affected_tables=affected_tables,
+            entity_type=entity_type,
+            entity_ids=entity_ids,
+            report_name=report_name,
+            status_code=status_code,
+            success=success,
+            error_message=error_message,
+            additional_data=additional_data,
+        )
+        submit_audit_event(event)
+    except Exception as e:
+        # Log audit failures to Django logs but don't break the main operation
+        import logging
+        logger = logging.getLogger(__name__)
+        logger.error(f"Failed to create audit log: {str(e)}")
+
+
+def submit_audit_event(event):
+    """Hand a captured event to the audit writer (queued, or written now if async audit is off)."""
+    writer = get_audit_writer()
+    if async_audit_enabled():
+        writer.submit(event)
+    else:
+        writer.write_now([event])
+
+
+def capture_audit_event(request, action, affected_tables=None, entity_type=None, entity_ids=None,
+                        report_name=None, status_code=200, success=True, error_message=None,
+                        additional_data=None):
+    """Everything an audit row needs from the request, as a plain dict (cheap, no queries)."""
+    additional_data = additional_data or {}
+
+    # Don't log sensitive data
+    safe_additional_data = {}
+    for key, value in additional_data.items():
+        # Skip sensitive fields
+        if key.lower() not in ['password', 'token', 'secret', 'key']:
+            safe_additional_data[key] = value
+
+    return {
+        'user_id': request.session.get("user_id"),
+        'action': action,
+        'endpoint': request.path,
+        'method': request.method,
+        'client_ip': get_client_ip(request),
+        'user_agent': request.META.get('HTTP_USER_AGENT', ''),
+        'timestamp': timezone.now(),
+        'affected_tables': list(affected_tables or []),
+        'entity_type': entity_type,
+        'entity_ids': list(entity_ids or []),
+        'report_name': report_name,
+        'status_code': status_code,
+        'success': success,
+        'error_message': error_message,
+        'additional_data': safe_additional_data,
+    }
+
+
+def build_audit_entries(events):
+    """Unsaved AuditLog rows for a batch of captured events (one user lookup per batch)."""
+    users = _get_users_info([e['user_id'] for e in events if e.get('user_id')])
+    entries = []
+    for event in events:
+        additional_data = event['additional_data']
+        user_email, username, user_roles, user_permissions = users.get(
+            event.get('user_id'), (None, None, [], [])
+        )
+
         # **ENHANCED: Handle special cases for registration and other anonymous actions**
-        attempted_email = None
-        registration_email = None
-        if additional_data:
-            attempted_email = additional_data.get('attempted_email') or additional_data.get('email')
-            registration_email = additional_data.get('registration_email')
-        
+        attempted_email = additional_data.get('attempted_email') or additional_data.get('email')
+        registration_email = additional_data.get('registration_email')
+
         # Handle different scenarios for anonymous users
         if not user_email:
-            if action in ['USER_REGISTRATION_SUCCESS', 'USER_REGISTRATION_FAILED', 
-                         'CREATE_PENDING_TUTOR_SUCCESS', 'CREATE_PENDING_TUTOR_FAILED',
-                         'CREATE_VOLUNTEER_SUCCESS', 'CREATE_VOLUNTEER_FAILED'] and registration_email:
+            if event['action'] in REGISTRATION_ACTIONS and registration_email:
                 # For registration-related actions, use the registration email as the user_email for audit
                 user_email = registration_email
                 username = additional_data.get('username', '')  # Use the created username
@@ -1081,64 +1166,51 @@ def log_api_action(
                 username = "anonymous"
             user_roles = []
             user_permissions = []
-        
-        # Prepare data
-        affected_tables = affected_tables or []
-        entity_ids = entity_ids or []
-        additional_data = additional_data or {}
-        
-        # Don't log sensitive data
-        safe_additional_data = {}
-        if additional_data:
-            for key, value in additional_data.items():
-                # Skip sensitive fields
-                if key.lower() not in ['password', 'token', 'secret', 'key']:
-                    safe_additional_data[key] = value
-        
+
         # **ENHANCED DESCRIPTION GENERATION**
-        client_ip = get_client_ip(request)
         description = generate_audit_description(
             user_email=user_email,
             username=username,
-            action=action,
-            timestamp=timezone.now(),
+            action=event['action'],
+            timestamp=event['timestamp'],
             user_roles=user_roles,
-            success=success,
-            error_message=error_message,
-            entity_type=entity_type,
-            entity_ids=entity_ids,
-            report_name=report_name,
-            additional_data=safe_additional_data,
-            client_ip=client_ip
+            success=event['success'],
+            error_message=event['error_message'],
+            entity_type=event['entity_type'],
+            entity_ids=event['entity_ids'],
+            report_name=event['report_name'],
+            additional_data=additional_data,
+            client_ip=event['client_ip']
         )
-        
-        # Create audit log entry
-        with transaction.atomic():
-            AuditLog.objects.create(
-                user_email=user_email,  # This will now contain the registration email
-                username=username,      # This will be the created username for registrations
-                action=action,
-                endpoint=request.path,
-                method=request.method,
-                affected_tables=affected_tables,
-                user_roles=user_roles,
-                permissions=user_permissions,
-                entity_type=entity_type,
-                entity_ids=entity_ids,
-                ip_address=client_ip,
-                user_agent=request.META.get('HTTP_USER_AGENT', ''),
-                status_code=status_code,
-                success=success,
-                error_message=error_message,
-                additional_data=safe_additional_data,
-                description=description,  # Enhanced description
-                report_name=report_name   
-            )
-    except Exception as e:
-        # Log audit failures to Django logs but don't break the main operation
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.error(f"Failed to create audit log: {str(e)}")
+
+        entries.append(AuditLog(
+            user_email=user_email,  # This will now contain the registration email
+            username=username,      # This will be the created username for registrations
+            action=event['action'],
+            endpoint=event['endpoint'],
+            method=event['method'],
+            affected_tables=event['affected_tables'],
+            user_roles=user_roles,
+            permissions=user_permissions,
+            entity_type=event['entity_type'],
+            entity_ids=event['entity_ids'],
+            ip_address=event['client_ip'],
+            user_agent=event['user_agent'],
+            status_code=event['status_code'],
+            success=event['success'],
+            error_message=event['error_message'],
+            additional_data=additional_data,
+            description=description,  # Enhanced description
+            report_name=event['report_name']
+        ))
+    return entries
+
+
+def write_audit_entries(entries):
+    """Insert a batch of AuditLog rows in one statement."""
+    if entries:
+        AuditLog.objects.bulk_create(entries)
+
 
 def audit_decorator(action, affected_tables=None, entity_type=None):
     """
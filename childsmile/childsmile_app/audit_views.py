@@ -1,30 +1,47 @@
 # childsmile/childsmile_app/audit_views.py
-from django.http import JsonResponse, HttpResponse
+from django.http import FileResponse, JsonResponse, HttpResponse, StreamingHttpResponse
 from django.core.paginator import Paginator
 from rest_framework.decorators import api_view
 from django.db.models import Q, Count
 from django.utils.dateparse import parse_datetime
+from django.urls import reverse
 from django.utils import timezone
 from datetime import timedelta, datetime
 from .models import AuditLog, Staff, AuditTranslation
 from .utils import *
 from .audit_utils import log_api_action
+from .audit_stats_utils import get_audit_stats
+from .audit_archive_utils import get_archive_path, list_audit_archives, purge_expired_audit_partitions
+from .audit_query_utils import (
+    AUDIT_EXPORT_CHUNK_SIZE,
+    AUDIT_FIELDS,
+    AUDIT_PAGE_SIZE,
+    audit_queryset,
+    get_audit_page,
+    is_search,
+    parse_audit_fields,
+    parse_audit_filters,
+    parse_audit_order,
+    retention_cutoff,
+    serialize_audit_row,
+    stream_audit_csv,
+    stream_audit_ndjson,
+)
 from .whatsapp_utils import send_security_breach_alert_whatsapp, _is_expired_session, get_client_ip
 from .logger import api_logger
 import csv
 import json
 
-@api_view(['GET'])
-def get_audit_logs(request):
+def _audit_admin_guard(request):
     """
-    Get all audit logs with translations — admin only.
+    Admin check shared by the audit log read endpoints.
+    Returns None for an admin, otherwise the error JsonResponse to send
+    (every rejection is audited and raises a security breach alert).
     """
-    api_logger.info("get_audit_logs called")
-
     user_id = request.session.get("user_id")
     if not user_id:
         log_api_action(request=request, action='UNAUTHORIZED_ACCESS_ATTEMPT',
-                       success=False, error_message="Unauthenticated request to /api/audit-logs/", status_code=401)
+                       success=False, error_message=f"Unauthenticated request to {request.path}", status_code=401)
         try:
             if not _is_expired_session(request):
                 send_security_breach_alert_whatsapp(request.path, get_client_ip(request))
@@ -35,7 +52,7 @@ def get_audit_logs(request):
         staff = Staff.objects.get(staff_id=user_id)
     except Staff.DoesNotExist:
         log_api_action(request=request, action='UNAUTHORIZED_ACCESS_ATTEMPT',
-                       success=False, error_message="Unknown user_id in session for /api/audit-logs/", status_code=403)
+                       success=False, error_message=f"Unknown user_id in session for {request.path}", status_code=403)
         try:
             send_security_breach_alert_whatsapp(request.path, get_client_ip(request))
         except Exception as e:
@@ -43,50 +60,81 @@ def get_audit_logs(request):
         return JsonResponse({"error": "User not found"}, status=403)
     if not is_admin(staff):
         log_api_action(request=request, action='UNAUTHORIZED_ACCESS_ATTEMPT',
-                       success=False, error_message="Non-admin attempted to access /api/audit-logs/", status_code=403)
+                       success=False, error_message=f"Non-admin attempted to access {request.path}", status_code=403)
         try:
             send_security_breach_alert_whatsapp(request.path, get_client_ip(request))
         except Exception as e:
             api_logger.error(f"Failed to send security breach alert: {e}")
         return JsonResponse({"error": "Admin permission required"}, status=403)
+    return None
+
+
+def _get_action_translations():
+    return dict(AuditTranslation.objects.values_list('action', 'hebrew_translation'))
+
+
+# Any of these switches get_audit_logs from the legacy "everything" payload
+# to the filtered, keyset-paginated query API.
+AUDIT_QUERY_PARAMS = (
+    'limit', 'cursor', 'fields', 'action', 'user', 'success', 'entity_type',
+    'entity_id', 'status_code', 'from', 'to', 'expired', 'q', 'order',
+)
+
+
+@api_view(['GET'])
+def get_audit_logs(request):
+    """
+    Audit logs with translations — admin only.
+
+    Query API (any of AUDIT_QUERY_PARAMS given):
+      ?limit=100&cursor=<next_cursor>   keyset pagination, newest first
+      filters                           see audit_query_utils.parse_audit_filters
+      ?fields=id,timestamp,action|all   column projection (default AUDIT_LIST_FIELDS)
+      ?order=desc|asc                   newest (default) or oldest first
+    → {'audit_logs', 'next_cursor', 'has_more'} (+ 'action_translations' on the first page)
+
+    Without parameters the legacy full payload is returned (every row, every
+    column); kept for old clients only — the Audit Log page pages through the
+    query API.
+    """
+    api_logger.info("get_audit_logs called")
+
+    denied = _audit_admin_guard(request)
+    if denied:
+        return denied
 
     try:
-        # Get all audit logs, ordered by newest first
-        logs = AuditLog.objects.all().order_by('-timestamp')
-        
-        api_logger.debug(f"Fetching all audit logs, total count: {logs.count()}")
-        
-        # Get all action translations
-        translations = {}
-        for trans in AuditTranslation.objects.all():
-            translations[trans.action] = trans.hebrew_translation
-        
-        # Format response
-        logs_data = []
-        for log in logs:
-            logs_data.append({
-                'id': log.audit_id,
-                'user_email': log.user_email,
-                'username': log.username,
-                'timestamp': log.timestamp,
-                'action': log.action,
-                'endpoint': log.endpoint,
-                'method': log.method,
-                'resource': log.affected_tables,
-                'user_roles': log.user_roles,
-                'permissions': log.permissions,
-                'entity_type': log.entity_type,
-                'entity_ids': log.entity_ids,
-                'ip_address': log.ip_address,
-                'user_agent': log.user_agent,
-                'status_code': log.status_code,
-                'success': log.success,
-                'error_message': log.error_message,
-                'additional_data': log.additional_data,
-                'report_name': log.report_name,
-                'description': log.description,
-            })
-        
+        if any(param in request.GET for param in AUDIT_QUERY_PARAMS):
+            try:
+                filters = parse_audit_filters(request.GET)
+                fields = parse_audit_fields(request.GET.get('fields'))
+                cursor = request.GET.get('cursor') or None
+                logs_data, next_cursor = get_audit_page(
+                    filters, fields, cursor=cursor,
+                    limit=int(request.GET.get('limit', AUDIT_PAGE_SIZE)),
+                    search=is_search(request.GET),
+                    ascending=parse_audit_order(request.GET),
+                )
+            except ValueError as e:
+                return JsonResponse({"error": str(e)}, status=400)
+
+            response_data = {
+                'audit_logs': logs_data,
+                'next_cursor': next_cursor,
+                'has_more': next_cursor is not None,
+            }
+            if not cursor:
+                response_data['action_translations'] = _get_action_translations()
+            api_logger.info(f"get_audit_logs returned a page of {len(logs_data)} logs")
+            log_api_action(request=request, action='VIEW_AUDIT_LOGS', success=True, status_code=200)
+            return JsonResponse(response_data, status=200)
+
+        translations = _get_action_translations()
+        logs_data = [
+            serialize_audit_row(row, AUDIT_FIELDS)
+            for row in audit_queryset(Q(), list(AUDIT_FIELDS)).iterator(chunk_size=AUDIT_EXPORT_CHUNK_SIZE)
+        ]
+
         api_logger.info(f"get_audit_logs returned {len(logs_data)} logs with {len(translations)} action translations")
         log_api_action(request=request, action='VIEW_AUDIT_LOGS', success=True, status_code=200)
         return JsonResponse({
@@ -99,11 +147,100 @@ def get_audit_logs(request):
         api_logger.error(f"Error in get_audit_logs: {str(e)}")
         return JsonResponse({"error": str(e)}, status=500)
 
+
+@api_view(['GET'])
+def search_audit_logs(request):
+    """
+    Full-text search in the audit logs — admin only.
+
+      ?q=<words>   required; every word must prefix-match a word in the
+                   description, error message or additional data
+      plus the filters / limit / cursor / fields of get_audit_logs
+
+    Served by the idx_auditlog_search GIN index, newest matches first.
+    """
+    api_logger.info("search_audit_logs called")
+
+    denied = _audit_admin_guard(request)
+    if denied:
+        return denied
+
+    if not is_search(request.GET):
+        return JsonResponse({"error": "Search text (q) is required"}, status=400)
+
+    try:
+        try:
+            filters = parse_audit_filters(request.GET)
+            fields = parse_audit_fields(request.GET.get('fields'))
+            logs_data, next_cursor = get_audit_page(
+                filters, fields, cursor=request.GET.get('cursor') or None,
+                limit=int(request.GET.get('limit', AUDIT_PAGE_SIZE)), search=True,
+            )
+        except ValueError as e:
+            return JsonResponse({"error": str(e)}, status=400)
+
+        api_logger.info(f"search_audit_logs found {len(logs_data)} logs (more: {next_cursor is not None})")
+        log_api_action(request=request, action='SEARCH_AUDIT_LOGS', success=True, status_code=200,
+                       additional_data={'q': request.GET.get('q')})
+        return JsonResponse({
+            'audit_logs': logs_data,
+            'next_cursor': next_cursor,
+            'has_more': next_cursor is not None,
+        }, status=200)
+
+    except Exception as e:
+        api_logger.error(f"Error in search_audit_logs: {str(e)}")
+        return JsonResponse({"error": str(e)}, status=500)
+
+
+@api_view(['GET'])
+def export_audit_logs(request):
+    """
+    Streamed export of the audit logs matching the filters — admin only.
+
+      ?file_format=ndjson (default) | csv  (not ?format= — DRF reserves it)
+      ?fields=... projection (default: all columns)
+      same filters as get_audit_logs, e.g. ?expired=true for the rows the
+      purge is about to delete
+
+    Rows are read through a server-side cursor and written as they arrive,
+    so neither the server nor the browser holds the whole table.
+    """
+    api_logger.info("export_audit_logs called")
+
+    denied = _audit_admin_guard(request)
+    if denied:
+        return denied
+
+    export_format = request.GET.get('file_format', 'ndjson').lower()
+    if export_format not in ('ndjson', 'csv'):
+        return JsonResponse({"error": "file_format must be 'ndjson' or 'csv'"}, status=400)
+    try:
+        filters = parse_audit_filters(request.GET)
+        fields = parse_audit_fields(request.GET.get('fields'), default=list(AUDIT_FIELDS))
+        search = is_search(request.GET)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    filename = f"auditlog_{timezone.now().strftime('%Y%m%d_%H%M%S')}.{export_format}"
+    if export_format == 'csv':
+        response = StreamingHttpResponse(stream_audit_csv(filters, fields, search), content_type="text/csv; charset=utf-8")
+    else:
+        response = StreamingHttpResponse(stream_audit_ndjson(filters, fields, search), content_type="application/x-ndjson")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+
+    log_api_action(
+        request=request, action='EXPORT_AUDIT_LOGS', success=True, status_code=200,
+        additional_data={'format': export_format, 'filters': dict(request.GET.items())},
+    )
+    return response
+
 @api_view(['GET'])
 def get_audit_statistics(request):
     api_logger.info("get_audit_statistics called")
     """
-    API endpoint for admin to view audit log statistics
+    API endpoint for admin to view audit log statistics.
+    Served from the hourly rollups (audit_stats_utils) — flat cost as the log grows.
     """
     try:
         # Check permissions
@@ -115,36 +252,9 @@ def get_audit_statistics(request):
         if not is_admin(staff):
             return JsonResponse({"error": "Admin permission required"}, status=403)
         
-        # Total logs
-        total_logs = AuditLog.objects.count()
-        
-        # Logs in last 24 hours
+        # Totals, last 24 hours (all / failed) and top actions / users
         yesterday = timezone.now() - timedelta(days=1)
-        recent_logs = AuditLog.objects.filter(timestamp__gte=yesterday).count()
-        
-        # Failed actions in last 24 hours
-        failed_recent = AuditLog.objects.filter(
-            timestamp__gte=yesterday,
-            success=False
-        ).count()
-        
-        # Top actions
-        top_actions = list(AuditLog.objects.values('action').annotate(
-            count=Count('action')
-        ).order_by('-count')[:10])
-        
-        # Top users
-        top_users = list(AuditLog.objects.values('user_email').annotate(
-            count=Count('user_email')
-        ).order_by('-count')[:10])
-        
-        return JsonResponse({
-            'total_logs': total_logs,
-            'recent_logs': recent_logs,
-            'failed_recent': failed_recent,
-            'top_actions': top_actions,
-            'top_users': top_users,
-        })
+        return JsonResponse(get_audit_stats(since=yesterday))
         
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=500)
@@ -186,13 +296,50 @@ def audit_action(request):
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=500)
 
+@api_view(['GET'])
+def preview_audit_purge(request):
+    """
+    What purge_old_audit_logs would delete right now — admin only.
+
+    A dry run of the purge itself: whole monthly partitions once audit_log is
+    partitioned, so the dialog shows exactly the rows that will be dropped
+    rather than the rows loaded in the browser.
+    """
+    api_logger.info("preview_audit_purge called")
+
+    denied = _audit_admin_guard(request)
+    if denied:
+        return denied
+
+    try:
+        cutoff_date = retention_cutoff()
+        result = purge_expired_audit_partitions(cutoff_date, dry_run=True)
+        first_date = parse_datetime(result['first_log_date']) if result['first_log_date'] else None
+        last_date = parse_datetime(result['last_log_date']) if result['last_log_date'] else None
+        return JsonResponse({
+            'record_count': result['deleted_count'],
+            'first_log_date': timezone.localtime(first_date).strftime('%d/%m/%Y') if first_date else None,
+            'last_log_date': timezone.localtime(last_date).strftime('%d/%m/%Y') if last_date else None,
+            'cutoff_date': timezone.localtime(cutoff_date).strftime('%d/%m/%Y'),
+            'partitioned': result['partitioned'],
+            'months': [archive['partition'] for archive in result['archives'] if archive.get('partition')],
+        }, status=200)
+    except Exception as e:
+        api_logger.error(f"Error in preview_audit_purge: {str(e)}")
+        return JsonResponse({"error": str(e)}, status=500)
+
+
 @conditional_csrf
 @api_view(["POST"])
 @block_viewer_writes
 def purge_old_audit_logs(request):
     """
-    Delete audit logs older than 90 days (AFTER user exports them)
-    This should only be called AFTER the frontend has exported the CSV
+    Archive and delete audit logs older than 90 days (AUDIT_RETENTION_DAYS).
+
+    The expired rows are written server-side to gzip NDJSON archives
+    (audit_archive_utils) and then removed — whole monthly partitions are
+    detached and dropped, so no long DELETE runs. Each archive in the
+    response carries its download_url (/api/audit-archives/<file>/).
     """
     api_logger.info("purge_old_audit_logs called - REAL DELETE HAPPENING")
     
@@ -209,53 +356,90 @@ def purge_old_audit_logs(request):
         except Staff.DoesNotExist:
             return JsonResponse({"error": "User not found"}, status=404)
         
-        # Calculate 90 days ago
-        cutoff_date = timezone.now() - timedelta(days=90)
+        # Calculate 90 days ago (AUDIT_RETENTION_DAYS)
+        cutoff_date = retention_cutoff()
         
-        # Find logs older than 90 days
-        old_logs = AuditLog.objects.filter(timestamp__lt=cutoff_date).order_by('timestamp')
+        # 📦 Archive to file, then 🗑️ drop the expired partitions / rows
+        result = purge_expired_audit_partitions(cutoff_date)
         
-        # Check if there are any old logs
-        if not old_logs.exists():
-            api_logger.warning(f"No logs older than 90 days found. Cutoff date: {cutoff_date}")
+        if not result['deleted_count']:
+            api_logger.warning(f"No audit logs to purge. Cutoff date: {cutoff_date}")
+            message = f"No audit logs older than 90 days to purge. Cutoff date: {cutoff_date.strftime('%d/%m/%Y')}"
+            if result['partitioned']:
+                message += " (logs are purged by whole months)"
             return JsonResponse({
-                "error": f"No audit logs older than 90 days to purge. Cutoff date: {cutoff_date.strftime('%d/%m/%Y')}",
+                "error": message,
                 "no_data": True,
                 "cutoff_date": cutoff_date.isoformat()
             }, status=200)
         
-        # Get count and metadata BEFORE deletion
-        record_count = old_logs.count()
-        first_log = old_logs.first()
-        last_log = old_logs.last()
-        
-        first_date = first_log.timestamp
-        last_date = last_log.timestamp
-        
-        # Format dates for filename: MM_YYYY
-        first_month_year = first_date.strftime("%m_%Y")
-        last_month_year = last_date.strftime("%m_%Y")
-        timestamp_suffix = timezone.now().strftime("%H%M%S")
+        first_date = parse_datetime(result['first_log_date'])
+        last_date = parse_datetime(result['last_log_date'])
+        archive_files = [archive['file'] for archive in result['archives']]
+        for archive in result['archives']:
+            archive['download_url'] = reverse('download_audit_archive', args=[archive['file']])
         
-        filename = f"auditlog_{first_month_year}_to_{last_month_year}_{timestamp_suffix}"
-        
-        # 🗑️ DELETE the old logs NOW
-        deleted_count, _ = old_logs.delete()
-        
-        api_logger.warning(f"🗑️ PURGED {deleted_count} audit logs. Date range: {first_date} to {last_date}")
+        api_logger.warning(
+            f"🗑️ PURGED {result['deleted_count']} audit logs. Date range: {first_date} to {last_date}. "
+            f"Archives: {', '.join(archive_files)}"
+        )
+        log_api_action(
+            request=request, action='PURGE_AUDIT_LOGS', success=True, status_code=200,
+            additional_data={'deleted_count': result['deleted_count'], 'archives': archive_files},
+        )
         
         return JsonResponse({
             'success': True,
-            'message': f'Successfully purged {record_count} audit logs',
-            'deleted_count': deleted_count,
-            'record_count': record_count,
+            'message': f"Successfully purged {result['deleted_count']} audit logs",
+            'deleted_count': result['deleted_count'],
+            'record_count': result['deleted_count'],
             'first_log_date': first_date.strftime('%d/%m/%Y'),
             'last_log_date': last_date.strftime('%d/%m/%Y'),
             'cutoff_date': cutoff_date.strftime('%d/%m/%Y'),
-            'filename': filename,
+            'filename': archive_files[0] if len(archive_files) == 1 else ', '.join(archive_files),
+            'archives': result['archives'],
             'purge_status': 'COMPLETED'
         }, status=200)
         
     except Exception as e:
         api_logger.error(f"Error in purge_old_audit_logs: {str(e)}")
-        return JsonResponse({"error": str(e)}, status=500)
\ No newline at end of file
+        return JsonResponse({"error": str(e)}, status=500)
+
+@api_view(['GET'])
+def get_audit_archives(request):
+    """
+    List the server-side audit archives written by the purge — admin only.
+    Each entry is the archive manifest (file, rows, first/last timestamp, sha256).
+    """
+    api_logger.info("get_audit_archives called")
+
+    denied = _audit_admin_guard(request)
+    if denied:
+        return denied
+
+    try:
+        archives = list_audit_archives()
+        log_api_action(request=request, action='VIEW_AUDIT_ARCHIVES', success=True, status_code=200)
+        return JsonResponse({'archives': archives}, status=200)
+    except Exception as e:
+        api_logger.error(f"Error in get_audit_archives: {str(e)}")
+        return JsonResponse({"error": str(e)}, status=500)
+
+
+@api_view(['GET'])
+def download_audit_archive(request, file_name):
+    """Download one audit archive (.ndjson.gz) or its manifest — admin only."""
+    api_logger.info(f"download_audit_archive called for {file_name}")
+
+    denied = _audit_admin_guard(request)
+    if denied:
+        return denied
+
+    path = get_archive_path(file_name)
+    if not path:
+        return JsonResponse({"error": "Archive not found"}, status=404)
+
+    log_api_action(request=request, action='DOWNLOAD_AUDIT_ARCHIVE', success=True, status_code=200,
+                   additional_data={'file': file_name})
+    content_type = 'application/gzip' if file_name.endswith('.gz') else 'application/json'
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=file_name, content_type=content_type)
@@ -0,0 +1,237 @@
+"""
+audit_writer.py
+
+Asynchronous, batched writer for the audit log.
+
+log_api_action() is called by practically every endpoint. It used to do all
+of its work on the request thread: a Staff fetch plus two roles.all()
+traversals (get_user_info), the long generate_audit_description() string
+building, and a synchronous AuditLog INSERT inside transaction.atomic().
+Every API call paid for an extra round of queries and a commit.
+
+Now the request thread only captures a small event dict (the fields that
+must be read from the request while it is alive) and puts it on an
+in-process queue. A background thread per worker process drains the queue and:
+
+  - resolves the users of the whole batch in ONE Staff query (+ one roles
+    prefetch) instead of one per event,
+  - builds the descriptions,
+  - writes the batch with one bulk_create.
+
+Guarantees / knobs (environment variables):
+  AUDIT_ASYNC_ENABLED      "true" (default) | "false" → write synchronously, as before
+  AUDIT_QUEUE_MAX          max queued events per process (default 10000) — bounded memory
+  AUDIT_BATCH_SIZE         max events per INSERT (default 200)
+  AUDIT_FLUSH_INTERVAL     seconds a partial batch may wait (default 1.0)
+  AUDIT_OVERFLOW_POLICY    what to do when the queue is full:
+                             "sync" (default) write that event on the request thread —
+                                    never lose an audit row, pay the old cost under overload
+                             "drop" discard it and count it (logged on the next flush)
+
+The queue is flushed on interpreter shutdown (atexit — gunicorn's graceful
+worker exit runs it) and can be flushed explicitly with flush().
+The writer thread is started lazily in the process that first logs, so it
+works with gunicorn's pre-fork model (a forked child starts its own thread).
+
+NOTE: AuditLog.timestamp is auto_now_add, so it records the insert time —
+at most AUDIT_FLUSH_INTERVAL after the event under normal load. The
+description's "Timestamp:" line is built from the exact event time.
+"""
+
+import atexit
+import os
+import queue
+import threading
+import time
+from django.db import close_old_connections
+from .logger import api_logger
+
+_SENTINEL = object()
+
+
+def _env_int(name, default):
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_float(name, default):
+    try:
+        return float(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+class AuditWriter:
+    """Bounded queue + background thread that bulk-inserts audit events."""
+
+    def __init__(self, build_entries, write_entries, max_queue=10000, batch_size=200,
+                 flush_interval=1.0, overflow_policy="sync"):
+        """
+        :param build_entries: callable(list of events) → list of unsaved AuditLog objects
+        :param write_entries: callable(list of AuditLog) → None (bulk insert)
+        """
+        self._build_entries = build_entries
+        self._write_entries = write_entries
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._dropped = 0
+
+    # ------------------------------------------------------------------ API
+
+    def submit(self, event):
+        """Queue one event (non-blocking). Applies the overflow policy when full."""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            if self.overflow_policy == "drop":
+                with self._lock:
+                    self._dropped += 1
+            else:
+                self.write_now([event])
+
+    def write_now(self, events):
+        """Build and write events on the calling thread."""
+        try:
+            self._write_entries(self._build_entries(events))
+        except Exception as e:
+            self._write_one_by_one(events, e)
+
+    def flush(self, timeout=10.0):
+        """Block until everything queued so far has been written (or timeout)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._drain_on_current_thread()
+            return
+        done = threading.Event()
+        try:
+            self._queue.put((_SENTINEL, done), timeout=timeout)
+        except queue.Full:
+            return
+        done.wait(timeout)
+
+    def pending(self):
+        return self._queue.qsize()
+
+    # ------------------------------------------------------------ internals
+
+    def _ensure_started(self):
+        pid = os.getpid()
+        if self._thread is not None and self._pid == pid and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == pid and self._thread.is_alive():
+                return
+            if self._pid != pid:
+                # Forked child: the parent's queue contents/thread are not ours
+                self._queue = queue.Queue(maxsize=self.max_queue)
+            self._pid = pid
+            self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            batch, markers = self._collect_batch()
+            if batch:
+                close_old_connections()
+                try:
+                    self.write_now(batch)
+                finally:
+                    # Don't hold a connection while blocked on the queue (CONN_MAX_AGE=0)
+                    close_old_connections()
+            for done in markers:
+                done.set()
+            self._report_dropped()
+
+    def _collect_batch(self):
+        """Wait for the first event, then gather up to batch_size within flush_interval."""
+        batch, markers = [], []
+        item = self._queue.get()
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            if isinstance(item, tuple) and len(item) == 2 and item[0] is _SENTINEL:
+                markers.append(item[1])
+                return batch, markers  # flush requested — write what we have now
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                return batch, markers
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return batch, markers
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                return batch, markers
+
+    def _drain_on_current_thread(self):
+        batch = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, tuple) and len(item) == 2 and item[0] is _SENTINEL:
+                item[1].set()
+                continue
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                self.write_now(batch)
+                batch = []
+        if batch:
+            self.write_now(batch)
+
+    def _write_one_by_one(self, events, batch_error):
+        """A failed batch is retried per event so one bad row can't lose the others."""
+        api_logger.error(f"Audit batch write failed ({len(events)} events), retrying one by one: {str(batch_error)[:200]}")
+        for event in events:
+            try:
+                self._write_entries(self._build_entries([event]))
+            except Exception as e:
+                api_logger.error(f"Failed to create audit log for {event.get('action')}: {str(e)[:200]}")
+
+    def _report_dropped(self):
+        if not self._dropped:
+            return
+        with self._lock:
+            dropped, self._dropped = self._dropped, 0
+        api_logger.warning(f"WARNING: Audit queue full — dropped {dropped} audit events (AUDIT_OVERFLOW_POLICY=drop)")
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def async_audit_enabled():
+    return os.environ.get("AUDIT_ASYNC_ENABLED", "true").lower() != "false"
+
+
+def get_audit_writer():
+    """Process-wide AuditWriter (created on first use)."""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                from .audit_utils import build_audit_entries, write_audit_entries
+                _writer = AuditWriter(
+                    build_entries=build_audit_entries,
+                    write_entries=write_audit_entries,
+                    max_queue=_env_int("AUDIT_QUEUE_MAX", 10000),
+                    batch_size=_env_int("AUDIT_BATCH_SIZE", 200),
+                    flush_interval=_env_float("AUDIT_FLUSH_INTERVAL", 1.0),
+                    overflow_policy=os.environ.get("AUDIT_OVERFLOW_POLICY", "sync").lower(),
+                )
+                atexit.register(flush_audit_log)
+    return _writer
+
+
+def flush_audit_log(timeout=10.0):
+    """Write every queued audit event now (shutdown hook; also handy in scripts)."""
+    if _writer is not None:
+        _writer.flush(timeout=timeout)
@@ -18,10 +18,10 @@ from rest_framework.decorators import api_view
 from django.utils import timezone
 from django.db.models import Q
 
-from .models import Staff, CoordinatorChatMessage, Role
+from .models import Staff, CoordinatorChatMessage
 from .logger import api_logger
 from .utils import conditional_csrf, block_viewer_writes, is_admin
-from .whatsapp_utils import send_whatsapp_message
+from .whatsapp_utils import send_whatsapp_message, queue_whatsapp_message
 from .notification_mute import is_whatsapp_muted
 
 
@@ -39,7 +39,7 @@ def _message_to_dict(msg):
     """Convert CoordinatorChatMessage to dict."""
     return {
         "id": msg.id,
-        "coordinator_id": msg.coordinator.staff_id,
+        "coordinator_id": msg.coordinator_id,
         "sender_type": msg.sender_type,
         "sender_id": msg.sender_id,
         "message_text": msg.message_text,
@@ -87,45 +87,31 @@ def coordinator_conversations_list(request):
         for first, last in exclude_names:
             all_coordinators = all_coordinators.exclude(first_name=first, last_name=last)
 
-        coordinator_count = all_coordinators.count()
-        api_logger.debug(f"[COORDINATOR_CHAT] Found {coordinator_count} coordinators with roles containing 'Coordinator'")
-        
-        # Debug: Log available role names in DB (DEBUG level only for security)
-        all_roles = Role.objects.all().values_list('role_name', flat=True).distinct()
-        api_logger.debug(f"[COORDINATOR_CHAT] All roles in DB: {list(all_roles)}")
+        # One query: coordinators LEFT JOIN their trigger-maintained chat summary
+        # and latest message (add_coordinator_chat_summary_table.sql)
+        all_coordinators = all_coordinators.select_related('chat_summary__last_message')
 
         conversations = []
         for coordinator in all_coordinators:
-            try:
-                messages = CoordinatorChatMessage.objects.filter(
-                    coordinator=coordinator
-                ).order_by('-created_at')
-
-                last_message = messages.first()
-                unread_count = messages.filter(is_read=False, sender_type='coordinator').count()
-
-                conversations.append({
-                    "coordinator_id": coordinator.staff_id,
-                    "coordinator_name": f"{coordinator.first_name} {coordinator.last_name}",
-                    "coordinator_phone": coordinator.staff_phone or "",
-                    "last_message": _message_to_dict(last_message) if last_message else None,
-                    "unread_count": unread_count,
-                    "total_messages": messages.count(),
-                    "has_messages": messages.exists(),
-                })
-            except Exception as e:
-                api_logger.error(f"[COORDINATOR_CHAT] Error processing coordinator {coordinator.staff_id}: {str(e)}")
-                continue
+            summary = getattr(coordinator, 'chat_summary', None)
+            last_message = summary.last_message if summary else None
+            total_messages = summary.total_messages if summary else 0
+            conversations.append({
+                "coordinator_id": coordinator.staff_id,
+                "coordinator_name": f"{coordinator.first_name} {coordinator.last_name}",
+                "coordinator_phone": coordinator.staff_phone or "",
+                "last_message": _message_to_dict(last_message) if last_message else None,
+                "unread_count": summary.unread_count if summary else 0,
+                "total_messages": total_messages,
+                "has_messages": total_messages > 0,
+            })
+        api_logger.debug(f"[COORDINATOR_CHAT] Found {len(conversations)} coordinators with roles containing 'Coordinator'")
 
         # Sort by unread count (desc) then by last message time (desc)
-        try:
-            conversations.sort(key=lambda x: (
-                -x['unread_count'],
-                -(datetime.fromisoformat(x['last_message']['created_at']).timestamp() if x['last_message'] and x['last_message'].get('created_at') else 0)
-            ))
-        except Exception as sort_error:
-            api_logger.warning(f"[COORDINATOR_CHAT] Error sorting conversations: {str(sort_error)}")
-            # Continue without sorting if there's an error
+        conversations.sort(key=lambda x: (
+            -x['unread_count'],
+            -(datetime.fromisoformat(x['last_message']['created_at']).timestamp() if x['last_message'] else 0)
+        ))
 
         return JsonResponse({
             "conversations": conversations,
@@ -386,7 +372,7 @@ def send_message_to_many(request):
                 
                 if template_sid:
                     # {{1}} = coordinator name, {{2}} = message text
-                    result = send_whatsapp_message(
+                    result = queue_whatsapp_message(
                         recipient_phone=coordinator.staff_phone,
                         message_body="",
                         use_template=True,
@@ -394,13 +380,15 @@ def send_message_to_many(request):
                         template_variables={
                             "1": f"{coordinator.first_name} {coordinator.last_name}",
                             "2": message_text
-                        }
+                        },
+                        source='coordinator_broadcast',
                     )
                 else:
-                    result = send_whatsapp_message(
+                    result = queue_whatsapp_message(
                         recipient_phone=coordinator.staff_phone,
                         message_body=message_text,
-                        use_template=False
+                        use_template=False,
+                        source='coordinator_broadcast',
                     )
 
                 if result['success']:
@@ -408,7 +396,8 @@ def send_message_to_many(request):
                         "coordinator_id": coordinator.staff_id,
                         "coordinator_name": f"{coordinator.first_name} {coordinator.last_name}",
                         "message_id": admin_msg.id,
-                        "whatsapp_sid": result.get('message_sid')
+                        "whatsapp_sid": result.get('message_sid'),
+                        "outbox_id": result.get('outbox_id')
                     })
                 else:
                     results['failed'].append({
@@ -556,7 +545,7 @@ def send_message_to_all(request):
                 
                 if template_sid:
                     # {{1}} = coordinator name, {{2}} = message text
-                    result = send_whatsapp_message(
+                    result = queue_whatsapp_message(
                         recipient_phone=coordinator.staff_phone,
                         message_body="",
                         use_template=True,
@@ -564,13 +553,15 @@ def send_message_to_all(request):
                         template_variables={
                             "1": f"{coordinator.first_name} {coordinator.last_name}",
                             "2": message_text
-                        }
+                        },
+                        source='coordinator_broadcast',
                     )
                 else:
-                    result = send_whatsapp_message(
+                    result = queue_whatsapp_message(
                         recipient_phone=coordinator.staff_phone,
                         message_body=message_text,
-                        use_template=False
+                        use_template=False,
+                        source='coordinator_broadcast',
                     )
 
                 if result['success']:
@@ -578,7 +569,8 @@ def send_message_to_all(request):
                         "coordinator_id": coordinator.staff_id,
                         "coordinator_name": f"{coordinator.first_name} {coordinator.last_name}",
                         "message_id": admin_msg.id,
-                        "whatsapp_sid": result.get('message_sid')
+                        "whatsapp_sid": result.get('message_sid'),
+                        "outbox_id": result.get('outbox_id')
                     })
                 else:
                     results['failed'].append({
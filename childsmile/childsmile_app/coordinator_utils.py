@@ -24,6 +24,8 @@ from .utils import create_task_internal
 # Import WhatsApp utils if available (optional feature - graceful fallback)
 from .whatsapp_utils import send_coordinator_notification_whatsapp, send_coordinator_notification_whatsapp_family, send_coordinator_notification_whatsapp_family_with_age_unit, send_family_left_tutorship_whatsapp
 from .notification_mute import is_whatsapp_muted
+from .email_outbox import enqueue_email, enqueue_emails
+from .notification_templates import register_template
 
 
 # ============================================================================
@@ -42,6 +44,104 @@ def create_tasks_for_admins_async(staff_user_id, user_name, user_email):
     thread.start()
 
 
+# Email to each Volunteer Coordinator about a registration waiting for first-level
+# approval (create_tasks_for_admins).
+NEW_VOLUNTEER_EMAIL = register_template("new_volunteer_coordinator", """<!DOCTYPE html>
+<html dir="rtl" lang="he">
+<head>
+    <meta charset="UTF-8">
+    <meta http-equiv="Content-Type" content="text/html; charset=UTF-8">
+</head>
+<body dir="rtl" style="direction: rtl; text-align: right; font-family: Arial, sans-serif; line-height: 1.6; margin: 0; padding: 20px; background-color: #f5f5f5;">
+    <table width="100%" cellpadding="0" cellspacing="0" style="background-color: #f5f5f5;">
+        <tr>
+            <td align="right" style="padding: 0;">
+                <table width="600" cellpadding="0" cellspacing="0" style="background-color: #f9f9f9; margin: 0 auto;">
+                    <!-- HEADER -->
+                    <tr>
+                        <td style="background: linear-gradient(to right, #4CAF50 0%, #45a049 100%); color: white; padding: 20px; text-align: center; font-size: 20px; font-weight: bold; border-radius: 8px 8px 0 0;">
+                            משימה חדשה: אישור הרשמה ראשוני
+                        </td>
+                    </tr>
+                    <!-- CONTENT -->
+                    <tr>
+                        <td style="background-color: white; padding: 30px; border-radius: 0;">
+                            <p dir="rtl" style="text-align: right; margin: 15px 0;">שלום {coordinator_name},</p>
+                            
+                            <p dir="rtl" style="text-align: right; margin: 15px 0;">קיים משתמש חדש הממתין לאישורך לרישום במערכת חיוך של ילד.</p>
+                            
+                            <hr style="border: none; border-top: 2px solid #4CAF50; margin: 20px 0;">
+                            
+                            <p dir="rtl" style="text-align: right; font-weight: bold; margin: 15px 0; padding-bottom: 10px; border-bottom: 3px solid #4CAF50; color: #333;">פרטי המשתמש החדש:</p>
+                            
+                            <!-- FIELDS TABLE -->
+                            <table width="100%" cellpadding="0" cellspacing="0" dir="rtl">
+                                <tr>
+                                    <td style="margin: 12px 0; padding: 10px; background-color: #f5f5f5; border-radius: 4px; text-align: right; direction: rtl;">
+                                        <span style="font-weight: bold; color: #333; display: inline-block; margin-left: 10px;">שם מלא:</span><span style="color: #666; direction: ltr; unicode-bidi: embed;">{user_full_name}</span>
+                                    </td>
+                                </tr>
+                                <tr>
+                                    <td style="margin: 12px 0; padding: 10px; background-color: #f5f5f5; border-radius: 4px; text-align: right; direction: rtl;">
+                                        <span style="font-weight: bold; color: #333; display: inline-block; margin-left: 10px;">דואר אלקטרוני:</span><span style="color: #666; direction: ltr; unicode-bidi: embed;">{user_email_display}</span>
+                                    </td>
+                                </tr>
+                                <tr>
+                                    <td style="margin: 12px 0; padding: 10px; background-color: #f5f5f5; border-radius: 4px; text-align: right; direction: rtl;">
+                                        <span style="font-weight: bold; color: #333; display: inline-block; margin-left: 10px;">גיל:</span><span style="color: #666; direction: ltr; unicode-bidi: embed;">{user_age}</span>
+                                    </td>
+                                </tr>
+                                <tr>
+                                    <td style="margin: 12px 0; padding: 10px; background-color: #f5f5f5; border-radius: 4px; text-align: right; direction: rtl;">
+                                        <span style="font-weight: bold; color: #333; display: inline-block; margin-left: 10px;">מין:</span><span style="color: #666; direction: ltr; unicode-bidi: embed;">{user_gender}</span>
+                                    </td>
+                                </tr>
+                                <tr>
+                                    <td style="margin: 12px 0; padding: 10px; background-color: #f5f5f5; border-radius: 4px; text-align: right; direction: rtl;">
+                                        <span style="font-weight: bold; color: #333; display: inline-block; margin-left: 10px;">טלפון:</span><span style="color: #666; direction: ltr; unicode-bidi: embed;">{user_phone}</span>
+                                    </td>
+                                </tr>
+                                <tr>
+                                    <td style="margin: 12px 0; padding: 10px; background-color: #f5f5f5; border-radius: 4px; text-align: right; direction: rtl;">
+                                        <span style="font-weight: bold; color: #333; display: inline-block; margin-left: 10px;">עיר מגורים:</span><span style="color: #666; direction: ltr; unicode-bidi: embed;">{user_city}</span>
+                                    </td>
+                                </tr>
+                                <tr>
+                                    <td style="margin: 12px 0; padding: 10px; background-color: #f5f5f5; border-radius: 4px; text-align: right; direction: rtl;">
+                                        <span style="font-weight: bold; color: #333; display: inline-block; margin-left: 10px;">מעוניין להיות חונך:</span><span style="color: #666; direction: ltr; unicode-bidi: embed;">{user_wants_tutor}</span>
+                                    </td>
+                                </tr>
+                                <tr>
+                                    <td style="margin: 12px 0; padding: 10px; background-color: #f5f5f5; border-radius: 4px; text-align: right; direction: rtl;">
+                                        <span style="font-weight: bold; color: #333; display: inline-block; margin-left: 10px;">תאריך הרשמה:</span><span style="color: #666; direction: ltr; unicode-bidi: embed;">{created_at}</span>
+                                    </td>
+                                </tr>
+                            </table>
+                            
+                            <hr style="border: none; border-top: 2px solid #4CAF50; margin: 20px 0;">
+                            
+                            <p dir="rtl" style="text-align: right; margin: 15px 0;"><strong style="color: #2e7d32;">אנא בדוק את פרטי המשתמש במערכת וקבע הערות/תנאים אם יש צורך.</strong></p>
+                            <p dir="rtl" style="text-align: right; margin: 15px 0;"><strong style="color: #2e7d32;">לאחר מכן אשר או דחה את ההרשמה כנדרש.</strong></p>
+                            
+                            <hr style="border: none; border-top: 2px solid #4CAF50; margin: 20px 0;">
+                            
+                            <p dir="rtl" style="text-align: right; color: #666; font-size: 12px; margin: 15px 0;">בברכה,<br>צוות חיוך של ילד</p>
+                        </td>
+                    </tr>
+                    <!-- FOOTER -->
+                    <tr>
+                        <td style="background-color: #f0f0f0; padding: 15px; text-align: center; font-size: 12px; color: #666; border-radius: 0 0 8px 8px;">
+                            <p dir="rtl" style="text-align: center; margin: 0;">זוהי הודעה אוטומטית - אנא אל תשיב לאימייל זה</p>
+                        </td>
+                    </tr>
+                </table>
+            </td>
+        </tr>
+    </table>
+</body>
+</html>""")
+
+
 def create_tasks_for_admins(staff_user_id, user_name, user_email):
     """
     Send email notification to all Volunteer Coordinators about a new registration needing approval.
@@ -134,116 +234,29 @@ def create_tasks_for_admins(staff_user_id, user_name, user_email):
                 subject = f"משימה חדשה: אישור הרשמה ראשוני - {user_full_name}"
                 
                 # Send individual emails and WhatsApp messages with personalized coordinator name
+                # User details are rendered once; only the greeting differs per coordinator
+                email_layout = NEW_VOLUNTEER_EMAIL.bind(
+                    user_full_name=user_full_name,
+                    user_email_display=user_email_display,
+                    user_age=user_age,
+                    user_gender=user_gender,
+                    user_phone=user_phone,
+                    user_city=user_city,
+                    user_wants_tutor=user_wants_tutor,
+                    created_at=created_at,
+                )
+                # Queued together after the loop: one insert, one dispatcher wake-up
+                emails = []
                 for staff_member in approval_staff:
                     coordinator_name = f"{staff_member.first_name} {staff_member.last_name}"
                     
-                    message = f"""<!DOCTYPE html>
-<html dir="rtl" lang="he">
-<head>
-    <meta charset="UTF-8">
-    <meta http-equiv="Content-Type" content="text/html; charset=UTF-8">
-</head>
-<body dir="rtl" style="direction: rtl; text-align: right; font-family: Arial, sans-serif; line-height: 1.6; margin: 0; padding: 20px; background-color: #f5f5f5;">
-    <table width="100%" cellpadding="0" cellspacing="0" style="background-color: #f5f5f5;">
-        <tr>
-            <td align="right" style="padding: 0;">
-                <table width="600" cellpadding="0" cellspacing="0" style="background-color: #f9f9f9; margin: 0 auto;">
-                    <!-- HEADER -->
-                    <tr>
-                        <td style="background: linear-gradient(to right, #4CAF50 0%, #45a049 100%); color: white; padding: 20px; text-align: center; font-size: 20px; font-weight: bold; border-radius: 8px 8px 0 0;">
-                            משימה חדשה: אישור הרשמה ראשוני
-                        </td>
-                    </tr>
-                    <!-- CONTENT -->
-                    <tr>
-                        <td style="background-color: white; padding: 30px; border-radius: 0;">
-                            <p dir="rtl" style="text-align: right; margin: 15px 0;">שלום {coordinator_name},</p>
-                            
-                            <p dir="rtl" style="text-align: right; margin: 15px 0;">קיים משתמש חדש הממתין לאישורך לרישום במערכת חיוך של ילד.</p>
-                            
-                            <hr style="border: none; border-top: 2px solid #4CAF50; margin: 20px 0;">
-                            
-                            <p dir="rtl" style="text-align: right; font-weight: bold; margin: 15px 0; padding-bottom: 10px; border-bottom: 3px solid #4CAF50; color: #333;">פרטי המשתמש החדש:</p>
-                            
-                            <!-- FIELDS TABLE -->
-                            <table width="100%" cellpadding="0" cellspacing="0" dir="rtl">
-                                <tr>
-                                    <td style="margin: 12px 0; padding: 10px; background-color: #f5f5f5; border-radius: 4px; text-align: right; direction: rtl;">
-                                        <span style="font-weight: bold; color: #333; display: inline-block; margin-left: 10px;">שם מלא:</span><span style="color: #666; direction: ltr; unicode-bidi: embed;">{user_full_name}</span>
-                                    </td>
-                                </tr>
-                                <tr>
-                                    <td style="margin: 12px 0; padding: 10px; background-color: #f5f5f5; border-radius: 4px; text-align: right; direction: rtl;">
-                                        <span style="font-weight: bold; color: #333; display: inline-block; margin-left: 10px;">דואר אלקטרוני:</span><span style="color: #666; direction: ltr; unicode-bidi: embed;">{user_email_display}</span>
-                                    </td>
-                                </tr>
-                                <tr>
-                                    <td style="margin: 12px 0; padding: 10px; background-color: #f5f5f5; border-radius: 4px; text-align: right; direction: rtl;">
-                                        <span style="font-weight: bold; color: #333; display: inline-block; margin-left: 10px;">גיל:</span><span style="color: #666; direction: ltr; unicode-bidi: embed;">{user_age}</span>
-                                    </td>
-                                </tr>
-                                <tr>
-                                    <td style="margin: 12px 0; padding: 10px; background-color: #f5f5f5; border-radius: 4px; text-align: right; direction: rtl;">
-                                        <span style="font-weight: bold; color: #333; display: inline-block; margin-left: 10px;">מין:</span><span style="color: #666; direction: ltr; unicode-bidi: embed;">{user_gender}</span>
-                                    </td>
-                                </tr>
-                                <tr>
-                                    <td style="margin: 12px 0; padding: 10px; background-color: #f5f5f5; border-radius: 4px; text-align: right; direction: rtl;">
-                                        <span style="font-weight: bold; color: #333; display: inline-block; margin-left: 10px;">טלפון:</span><span style="color: #666; direction: ltr; unicode-bidi: embed;">{user_phone}</span>
-                                    </td>
-                                </tr>
-                                <tr>
-                                    <td style="margin: 12px 0; padding: 10px; background-color: #f5f5f5; border-radius: 4px; text-align: right; direction: rtl;">
-                                        <span style="font-weight: bold; color: #333; display: inline-block; margin-left: 10px;">עיר מגורים:</span><span style="color: #666; direction: ltr; unicode-bidi: embed;">{user_city}</span>
-                                    </td>
-                                </tr>
-                                <tr>
-                                    <td style="margin: 12px 0; padding: 10px; background-color: #f5f5f5; border-radius: 4px; text-align: right; direction: rtl;">
-                                        <span style="font-weight: bold; color: #333; display: inline-block; margin-left: 10px;">מעוניין להיות חונך:</span><span style="color: #666; direction: ltr; unicode-bidi: embed;">{user_wants_tutor}</span>
-                                    </td>
-                                </tr>
-                                <tr>
-                                    <td style="margin: 12px 0; padding: 10px; background-color: #f5f5f5; border-radius: 4px; text-align: right; direction: rtl;">
-                                        <span style="font-weight: bold; color: #333; display: inline-block; margin-left: 10px;">תאריך הרשמה:</span><span style="color: #666; direction: ltr; unicode-bidi: embed;">{created_at}</span>
-                                    </td>
-                                </tr>
-                            </table>
-                            
-                            <hr style="border: none; border-top: 2px solid #4CAF50; margin: 20px 0;">
-                            
-                            <p dir="rtl" style="text-align: right; margin: 15px 0;"><strong style="color: #2e7d32;">אנא בדוק את פרטי המשתמש במערכת וקבע הערות/תנאים אם יש צורך.</strong></p>
-                            <p dir="rtl" style="text-align: right; margin: 15px 0;"><strong style="color: #2e7d32;">לאחר מכן אשר או דחה את ההרשמה כנדרש.</strong></p>
-                            
-                            <hr style="border: none; border-top: 2px solid #4CAF50; margin: 20px 0;">
-                            
-                            <p dir="rtl" style="text-align: right; color: #666; font-size: 12px; margin: 15px 0;">בברכה,<br>צוות חיוך של ילד</p>
-                        </td>
-                    </tr>
-                    <!-- FOOTER -->
-                    <tr>
-                        <td style="background-color: #f0f0f0; padding: 15px; text-align: center; font-size: 12px; color: #666; border-radius: 0 0 8px 8px;">
-                            <p dir="rtl" style="text-align: center; margin: 0;">זוהי הודעה אוטומטית - אנא אל תשיב לאימייל זה</p>
-                        </td>
-                    </tr>
-                </table>
-            </td>
-        </tr>
-    </table>
-</body>
-</html>"""
+                    message = email_layout.render(coordinator_name=coordinator_name)
 
                     # Send email (skip if this coordinator muted this notification — mute covers email too)
                     if is_whatsapp_muted(staff_member, 'new_volunteer_registration'):
                         api_logger.info(f"🔕 Coordinator {staff_member.staff_id} muted 'new_volunteer_registration' — email skipped")
                     else:
-                        send_mail(
-                            subject,
-                            message,
-                            settings.DEFAULT_FROM_EMAIL,
-                            [staff_member.email],
-                            fail_silently=True,
-                            html_message=message
-                        )
+                        emails.append((staff_member.email, subject, message, message))
                     
                     # Send WhatsApp message to coordinator (prod only)
                     if not getattr(settings, 'IS_PROD', False):
@@ -273,6 +286,8 @@ def create_tasks_for_admins(staff_user_id, user_name, user_email):
                                 api_logger.warning(f"Failed to send WhatsApp to coordinator {staff_member.staff_id}: {whatsapp_result.get('error')}")
                         except Exception as wa_error:
                             api_logger.error(f"Error sending WhatsApp to coordinator {staff_member.staff_id}: {str(wa_error)}")
+
+                enqueue_emails(emails, source='new_volunteer_registration')
                 
                 api_logger.debug(f"Registration approval notifications (email + WhatsApp) sent to {len(approval_staff)} Volunteer Coordinators for user {user_email}")
                 
@@ -328,96 +343,9 @@ def notify_tutored_families_coordinators_async(child_id):
     thread.start()
 
 
-def notify_tutored_families_coordinators(child_id):
-    """
-    Send email notification to all Tutored Families Coordinators about a new family needing a tutor.
-    
-    Triggered when a family is added via create_family API with tutoring_status requiring a tutor.
-    
-    Email includes:
-    - Child demographics (name, age, gender, city, phone)
-    - Tutoring details (status, requirements, registration date)
-    - HTML formatted with RTL support for Hebrew
-    - Blue header (#2196F3) to differentiate from registration emails
-    - Personalized greeting with coordinator name
-    """
-    try:
-        # Fetch "Tutored Families Coordinator" role
-        coordinator_role = Role.objects.filter(role_name="Tutored Families Coordinator").first()
-        
-        if not coordinator_role:
-            api_logger.debug("Role 'Tutored Families Coordinator' not found in the database.")
-            return
-        
-        # Fetch all Tutored Families Coordinators
-        coordinators = Staff.objects.filter(roles=coordinator_role).distinct()
-        
-        if not coordinators.exists():
-            api_logger.warning("No Tutored Families Coordinators found in the database.")
-            return
-        
-        api_logger.debug(f"Found {coordinators.count()} Tutored Families Coordinators.")
-        
-        # Retrieve child data
-        try:
-            child = Children.objects.get(child_id=child_id)
-        except Children.DoesNotExist:
-            api_logger.error(f"Child with ID {child_id} not found")
-            return
-        
-        # Check if child's tutoring status requires a tutor
-        if child.tutoring_status not in TUTORING_STATUSES_REQUIRING_TUTOR:
-            api_logger.debug(f"Child {child_id} tutoring status '{child.tutoring_status}' does not require tutor notification")
-            return
-        
-        # Format child information
-        from .utils import calculate_age_from_birth_date
-        
-        child_full_name = f"{child.childfirstname} {child.childsurname}"
-        child_age = calculate_age_from_birth_date(child.date_of_birth)
-        child_gender = "נקבה" if child.gender else "זכר"
-        
-        # Get parent phone numbers - prefer mother's phone, fallback to father's, then both if available
-        parent_phone = None
-        if child.mother_phone:
-            parent_phone = str(child.mother_phone)
-        elif child.father_phone:
-            parent_phone = str(child.father_phone)
-        else:
-            # Try to combine both if available
-            phones = []
-            if child.father_phone:
-                phones.append(f"אב: {child.father_phone}")
-            if child.mother_phone:
-                phones.append(f"אם: {child.mother_phone}")
-            parent_phone = " | ".join(phones) if phones else "לא זמין"
-        
-        if not parent_phone or parent_phone == "לא זמין":
-            parent_phone = "לא זמין"
-        
-        child_city = child.city if child.city else "לא זמין"
-        child_hospital = child.treating_hospital if child.treating_hospital else "לא ידוע"
-        
-        # Format tutoring status in Hebrew
-        tutoring_status_labels = {
-            'למצוא_חונך': 'צריך למצוא חונך',
-            'יש_חונך': 'יש חונך קיים',
-            'למצוא_חונך_אין_באיזור_שלו': 'צריך חונך - אין באיזורו',
-            'למצוא_חונך_בעדיפות_גבוה': 'צריך חונך - עדיפות גבוהה',
-            'שידוך_בסימן_שאלה': 'שידוך בסימן שאלה',
-        }
-        tutoring_status_display = tutoring_status_labels.get(child.tutoring_status, child.tutoring_status)
-        
-        # Format registration date
-        registration_date = child.registrationdate.strftime("%d/%m/%Y") if child.registrationdate else "לא זמין"
-        
-        subject = f"משפחה חדשה ממתינה לחונך - {child_full_name}"
-        
-        # Send individual emails to each coordinator
-        for coordinator in coordinators:
-            coordinator_name = f"{coordinator.first_name} {coordinator.last_name}"
-            
-            message = f"""<!DOCTYPE html>
+# Email to each Tutored Families Coordinator about a new family needing a tutor
+# (notify_tutored_families_coordinators).
+NEW_FAMILY_TUTORED_COORDINATOR_EMAIL = register_template("new_family_tutored_coordinator", """<!DOCTYPE html>
 <html dir="rtl" lang="he">
 <head>
     <meta charset="UTF-8">
@@ -514,19 +442,117 @@ def notify_tutored_families_coordinators(child_id):
         </tr>
     </table>
 </body>
-</html>"""
+</html>""")
+
+
+def notify_tutored_families_coordinators(child_id):
+    """
+    Send email notification to all Tutored Families Coordinators about a new family needing a tutor.
+    
+    Triggered when a family is added via create_family API with tutoring_status requiring a tutor.
+    
+    Email includes:
+    - Child demographics (name, age, gender, city, phone)
+    - Tutoring details (status, requirements, registration date)
+    - HTML formatted with RTL support for Hebrew
+    - Blue header (#2196F3) to differentiate from registration emails
+    - Personalized greeting with coordinator name
+    """
+    try:
+        # Fetch "Tutored Families Coordinator" role
+        coordinator_role = Role.objects.filter(role_name="Tutored Families Coordinator").first()
+        
+        if not coordinator_role:
+            api_logger.debug("Role 'Tutored Families Coordinator' not found in the database.")
+            return
+        
+        # Fetch all Tutored Families Coordinators
+        coordinators = Staff.objects.filter(roles=coordinator_role).distinct()
+        
+        if not coordinators.exists():
+            api_logger.warning("No Tutored Families Coordinators found in the database.")
+            return
+        
+        api_logger.debug(f"Found {coordinators.count()} Tutored Families Coordinators.")
+        
+        # Retrieve child data
+        try:
+            child = Children.objects.get(child_id=child_id)
+        except Children.DoesNotExist:
+            api_logger.error(f"Child with ID {child_id} not found")
+            return
+        
+        # Check if child's tutoring status requires a tutor
+        if child.tutoring_status not in TUTORING_STATUSES_REQUIRING_TUTOR:
+            api_logger.debug(f"Child {child_id} tutoring status '{child.tutoring_status}' does not require tutor notification")
+            return
+        
+        # Format child information
+        from .utils import calculate_age_from_birth_date
+        
+        child_full_name = f"{child.childfirstname} {child.childsurname}"
+        child_age = calculate_age_from_birth_date(child.date_of_birth)
+        child_gender = "נקבה" if child.gender else "זכר"
+        
+        # Get parent phone numbers - prefer mother's phone, fallback to father's, then both if available
+        parent_phone = None
+        if child.mother_phone:
+            parent_phone = str(child.mother_phone)
+        elif child.father_phone:
+            parent_phone = str(child.father_phone)
+        else:
+            # Try to combine both if available
+            phones = []
+            if child.father_phone:
+                phones.append(f"אב: {child.father_phone}")
+            if child.mother_phone:
+                phones.append(f"אם: {child.mother_phone}")
+            parent_phone = " | ".join(phones) if phones else "לא זמין"
+        
+        if not parent_phone or parent_phone == "לא זמין":
+            parent_phone = "לא זמין"
+        
+        child_city = child.city if child.city else "לא זמין"
+        child_hospital = child.treating_hospital if child.treating_hospital else "לא ידוע"
+        
+        # Format tutoring status in Hebrew
+        tutoring_status_labels = {
+            'למצוא_חונך': 'צריך למצוא חונך',
+            'יש_חונך': 'יש חונך קיים',
+            'למצוא_חונך_אין_באיזור_שלו': 'צריך חונך - אין באיזורו',
+            'למצוא_חונך_בעדיפות_גבוה': 'צריך חונך - עדיפות גבוהה',
+            'שידוך_בסימן_שאלה': 'שידוך בסימן שאלה',
+        }
+        tutoring_status_display = tutoring_status_labels.get(child.tutoring_status, child.tutoring_status)
+        
+        # Format registration date
+        registration_date = child.registrationdate.strftime("%d/%m/%Y") if child.registrationdate else "לא זמין"
+        
+        subject = f"משפחה חדשה ממתינה לחונך - {child_full_name}"
+        
+        # Send individual emails to each coordinator
+        # Family details are rendered once; only the greeting differs per coordinator
+        email_layout = NEW_FAMILY_TUTORED_COORDINATOR_EMAIL.bind(
+            child_full_name=child_full_name,
+            child_age=child_age,
+            child_gender=child_gender,
+            child_city=child_city,
+            parent_phone=parent_phone,
+            child_hospital=child_hospital,
+            tutoring_status_display=tutoring_status_display,
+            registration_date=registration_date,
+        )
+        # Queued together after the loop: one insert, one dispatcher wake-up
+        emails = []
+        for coordinator in coordinators:
+            coordinator_name = f"{coordinator.first_name} {coordinator.last_name}"
+            
+            message = email_layout.render(coordinator_name=coordinator_name)
 
             if is_whatsapp_muted(coordinator, 'new_family_needs_tutor'):
                 api_logger.info(f"🔕 Coordinator {coordinator.staff_id} muted 'new_family_needs_tutor' — email skipped")
             else:
-                send_mail(
-                    subject,
-                    message,
-                    settings.DEFAULT_FROM_EMAIL,
-                    [coordinator.email],
-                    fail_silently=True,
-                    html_message=message
-                )
+                emails.append((coordinator.email, subject, message, message))
             
             # Send WhatsApp message to coordinator (prod only)
             if coordinator.staff_phone and getattr(settings, 'IS_PROD', False) and not is_whatsapp_muted(coordinator, 'new_family_needs_tutor'):
@@ -551,6 +577,8 @@ def notify_tutored_families_coordinators(child_id):
                     api_logger.error(f"Error sending WhatsApp to coordinator {coordinator.staff_id}: {str(wa_error)}")
             else:
                 api_logger.debug(f"🔔 Coordinator {coordinator.staff_id} has no phone number - WhatsApp notification will NOT be sent")
+
+        enqueue_emails(emails, source='new_family_needs_tutor')
         
         api_logger.info(f"Family notification email sent to {coordinators.count()} Tutored Families Coordinators for child {child_id}")
         
@@ -600,66 +628,9 @@ def notify_tutored_coordinators_family_left_async(child_id, new_tutoring_status)
     thread.start()
 
 
-def notify_tutored_coordinators_family_left(child_id, new_tutoring_status):
-    """
-    Notify all Tutored Families Coordinators that a family has left their supervision,
-    i.e. the tutoring_status changed FROM one of TUTORING_STATUSES_REQUIRING_TUTOR
-    to something that no longer requires a tutor (or coordinator changed away from them).
-
-    Sends:
-    - Email (always)
-    - WhatsApp (prod only, using NEW_FAMILY_LEFT_TUT_SID template)
-    """
-    try:
-        coordinator_role = Role.objects.filter(role_name="Tutored Families Coordinator").first()
-        if not coordinator_role:
-            api_logger.debug("notify_tutored_coordinators_family_left: role not found — skipping")
-            return
-
-        coordinators = Staff.objects.filter(roles=coordinator_role, is_active=True).distinct()
-        if not coordinators.exists():
-            api_logger.warning("notify_tutored_coordinators_family_left: no active coordinators found")
-            return
-
-        try:
-            child = Children.objects.get(child_id=child_id)
-        except Children.DoesNotExist:
-            api_logger.error(f"notify_tutored_coordinators_family_left: child {child_id} not found")
-            return
-
-        from .utils import calculate_age_from_birth_date
-        child_full_name = f"{child.childfirstname} {child.childsurname}"
-        child_age = calculate_age_from_birth_date(child.date_of_birth)
-        child_gender = "נקבה" if child.gender else "זכר"
-
-        if child.mother_phone:
-            parent_phone = str(child.mother_phone)
-        elif child.father_phone:
-            parent_phone = str(child.father_phone)
-        else:
-            parent_phone = "לא זמין"
-
-        # Strip BiDi/RTL control chars and add leading 0 for Israeli numbers (DB stores without it)
-        BIDI_CHARS = {8206, 8207, 8234, 8235, 8236, 8237, 8238, 8239, 8294, 8295, 8296, 8297}
-        parent_phone = "".join(c for c in parent_phone.strip() if ord(c) not in BIDI_CHARS).strip()
-        if len(parent_phone) == 9 and parent_phone[0] in "234578":
-            parent_phone = "0" + parent_phone
-
-        child_city = child.city or "לא זמין"
-        child_hospital = child.treating_hospital or "לא ידוע"
-        tutoring_status_display = ALL_TUTORING_STATUS_LABELS.get(new_tutoring_status, new_tutoring_status)
-        registration_date = child.registrationdate.strftime("%d/%m/%Y") if child.registrationdate else "לא זמין"
-
-        subject = f"משפחה עזבה את תור החונכות - {child_full_name}"
-
-        for coordinator in coordinators:
-            coordinator_name = f"{coordinator.first_name} {coordinator.last_name}"
-
-            if not coordinator.email:
-                api_logger.debug(f"notify_tutored_coordinators_family_left: coordinator {coordinator.staff_id} has no email — skipping")
-                continue
-
-            html_message = f"""<!DOCTYPE html>
+# Email to each Tutored Families Coordinator about a family that left the tutoring queue
+# (notify_tutored_coordinators_family_left).
+FAMILY_LEFT_TUTORED_COORDINATOR_EMAIL = register_template("family_left_tutored_coordinator", """<!DOCTYPE html>
 <html dir="rtl" lang="he">
 <head><meta charset="UTF-8"><meta http-equiv="Content-Type" content="text/html; charset=UTF-8"></head>
 <body dir="rtl" style="direction:rtl;text-align:right;font-family:Arial,sans-serif;line-height:1.6;margin:0;padding:20px;background-color:#f5f5f5;">
@@ -728,7 +699,80 @@ def notify_tutored_coordinators_family_left(child_id, new_tutoring_status):
     </td></tr>
   </table>
 </body>
-</html>"""
+</html>""")
+
+
+def notify_tutored_coordinators_family_left(child_id, new_tutoring_status):
+    """
+    Notify all Tutored Families Coordinators that a family has left their supervision,
+    i.e. the tutoring_status changed FROM one of TUTORING_STATUSES_REQUIRING_TUTOR
+    to something that no longer requires a tutor (or coordinator changed away from them).
+
+    Sends:
+    - Email (always)
+    - WhatsApp (prod only, using NEW_FAMILY_LEFT_TUT_SID template)
+    """
+    try:
+        coordinator_role = Role.objects.filter(role_name="Tutored Families Coordinator").first()
+        if not coordinator_role:
+            api_logger.debug("notify_tutored_coordinators_family_left: role not found — skipping")
+            return
+
+        coordinators = Staff.objects.filter(roles=coordinator_role, is_active=True).distinct()
+        if not coordinators.exists():
+            api_logger.warning("notify_tutored_coordinators_family_left: no active coordinators found")
+            return
+
+        try:
+            child = Children.objects.get(child_id=child_id)
+        except Children.DoesNotExist:
+            api_logger.error(f"notify_tutored_coordinators_family_left: child {child_id} not found")
+            return
+
+        from .utils import calculate_age_from_birth_date
+        child_full_name = f"{child.childfirstname} {child.childsurname}"
+        child_age = calculate_age_from_birth_date(child.date_of_birth)
+        child_gender = "נקבה" if child.gender else "זכר"
+
+        if child.mother_phone:
+            parent_phone = str(child.mother_phone)
+        elif child.father_phone:
+            parent_phone = str(child.father_phone)
+        else:
+            parent_phone = "לא זמין"
+
+        # Strip BiDi/RTL control chars and add leading 0 for Israeli numbers (DB stores without it)
+        BIDI_CHARS = {8206, 8207, 8234, 8235, 8236, 8237, 8238, 8239, 8294, 8295, 8296, 8297}
+        parent_phone = "".join(c for c in parent_phone.strip() if ord(c) not in BIDI_CHARS).strip()
+        if len(parent_phone) == 9 and parent_phone[0] in "234578":
+            parent_phone = "0" + parent_phone
+
+        child_city = child.city or "לא זמין"
+        child_hospital = child.treating_hospital or "לא ידוע"
+        tutoring_status_display = ALL_TUTORING_STATUS_LABELS.get(new_tutoring_status, new_tutoring_status)
+        registration_date = child.registrationdate.strftime("%d/%m/%Y") if child.registrationdate else "לא זמין"
+
+        subject = f"משפחה עזבה את תור החונכות - {child_full_name}"
+
+        # Family details are rendered once; only the greeting differs per coordinator
+        email_layout = FAMILY_LEFT_TUTORED_COORDINATOR_EMAIL.bind(
+            child_full_name=child_full_name,
+            child_age=child_age,
+            child_gender=child_gender,
+            child_city=child_city,
+            parent_phone=parent_phone,
+            child_hospital=child_hospital,
+            tutoring_status_display=tutoring_status_display,
+            registration_date=registration_date,
+        )
+        for coordinator in coordinators:
+            coordinator_name = f"{coordinator.first_name} {coordinator.last_name}"
+
+            if not coordinator.email:
+                api_logger.debug(f"notify_tutored_coordinators_family_left: coordinator {coordinator.staff_id} has no email — skipping")
+                continue
+
+            html_message = email_layout.render(coordinator_name=coordinator_name)
 
             try:
                 # send_mail(
@@ -776,79 +820,9 @@ def notify_tutored_coordinators_family_left(child_id, new_tutoring_status):
         api_logger.error(f"notify_tutored_coordinators_family_left: unexpected error: {e}")
 
 
-def notify_families_coordinator_of_new_family(child_id):
-    """
-    Send email notification to all Families Coordinators about a newly created family
-    whose tutoring_status falls under their responsibility:
-      לא_רוצים | לא_רלוונטי | בוגר
-
-    Mirrors the admin email format (orange header) but addressed to the Families Coordinator.
-    Does NOT send WhatsApp (coordinators use email only).
-    """
-    try:
-        from .utils import calculate_age_from_birth_date
-        from datetime import date
-
-        child = Children.objects.get(child_id=child_id)
-
-        # Only notify for statuses that belong to the Families Coordinator
-        if child.tutoring_status not in FAMILIES_COORDINATOR_STATUSES:
-            api_logger.debug(
-                f"notify_families_coordinator: child {child_id} status "
-                f"'{child.tutoring_status}' not in families-coordinator set — skipping"
-            )
-            return
-
-        # Resolve Families Coordinator staff
-        coordinator_role = Role.objects.filter(role_name='Families Coordinator').first()
-        if not coordinator_role:
-            api_logger.warning("Role 'Families Coordinator' not found — skipping family coordinator notification")
-            return
-
-        coordinators = Staff.objects.filter(roles=coordinator_role, is_active=True).distinct()
-        if not coordinators.exists():
-            api_logger.warning("No active Families Coordinators found — skipping family coordinator notification")
-            return
-
-        # Build child data
-        child_name = f"{child.childfirstname} {child.childsurname}"
-
-        if child.date_of_birth:
-            today = date.today()
-            age_years = (
-                today.year - child.date_of_birth.year
-                - ((today.month, today.day) < (child.date_of_birth.month, child.date_of_birth.day))
-            )
-            if age_years < 1:
-                age_months = (today.month - child.date_of_birth.month) % 12
-                age_display = f"{age_months} חודשים"
-                age_number = str(age_months)
-                age_unit = "חודשים"
-            else:
-                age_display = f"{age_years} שנים"
-                age_number = str(age_years)
-                age_unit = "שנים"
-        else:
-            age_display = "לא זמין"
-            age_number = "N/A"
-            age_unit = ""
-
-        child_gender = "נקבה" if child.gender else "זכר"
-        parent_phone = str(child.mother_phone or child.father_phone or "לא זמין")
-        child_city = child.city or "לא זמין"
-        child_hospital = child.treating_hospital or "לא זמין"
-        tutoring_status_display = FAMILIES_COORDINATOR_STATUS_LABELS.get(child.tutoring_status, child.tutoring_status)
-        registration_date = child.registrationdate.strftime("%d/%m/%Y") if child.registrationdate else "לא זמין"
-
-        subject = f"משפחה חדשה נוספה - {child_name}"
-
-        for coordinator in coordinators:
-            coordinator_name = f"{coordinator.first_name} {coordinator.last_name}"
-            if not coordinator.email:
-                api_logger.debug(f"Families Coordinator {coordinator.staff_id} has no email — skipping")
-                continue
-
-            html_message = f"""<!DOCTYPE html>
+# Email to each Families Coordinator about a new family in their statuses
+# (notify_families_coordinator_of_new_family).
+NEW_FAMILY_FAMILIES_COORDINATOR_EMAIL = register_template("new_family_families_coordinator", """<!DOCTYPE html>
 <html dir="rtl" lang="he">
 <head><meta charset="UTF-8"><meta http-equiv="Content-Type" content="text/html; charset=UTF-8"></head>
 <body dir="rtl" style="direction:rtl;text-align:right;font-family:Arial,sans-serif;line-height:1.6;margin:0;padding:20px;background-color:#f5f5f5;">
@@ -913,28 +887,100 @@ def notify_families_coordinator_of_new_family(child_id):
     </td></tr>
   </table>
 </body>
-</html>"""
+</html>""")
+
+
+def notify_families_coordinator_of_new_family(child_id):
+    """
+    Send email notification to all Families Coordinators about a newly created family
+    whose tutoring_status falls under their responsibility:
+      לא_רוצים | לא_רלוונטי | בוגר
+
+    Mirrors the admin email format (orange header) but addressed to the Families Coordinator.
+    Does NOT send WhatsApp (coordinators use email only).
+    """
+    try:
+        from .utils import calculate_age_from_birth_date
+        from datetime import date
+
+        child = Children.objects.get(child_id=child_id)
+
+        # Only notify for statuses that belong to the Families Coordinator
+        if child.tutoring_status not in FAMILIES_COORDINATOR_STATUSES:
+            api_logger.debug(
+                f"notify_families_coordinator: child {child_id} status "
+                f"'{child.tutoring_status}' not in families-coordinator set — skipping"
+            )
+            return
+
+        # Resolve Families Coordinator staff
+        coordinator_role = Role.objects.filter(role_name='Families Coordinator').first()
+        if not coordinator_role:
+            api_logger.warning("Role 'Families Coordinator' not found — skipping family coordinator notification")
+            return
+
+        coordinators = Staff.objects.filter(roles=coordinator_role, is_active=True).distinct()
+        if not coordinators.exists():
+            api_logger.warning("No active Families Coordinators found — skipping family coordinator notification")
+            return
+
+        # Build child data
+        child_name = f"{child.childfirstname} {child.childsurname}"
+
+        if child.date_of_birth:
+            today = date.today()
+            age_years = (
+                today.year - child.date_of_birth.year
+                - ((today.month, today.day) < (child.date_of_birth.month, child.date_of_birth.day))
+            )
+            if age_years < 1:
+                age_months = (today.month - child.date_of_birth.month) % 12
+                age_display = f"{age_months} חודשים"
+                age_number = str(age_months)
+                age_unit = "חודשים"
+            else:
+                age_display = f"{age_years} שנים"
+                age_number = str(age_years)
+                age_unit = "שנים"
+        else:
+            age_display = "לא זמין"
+            age_number = "N/A"
+            age_unit = ""
+
+        child_gender = "נקבה" if child.gender else "זכר"
+        parent_phone = str(child.mother_phone or child.father_phone or "לא זמין")
+        child_city = child.city or "לא זמין"
+        child_hospital = child.treating_hospital or "לא זמין"
+        tutoring_status_display = FAMILIES_COORDINATOR_STATUS_LABELS.get(child.tutoring_status, child.tutoring_status)
+        registration_date = child.registrationdate.strftime("%d/%m/%Y") if child.registrationdate else "לא זמין"
+
+        subject = f"משפחה חדשה נוספה - {child_name}"
+
+        # Family details are rendered once; only the greeting differs per coordinator
+        email_layout = NEW_FAMILY_FAMILIES_COORDINATOR_EMAIL.bind(
+            child_name=child_name,
+            age_display=age_display,
+            child_gender=child_gender,
+            child_city=child_city,
+            parent_phone=parent_phone,
+            child_hospital=child_hospital,
+            tutoring_status_display=tutoring_status_display,
+            registration_date=registration_date,
+        )
+        # Queued together after the loop: one insert, one dispatcher wake-up
+        emails = []
+        for coordinator in coordinators:
+            coordinator_name = f"{coordinator.first_name} {coordinator.last_name}"
+            if not coordinator.email:
+                api_logger.debug(f"Families Coordinator {coordinator.staff_id} has no email — skipping")
+                continue
+
+            html_message = email_layout.render(coordinator_name=coordinator_name)
 
             if is_whatsapp_muted(coordinator, 'new_family_families_coordinator'):
                 api_logger.info(f"🔕 notify_families_coordinator: coordinator {coordinator.staff_id} muted 'new_family_families_coordinator' — email skipped")
             else:
-                try:
-                    send_mail(
-                        subject,
-                        html_message,
-                        settings.DEFAULT_FROM_EMAIL,
-                        [coordinator.email],
-                        fail_silently=False,
-                        html_message=html_message,
-                    )
-                    api_logger.info(
-                        f"✅ notify_families_coordinator: email sent to {coordinator.email} "
-                        f"for child {child_id} ({child_name})"
-                    )
-                except Exception as mail_err:
-                    api_logger.error(
-                        f"❌ notify_families_coordinator: email failed for {coordinator.email}: {mail_err}"
-                    )
+                emails.append((coordinator.email, subject, html_message, html_message))
 
             # WhatsApp (prod only, same template as admin/tutored coordinator)
             if coordinator.staff_phone and getattr(settings, 'IS_PROD', False) and not is_whatsapp_muted(coordinator, 'new_family_families_coordinator'):
@@ -971,12 +1017,117 @@ def notify_families_coordinator_of_new_family(child_id):
                 else:
                     api_logger.debug(f"notify_families_coordinator: not prod — WhatsApp skipped for {coordinator.staff_id}")
 
+        try:
+            queued = enqueue_emails(emails, source='new_family_families_coordinator')
+            if queued:
+                api_logger.info(
+                    f"✅ notify_families_coordinator: email queued for {', '.join(row.to_email for row in queued)} "
+                    f"for child {child_id} ({child_name})"
+                )
+        except Exception as mail_err:
+            api_logger.error(
+                f"❌ notify_families_coordinator: email failed for {', '.join(email[0] for email in emails)}: {mail_err}"
+            )
+
     except Children.DoesNotExist:
         api_logger.error(f"notify_families_coordinator: child {child_id} not found")
     except Exception as e:
         api_logger.error(f"notify_families_coordinator: unexpected error: {e}")
 
 
+# Email to the admin who gets new-family notifications by email instead of WhatsApp
+# (notify_admins_of_new_family).
+NEW_FAMILY_ADMIN_EMAIL = register_template("new_family_admin", """<!DOCTYPE html>
+<html dir="rtl" lang="he">
+<head>
+    <meta charset="UTF-8">
+    <meta http-equiv="Content-Type" content="text/html; charset=UTF-8">
+</head>
+<body dir="rtl" style="direction: rtl; text-align: right; font-family: Arial, sans-serif; line-height: 1.6; margin: 0; padding: 20px; background-color: #f5f5f5;">
+    <table width="100%" cellpadding="0" cellspacing="0" style="background-color: #f5f5f5;">
+        <tr>
+            <td align="right" style="padding: 0;">
+                <table width="600" cellpadding="0" cellspacing="0" style="background-color: #f9f9f9; margin: 0 auto;">
+                    <!-- HEADER -->
+                    <tr>
+                        <td style="background: linear-gradient(to right, #FF9800 0%, #F57C00 100%); color: white; padding: 20px; text-align: center; font-size: 20px; font-weight: bold; border-radius: 8px 8px 0 0;">
+                            משפחה חדשה נוספה למערכת
+                        </td>
+                    </tr>
+                    <!-- CONTENT -->
+                    <tr>
+                        <td style="background-color: white; padding: 30px; border-radius: 0;">
+                            <p dir="rtl" style="text-align: right; margin: 15px 0;">שלום {admin_name},</p>
+                            
+                            <p dir="rtl" style="text-align: right; margin: 15px 0;">משפחה חדשה נוספה למערכת.</p>
+                            
+                            <hr style="border: none; border-top: 2px solid #FF9800; margin: 20px 0;">
+                            
+                            <p dir="rtl" style="text-align: right; font-weight: bold; margin: 15px 0; padding-bottom: 10px; border-bottom: 3px solid #FF9800; color: #333;">פרטי הילד:</p>
+                            
+                            <!-- CHILD FIELDS TABLE -->
+                            <table width="100%" cellpadding="0" cellspacing="0" dir="rtl">
+                                <tr>
+                                    <td style="margin: 12px 0; padding: 10px; background-color: #f5f5f5; border-radius: 4px; text-align: right; direction: rtl;">
+                                        <span style="font-weight: bold; color: #333; display: inline-block; margin-left: 10px;">שם מלא:</span><span style="color: #666; direction: ltr; unicode-bidi: embed;">{child_name}</span>
+                                    </td>
+                                </tr>
+                                <tr>
+                                    <td style="margin: 12px 0; padding: 10px; background-color: #f5f5f5; border-radius: 4px; text-align: right; direction: rtl;">
+                                        <span style="font-weight: bold; color: #333; display: inline-block; margin-left: 10px;">גיל:</span><span style="color: #666; direction: ltr; unicode-bidi: embed;">{age_number} {age_unit}</span>
+                                    </td>
+                                </tr>
+                                <tr>
+                                    <td style="margin: 12px 0; padding: 10px; background-color: #f5f5f5; border-radius: 4px; text-align: right; direction: rtl;">
+                                        <span style="font-weight: bold; color: #333; display: inline-block; margin-left: 10px;">מין:</span><span style="color: #666; direction: ltr; unicode-bidi: embed;">{child_gender}</span>
+                                    </td>
+                                </tr>
+                                <tr>
+                                    <td style="margin: 12px 0; padding: 10px; background-color: #f5f5f5; border-radius: 4px; text-align: right; direction: rtl;">
+                                        <span style="font-weight: bold; color: #333; display: inline-block; margin-left: 10px;">עיר מגורים:</span><span style="color: #666; direction: ltr; unicode-bidi: embed;">{child_city}</span>
+                                    </td>
+                                </tr>
+                                <tr>
+                                    <td style="margin: 12px 0; padding: 10px; background-color: #f5f5f5; border-radius: 4px; text-align: right; direction: rtl;">
+                                        <span style="font-weight: bold; color: #333; display: inline-block; margin-left: 10px;">טלפון הורים:</span><span style="color: #666; direction: ltr; unicode-bidi: embed;">{parent_phone}</span>
+                                    </td>
+                                </tr>
+                                <tr>
+                                    <td style="margin: 12px 0; padding: 10px; background-color: #f5f5f5; border-radius: 4px; text-align: right; direction: rtl;">
+                                        <span style="font-weight: bold; color: #333; display: inline-block; margin-left: 10px;">בית חולים/מוסד:</span><span style="color: #666; direction: ltr; unicode-bidi: embed;">{child_hospital}</span>
+                                    </td>
+                                </tr>
+                                <tr>
+                                    <td style="margin: 12px 0; padding: 10px; background-color: #f5f5f5; border-radius: 4px; text-align: right; direction: rtl;">
+                                        <span style="font-weight: bold; color: #333; display: inline-block; margin-left: 10px;">סטטוס חונכות:</span><span style="color: #666; direction: ltr; unicode-bidi: embed;">{tutoring_status}</span>
+                                    </td>
+                                </tr>
+                                <tr>
+                                    <td style="margin: 12px 0; padding: 10px; background-color: #f5f5f5; border-radius: 4px; text-align: right; direction: rtl;">
+                                        <span style="font-weight: bold; color: #333; display: inline-block; margin-left: 10px;">תאריך הוספה:</span><span style="color: #666; direction: ltr; unicode-bidi: embed;">{registration_date}</span>
+                                    </td>
+                                </tr>
+                            </table>
+                            
+                            <hr style="border: none; border-top: 2px solid #FF9800; margin: 20px 0;">
+                            
+                            <p dir="rtl" style="text-align: right; color: #666; font-size: 12px; margin: 15px 0;">בברכה,<br>צוות חיוך של ילד</p>
+                        </td>
+                    </tr>
+                    <!-- FOOTER -->
+                    <tr>
+                        <td style="background-color: #f0f0f0; padding: 15px; text-align: center; font-size: 12px; color: #666; border-radius: 0 0 8px 8px;">
+                            <p dir="rtl" style="text-align: center; margin: 0;">זוהי הודעה אוטומטית - אנא אל תשיב לאימייל זה</p>
+                        </td>
+                    </tr>
+                </table>
+            </td>
+        </tr>
+    </table>
+</body>
+</html>""")
+
+
 def notify_admins_of_new_family(child_id):
     """
     Send notifications to all System Administrators about a new family:
@@ -1123,108 +1274,30 @@ def notify_admins_of_new_family(child_id):
                 
                 subject = f"משפחה חדשה נוספה - {child_name}"
                 
-                message = f"""<!DOCTYPE html>
-<html dir="rtl" lang="he">
-<head>
-    <meta charset="UTF-8">
-    <meta http-equiv="Content-Type" content="text/html; charset=UTF-8">
-</head>
-<body dir="rtl" style="direction: rtl; text-align: right; font-family: Arial, sans-serif; line-height: 1.6; margin: 0; padding: 20px; background-color: #f5f5f5;">
-    <table width="100%" cellpadding="0" cellspacing="0" style="background-color: #f5f5f5;">
-        <tr>
-            <td align="right" style="padding: 0;">
-                <table width="600" cellpadding="0" cellspacing="0" style="background-color: #f9f9f9; margin: 0 auto;">
-                    <!-- HEADER -->
-                    <tr>
-                        <td style="background: linear-gradient(to right, #FF9800 0%, #F57C00 100%); color: white; padding: 20px; text-align: center; font-size: 20px; font-weight: bold; border-radius: 8px 8px 0 0;">
-                            משפחה חדשה נוספה למערכת
-                        </td>
-                    </tr>
-                    <!-- CONTENT -->
-                    <tr>
-                        <td style="background-color: white; padding: 30px; border-radius: 0;">
-                            <p dir="rtl" style="text-align: right; margin: 15px 0;">שלום {admin_name},</p>
-                            
-                            <p dir="rtl" style="text-align: right; margin: 15px 0;">משפחה חדשה נוספה למערכת.</p>
-                            
-                            <hr style="border: none; border-top: 2px solid #FF9800; margin: 20px 0;">
-                            
-                            <p dir="rtl" style="text-align: right; font-weight: bold; margin: 15px 0; padding-bottom: 10px; border-bottom: 3px solid #FF9800; color: #333;">פרטי הילד:</p>
-                            
-                            <!-- CHILD FIELDS TABLE -->
-                            <table width="100%" cellpadding="0" cellspacing="0" dir="rtl">
-                                <tr>
-                                    <td style="margin: 12px 0; padding: 10px; background-color: #f5f5f5; border-radius: 4px; text-align: right; direction: rtl;">
-                                        <span style="font-weight: bold; color: #333; display: inline-block; margin-left: 10px;">שם מלא:</span><span style="color: #666; direction: ltr; unicode-bidi: embed;">{child_name}</span>
-                                    </td>
-                                </tr>
-                                <tr>
-                                    <td style="margin: 12px 0; padding: 10px; background-color: #f5f5f5; border-radius: 4px; text-align: right; direction: rtl;">
-                                        <span style="font-weight: bold; color: #333; display: inline-block; margin-left: 10px;">גיל:</span><span style="color: #666; direction: ltr; unicode-bidi: embed;">{age_number} {age_unit}</span>
-                                    </td>
-                                </tr>
-                                <tr>
-                                    <td style="margin: 12px 0; padding: 10px; background-color: #f5f5f5; border-radius: 4px; text-align: right; direction: rtl;">
-                                        <span style="font-weight: bold; color: #333; display: inline-block; margin-left: 10px;">מין:</span><span style="color: #666; direction: ltr; unicode-bidi: embed;">{child_gender}</span>
-                                    </td>
-                                </tr>
-                                <tr>
-                                    <td style="margin: 12px 0; padding: 10px; background-color: #f5f5f5; border-radius: 4px; text-align: right; direction: rtl;">
-                                        <span style="font-weight: bold; color: #333; display: inline-block; margin-left: 10px;">עיר מגורים:</span><span style="color: #666; direction: ltr; unicode-bidi: embed;">{child_city}</span>
-                                    </td>
-                                </tr>
-                                <tr>
-                                    <td style="margin: 12px 0; padding: 10px; background-color: #f5f5f5; border-radius: 4px; text-align: right; direction: rtl;">
-                                        <span style="font-weight: bold; color: #333; display: inline-block; margin-left: 10px;">טלפון הורים:</span><span style="color: #666; direction: ltr; unicode-bidi: embed;">{parent_phone}</span>
-                                    </td>
-                                </tr>
-                                <tr>
-                                    <td style="margin: 12px 0; padding: 10px; background-color: #f5f5f5; border-radius: 4px; text-align: right; direction: rtl;">
-                                        <span style="font-weight: bold; color: #333; display: inline-block; margin-left: 10px;">בית חולים/מוסד:</span><span style="color: #666; direction: ltr; unicode-bidi: embed;">{child_hospital}</span>
-                                    </td>
-                                </tr>
-                                <tr>
-                                    <td style="margin: 12px 0; padding: 10px; background-color: #f5f5f5; border-radius: 4px; text-align: right; direction: rtl;">
-                                        <span style="font-weight: bold; color: #333; display: inline-block; margin-left: 10px;">סטטוס חונכות:</span><span style="color: #666; direction: ltr; unicode-bidi: embed;">{tutoring_status}</span>
-                                    </td>
-                                </tr>
-                                <tr>
-                                    <td style="margin: 12px 0; padding: 10px; background-color: #f5f5f5; border-radius: 4px; text-align: right; direction: rtl;">
-                                        <span style="font-weight: bold; color: #333; display: inline-block; margin-left: 10px;">תאריך הוספה:</span><span style="color: #666; direction: ltr; unicode-bidi: embed;">{registration_date}</span>
-                                    </td>
-                                </tr>
-                            </table>
-                            
-                            <hr style="border: none; border-top: 2px solid #FF9800; margin: 20px 0;">
-                            
-                            <p dir="rtl" style="text-align: right; color: #666; font-size: 12px; margin: 15px 0;">בברכה,<br>צוות חיוך של ילד</p>
-                        </td>
-                    </tr>
-                    <!-- FOOTER -->
-                    <tr>
-                        <td style="background-color: #f0f0f0; padding: 15px; text-align: center; font-size: 12px; color: #666; border-radius: 0 0 8px 8px;">
-                            <p dir="rtl" style="text-align: center; margin: 0;">זוהי הודעה אוטומטית - אנא אל תשיב לאימייל זה</p>
-                        </td>
-                    </tr>
-                </table>
-            </td>
-        </tr>
-    </table>
-</body>
-</html>"""
+                message = NEW_FAMILY_ADMIN_EMAIL.render(
+                    admin_name=admin_name,
+                    child_name=child_name,
+                    age_number=age_number,
+                    age_unit=age_unit,
+                    child_gender=child_gender,
+                    child_city=child_city,
+                    parent_phone=parent_phone,
+                    child_hospital=child_hospital,
+                    tutoring_status=tutoring_status,
+                    registration_date=registration_date,
+                )
                 
                 if is_whatsapp_muted(special_admin, 'new_family_admins'):
                     api_logger.info(f"🔕 Special admin {special_admin.staff_id} muted 'new_family_admins' — email skipped")
                 else:
-                    send_mail(
+                    enqueue_email(
+                        [special_admin.email],
                         subject,
                         message,
-                        settings.DEFAULT_FROM_EMAIL,
-                        [special_admin.email],
-                        fail_silently=True,
-                        html_message=message
+                        html_message=message,
+                        source='new_family_admins',
                     )
-                    api_logger.debug(f"✅ Email notification sent to special admin {special_admin.staff_id} ({special_admin.email})")
+                    api_logger.debug(f"✅ Email notification queued for special admin {special_admin.staff_id} ({special_admin.email})")
                 
             except Exception as email_error:
                 api_logger.error(f"❌ Error sending email to special admin {special_admin.staff_id}: {str(email_error)}")
@@ -0,0 +1,249 @@
+"""
+dashboard_metrics.py
+
+One metrics service for the admin dashboard, the feedback widget, the AI chat
+and the video / PPT generators.
+
+get_dashboard_data used to issue 20+ separate COUNT queries per request (five
+feedback-type counts, four age-group counts, one per KPI...), and
+dashboard_services.generate_dashboard_data recomputed a different set — with
+different definitions — for the video and the PPT.
+
+get_dashboard_snapshot(timeframe) computes everything in a handful of
+queries:
+  1. Children    — every family KPI, the "new" counts and the four age groups
+                   as conditional aggregates of ONE query (a NOT EXISTS
+                   tutorship annotation replaces the tutorships__isnull joins)
+  2. Tutorships  — active tutorships (active tutor) + total
+  3. Staff       — approved, active staff count
+  4. Tutors      — tutors without a tutee
+  5. Feedback    — one GROUP BY feedback_type within the timeframe
+  6. Cities      — top cities of families without a tutor
+  7-8. the two recent-tutorship tables
+and caches the snapshot per timeframe for DASHBOARD_CACHE_TTL seconds.
+Saves / deletes of Children, Tutorships, Tutors, Feedback and Staff drop the
+cached snapshots after the transaction commits (connect_dashboard_signals,
+called from AppConfig.ready). With the default per-process cache the other
+workers pick the change up within the TTL.
+"""
+
+from datetime import timedelta
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Exists, OuterRef, Q
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+from .models import Children, Feedback, Staff, Tutors, Tutorships
+from .logger import api_logger
+
+DASHBOARD_CACHE_TTL = 60  # seconds
+DASHBOARD_CACHE_KEY = "dashboard_snapshot:{timeframe}"
+
+# Look-back per timeframe (None = all time)
+DASHBOARD_TIMEFRAMES = {
+    'week': timedelta(days=7),
+    'month': timedelta(days=30),
+    'year': timedelta(days=365),
+    'all': None,
+}
+
+# Hebrew timeframe labels of the video / PPT forms
+HEBREW_TIMEFRAMES = {
+    'שבוע אחרון': 'week',
+    'חודש אחרון': 'month',
+    '3 חודשים אחרונים': 'month',
+    'שנה אחרונה': 'year',
+    'כל הזמן': 'all',
+}
+
+FEEDBACK_TYPES = (
+    'tutor_fun_day',
+    'general_volunteer_fun_day',
+    'general_volunteer_hospital_visit',
+    'general_house_visit',
+    'tutorship',
+)
+
+EXIT_STATUSES = ('עזב', 'ז״ל', 'בריא')
+NOT_WAITING_TUTORING_STATUSES = ('לא_רלוונטי', 'בוגר', 'לא_רוצים')
+AGE_GROUPS = (('6-8', 6, 9), ('9-11', 9, 12), ('12-14', 12, 15), ('15-17', 15, 18))
+EXCLUDED_STAFF_NAMES = ('דריה', 'דביר')  # test / developer accounts
+
+
+def normalize_timeframe(timeframe):
+    """'week' / 'month' / 'year' / 'all' from an English or Hebrew label."""
+    timeframe = HEBREW_TIMEFRAMES.get(timeframe, timeframe)
+    return timeframe if timeframe in DASHBOARD_TIMEFRAMES else 'all'
+
+
+def _children_metrics(today, start_date):
+    no_tutorship = Q(has_tutorship=False)
+    aggregates = {
+        'total_families': Count('child_id'),
+        'active_families': Count('child_id', filter=~Q(status__in=EXIT_STATUSES)),
+        'waiting_families': Count('child_id', filter=(
+            no_tutorship
+            & ~Q(status__in=EXIT_STATUSES)
+            & ~Q(tutoring_status__in=NOT_WAITING_TUTORING_STATUSES)
+        )),
+        'without_tutorship': Count('child_id', filter=no_tutorship),
+        'new_families_month': Count('child_id', filter=Q(registrationdate__gte=today - timedelta(days=30))),
+    }
+    if start_date:
+        aggregates['new_families'] = Count('child_id', filter=Q(registrationdate__gte=start_date.date()))
+    for label, min_age, max_age in AGE_GROUPS:
+        aggregates[f'age_{label}'] = Count('child_id', filter=no_tutorship & Q(
+            date_of_birth__lte=today - timedelta(days=min_age * 365),
+            date_of_birth__gte=today - timedelta(days=max_age * 365),
+        ))
+
+    result = (
+        Children.objects
+        .annotate(has_tutorship=Exists(Tutorships.objects.filter(child_id=OuterRef('pk'))))
+        .aggregate(**aggregates)
+    )
+    result.setdefault('new_families', 0)
+    return result
+
+
+def _staff_count():
+    staff = Staff.objects.filter(registration_approved=True, is_active=True)
+    for name in EXCLUDED_STAFF_NAMES:
+        staff = staff.exclude(first_name__contains=name).exclude(last_name__contains=name)
+    return staff.count()
+
+
+def _feedback_by_type(start_date):
+    feedback = Feedback.objects.all()
+    if start_date:
+        feedback = feedback.filter(timestamp__gte=start_date)
+    counts = dict(feedback.values_list('feedback_type').annotate(count=Count('feedback_id')).order_by())
+    return {feedback_type: counts.get(feedback_type, 0) for feedback_type in FEEDBACK_TYPES}
+
+
+def _tutorship_rows(tutorships, limit):
+    return (
+        tutorships.select_related('child', 'tutor', 'tutor__id')
+        .only(
+            'created_date',
+            'child__child_id', 'child__childfirstname', 'child__childsurname',
+            'tutor__id__first_name', 'tutor__id__surname',
+        )
+        .order_by('-created_date')[:limit]
+    )
+
+
+def _names(tutorship, missing_child_label):
+    child = tutorship.child
+    child_name = f"{child.childfirstname} {child.childsurname}" if child else f"{missing_child_label} {tutorship.child_id}"
+    tutor_name = (
+        f"{tutorship.tutor.id.first_name} {tutorship.tutor.id.surname}"
+        if tutorship.tutor and tutorship.tutor.id else "Unknown Tutor"
+    )
+    return child_name, tutor_name
+
+
+def compute_dashboard_snapshot(timeframe):
+    """All dashboard KPIs, chart series and tables for one timeframe (uncached)."""
+    now = timezone.now()
+    today = timezone.localdate()
+    look_back = DASHBOARD_TIMEFRAMES[timeframe]
+    start_date = now - look_back if look_back else None
+
+    children = _children_metrics(today, start_date)
+    tutorships = Tutorships.objects.aggregate(
+        active=Count('id', filter=Q(tutor__staff__is_active=True)),
+        total=Count('id'),
+    )
+    staff_count = _staff_count()
+    pending_tutors = Tutors.objects.filter(tutorship_status='אין_חניך').count()
+    feedback_data = _feedback_by_type(start_date)
+
+    cities = list(
+        Children.objects
+        .filter(~Exists(Tutorships.objects.filter(child_id=OuterRef('pk'))))
+        .values('city')
+        .annotate(count=Count('child_id'))
+        .order_by('-count')[:12]
+    )
+
+    recent_data = []
+    for tutorship in _tutorship_rows(Tutorships.objects.filter(tutor__staff__is_active=True), 10):
+        child_name, tutor_name = _names(tutorship, "Child")
+        recent_data.append({
+            'child_name': child_name,
+            'tutor_name': tutor_name,
+            'days': (now - tutorship.created_date).days if tutorship.created_date else 0,
+        })
+
+    table_data = []
+    for tutorship in _tutorship_rows(Tutorships.objects.all(), 20):
+        child_name, tutor_name = _names(tutorship, "משפחה")
+        weeks_active = (now - tutorship.created_date).days // 7 if tutorship.created_date else 0
+        table_data.append({
+            'child_name': child_name,
+            'tutor_name': tutor_name,
+            'start_date': tutorship.created_date.strftime('%d/%m/%Y') if tutorship.created_date else 'N/A',
+            'duration': f"{weeks_active} שבועות",
+            'status': 'פעיל',
+        })
+
+    return {
+        'kpis': {
+            'total_families': children['total_families'],
+            'active_families': children['active_families'],
+            'waiting_families': children['waiting_families'],
+            'active_tutorships': tutorships['active'],
+            'staff_count': staff_count,
+            'new_families_month': children['new_families_month'],
+        },
+        'charts': {
+            'tutorship_status': {
+                'with_tutor': tutorships['active'],
+                'waiting': children['waiting_families'],
+            },
+            'feedback_by_type': feedback_data,
+            'cities': [{'city': item['city'], 'count': item['count']} for item in cities],
+            'recent_tutorships': recent_data,
+            'age_groups': {label: children[f'age_{label}'] for label, _, _ in AGE_GROUPS},
+        },
+        'table': table_data,
+        # Extra figures used by the video / PPT generators and the AI chat
+        'summary': {
+            'new_families': children['new_families'],
+            'pending_tutors': pending_tutors,
+            'families_without_tutorship': children['without_tutorship'],
+            'total_tutorships': tutorships['total'],
+        },
+        'timeframe': timeframe,
+        'generated_at': now.isoformat(),
+    }
+
+
+def get_dashboard_snapshot(timeframe='month'):
+    """Cached dashboard snapshot (see compute_dashboard_snapshot)."""
+    timeframe = normalize_timeframe(timeframe)
+    cache_key = DASHBOARD_CACHE_KEY.format(timeframe=timeframe)
+    snapshot = cache.get(cache_key)
+    if snapshot is None:
+        snapshot = compute_dashboard_snapshot(timeframe)
+        cache.set(cache_key, snapshot, timeout=DASHBOARD_CACHE_TTL)
+        api_logger.debug(f"DEBUG: Dashboard snapshot computed for timeframe '{timeframe}'")
+    return snapshot
+
+
+def invalidate_dashboard_snapshot():
+    cache.delete_many([DASHBOARD_CACHE_KEY.format(timeframe=timeframe) for timeframe in DASHBOARD_TIMEFRAMES])
+
+
+def _on_dashboard_data_changed(sender, **kwargs):
+    transaction.on_commit(invalidate_dashboard_snapshot)
+
+
+def connect_dashboard_signals():
+    """Drop cached snapshots when dashboard source data changes (AppConfig.ready)."""
+    for model in (Children, Tutorships, Tutors, Feedback, Staff):
+        post_save.connect(_on_dashboard_data_changed, sender=model,
+                          dispatch_uid=f"dashboard_{model.__name__}_saved")
+        post_delete.connect(_on_dashboard_data_changed, sender=model,
+                            dispatch_uid=f"dashboard_{model.__name__}_deleted")
@@ -2,53 +2,44 @@
 Services for dashboard video generation and PPT export
 """
 import os
+import shutil
 import tempfile
 import uuid
 from pathlib import Path
 from datetime import timedelta
 from django.utils import timezone
 from django.db.models import Count, Q
-import threading
-import time
 
 from .models import Children, Tutors, Tutorships, Feedback, Staff
+from .dashboard_metrics import get_dashboard_snapshot
+from .render_cache import cached_file, content_key, materialize
 
 
 def generate_dashboard_data(timeframe):
-    """Generate dashboard data based on timeframe"""
-    
-    now = timezone.now()
-    
-    # Calculate date range
-    if timeframe == 'שבוע אחרון':
-        start_date = now - timedelta(days=7)
-    elif timeframe == 'חודש אחרון' or timeframe == '3 חודשים אחרונים':
-        start_date = now - timedelta(days=30)
-    elif timeframe == 'שנה אחרונה':
-        start_date = now - timedelta(days=365)
-    else:  # 'כל הזמן'
-        start_date = None
-    
-    # Collect data
-    data = {
-        'total_families': Children.objects.count(),
-        'waiting_families': Children.objects.filter(
-            tutorships__isnull=True
-        ).count(),
-        'active_tutorships': Tutorships.objects.count(),
-        'pending_tutors': Tutors.objects.filter(tutorship_status='אין_חניך').count(),
-        'staff_count': Staff.objects.filter(registration_approved=True).count(),
-        'new_families': Children.objects.filter(registrationdate__gte=start_date).count() if start_date else 0,
+    """
+    Summary figures for the video / PPT generators, taken from the cached
+    dashboard snapshot so they match the numbers shown on the dashboard.
+    :param timeframe: Hebrew form label ('חודש אחרון', ...) or 'week' / 'month' / 'year' / 'all'
+    """
+    snapshot = get_dashboard_snapshot(timeframe)
+    
+    return {
+        'total_families': snapshot['kpis']['total_families'],
+        'waiting_families': snapshot['kpis']['waiting_families'],
+        'active_tutorships': snapshot['kpis']['active_tutorships'],
+        'pending_tutors': snapshot['summary']['pending_tutors'],
+        'staff_count': snapshot['kpis']['staff_count'],
+        'new_families': snapshot['summary']['new_families'],
         'timeframe': timeframe
     }
-    
-    return data
 
 
 def generate_ai_video(video_id, dashboard_data, timeframe, duration, pages, style):
     """
     Generate AI marketing video with Hebrew narration using gTTS and MoviePy
-    Creates professional slides with system data and Hebrew voiceover
+    Creates professional slides with system data and Hebrew voiceover.
+    Slides, narration sentences and the finished MP4 are served from the
+    render cache when their inputs haven't changed (see render_cache).
     """
     try:
         from gtts import gTTS
@@ -63,124 +54,25 @@ def generate_ai_video(video_id, dashboard_data, timeframe, duration, pages, styl
     temp_dir.mkdir(exist_ok=True)
     
     video_path = temp_dir / f"{video_id}.mp4"
-    audio_path = temp_dir / f"{video_id}_audio.mp3"
     
     try:
         # Generate marketing script in Hebrew
         script = generate_marketing_script(dashboard_data, timeframe, style)
         print(f"✅ Generated script ({len(script)} chars)")
         
-        # Create TTS audio
-        print("⏳ Creating TTS audio...")
-        tts = gTTS(text=script, lang='iw', slow=False)  # 'iw' is the language code for Hebrew
-        tts.save(str(audio_path))
-        print(f"✅ Audio saved: {audio_path}")
-        
-        # Create professional slides
-        print("⏳ Creating slides...")
-        slides_images = create_professional_slides(dashboard_data, timeframe)
-        print(f"✅ Created {len(slides_images)} slides")
-        
-        # Save slides as temporary image files
-        slide_paths = []
-        for i, slide_img in enumerate(slides_images):
-            slide_path = temp_dir / f"{video_id}_slide_{i}.png"
-            slide_img.save(str(slide_path))
-            slide_paths.append(str(slide_path))
-        print(f"✅ Saved {len(slide_paths)} slide images")
-        
-        # Load audio first to get duration
-        print("⏳ Loading audio...")
-        audio_clip = AudioFileClip(str(audio_path))
-        audio_duration = audio_clip.duration
-        print(f"✅ Audio duration: {audio_duration}s")
-        
-        # Calculate slide durations intelligently
-        # First and last slides: 2 seconds each
-        # Middle slides: share the remaining time evenly
-        num_slides = len(slide_paths)
-        first_slide_duration = 2.0
-        last_slide_duration = 2.0
-        
-        if num_slides <= 2:
-            # If 1-2 slides, divide the audio duration evenly
-            slide_durations = [audio_duration / num_slides] * num_slides
-        else:
-            # Reserve 2 seconds for first and last slides
-            remaining_duration = audio_duration - first_slide_duration - last_slide_duration
-            middle_slides_count = num_slides - 2
-            middle_slide_duration = remaining_duration / middle_slides_count
-            
-            # Build duration list
-            slide_durations = [first_slide_duration]
-            slide_durations.extend([middle_slide_duration] * middle_slides_count)
-            slide_durations.append(last_slide_duration)
-        
-        print(f"⏳ Slide durations: {[f'{d:.1f}s' for d in slide_durations]}")
-        
-        # Create video from slides with calculated durations
-        print("⏳ Creating video clips...")
-        slide_clips = []
-        for slide_path, duration in zip(slide_paths, slide_durations):
-            clip = ImageSequenceClip([slide_path], fps=1)
-            clip = clip.with_duration(duration)
-            slide_clips.append(clip)
-        print(f"✅ Created {len(slide_clips)} clip objects")
+        # Slides (only the ones whose numbers changed are drawn again)
+        slide_paths, slide_keys = render_cached_slides(dashboard_data, timeframe)
+        print(f"✅ {len(slide_paths)} slides ready")
         
-        # Concatenate all slides
-        print("⏳ Concatenating clips...")
-        video_clip = concatenate_videoclips(slide_clips, method="compose")
-        print(f"✅ Video clip duration: {video_clip.duration}s")
-        
-        # Adjust video duration to match audio
-        video_duration = video_clip.duration
-        audio_duration = audio_clip.duration
-        
-        if video_duration < audio_duration:
-            # Video is shorter - extend it by repeating the last frame
-            print(f"⏳ Extending video from {video_duration}s to {audio_duration}s...")
-            video_clip = video_clip.with_duration(audio_duration)
-        elif video_duration > audio_duration:
-            # Video is longer - trim it
-            print(f"⏳ Trimming video from {video_duration}s to {audio_duration}s...")
-            video_clip = video_clip.with_duration(audio_duration)
-        
-        print(f"✅ Synchronized video duration: {video_clip.duration}s")
-        
-        # Set audio on video using with_audio (MoviePy 2.x API)
-        final_clip = video_clip.with_audio(audio_clip)
-        print("✅ Audio attached to video")
-        
-        # Write video file
-        print(f"⏳ Writing MP4 file (this may take 30-60 seconds)...")
-        final_clip.write_videofile(
-            str(video_path), 
-            fps=24,
-            codec='libx264',
-            audio_codec='aac',
-            temp_audiofile=str(temp_dir / f"{video_id}_temp_audio.m4a"),
-            remove_temp=True,
-            verbose=False,
-            logger=None
+        # The MP4 is fully determined by the script and the slides
+        video_key = content_key('video', script, slide_keys)
+        cached_video, hit = cached_file(
+            'videos', video_key, '.mp4',
+            lambda output_path: _encode_video(script, slide_paths, output_path, temp_dir, video_id),
         )
-        print(f"✅ Video file created: {video_path}")
+        materialize(cached_video, str(video_path))
         
-        # Clean up temporary slide files
-        for slide_path in slide_paths:
-            try:
-                os.remove(slide_path)
-            except:
-                pass
-        print("✅ Cleaned up temporary slide files")
-        
-        # Clean up audio file
-        try:
-            os.remove(audio_path)
-        except:
-            pass
-        print("✅ Cleaned up temporary audio file")
-        
-        print(f"🎉 Video generation complete: {video_path}")
+        print(f"🎉 Video generation complete{' (from cache)' if hit else ''}: {video_path}")
         return str(video_path)
         
     except Exception as e:
@@ -190,6 +82,121 @@ def generate_ai_video(video_id, dashboard_data, timeframe, duration, pages, styl
         raise
 
 
+def synthesize_narration(script, audio_path):
+    """
+    Write the Hebrew narration of `script` to audio_path. Every sentence is
+    synthesized (gTTS) once and cached; the MP3 segments are concatenated the
+    same way gTTS joins the chunks of a long text.
+    """
+    from gtts import gTTS
+
+    sentences = [line.strip() for line in script.splitlines() if line.strip()]
+    synthesized = 0
+    with open(audio_path, 'wb') as audio_file:
+        for sentence in sentences:
+            segment_path, hit = cached_file(
+                'tts', content_key('tts', 'iw', sentence), '.mp3',
+                # 'iw' is the language code for Hebrew
+                lambda path: gTTS(text=sentence, lang='iw', slow=False).save(path),
+            )
+            synthesized += not hit
+            with open(segment_path, 'rb') as segment:
+                shutil.copyfileobj(segment, audio_file)
+    print(f"✅ Audio saved: {audio_path} ({synthesized}/{len(sentences)} sentences synthesized)")
+
+
+def _encode_video(script, slide_paths, output_path, temp_dir, video_id):
+    """Narration + slides → MP4 at output_path (libx264 / aac)."""
+    from moviepy import ImageSequenceClip, AudioFileClip, concatenate_videoclips
+
+    audio_path = temp_dir / f"{video_id}_audio.mp3"
+    print("⏳ Creating TTS audio...")
+    synthesize_narration(script, str(audio_path))
+    
+    # Load audio first to get duration
+    print("⏳ Loading audio...")
+    audio_clip = AudioFileClip(str(audio_path))
+    audio_duration = audio_clip.duration
+    print(f"✅ Audio duration: {audio_duration}s")
+    
+    # Calculate slide durations intelligently
+    # First and last slides: 2 seconds each
+    # Middle slides: share the remaining time evenly
+    num_slides = len(slide_paths)
+    first_slide_duration = 2.0
+    last_slide_duration = 2.0
+    
+    if num_slides <= 2:
+        # If 1-2 slides, divide the audio duration evenly
+        slide_durations = [audio_duration / num_slides] * num_slides
+    else:
+        # Reserve 2 seconds for first and last slides
+        remaining_duration = audio_duration - first_slide_duration - last_slide_duration
+        middle_slides_count = num_slides - 2
+        middle_slide_duration = remaining_duration / middle_slides_count
+        
+        # Build duration list
+        slide_durations = [first_slide_duration]
+        slide_durations.extend([middle_slide_duration] * middle_slides_count)
+        slide_durations.append(last_slide_duration)
+    
+    print(f"⏳ Slide durations: {[f'{d:.1f}s' for d in slide_durations]}")
+    
+    # Create video from slides with calculated durations
+    print("⏳ Creating video clips...")
+    slide_clips = []
+    for slide_path, duration in zip(slide_paths, slide_durations):
+        clip = ImageSequenceClip([slide_path], fps=1)
+        clip = clip.with_duration(duration)
+        slide_clips.append(clip)
+    print(f"✅ Created {len(slide_clips)} clip objects")
+    
+    # Concatenate all slides
+    print("⏳ Concatenating clips...")
+    video_clip = concatenate_videoclips(slide_clips, method="compose")
+    print(f"✅ Video clip duration: {video_clip.duration}s")
+    
+    # Adjust video duration to match audio
+    video_duration = video_clip.duration
+    audio_duration = audio_clip.duration
+    
+    if video_duration < audio_duration:
+        # Video is shorter - extend it by repeating the last frame
+        print(f"⏳ Extending video from {video_duration}s to {audio_duration}s...")
+        video_clip = video_clip.with_duration(audio_duration)
+    elif video_duration > audio_duration:
+        # Video is longer - trim it
+        print(f"⏳ Trimming video from {video_duration}s to {audio_duration}s...")
+        video_clip = video_clip.with_duration(audio_duration)
+    
+    print(f"✅ Synchronized video duration: {video_clip.duration}s")
+    
+    # Set audio on video using with_audio (MoviePy 2.x API)
+    final_clip = video_clip.with_audio(audio_clip)
+    print("✅ Audio attached to video")
+    
+    # Write video file
+    print(f"⏳ Writing MP4 file (this may take 30-60 seconds)...")
+    final_clip.write_videofile(
+        str(output_path),
+        fps=24,
+        codec='libx264',
+        audio_codec='aac',
+        temp_audiofile=str(temp_dir / f"{video_id}_temp_audio.m4a"),
+        remove_temp=True,
+        verbose=False,
+        logger=None
+    )
+    print(f"✅ Video file created: {output_path}")
+    
+    # Clean up audio file
+    try:
+        os.remove(audio_path)
+    except:
+        pass
+    print("✅ Cleaned up temporary audio file")
+
+
 def generate_marketing_script(dashboard_data, timeframe, style):
     """Generate compelling Hebrew marketing script"""
     
@@ -234,10 +241,25 @@ def generate_marketing_script(dashboard_data, timeframe, style):
     return script.strip()
 
 
-def create_professional_slides(dashboard_data, timeframe):
-    """Create beautiful slides with system data using Pillow with RTL support"""
-    from PIL import Image, ImageDraw, ImageFont
-    import os
+def _slide_specs(dashboard_data, timeframe):
+    """
+    (name, inputs) of every video slide, in order. A slide is cached by its
+    inputs, so only slides whose numbers changed are drawn again.
+    """
+    return [
+        ('title', {'timeframe': timeframe}),
+        ('kpis', {
+            key: dashboard_data.get(key, 0)
+            for key in ('total_families', 'active_tutorships', 'waiting_families', 'pending_tutors')
+        }),
+        ('new_families', {'new_families': dashboard_data.get('new_families', 0)}),
+        ('thank_you', {}),
+    ]
+
+
+def _load_slide_fonts():
+    """(font_large, font_medium, font_small, fix_hebrew_text) for the slides"""
+    from PIL import ImageFont
 
     try:
         from bidi.algorithm import get_display
@@ -266,9 +288,6 @@ def create_professional_slides(dashboard_data, timeframe):
             return get_display(text)
         return text
 
-    slides = []
-    width, height = 1280, 720
-    
     use_system_fonts = os.environ.get("USE_SYSTEM_FONTS", "false").lower() == "true"
 
     if use_system_fonts:
@@ -298,49 +317,87 @@ def create_professional_slides(dashboard_data, timeframe):
         font_medium = load_font("regular", 40)
         font_small = load_font("regular", 32)
 
-    # Slide 1: Title Slide
-    img1 = Image.new('RGB', (width, height), color='#6EC1E4')
-    draw1 = ImageDraw.Draw(img1)
-    draw1.text((640, 280), 'ChildSmile', font=font_large, fill='white', anchor='mm')
-    draw1.text((640, 380), fix_hebrew_text(f'סקירת מערכת - {timeframe}'), font=font_medium, fill='#E3F4FA', anchor='mm')
-    slides.append(img1)
-    
-    # Slide 2: KPIs
-    img2 = Image.new('RGB', (width, height), color='#1E293B')
-    draw2 = ImageDraw.Draw(img2)
-    draw2.text((640, 80), fix_hebrew_text('מדדים עיקריים'), font=font_medium, fill='#6EC1E4', anchor='mm')
-    
-    kpis = [
-        (fix_hebrew_text(f"סה\"כ משפחות: {dashboard_data.get('total_families', 0)}"), '#3B82F6'),
-        (fix_hebrew_text(f"חונכויות פעילות: {dashboard_data.get('active_tutorships', 0)}"), '#10B981'),
-        (fix_hebrew_text(f"משפחות ממתינות: {dashboard_data.get('waiting_families', 0)}"), '#F59E0B'),
-        (fix_hebrew_text(f"חונכים ממתינים: {dashboard_data.get('pending_tutors', 0)}"), '#6EC1E4'),
-    ]
-    
-    y_pos = 200
-    for kpi_text, color in kpis:
-        draw2.text((640, y_pos), kpi_text, font=font_small, fill=color, anchor='mm')
-        y_pos += 100
-    
-    slides.append(img2)
-    
-    # Slide 3: New Families
-    img3 = Image.new('RGB', (width, height), color='#0F172A')
-    draw3 = ImageDraw.Draw(img3)
-    draw3.text((640, 250), fix_hebrew_text('משפחות חדשות'), font=font_medium, fill='#6EC1E4', anchor='mm')
-    new_fam = dashboard_data.get('new_families', 0)
-    draw3.text((640, 380), f'{new_fam}', font=font_large, fill='#10B981', anchor='mm')
-    draw3.text((640, 480), fix_hebrew_text('הצטרפו לאחרונה'), font=font_small, fill='white', anchor='mm')
-    slides.append(img3)
-    
-    # Slide 4: Thank You
-    img4 = Image.new('RGB', (width, height), color='#6EC1E4')
-    draw4 = ImageDraw.Draw(img4)
-    draw4.text((640, 320), fix_hebrew_text('תודה רבה!'), font=font_large, fill='white', anchor='mm')
-    draw4.text((640, 420), fix_hebrew_text('יחד אנחנו עושים את ההבדל'), font=font_small, fill='#E3F4FA', anchor='mm')
-    slides.append(img4)
-    
-    return slides
+    return font_large, font_medium, font_small, fix_hebrew_text
+
+
+def _draw_slide(name, inputs, fonts):
+    """Draw one slide of _slide_specs with Pillow (RTL support via python-bidi)"""
+    from PIL import Image, ImageDraw
+
+    font_large, font_medium, font_small, fix_hebrew_text = fonts
+    width, height = 1280, 720
+
+    if name == 'title':
+        # Slide 1: Title Slide
+        img = Image.new('RGB', (width, height), color='#6EC1E4')
+        draw = ImageDraw.Draw(img)
+        draw.text((640, 280), 'ChildSmile', font=font_large, fill='white', anchor='mm')
+        draw.text((640, 380), fix_hebrew_text(f'סקירת מערכת - {inputs["timeframe"]}'), font=font_medium, fill='#E3F4FA', anchor='mm')
+    elif name == 'kpis':
+        # Slide 2: KPIs
+        img = Image.new('RGB', (width, height), color='#1E293B')
+        draw = ImageDraw.Draw(img)
+        draw.text((640, 80), fix_hebrew_text('מדדים עיקריים'), font=font_medium, fill='#6EC1E4', anchor='mm')
+        
+        kpis = [
+            (fix_hebrew_text(f"סה\"כ משפחות: {inputs['total_families']}"), '#3B82F6'),
+            (fix_hebrew_text(f"חונכויות פעילות: {inputs['active_tutorships']}"), '#10B981'),
+            (fix_hebrew_text(f"משפחות ממתינות: {inputs['waiting_families']}"), '#F59E0B'),
+            (fix_hebrew_text(f"חונכים ממתינים: {inputs['pending_tutors']}"), '#6EC1E4'),
+        ]
+        
+        y_pos = 200
+        for kpi_text, color in kpis:
+            draw.text((640, y_pos), kpi_text, font=font_small, fill=color, anchor='mm')
+            y_pos += 100
+    elif name == 'new_families':
+        # Slide 3: New Families
+        img = Image.new('RGB', (width, height), color='#0F172A')
+        draw = ImageDraw.Draw(img)
+        draw.text((640, 250), fix_hebrew_text('משפחות חדשות'), font=font_medium, fill='#6EC1E4', anchor='mm')
+        draw.text((640, 380), f'{inputs["new_families"]}', font=font_large, fill='#10B981', anchor='mm')
+        draw.text((640, 480), fix_hebrew_text('הצטרפו לאחרונה'), font=font_small, fill='white', anchor='mm')
+    else:
+        # Slide 4: Thank You
+        img = Image.new('RGB', (width, height), color='#6EC1E4')
+        draw = ImageDraw.Draw(img)
+        draw.text((640, 320), fix_hebrew_text('תודה רבה!'), font=font_large, fill='white', anchor='mm')
+        draw.text((640, 420), fix_hebrew_text('יחד אנחנו עושים את ההבדל'), font=font_small, fill='#E3F4FA', anchor='mm')
+
+    return img
+
+
+def create_professional_slides(dashboard_data, timeframe):
+    """Create beautiful slides with system data using Pillow with RTL support"""
+    fonts = _load_slide_fonts()
+    return [_draw_slide(name, inputs, fonts) for name, inputs in _slide_specs(dashboard_data, timeframe)]
+
+
+def render_cached_slides(dashboard_data, timeframe):
+    """
+    Slide PNGs from the render cache, drawing only the missing ones.
+    :return: (list of PNG paths, list of their cache keys)
+    """
+    use_system_fonts = os.environ.get("USE_SYSTEM_FONTS", "false").lower() == "true"
+    fonts = None
+    paths, keys = [], []
+    for name, inputs in _slide_specs(dashboard_data, timeframe):
+        key = content_key('slide', name, inputs, use_system_fonts)
+
+        def build(path, name=name, inputs=inputs):
+            nonlocal fonts
+            fonts = fonts or _load_slide_fonts()
+            _draw_slide(name, inputs, fonts).save(path, format='PNG')
+
+        path, hit = cached_file('slides', key, '.png', build)
+        if not hit:
+            print(f"✅ Rendered slide '{name}'")
+        paths.append(path)
+        keys.append(key)
+    return paths, keys
+
+
+PPT_KPI_KEYS = ('total_families', 'waiting_families', 'active_tutorships', 'pending_tutors', 'staff_count')
 
 
 def generate_ppt_slide(ppt_id, dashboard_data):
@@ -372,6 +429,24 @@ def generate_ppt_slide(ppt_id, dashboard_data):
     
     ppt_path = temp_dir / f"{ppt_id}.pptx"
     
+    # Same numbers → same file, served from the render cache
+    kpi_values = {key: dashboard_data.get(key) for key in PPT_KPI_KEYS}
+    cached_ppt, hit = cached_file(
+        'ppts', content_key('pptx', kpi_values), '.pptx',
+        lambda path: _build_ppt(dashboard_data, path),
+    )
+    materialize(cached_ppt, str(ppt_path))
+    
+    return str(ppt_path)
+
+
+def _build_ppt(dashboard_data, ppt_path):
+    """Write the dashboard presentation to ppt_path (python-pptx)"""
+    from pptx import Presentation
+    from pptx.util import Inches, Pt
+    from pptx.enum.text import PP_ALIGN
+    from pptx.dml.color import RGBColor
+    
     # Create presentation
     prs = Presentation()
     prs.slide_width = Inches(13.33)  # Wide format
@@ -471,25 +546,3 @@ def generate_ppt_slide(ppt_id, dashboard_data):
     
     # Save presentation
     prs.save(str(ppt_path))
-    
-    return str(ppt_path)
-
-
-def cleanup_temp_files(file_path, delay_minutes=60):
-    """
-    Schedule cleanup of temporary files
-    Files are deleted after specified delay
-    """
-    
-    def delete_file():
-        time.sleep(delay_minutes * 60)
-        try:
-            if os.path.exists(file_path):
-                os.remove(file_path)
-                print(f"Cleaned up temp file: {file_path}")
-        except Exception as e:
-            print(f"Error cleaning up {file_path}: {e}")
-    
-    # Run cleanup in background thread
-    cleanup_thread = threading.Thread(target=delete_file, daemon=True)
-    cleanup_thread.start()
@@ -12,16 +12,20 @@ import tempfile
 import uuid
 from pathlib import Path
 
-from .models import Children, Tutors, Tutorships, Feedback, Staff, Tasks
+from .models import Children, Tutors, Tutorships, Feedback, Staff, Tasks, RenderJob
 from .utils import conditional_csrf, has_permission, block_viewer_writes, is_admin
 from .audit_utils import log_api_action
 from .logger import api_logger
-from .dashboard_services import (
-    generate_dashboard_data,
-    generate_ai_video,
-    generate_ppt_slide,
-    cleanup_temp_files
-)
+from .dashboard_metrics import get_dashboard_snapshot
+from .render_jobs import RenderQueueFull, submit_render_job, render_job_status
+
+
+def _rendered_file(job_id, kind):
+    """Path of a completed render job's file, or None if unknown / not ready / swept."""
+    job = RenderJob.objects.filter(job_id=job_id, kind=kind, status=RenderJob.STATUS_COMPLETED).first()
+    if job is None or not job.file_path or not os.path.exists(job.file_path):
+        return None
+    return job.file_path
 
 
 @conditional_csrf
@@ -71,155 +75,16 @@ def get_dashboard_data(request):
     try:
         # Get timeframe parameter
         timeframe = request.GET.get('timeframe', 'month')
-        
-        # Calculate date range
-        now = timezone.now()
-        if timeframe == 'week':
-            start_date = now - timedelta(days=7)
-        elif timeframe == 'month':
-            start_date = now - timedelta(days=30)
-        elif timeframe == 'year':
-            start_date = now - timedelta(days=365)
-        else:  # 'all'
-            start_date = None
-        
-        # KPI Cards
-        total_families = Children.objects.count()
-        
-        # Active families (status NOT in עזב, ז״ל, בריא)
-        active_families = Children.objects.exclude(status__in=['עזב', 'ז״ל', 'בריא']).count()
-        
-        # Families waiting for tutor:
-        # - Active (not in exit statuses)
-        # - Want tutoring (tutoring_status not in לא_רלוונטי, בוגר, לא_רוצים)
-        # - Have NO tutors (tutorships__isnull=True)
-        waiting_families = Children.objects.exclude(
-            status__in=['עזב', 'ז״ל', 'בריא']
-        ).exclude(
-            tutoring_status__in=['לא_רלוונטי', 'בוגר', 'לא_רוצים']
-        ).filter(
-            tutorships__isnull=True
-        ).distinct().count()
-        
-        # Active tutorships (families that have a tutorship with active tutors)
-        active_tutorships = Tutorships.objects.filter(tutor__staff__is_active=True).count()
-        
-        staff_count = Staff.objects.filter(
-            registration_approved=True, 
-            is_active=True
-        ).exclude(
-            first_name__contains='דריה'
-        ).exclude(
-            first_name__contains='דביר'
-        ).exclude(
-            last_name__contains='דריה'
-        ).exclude(
-            last_name__contains='דביר'
-        ).count()
-        
-        # Tutorship Status Distribution
-        tutorship_with = active_tutorships
-        tutorship_waiting = waiting_families
-        
-        # Feedback by Type
-        feedback_query = Feedback.objects.all()
-        if start_date:
-            feedback_query = feedback_query.filter(timestamp__gte=start_date)
-        
-        feedback_data = {
-            'tutor_fun_day': feedback_query.filter(feedback_type='tutor_fun_day').count(),
-            'general_volunteer_fun_day': feedback_query.filter(feedback_type='general_volunteer_fun_day').count(),
-            'general_volunteer_hospital_visit': feedback_query.filter(feedback_type='general_volunteer_hospital_visit').count(),
-            'general_house_visit': feedback_query.filter(feedback_type='general_house_visit').count(),
-            'tutorship': feedback_query.filter(feedback_type='tutorship').count()
-        }
-        
-        # New families this month
-        new_families_month = Children.objects.filter(
-            registrationdate__gte=now - timedelta(days=30)
-        ).count()
-        
-        # Cities with waiting families
-        cities_data = Children.objects.filter(
-            tutorships__isnull=True
-        ).values('city').annotate(
-            count=Count('child_id')
-        ).order_by('-count')[:12]
-        
-        # Recent tutorships
-        recent_tutorships = Tutorships.objects.select_related(
-            'child', 'tutor', 'tutor__id'
-        ).filter(tutor__staff__is_active=True).order_by('-created_date')[:10]
-        
-        recent_data = []
-        for t in recent_tutorships:
-            days_active = (now - t.created_date).days if t.created_date else 0
-            child_name = f"{t.child.childfirstname} {t.child.childsurname}" if t.child else f"Child {t.child.child_id}"
-            tutor_name = f"{t.tutor.id.first_name} {t.tutor.id.surname}" if t.tutor and t.tutor.id else "Unknown Tutor"
-            recent_data.append({
-                'child_name': child_name,
-                'tutor_name': tutor_name,
-                'days': days_active
-            })
-        
-        # Age group opportunities (waiting families by age)
-        age_groups = {
-            '6-8': Children.objects.filter(
-                tutorships__isnull=True,
-                date_of_birth__lte=now - timedelta(days=6*365),
-                date_of_birth__gte=now - timedelta(days=9*365)
-            ).count(),
-            '9-11': Children.objects.filter(
-                tutorships__isnull=True,
-                date_of_birth__lte=now - timedelta(days=9*365),
-                date_of_birth__gte=now - timedelta(days=12*365)
-            ).count(),
-            '12-14': Children.objects.filter(
-                tutorships__isnull=True,
-                date_of_birth__lte=now - timedelta(days=12*365),
-                date_of_birth__gte=now - timedelta(days=15*365)
-            ).count(),
-            '15-17': Children.objects.filter(
-                tutorships__isnull=True,
-                date_of_birth__lte=now - timedelta(days=15*365),
-                date_of_birth__gte=now - timedelta(days=18*365)
-            ).count(),
-        }
-        
-        # Recent active tutorships table
-        table_data = []
-        for t in Tutorships.objects.select_related('child', 'tutor', 'tutor__id').order_by('-created_date')[:20]:
-            weeks_active = (now - t.created_date).days // 7 if t.created_date else 0
-            child_name = f"{t.child.childfirstname} {t.child.childsurname}" if t.child else f"משפחה {t.child.child_id}"
-            tutor_name = f"{t.tutor.id.first_name} {t.tutor.id.surname}" if t.tutor and t.tutor.id else "Unknown Tutor"
-            table_data.append({
-                'child_name': child_name,
-                'tutor_name': tutor_name,
-                'start_date': t.created_date.strftime('%d/%m/%Y') if t.created_date else 'N/A',
-                'duration': f"{weeks_active} שבועות",
-                'status': 'פעיל'
-            })
-        
+
+        # KPIs, charts and tables come from one cached snapshot
+        # (a handful of aggregate queries — see dashboard_metrics)
+        snapshot = get_dashboard_snapshot(timeframe)
         response_data = {
-            'kpis': {
-                'total_families': total_families,
-                'active_families': active_families,
-                'waiting_families': waiting_families,
-                'active_tutorships': active_tutorships,
-                'staff_count': staff_count,
-                'new_families_month': new_families_month
-            },
-            'charts': {
-                'tutorship_status': {
-                    'with_tutor': tutorship_with,
-                    'waiting': tutorship_waiting
-                },
-                'feedback_by_type': feedback_data,
-                'cities': [{'city': item['city'], 'count': item['count']} for item in cities_data],
-                'recent_tutorships': recent_data,
-                'age_groups': age_groups
-            },
-            'table': table_data
+            'kpis': snapshot['kpis'],
+            'charts': snapshot['charts'],
+            'table': snapshot['table'],
+            'timeframe': snapshot['timeframe'],
+            'generated_at': snapshot['generated_at'],
         }
         
         log_api_action(
@@ -290,40 +155,30 @@ def generate_video_ai(request):
         pages = data.get('pages', [])
         style = data.get('style', 'מקצועי ורשמי')
         
-        # Generate unique video ID
-        video_id = str(uuid.uuid4())
-        
-        # Get dashboard data
-        dashboard_data = generate_dashboard_data(timeframe)
-        
-        # Generate video (simulated - returns temp file path)
+        # Queue the render — the encode runs on the render worker pool,
+        # the client polls video-status/ (identical requests share one job)
         try:
-            video_path = generate_ai_video(
-                video_id=video_id,
-                dashboard_data=dashboard_data,
-                timeframe=timeframe,
-                duration=duration,
-                pages=pages,
-                style=style
+            job, created = submit_render_job(
+                'video',
+                {'timeframe': timeframe, 'duration': duration, 'pages': pages, 'style': style},
+                requested_by=user_id,
             )
-            
-            # Schedule cleanup after 1 hour
-            cleanup_temp_files(video_path, delay_minutes=60)
-            
-            return JsonResponse({
-                'success': True,
-                'video_id': video_id,
-                'download_url': f'/api/dashboard/download-video/{video_id}/',
-                'title': f'סקירת מערכת - חיוך של ילד - {timeframe}',
-                'duration_text': duration,
-                'style': style
-            })
-        except Exception as video_error:
-            error_msg = str(video_error)
-            api_logger.error(f"Video generation failed: {error_msg}")
+        except RenderQueueFull:
             return JsonResponse({
-                'error': f'Video generation failed: {error_msg}'
-            }, status=500)
+                'error': 'Too many videos are being generated, please try again in a few minutes'
+            }, status=429)
+        
+        return JsonResponse({
+            'success': True,
+            'video_id': job.job_id,
+            'status': job.status,
+            'deduplicated': not created,
+            'status_url': f'/api/dashboard/video-status/{job.job_id}/',
+            'download_url': f'/api/dashboard/download-video/{job.job_id}/',
+            'title': f'סקירת מערכת - חיוך של ילד - {timeframe}',
+            'duration_text': duration,
+            'style': style
+        }, status=202)
         
     except Exception as e:
         api_logger.error(f"Unexpected error in generate_video_ai: {str(e)}")
@@ -354,11 +209,8 @@ def download_video(request, video_id):
         return JsonResponse({"error": "Staff member not found."}, status=403)
     
     try:
-        # Get video path from cache
-        temp_dir = Path(tempfile.gettempdir()) / 'childsmile_videos'
-        video_path = temp_dir / f"{video_id}.mp4"
-        
-        if not video_path.exists():
+        video_path = _rendered_file(video_id, 'video')
+        if video_path is None:
             return JsonResponse({'error': 'Video not found or expired'}, status=404)
         
         # Return file
@@ -399,25 +251,15 @@ def video_generation_status(request, video_id):
         return JsonResponse({"error": "Staff member not found."}, status=403)
     
     try:
-        # Check if video file exists
-        temp_dir = Path(tempfile.gettempdir()) / 'childsmile_videos'
-        video_path = temp_dir / f"{video_id}.mp4"
+        job = RenderJob.objects.filter(job_id=video_id, kind='video').first()
+        if job is None:
+            return JsonResponse({'error': 'Video not found or expired'}, status=404)
         
-        if video_path.exists():
-            # Get file size
-            file_size = video_path.stat().st_size
-            return JsonResponse({
-                'status': 'completed',
-                'video_id': video_id,
-                'file_size': file_size,
-                'download_url': f'/api/dashboard/download-video/{video_id}/'
-            })
-        else:
-            return JsonResponse({
-                'status': 'generating',
-                'video_id': video_id,
-                'message': 'Video is being generated, please wait...'
-            })
+        payload = render_job_status(job, f'/api/dashboard/download-video/{video_id}/')
+        payload['video_id'] = video_id
+        if payload['status'] == 'generating':
+            payload['message'] = 'Video is being generated, please wait...'
+        return JsonResponse(payload)
         
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
@@ -465,21 +307,58 @@ def export_ppt(request):
         # Parse request body
         data = json.loads(request.body)
         
-        # Get dashboard data
-        dashboard_data = generate_dashboard_data('month')
-        
-        # Generate PPT
-        ppt_id = str(uuid.uuid4())
-        ppt_path = generate_ppt_slide(ppt_id, dashboard_data)
-        
-        # Schedule cleanup after 1 hour
-        cleanup_temp_files(ppt_path, delay_minutes=60)
+        try:
+            job, created = submit_render_job('ppt', {'timeframe': data.get('timeframe', 'month')}, requested_by=user_id)
+        except RenderQueueFull:
+            return JsonResponse({
+                'error': 'Too many exports are being generated, please try again in a few minutes'
+            }, status=429)
         
         return JsonResponse({
             'success': True,
-            'download_url': f'/api/dashboard/download-ppt/{ppt_id}/',
+            'ppt_id': job.job_id,
+            'status': job.status,
+            'deduplicated': not created,
+            'status_url': f'/api/dashboard/ppt-status/{job.job_id}/',
+            'download_url': f'/api/dashboard/download-ppt/{job.job_id}/',
             'filename': 'ChildSmile_Dashboard.pptx'
-        })
+        }, status=202)
+        
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+@conditional_csrf
+@api_view(['GET'])
+def ppt_generation_status(request, ppt_id):
+    """Check if PPT generation is complete"""
+    api_logger.info(f"ppt_generation_status called for {ppt_id}")
+    
+    # Check user authentication
+    user_id = request.session.get("user_id")
+    if not user_id:
+        return JsonResponse(
+            {"detail": "Authentication credentials were not provided."}, status=403
+        )
+    
+    # Check if user is System Administrator
+    try:
+        staff = Staff.objects.get(staff_id=user_id)
+        if not is_admin(staff):
+            return JsonResponse(
+                {"error": "System Administrator permission required."}, status=403
+            )
+    except Staff.DoesNotExist:
+        return JsonResponse({"error": "Staff member not found."}, status=403)
+    
+    try:
+        job = RenderJob.objects.filter(job_id=ppt_id, kind='ppt').first()
+        if job is None:
+            return JsonResponse({'error': 'File not found or expired'}, status=404)
+        
+        payload = render_job_status(job, f'/api/dashboard/download-ppt/{ppt_id}/')
+        payload['ppt_id'] = ppt_id
+        return JsonResponse(payload)
         
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
@@ -509,11 +388,8 @@ def download_ppt(request, ppt_id):
         return JsonResponse({"error": "Staff member not found."}, status=403)
     
     try:
-        # Get PPT path from cache
-        temp_dir = Path(tempfile.gettempdir()) / 'childsmile_ppts'
-        ppt_path = temp_dir / f"{ppt_id}.pptx"
-        
-        if not ppt_path.exists():
+        ppt_path = _rendered_file(ppt_id, 'ppt')
+        if ppt_path is None:
             return JsonResponse({'error': 'File not found or expired'}, status=404)
         
         # Return file
@@ -557,29 +433,7 @@ def get_feedback_data(request):
         # Get timeframe parameter
         timeframe = request.GET.get('timeframe', 'month')
         
-        # Calculate date range
-        now = timezone.now()
-        if timeframe == 'week':
-            start_date = now - timedelta(days=7)
-        elif timeframe == 'month':
-            start_date = now - timedelta(days=30)
-        elif timeframe == 'year':
-            start_date = now - timedelta(days=365)
-        else:  # 'all'
-            start_date = None
-        
-        # Get feedback by type
-        feedback_query = Feedback.objects.all()
-        if start_date:
-            feedback_query = feedback_query.filter(timestamp__gte=start_date)
-        
-        feedback_data = {
-            'tutor_fun_day': feedback_query.filter(feedback_type='tutor_fun_day').count(),
-            'general_volunteer_fun_day': feedback_query.filter(feedback_type='general_volunteer_fun_day').count(),
-            'general_volunteer_hospital_visit': feedback_query.filter(feedback_type='general_volunteer_hospital_visit').count(),
-            'general_house_visit': feedback_query.filter(feedback_type='general_house_visit').count(),
-            'tutorship': feedback_query.filter(feedback_type='tutorship').count(),
-        }
+        feedback_data = get_dashboard_snapshot(timeframe)['charts']['feedback_by_type']
         
         return JsonResponse(feedback_data)
         
@@ -650,14 +504,11 @@ def get_ai_chat_response(message):
         )
     
     if 'משפחות' in message or 'נתונים' in message:
-        total = Children.objects.count()
-        new_month = Children.objects.filter(
-            registrationdate__gte=timezone.now() - timedelta(days=30)
-        ).count()
-        waiting = Children.objects.filter(
-            tutorships__isnull=True
-        ).count()
-        active = Tutorships.objects.count()
+        snapshot = get_dashboard_snapshot('month')
+        total = snapshot['kpis']['total_families']
+        new_month = snapshot['kpis']['new_families_month']
+        waiting = snapshot['summary']['families_without_tutorship']
+        active = snapshot['summary']['total_tutorships']
         
         return (
             f'בחודש האחרון:<br>'
@@ -0,0 +1,278 @@
+"""
+email_outbox.py
+
+Durable outbox and batched SMTP dispatcher for notification emails.
+
+Coordinator notifications (new volunteer / new family), meeting reminders and
+events and the weekly digest used to call send_mail() once per recipient —
+every call opened its own SMTP connection (TCP + STARTTLS + login), often from
+a fresh threading.Thread per event. Fan-out to every coordinator of a role
+cost N handshakes.
+
+Now:
+  - enqueue_email() / enqueue_emails() (per-recipient bodies) INSERT one
+    outbox row per recipient (add_email_outbox_table.sql) in the caller's
+    transaction, so a rolled-back request sends nothing. The dispatcher is
+    woken on commit — once per call, so a fan-out is queued with one call.
+  - EMAIL_DISPATCH_WORKERS threads per process each claim up to
+    EMAIL_BATCH_SIZE due rows (SELECT ... FOR UPDATE SKIP LOCKED) and send
+    them over ONE connection (get_connection() + send_messages()), so a
+    fan-out costs one SMTP handshake instead of N.
+  - Every row gets its own outcome: permanent (5xx) rejections fail that
+    message only; temporary (4xx) rejections and dropped connections are
+    retried with exponential backoff (EMAIL_RETRY_BASE * 2^attempt) up to
+    EMAIL_MAX_ATTEMPTS.
+  - sweep_email_outbox() — scheduler — wakes the dispatcher for rows queued
+    before a restart or whose worker died mid-send, and deletes old rows.
+
+Interactive emails (login / registration TOTP codes, the mail UI) stay
+synchronous — the user is waiting for them and needs the error at once.
+
+Environment:
+  EMAIL_DISPATCH_WORKERS       concurrent SMTP connections per process (default 2)
+  EMAIL_BATCH_SIZE             messages sent per connection (default 50)
+  EMAIL_MAX_ATTEMPTS           attempts before a message is failed (default 5)
+  EMAIL_RETRY_BASE             seconds before the first retry, doubled per attempt (default 30)
+  EMAIL_POLL_INTERVAL          seconds between idle outbox polls (default 15)
+  EMAIL_OUTBOX_RETENTION_DAYS  days sent / failed rows are kept (default 30)
+"""
+
+import os
+import smtplib
+import threading
+from datetime import timedelta
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from .models import EmailOutbox
+from .job_workers import JobWorkerPool
+from .logger import api_logger
+
+SENDING_TIMEOUT = timedelta(minutes=5)  # a 'sending' row older than this lost its worker
+MAX_RETRY_DELAY = 3600  # seconds
+
+
+def _env_int(name, default):
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def enqueue_email(recipient_emails, subject, message, html_message=None, from_email=None, source=None, wake=True):
+    """
+    Queue one email per recipient (same arguments as send_mail, one message each).
+
+    :param recipient_emails: email addresses; blanks and duplicates are skipped
+    :param subject: subject line
+    :param message: plain-text body
+    :param html_message: optional HTML alternative
+    :param from_email: sender (default settings.DEFAULT_FROM_EMAIL)
+    :param source: caller name, stored for the logs
+    :param wake: wake the dispatcher on commit (see enqueue_emails)
+    :return: list of the queued EmailOutbox rows
+    """
+    return enqueue_emails(
+        [(email, subject, message, html_message) for email in recipient_emails],
+        from_email=from_email, source=source, wake=wake,
+    )
+
+
+def enqueue_emails(messages, from_email=None, source=None, wake=True):
+    """
+    Queue a fan-out whose body differs per recipient (e.g. a personal greeting)
+    with ONE insert and ONE dispatcher wake-up. Callers outside a transaction
+    (the *_async notification threads) must render every body first and call
+    this once: on_commit() fires at once in autocommit, so queuing per
+    recipient lets an idle worker claim — and open a connection for — each row
+    while the next one is still being rendered.
+
+    :param messages: iterable of (to_email, subject, message, html_message);
+        blank and duplicate addresses are skipped
+    :param from_email: sender (default settings.DEFAULT_FROM_EMAIL)
+    :param source: caller name, stored for the logs
+    :param wake: wake the dispatcher on commit. False leaves the rows to the
+        caller's flush_email_outbox() (management commands) or the next sweep.
+    :return: list of the queued EmailOutbox rows
+    """
+    seen = set()
+    rows = []
+    for email, subject, message, html_message in messages:
+        email = (email or '').strip()
+        if not email or email.lower() in seen:
+            continue
+        seen.add(email.lower())
+        rows.append(EmailOutbox(
+            to_email=email,
+            from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+            subject=subject,
+            body=message or '',
+            html_body=html_message,
+            source=(source or '')[:50] or None,
+        ))
+
+    if rows:
+        EmailOutbox.objects.bulk_create(rows)
+        if wake:
+            transaction.on_commit(get_email_dispatcher().wake)
+        api_logger.debug(f"DEBUG: Queued {len(rows)} email(s) ({source or 'unknown source'})")
+    return rows
+
+
+def _due():
+    now = timezone.now()
+    return Q(status=EmailOutbox.STATUS_QUEUED, next_attempt_at__lte=now) | Q(
+        status=EmailOutbox.STATUS_SENDING, locked_at__lt=now - SENDING_TIMEOUT,
+    )
+
+
+def claim_next_email_batch():
+    """Mark up to EMAIL_BATCH_SIZE due messages as sending and return them (None if nothing is due)."""
+    with transaction.atomic():
+        batch = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True)
+            .filter(_due())
+            .order_by('next_attempt_at', 'id')[:max(1, _env_int('EMAIL_BATCH_SIZE', 50))]
+        )
+        if not batch:
+            return None
+        now = timezone.now()
+        for message in batch:
+            message.status = EmailOutbox.STATUS_SENDING
+            message.locked_at = now
+            message.attempts += 1
+        EmailOutbox.objects.bulk_update(batch, ['status', 'locked_at', 'attempts'])
+    return batch
+
+
+def _is_permanent(error):
+    """True for SMTP 5xx rejections of this message — retrying will not help."""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in error.recipients.values())
+    if isinstance(error, (smtplib.SMTPSenderRefused, smtplib.SMTPDataError)):
+        return error.smtp_code >= 500
+    return False
+
+
+def _retry_or_fail(message, error):
+    message.last_error = error[:1000]
+    if message.attempts >= _env_int('EMAIL_MAX_ATTEMPTS', 5):
+        message.status = EmailOutbox.STATUS_FAILED
+        api_logger.error(f"❌ Email #{message.id} to {message.to_email} failed after {message.attempts} attempts: {error[:200]}")
+    else:
+        delay = min(_env_int('EMAIL_RETRY_BASE', 30) * (2 ** (message.attempts - 1)), MAX_RETRY_DELAY)
+        message.status = EmailOutbox.STATUS_QUEUED
+        message.next_attempt_at = timezone.now() + timedelta(seconds=delay)
+        api_logger.warning(f"⚠️ Email #{message.id} to {message.to_email} will be retried in {delay}s ({error[:200]})")
+
+
+def _build_message(message, connection):
+    email = EmailMultiAlternatives(
+        subject=message.subject,
+        body=message.body,
+        from_email=message.from_email,
+        to=[message.to_email],
+        connection=connection,
+    )
+    if message.html_body:
+        email.attach_alternative(message.html_body, 'text/html')
+    return email
+
+
+def deliver_email_batch(batch):
+    """Send a claimed batch over one SMTP connection and record each outcome on its row."""
+    connection = get_connection(fail_silently=False)
+    pending = list(batch)
+    try:
+        connection.open()
+        while pending:
+            message = pending[0]
+            try:
+                connection.send_messages([_build_message(message, connection)])
+            except Exception as e:
+                if not _is_permanent(e):
+                    raise
+                message.status = EmailOutbox.STATUS_FAILED
+                message.last_error = f"{type(e).__name__}: {e}"[:1000]
+                api_logger.error(f"❌ Email #{message.id} to {message.to_email} rejected: {str(e)[:200]}")
+            else:
+                message.status = EmailOutbox.STATUS_SENT
+                message.sent_at = timezone.now()
+                message.last_error = None
+            pending.pop(0)
+    except Exception as e:
+        # Connection / login failure or temporary rejection: this message and
+        # the rest of the batch go back to the queue.
+        for message in pending:
+            _retry_or_fail(message, f"{type(e).__name__}: {e}")
+    finally:
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    for message in batch:
+        message.locked_at = None
+    EmailOutbox.objects.bulk_update(
+        batch, ['status', 'next_attempt_at', 'locked_at', 'last_error', 'sent_at'],
+    )
+    sent = sum(1 for message in batch if message.status == EmailOutbox.STATUS_SENT)
+    api_logger.debug(f"DEBUG: Email batch of {len(batch)} sent over one connection ({sent} delivered)")
+    return batch
+
+
+def flush_email_outbox():
+    """
+    Send every due message from the calling thread (management commands,
+    which exit before the dispatcher's daemon threads would get to them).
+    :return: number of messages sent
+    """
+    sent = 0
+    while True:
+        batch = claim_next_email_batch()
+        if batch is None:
+            return sent
+        deliver_email_batch(batch)
+        sent += sum(1 for message in batch if message.status == EmailOutbox.STATUS_SENT)
+        if any(message.status == EmailOutbox.STATUS_QUEUED for message in batch):
+            return sent  # temporary SMTP failure — leave the retries to the dispatcher
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_email_dispatcher():
+    """Process-wide email JobWorkerPool (created on first use)."""
+    global _dispatcher
+    if _dispatcher is None:
+        with _dispatcher_lock:
+            if _dispatcher is None:
+                _dispatcher = JobWorkerPool(
+                    'email-dispatcher', claim_next_email_batch, deliver_email_batch,
+                    workers=_env_int('EMAIL_DISPATCH_WORKERS', 2),
+                    poll_interval=_env_int('EMAIL_POLL_INTERVAL', 15),
+                )
+    return _dispatcher
+
+
+def sweep_email_outbox():
+    """
+    Periodic housekeeping (scheduler, EMAIL_OUTBOX_SWEEP_INTERVAL):
+      - delete sent / failed rows older than EMAIL_OUTBOX_RETENTION_DAYS
+      - wake the dispatcher if messages are due — queued after a restart,
+        retries whose backoff expired, or rows whose worker died mid-send
+    :return: Dictionary with the counts per step
+    """
+    now = timezone.now()
+    result = {'deleted': 0, 'due': 0}
+    result['deleted'], _ = EmailOutbox.objects.filter(
+        status__in=[EmailOutbox.STATUS_SENT, EmailOutbox.STATUS_FAILED],
+        created_at__lt=now - timedelta(days=_env_int('EMAIL_OUTBOX_RETENTION_DAYS', 30)),
+    ).delete()
+    result['due'] = EmailOutbox.objects.filter(_due()).count()
+    if result['due']:
+        get_email_dispatcher().wake()
+    return result
@@ -0,0 +1,761 @@
+"""
+family_import.py
+
+Import engine of the bulk Excel import of families (import_families_endpoint).
+
+The endpoint used to walk the sheet with df.iterrows() and, for every row,
+parse each cell by hand (16 strptime attempts per date column), run a
+Children.exists() query and a duplicate-detection query, resolve the city /
+street, call Children.objects.create in its own transaction and create the
+missing-surname coordinator tasks one by one. A few thousand rows kept a
+gunicorn worker busy for minutes.
+
+Now import_jobs feeds the sheet to FamiliesImport chunk by chunk (in a
+background job), and for each chunk:
+  1. prepare_families_frame() cleans every column with vectorized pandas
+     string operations: names (with the full-name fallback), 9-digit IDs,
+     phones (XXX-XXXXXXX), dates (one to_datetime pass per format, only over
+     the values no earlier format parsed), numbers and flags.
+  2. Cities and streets are resolved once per distinct value.
+  3. Existing IDs and the duplicate keys (first name + surname + city, with
+     the phones) are prefetched in a few IN queries.
+  4. Rows are validated in file order in memory — same checks, same order,
+     same messages as before. A row accepted earlier in the same file counts
+     as existing for the later ones (as it did when it was already inserted),
+     so the dry run now reports in-file duplicates too.
+  5. Accepted rows are inserted with bulk_create, FAMILIES_IMPORT_BATCH_SIZE
+     per (nested) transaction. If a batch fails (e.g. a NOT NULL column), it
+     is retried row by row so only the offending rows are reported.
+
+bulk_create sends no post_save signals, so the PossibleMatches sync and the
+dashboard snapshot invalidation run once per chunk, after it commits.
+build_families_workbook() renders the result / preview workbook.
+
+Environment:
+  FAMILIES_IMPORT_BATCH_SIZE   rows per insert transaction (default 500)
+"""
+
+import os
+import re
+from datetime import date, timedelta
+from io import BytesIO
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.styles import Alignment, Font, PatternFill
+from django.db import DatabaseError, IntegrityError, transaction
+from .models import Children, Staff, Task_Types, Tasks
+from .utils import get_enum_values, get_responsible_coordinator_for_family
+from .logger import api_logger
+
+LOOKUP_CHUNK_SIZE = 2000  # values per IN (...) prefetch query
+
+EXIT_STATUSES = ('בריא', 'ז״ל', 'עזב')
+FEMALE_VALUES = ('true', 'נקבה', 'female', 'f', '1')
+TRUE_VALUES = ('true', 'כן', 'yes', '1')
+FALSE_VALUES = ('false', 'לא', 'no', '0')
+SURNAME_PLACEHOLDER = 'XXX'
+SURNAME_TASK_TYPE = 'עדכון משפחה'
+SURNAME_TASK_DUE_DAYS = 7
+
+# Tried in this order — the first format that parses wins
+DATE_FORMATS = (
+    '%Y-%m-%d %H:%M:%S',  # ISO with time
+    '%Y-%m-%d',           # ISO
+    '%d/%m/%Y',           # EU: dd/mm/yyyy
+    '%m/%d/%Y',           # US: mm/dd/yyyy
+    '%d-%m-%Y',           # dd-mm-yyyy
+    '%m-%d-%Y',           # mm-dd-yyyy
+    '%d.%m.%Y',           # dd.mm.yyyy
+    '%m.%d.%Y',           # mm.dd.yyyy
+    '%d/%m/%y',           # dd/mm/yy (2-digit year)
+    '%m/%d/%y',           # mm/dd/yy
+    '%d-%m-%y',           # dd-mm-yy
+    '%m-%d-%y',           # mm-dd-yy
+    '%d.%m.%y',           # dd.mm.yy
+    '%m.%d.%y',           # mm.dd.yy
+    '%Y/%m/%d',           # yyyy/mm/dd
+    '%Y.%m.%d',           # yyyy.mm.dd
+)
+REVIEW_TALK_DATE_FORMATS = DATE_FORMATS + ('%Y',)  # Year only
+REVIEW_NOT_NEEDED = 'לא צריך'
+
+# Hebrew month names in the "שיחת ביקורת" column (checked in this order)
+HEBREW_MONTHS = {
+    'ינואר': '01', 'יוני': '06', 'יולי': '07', 'אוגוסט': '08',
+    'ספטמבר': '09', 'אוקטובר': '10', 'נובמבר': '11', 'דצמבר': '12',
+    'פברואר': '02', 'מרץ': '03', 'אפריל': '04', 'מאי': '05',
+    'אגוסטוס': '08',
+    # Short forms
+    'ינ': '01', 'פב': '02', 'מר': '03', 'אפ': '04', 'מא': '05',
+    'יו': '06', 'יול': '07', 'אוג': '08', 'ספ': '09', 'אוק': '10',
+    'נו': '11', 'דצ': '12',
+}
+_HEBREW_LETTER = re.compile(r'[א-ת]')
+
+
+def _env_int(name, default):
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+# ==================== COLUMN MAPPING ====================
+
+def resolve_family_columns(df):
+    """
+    Map the sheet's headers to the fields of the import.
+    Handles both "שם מלא" and separate "שם פרטי"/"שם משפחה" columns; a
+    missing column maps to its default name (read as empty).
+    """
+    columns = {col.strip(): col for col in df.columns}  # Normalized column names
+
+    def find_column(potential_names):
+        """Find which column exists from a list of potential names"""
+        for name in potential_names:
+            if name.strip() in columns:
+                return columns[name.strip()]
+        return None
+
+    def find_column_contains(substring):
+        for col in df.columns:
+            if substring in col:
+                return col
+        return None
+
+    return {
+        'first_name': find_column(['שם פרטי']) or 'שם פרטי',
+        'last_name': find_column(['שם משפחה']) or 'שם משפחה',
+        'full_name': find_column(['שם מלא של הילד/ה', 'שם מלא']) or None,
+        'child_id': find_column(['תעודת זהות ילד/ה', 'תעודת זהות', 'ID']) or 'תעודת זהות ילד/ה',
+        'status': find_column(['סטטוס']) or 'סטטוס',
+        'marital_status': find_column(['סטטוס זוגי']) or 'סטטוס זוגי',
+        'tutoring_status': find_column(['מצב חונכות', 'סטטוס חונכות']) or 'מצב חונכות',
+        'gender': find_column(['מין']) or 'מין',
+        'city': find_column(['עיר']) or 'עיר',
+        'phone': find_column(['מספר טלפון של הילד/ה', 'מספר טלפון']) or 'מספר טלפון של הילד/ה',
+        'hospital': find_column(['בית חולים מטפל', 'בית חולים']) or 'בית חולים מטפל',
+        'diagnosis': find_column(['אבחנה רפואית', 'אבחנה']) or 'אבחנה רפואית',
+        'diagnosis_date': find_column(['תאריך אבחון', 'תאריך אבחנה']) or 'תאריך אבחון',
+        'num_of_siblings': find_column_contains("כמה אחים") or 'כמה אחים יש?',
+        'registration_date': find_column(['תאריך רישום']) or 'תאריך רישום',
+        'birth_date': 'תאריך לידה',
+        # Street and apartment are TWO separate columns
+        'street': find_column(['רחוב']) or 'רחוב',
+        'apartment': find_column(['מס׳ דירה', 'מס דירה']) or 'מס׳ דירה',
+        'medical_state': find_column(['מצב רפואי עדכני', 'מצב רפואי']) or 'מצב רפואי עדכני',
+        'completed_treatments': find_column(['האם סיים/ה טיפולים?', 'סיום טיפולים']) or 'האם סיים/ה טיפולים?',
+        'treatment_end_protocol': find_column(['צפי סיום על פי פרוטוקול?', 'תאריך סיום צפוי']) or 'צפי סיום על פי פרוטוקול?',
+        'when_completed_treatments': find_column(['מתי סיים/ה טיפולים?', 'תאריך סיום טיפולים']) or 'מתי סיים/ה טיפולים?',
+        'father_name': find_column(['שם האב']) or 'שם האב',
+        'father_phone': find_column_contains("טלפון של האב") or 'מס טלפון של האב',
+        'mother_name': find_column(['שם האם']) or 'שם האם',
+        'mother_phone': find_column_contains("טלפון של האם") or 'מס טלפון של האם',
+        'tutoring_details': find_column(['פרטים לצורך חונכות', 'פרטים לחונכות']) or 'פרטים לצורך חונכות (לצורך ליה ונעם)',
+        'additional_info': find_column(['האם יש משהו ספציפי שתרצו לבקש/לדעת?', 'מידע נוסף', 'הערות']) or 'האם יש משהו ספציפי שתרצו לבקש/לדעת?',
+        'is_in_frame': find_column(['האם נמצא במסגרת?']) or 'האם נמצא במסגרת?',
+        'coordinator_comments': find_column(['הערות רכז', 'הערות רכז/מנהל']) or 'הערות רכז',
+        'sug': 'סוג',
+        'review_talk': 'שיחת ביקורת',
+    }
+
+
+# ==================== VECTORIZED PARSING ====================
+
+def _raw(df, col):
+    """Column as strings, '' for missing cells (or a missing column)."""
+    if col is None or col not in df.columns:
+        return pd.Series('', index=df.index, dtype=object)
+    return df[col].astype(object).where(df[col].notna(), '').astype(str)
+
+
+def _text(df, col):
+    """Stripped cell text; '' for empty / NaN cells."""
+    raw = _raw(df, col)
+    return raw.str.strip().mask(raw.str.lower() == 'nan', '')
+
+
+def _without_commas(series):
+    return series.str.replace(',', '', regex=False).str.strip()
+
+
+def _phones(series):
+    """Digits only, padded to 10 with trailing zeros, as XXX-XXXXXXX ('' if invalid)."""
+    digits = series.str.replace(r'\D', '', regex=True)
+    padded = digits.str.pad(10, side='right', fillchar='0')
+    formatted = padded.str[:3] + '-' + padded.str[3:]
+    return formatted.where((digits != '') & (padded.str.len() == 10), '')
+
+
+def _child_ids(series):
+    """IDs zero-padded to 9 digits ('' if not a number)."""
+    valid = series.str.fullmatch(r'\+?\d+').fillna(False).astype(bool)
+    digits = series.str.lstrip('+').str.lstrip('0').replace('', '0')
+    return digits.str.zfill(9).where(valid, '')
+
+
+def parse_dates(series, formats=DATE_FORMATS):
+    """
+    Parse stripped date strings with the first matching format (None if none
+    does). One to_datetime pass per format, over the still-unparsed values.
+    """
+    parsed = pd.Series([None] * len(series), index=series.index, dtype=object)
+    pending = series[series != '']
+    for fmt in formats:
+        if pending.empty:
+            break
+        attempt = pd.to_datetime(pending, format=fmt, errors='coerce')
+        hits = attempt.notna()
+        parsed[hits[hits].index] = attempt[hits].dt.date
+        pending = pending[~hits]
+    return parsed
+
+
+def _hebrew_date(value, today):
+    """'D <Hebrew month> [YYYY]' → date, or None."""
+    for heb_month, month_num in HEBREW_MONTHS.items():
+        if heb_month in value:
+            day_match = re.search(r'(\d{1,2})\s+' + heb_month, value)
+            year_match = re.search(heb_month + r'.*?(\d{4})', value)
+            if day_match:
+                year = int(year_match.group(1)) if year_match else today.year
+                try:
+                    return date(year, int(month_num), int(day_match.group(1)))
+                except ValueError:
+                    continue
+    return None
+
+
+def _review_talk_dates(series, today):
+    """
+    last_review_talk_conducted from the "שיחת ביקורת" column: Hebrew month
+    names first, then the standard formats; "לא צריך" is not a date.
+    """
+    dates = pd.Series([None] * len(series), index=series.index, dtype=object)
+    candidates = series[(series != '') & (series != REVIEW_NOT_NEEDED)]
+    hebrew = candidates[candidates.str.contains(_HEBREW_LETTER)]
+    for idx, value in hebrew.items():
+        dates[idx] = _hebrew_date(value, today)
+    remaining = candidates[dates[candidates.index].isna()]
+    parsed = parse_dates(remaining, REVIEW_TALK_DATE_FORMATS)
+    dates[parsed.index] = parsed
+    return dates
+
+
+def _siblings(series):
+    """Number of siblings, 0 if missing / invalid / outside 0-20."""
+    valid = series.str.fullmatch(r'[+-]?\d+').fillna(False).astype(bool)
+    numbers = pd.to_numeric(series.where(valid, '0'), errors='coerce').fillna(0).astype(int)
+    return numbers.where(numbers.between(0, 20), 0)
+
+
+def _optional_bool(series):
+    lowered = series.str.lower()
+    return pd.Series(
+        [True if value in TRUE_VALUES else False if value in FALSE_VALUES else None for value in lowered],
+        index=series.index, dtype=object,
+    )
+
+
+def prepare_families_frame(df, cols, today=None):
+    """Clean every import column of the sheet (one vectorized pass per column)."""
+    today = today or date.today()
+    frame = pd.DataFrame(index=df.index)
+
+    # Names: separate columns, else split the full name (last word = surname)
+    first = _text(df, cols['first_name'])
+    last = _text(df, cols['last_name'])
+    if cols['full_name']:
+        full = _text(df, cols['full_name'])
+        use_full = ((first == '') | (last == '')) & (full != '')
+        if use_full.any():
+            parts = full[use_full].str.split()
+            last = last.mask(use_full & (last == ''), parts.str[-1])
+            first = first.mask(
+                use_full & (first == ''),
+                parts.str[:-1].str.join(' ').where(parts.str.len() > 1, parts.str[0]),
+            )
+    status = _text(df, cols['status'])
+    # Missing surname: the status for בריא/ז״ל/עזב, else a placeholder + a task
+    missing_last = last == ''
+    frame['needs_surname_task'] = missing_last & ~status.isin(EXIT_STATUSES)
+    frame['child_first_name'] = first
+    frame['child_last_name'] = last.mask(
+        missing_last, status.where(status.isin(EXIT_STATUSES), SURNAME_PLACEHOLDER)
+    )
+    frame['status'] = status
+    frame['child_id'] = _child_ids(_text(df, cols['child_id']))
+
+    frame['city'] = _without_commas(_text(df, cols['city']))
+    frame['street'] = _without_commas(_text(df, cols['street']))
+    frame['apartment'] = _without_commas(_text(df, cols['apartment']))
+
+    frame['phone'] = _phones(_text(df, cols['phone']))
+    frame['father_phone'] = _phones(_text(df, cols['father_phone']))
+    frame['mother_phone'] = _phones(_text(df, cols['mother_phone']))
+    frame['hospital'] = _without_commas(_text(df, cols['hospital']))
+    frame['diagnosis'] = _without_commas(_text(df, cols['diagnosis']))
+    for field in ('medical_state', 'father_name', 'mother_name', 'tutoring_details', 'additional_info',
+                  'is_in_frame', 'coordinator_comments', 'marital_status', 'when_completed_treatments',
+                  'treatment_end_protocol', 'sug'):
+        frame[field] = _text(df, cols[field])
+
+    frame['birth_date'] = parse_dates(_text(df, cols['birth_date']))
+    frame['diagnosis_date'] = parse_dates(_text(df, cols['diagnosis_date']))
+    registration = parse_dates(_text(df, cols['registration_date']))
+    frame['registration_date'] = registration.where(registration.notna(), today)
+    review_talk = _text(df, cols['review_talk'])
+    frame['review_not_needed'] = review_talk == REVIEW_NOT_NEEDED
+    frame['last_review_talk_conducted'] = _review_talk_dates(review_talk, today)
+
+    frame['has_completed_treatments'] = _optional_bool(_text(df, cols['completed_treatments']))
+    frame['num_of_siblings'] = _siblings(_text(df, cols['num_of_siblings']))
+    frame['gender'] = _raw(df, cols['gender']).str.lower().isin(FEMALE_VALUES)
+    # Spaces → underscores for tutoring_status only, default 'למצוא_חונך'
+    tutoring_status = _text(df, cols['tutoring_status']).str.replace(' ', '_', regex=False)
+    frame['tutoring_status'] = tutoring_status.mask(tutoring_status == '', 'למצוא_חונך')
+    return frame
+
+
+# ==================== PREFETCH ====================
+
+def _chunks(items, size):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _existing_child_ids(child_ids):
+    existing = set()
+    for chunk in _chunks(child_ids, LOOKUP_CHUNK_SIZE):
+        existing.update(Children.objects.filter(child_id__in=chunk).values_list('child_id', flat=True))
+    return existing
+
+
+def _existing_phones_by_key(keys):
+    """{(first name, surname, city): [(child phone, father phone, mother phone), ...]}"""
+    phones = {}
+    for chunk in _chunks(keys, LOOKUP_CHUNK_SIZE):
+        rows = Children.objects.filter(
+            childfirstname__in={key[0] for key in chunk},
+            childsurname__in={key[1] for key in chunk},
+            city__in={key[2] for key in chunk},
+        ).values_list('childfirstname', 'childsurname', 'city',
+                      'child_phone_number', 'father_phone', 'mother_phone')
+        for first, last, city, *row_phones in rows:
+            phones.setdefault((first, last, city), []).append(tuple(row_phones))
+    return phones
+
+
+def _phones_match(phones, existing):
+    """Any of the row's phones equals the same phone field of an existing child."""
+    return any(value and other and value == other for value, other in zip(phones, existing))
+
+
+# ==================== ADDRESS RESOLUTION ====================
+
+class _AddressResolver:
+    """City / street matching, computed once per distinct value."""
+
+    def __init__(self, settlement_index):
+        from .family_views import find_best_city_match, find_best_street_match
+
+        self.index = settlement_index
+        self._match_city = find_best_city_match
+        self._match_street = find_best_street_match
+        self._cities = {}
+        self._streets = {}
+
+    def city(self, city_original):
+        """(city, corrected) — city None if the city doesn't exist."""
+        if city_original not in self._cities:
+            exact = self.index.exact_city(city_original)
+            if exact:
+                self._cities[city_original] = (exact, False)
+            else:
+                # Fallback to smart matching (mapping, normalized / fuzzy, special values)
+                city, was_corrected = self._match_city(city_original)
+                self._cities[city_original] = (city, bool(city is not None and was_corrected and city != city_original))
+        return self._cities[city_original]
+
+    def street(self, street_original, city):
+        """(street, corrected) — street None if it isn't a street of the city."""
+        key = (city, street_original)
+        if key not in self._streets:
+            street_index = self.index.streets_of(city)
+            city_streets = street_index.street_set if street_index else set()
+            if street_original in city_streets:
+                self._streets[key] = (street_original, False)
+            else:
+                matched_street, was_corrected, _ = self._match_street(street_original, city)
+                if matched_street == street_original and not was_corrected and street_original not in city_streets:
+                    self._streets[key] = (None, False)
+                else:
+                    self._streets[key] = (matched_street, bool(was_corrected and matched_street != street_original))
+        return self._streets[key]
+
+
+# ==================== VALIDATION ====================
+
+def _need_review(row, final_status, today):
+    """
+    Feature #2 + #3: need_review is False for בריא/ז״ל/עזב, "לא צריך" in the
+    review talk column, בוגר in the סוג column, or age >= 16; otherwise True.
+    """
+    birth_date = row['birth_date']
+    is_mature_by_age = False
+    if birth_date:
+        age = today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
+        is_mature_by_age = age >= 16
+    return not (final_status in EXIT_STATUSES or row['review_not_needed']
+                or 'בוגר' in row['sug'] or is_mature_by_age)
+
+
+def _build_child(row, child_id_int, city, street_and_apartment, responsible_coordinator, today):
+    return Children(
+        child_id=child_id_int,
+        childfirstname=row['child_first_name'],
+        childsurname=row['child_last_name'],
+        city=city,
+        child_phone_number=row['phone'] or None,
+        treating_hospital=row['hospital'],
+        medical_diagnosis=row['diagnosis'],
+        diagnosis_date=row['diagnosis_date'],
+        date_of_birth=row['birth_date'],
+        marital_status=row['marital_status'],
+        num_of_siblings=row['num_of_siblings'],
+        registrationdate=row['registration_date'],
+        lastupdateddate=today,
+        status=row['status'],
+        tutoring_status=row['tutoring_status'],
+        responsible_coordinator=responsible_coordinator,
+        gender=row['gender'],
+        last_review_talk_conducted=row['last_review_talk_conducted'],
+        street_and_apartment_number=street_and_apartment,
+        current_medical_state=row['medical_state'],
+        when_completed_treatments=row['when_completed_treatments'] or None,
+        has_completed_treatments=row['has_completed_treatments'],
+        expected_end_treatment_by_protocol=row['treatment_end_protocol'] or None,
+        father_name=row['father_name'] or None,
+        father_phone=row['father_phone'] or None,
+        mother_name=row['mother_name'] or None,
+        mother_phone=row['mother_phone'] or None,
+        details_for_tutoring=row['tutoring_details'] or None,
+        additional_info=row['additional_info'] or None,
+        is_in_frame=row['is_in_frame'] or None,
+        coordinator_comments=row['coordinator_comments'] or None,
+        need_review=_need_review(row, row['status'], today),
+    )
+
+
+# ==================== IMPORT ====================
+
+def _surname_tasks(children, coordinators, task_type, due_date):
+    """One עדכון משפחה task per Families Coordinator for each child imported with surname XXX."""
+    return [
+        Tasks(
+            task_type=task_type,
+            description=f"עדכון שם משפחה חסר לילד/ה {child.childfirstname} (כרגע: {child.childsurname}) - תעודת זהות: {str(child.child_id).zfill(9)}",
+            due_date=due_date,
+            status='לא הושלמה',
+            assigned_to=coordinator,
+            related_child=child,
+        )
+        for child in children
+        for coordinator in coordinators
+    ]
+
+
+def _create_surname_tasks(children, today):
+    if not children:
+        return
+    try:
+        with transaction.atomic():
+            coordinators = list(Staff.objects.filter(roles__role_name='Families Coordinator').distinct())
+            if not coordinators:
+                return
+            task_type, _ = Task_Types.objects.get_or_create(
+                task_type=SURNAME_TASK_TYPE,
+                defaults={'resource': 'childsmile_app_children', 'action': 'UPDATE'}
+            )
+            Tasks.objects.bulk_create(
+                _surname_tasks(children, coordinators, task_type, today + timedelta(days=SURNAME_TASK_DUE_DAYS))
+            )
+    except Exception as e:
+        # Log task creation failure but don't fail the import
+        ids = [child.child_id for child in children]
+        api_logger.warning(f"Failed to create surname update tasks for children {ids}: {str(e)}")
+
+
+def _after_import(child_ids):
+    """What the Children post_save signals did per row, once per chunk."""
+    from .dashboard_metrics import invalidate_dashboard_snapshot
+    from .matching_utils import sync_possible_matches
+
+    invalidate_dashboard_snapshot()
+    try:
+        sync_possible_matches(child_ids=child_ids)
+    except Exception as e:
+        api_logger.error(f"PossibleMatches sync after families import failed: {str(e)[:200]}")
+
+
+class FamiliesImport:
+    """
+    One families import, fed chunk by chunk (import_jobs). Carries the
+    in-file state between chunks: rows accepted by earlier chunks, resolved
+    addresses and coordinators. A resumed live import starts with an empty
+    state — the rows of the committed chunks are in the database by then.
+    """
+
+    EMPTY_COUNTS = {'success': 0, 'error': 0, 'skipped': 0, 'invalid_enum': 0}
+
+    def __init__(self, df, settlement_index, dry_run=False, counts=None):
+        """
+        :param df: the whole sheet, read with dtype=str (for the column mapping)
+        :param settlement_index: settlements_index.SettlementIndex for the address checks
+        :param dry_run: only validate — every valid row is reported as OK
+        :param counts: counters of the chunks already processed (resume)
+        """
+        self.cols = resolve_family_columns(df)
+        self.dry_run = dry_run
+        self.today = date.today()
+        self.valid_statuses = set(get_enum_values("status"))
+        self.resolver = _AddressResolver(settlement_index)
+        self.batch_size = max(1, _env_int('FAMILIES_IMPORT_BATCH_SIZE', 500))
+        self.counts = dict(self.EMPTY_COUNTS, **(counts or {}))
+        self._accepted_ids = set()
+        self._accepted_phones = {}
+        self._coordinator_by_status = {}
+        api_logger.info(
+            f"Column mapping: first_name={self.cols['first_name']}, "
+            f"last_name={self.cols['last_name']}, full_name={self.cols['full_name']}"
+        )
+
+    def _error(self, result, details, warning=None, counter='error'):
+        result['status'] = 'Error'
+        result['details'] = details
+        if warning:
+            result['enum_warnings'].append(warning)
+        self.counts[counter] += 1
+
+    def _skip(self, result, details):
+        result['status'] = 'Skipped'
+        result['details'] = details
+        self.counts['skipped'] += 1
+
+    def process_chunk(self, chunk):
+        """
+        Validate (and unless dry_run, insert) one chunk of the sheet.
+        Call inside a transaction to commit the inserts with the caller's checkpoint.
+        :return: the chunk's per-row results, in file order
+        """
+        frame = prepare_families_frame(chunk, self.cols, self.today)
+        results, accepted = self._validate(frame)
+
+        if self.dry_run:
+            for result, _, _ in accepted:
+                result['status'] = 'OK'
+                result['details'] = 'בדיקה בלבד: משפחה תקינה'
+            self.counts['success'] += len(accepted)
+            return results
+
+        created_ids = []
+        for batch in _chunks(accepted, self.batch_size):
+            created_ids.extend(self._insert_batch(batch))
+        if created_ids:
+            transaction.on_commit(lambda: _after_import(created_ids))
+        return results
+
+    def _validate(self, frame):
+        """
+        Validate the prepared rows in file order.
+        :return: (results, [(result, Children, needs_surname_task) to insert])
+        """
+        rows = frame.to_dict('records')
+        resolver = self.resolver
+
+        ids = {int(row['child_id']) for row in rows if row['child_id']}
+        existing_ids = _existing_child_ids(ids) | self._accepted_ids
+
+        # Duplicate keys of every row whose city resolves (the DB side of the check)
+        keys = set()
+        for row in rows:
+            if row['child_first_name'] and row['city']:
+                city, _ = resolver.city(row['city'])
+                if city:
+                    keys.add((row['child_first_name'], row['child_last_name'], city))
+        phones_by_key = _existing_phones_by_key(keys)
+
+        results = []
+        accepted = []
+        for idx, row in zip(frame.index, rows):
+            result = {
+                'row_num': idx + 2,
+                'child_first_name': row['child_first_name'],
+                'child_last_name': row['child_last_name'],
+                'child_id': row['child_id'],
+                'status': '',
+                'details': '',
+                'enum_warnings': []
+            }
+            results.append(result)
+            try:
+                if not row['child_first_name'] or not row['child_last_name']:
+                    self._error(result, 'חסר שם פרטי או שם משפחה של ילד')
+                    continue
+                if not row['child_id']:
+                    self._error(result, 'חסרה תעודת זהות של ילד')
+                    continue
+
+                child_id_int = int(row['child_id'])
+                if child_id_int in existing_ids:
+                    self._skip(result, 'תעודת זהות כבר קיימת במערכת')
+                    continue
+
+                city_original = row['city']
+                if not city_original:
+                    self._error(result, 'שגיאה: עיר חסרה (עמודה K) - חובה מלא', 'עיר חסרה')
+                    continue
+                city, city_was_corrected = resolver.city(city_original)
+                if city is None:
+                    self._error(result, f'שגיאה: עיר "{city_original}" לא קיימת במערכת (עמודה K)',
+                                f'עיר "{city_original}" לא קיימת במערכת')
+                    continue
+                if city_was_corrected:
+                    result['enum_warnings'].append(f'עיר תוקנה: "{city_original}" → "{city}"')
+
+                street_original = row['street']
+                if not street_original:
+                    self._error(result, 'שגיאה: רחוב חסר (עמודה J) - חובה מלא', 'רחוב חסר')
+                    continue
+                matched_street, street_was_corrected = resolver.street(street_original, city)
+                if matched_street is None:
+                    self._error(result, f'שגיאה: רחוב "{street_original}" לא קיים ברשימת הרחובות של "{city}" (עמודה J)',
+                                f'רחוב "{street_original}" לא קיים ברשימת הרחובות של "{city}"')
+                    continue
+                if street_was_corrected:
+                    result['enum_warnings'].append(f'רחוב תוקן: "{street_original}" → "{matched_street}"')
+                street_and_apartment = f"{matched_street} {row['apartment']}".strip() if row['apartment'] else matched_street
+
+                final_status = row['status']
+                if not final_status:
+                    self._error(result, 'סטטוס חובה - חסר או ריק')
+                    continue
+                if final_status not in self.valid_statuses:
+                    self._error(result, f'סטטוס "{final_status}" לא תקין. ערכים חוקיים: {", ".join(self.valid_statuses)}',
+                                counter='invalid_enum')
+                    continue
+
+                # Duplicate detection: firstname + surname + city + any matching phone field
+                key = (row['child_first_name'], row['child_last_name'], city)
+                phones = (row['phone'], row['father_phone'], row['mother_phone'])
+                candidates = phones_by_key.get(key, []) + self._accepted_phones.get(key, [])
+                if any(_phones_match(phones, existing) for existing in candidates):
+                    self._skip(result, f'דילוג: דובליקט חשוד - {row["child_first_name"]} {row["child_last_name"]} ב{city} קיים כבר במערכת עם טלפון תואם')
+                    result['enum_warnings'].append('דובליקט חשוד - בדוק יד')
+                    continue
+
+                # One coordinator lookup per (tutoring status, status) pair
+                coordinator_key = (row['tutoring_status'], final_status)
+                if coordinator_key not in self._coordinator_by_status:
+                    self._coordinator_by_status[coordinator_key] = get_responsible_coordinator_for_family(
+                        row['tutoring_status'], child_status=final_status
+                    )
+
+                child = _build_child(row, child_id_int, city, street_and_apartment,
+                                     self._coordinator_by_status[coordinator_key], self.today)
+                accepted.append((result, child, bool(row['needs_surname_task'])))
+
+                # Later rows of the file see this one as existing
+                existing_ids.add(child_id_int)
+                self._accepted_ids.add(child_id_int)
+                self._accepted_phones.setdefault(key, []).append(phones)
+            except Exception as e:
+                self._error(result, f'שגיאה כללית: {str(e)[:50]}')
+        return results, accepted
+
+    def _insert_batch(self, batch):
+        """
+        Insert one batch in one (nested) transaction; on failure, retry it row by row.
+        :return: the IDs of the created children
+        """
+        try:
+            with transaction.atomic():
+                Children.objects.bulk_create([child for _, child, _ in batch])
+                _create_surname_tasks([child for _, child, needs_task in batch if needs_task], self.today)
+            inserted = batch
+        except DatabaseError as e:
+            api_logger.warning(f"Import batch of {len(batch)} families failed ({str(e)[:100]}) - retrying row by row")
+            inserted = []
+            for entry in batch:
+                result, child, needs_task = entry
+                try:
+                    with transaction.atomic():
+                        Children.objects.bulk_create([child])
+                        _create_surname_tasks([child] if needs_task else [], self.today)
+                    inserted.append(entry)
+                except IntegrityError as row_error:
+                    self._error(result, f'שגיאת מסד נתונים: {str(row_error)[:50]}')
+                except Exception as row_error:
+                    self._error(result, f'שגיאה כללית: {str(row_error)[:50]}')
+
+        for result, _, _ in inserted:
+            result['status'] = 'OK'
+            result['details'] = 'נוצרה בהצלחה'
+        self.counts['success'] += len(inserted)
+        return [child.child_id for _, child, _ in inserted]
+
+
+# ==================== RESULT WORKBOOK ====================
+
+def build_families_workbook(results):
+    """The result / preview .xlsx of a families import, as bytes."""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "תוצאות ייבוא"
+
+    headers = ['שורה', 'שם פרטי ילד', 'שם משפחה ילד', 'תעודת זהות', 'סטטוס ייבוא', 'פרטים', 'אזהרות שדות']
+    header_fill = PatternFill(start_color='4472C4', end_color='4472C4', fill_type='solid')
+    header_font = Font(color='FFFFFF', bold=True)
+    ok_fill = PatternFill(start_color='C6EFCE', end_color='C6EFCE', fill_type='solid')
+    error_fill = PatternFill(start_color='FFC7CE', end_color='FFC7CE', fill_type='solid')
+    warning_fill = PatternFill(start_color='FFEB9C', end_color='FFEB9C', fill_type='solid')
+
+    for col, header in enumerate(headers, 1):
+        cell = ws.cell(row=1, column=col, value=header)
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.alignment = Alignment(horizontal='center')
+
+    for row_idx, result in enumerate(results, 2):
+        ws.cell(row=row_idx, column=1, value=result.get('row_num', ''))
+        ws.cell(row=row_idx, column=2, value=result['child_first_name'])
+        ws.cell(row=row_idx, column=3, value=result['child_last_name'])
+        ws.cell(row=row_idx, column=4, value=result.get('child_id', ''))
+
+        status_cell = ws.cell(row=row_idx, column=5, value=result['status'])
+        if result['status'] == 'OK':
+            status_cell.fill = ok_fill
+        elif result['status'] == 'Error':
+            status_cell.fill = error_fill
+        elif result['status'] == 'Skipped' or result['status'] == 'Warning':
+            status_cell.fill = warning_fill
+
+        ws.cell(row=row_idx, column=6, value=result.get('details', ''))
+
+        # Add enum warnings if any
+        if result.get('enum_warnings'):
+            ws.cell(row=row_idx, column=7, value=' | '.join(result['enum_warnings']))
+
+    ws.column_dimensions['A'].width = 8
+    ws.column_dimensions['B'].width = 15
+    ws.column_dimensions['C'].width = 15
+    ws.column_dimensions['D'].width = 15
+    ws.column_dimensions['E'].width = 12
+    ws.column_dimensions['F'].width = 60
+    ws.column_dimensions['G'].width = 80
+    ws.sheet_view.rightToLeft = True
+
+    output = BytesIO()
+    wb.save(output)
+    return output.getvalue()
@@ -70,38 +70,15 @@ import re
 import base64
 import pandas as pd
 from io import BytesIO
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment
 from django.db.models import Count, F, Q , Prefetch
-from difflib import get_close_matches
+from .settlements_index import get_settlement_index, normalize_special_chars
+from .import_jobs import submit_import_job, import_job_status
 from .utils import *
-from .audit_utils import log_api_action
+from .audit_utils import log_api_action, capture_audit_event
 from .logger import api_logger
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-# Load settlements and streets data from database for import validation
-def get_settlements_dict():
-    """
-    Load settlements and streets from database table.
-    Returns dict format: {city_name: [streets]}
-    """
-    try:
-        settlements_dict = {}
-        settlements = SettlementsStreets.objects.all().values('city_name', 'streets')
-        for item in settlements:
-            city_name = item['city_name']
-            streets = item['streets'] if item['streets'] else []
-            settlements_dict[city_name] = streets
-        return settlements_dict
-    except Exception as e:
-        api_logger.warning(f"Failed to load settlements from database: {str(e)}")
-        return {}
-
-# Load settlements at startup for import validation (will be refreshed on each use)
-SETTLEMENTS_N_STREETS = get_settlements_dict()
-
-
 # Fallback special values dict for the 5 problematic rows that fail all other mechanisms
 # Keys use * as wildcard (each part around * must appear in input)
 # Values are the exact correct database values
@@ -168,108 +145,33 @@ def get_special_value_if_matched(user_input):
     return None, False
 
 
-def normalize_special_chars(text):
-    """
-    Normalize special characters for fuzzy matching.
-    Removes/normalizes: apostrophes, commas, dashes, quotes, etc.
-    Returns normalized text suitable for comparison.
-    
-    Examples:
-    - "מג׳ד אל-כרום" → "מגד אל כרום"
-    - "דולצ׳ין אריה" → "דולצין אריה"
-    - "בן-גוריון" → "בן גוריון"
-    """
-    if not text:
-        return ""
-    
-    # Replace various quote/apostrophe characters with nothing
-    text = text.replace("׳", "")  # Hebrew geresh (׳)
-    text = text.replace("'", "")  # Regular apostrophe (')
-    text = text.replace("`", "")  # Backtick
-    text = text.replace("´", "")  # Acute accent
-    
-    # Replace dashes/hyphens with space
-    text = text.replace("-", " ")
-    text = text.replace("–", " ")  # En dash
-    text = text.replace("—", " ")  # Em dash
-    
-    # Replace commas with space
-    text = text.replace(",", " ")
-    
-    # Normalize multiple spaces to single space
-    text = " ".join(text.split())
-    
-    return text.strip()
-
-
-def find_city_by_normalized_match(user_input, settlements_dict):
+def find_city_by_normalized_match(user_input, settlement_index):
     """
-    Find a city in settlements_dict by normalizing special characters.
+    Find a city in the settlements index by normalizing special characters.
     If exact match fails, try fuzzy match with normalized versions.
     
     Returns: (matched_city, was_corrected)
     - matched_city: The exact city name from DB (with correct punctuation)
     - was_corrected: Boolean indicating if correction was made
     """
-    if not user_input or not settlements_dict:
+    if not user_input or not settlement_index:
         return None, False
     
-    normalized_input = normalize_special_chars(user_input.strip())
-    if not normalized_input:
-        return None, False
-    
-    # Try exact match first (after normalization)
-    for city in settlements_dict.keys():
-        normalized_city = normalize_special_chars(city)
-        if normalized_input == normalized_city:
-            was_corrected = (user_input.strip() != city)
-            return city, was_corrected
-    
-    # Try fuzzy matching with normalized versions
-    normalized_cities = {normalize_special_chars(city): city for city in settlements_dict.keys()}
-    matches = get_close_matches(normalized_input, normalized_cities.keys(), n=1, cutoff=0.75)
-    
-    if matches:
-        matched_normalized = matches[0]
-        matched_city = normalized_cities[matched_normalized]
-        was_corrected = (user_input.strip() != matched_city)
-        return matched_city, was_corrected
-    
-    return None, False
+    # Normalized-name hash map, then the bigram fuzzy index (see settlements_index)
+    return settlement_index.find_normalized(user_input)
 
 
-def find_street_by_normalized_match(user_input, streets_list):
+def find_street_by_normalized_match(user_input, street_index):
     """
-    Find a street in streets_list by normalizing special characters.
+    Find a street in a city's StreetIndex by normalizing special characters.
     Returns: (matched_street, was_corrected)
     - matched_street: The exact street name from DB (with correct punctuation)
     - was_corrected: Boolean indicating if correction was made
     """
-    if not user_input or not streets_list:
+    if not user_input or street_index is None:
         return None, False
     
-    normalized_input = normalize_special_chars(user_input.strip())
-    if not normalized_input:
-        return None, False
-    
-    # Try exact match first (after normalization)
-    for street in streets_list:
-        normalized_street = normalize_special_chars(street)
-        if normalized_input == normalized_street:
-            was_corrected = (user_input.strip() != street)
-            return street, was_corrected
-    
-    # Try fuzzy matching with normalized versions
-    normalized_streets = {normalize_special_chars(street): street for street in streets_list}
-    matches = get_close_matches(normalized_input, normalized_streets.keys(), n=1, cutoff=0.75)
-    
-    if matches:
-        matched_normalized = matches[0]
-        matched_street = normalized_streets[matched_normalized]
-        was_corrected = (user_input.strip() != matched_street)
-        return matched_street, was_corrected
-    
-    return None, False
+    return street_index.find_normalized(user_input)
 
 
 def find_best_city_match(user_input):
@@ -282,7 +184,8 @@ def find_best_city_match(user_input):
     
     This approach handles special characters (apostrophes, dashes, commas) in names.
     """
-    if not user_input or not SETTLEMENTS_N_STREETS:
+    settlement_index = get_settlement_index()
+    if not user_input or not settlement_index:
         return user_input, False
     
     # Normalize user input
@@ -340,7 +243,7 @@ def find_best_city_match(user_input):
             return value, True
     
     # **STEP 3: Try normalized matching (handles apostrophes, dashes, commas)**
-    matched_city, was_corrected = find_city_by_normalized_match(normalized_input, SETTLEMENTS_N_STREETS)
+    matched_city, was_corrected = find_city_by_normalized_match(normalized_input, settlement_index)
     if matched_city:
         return matched_city, was_corrected
     
@@ -372,7 +275,8 @@ def extract_street_and_apartment(user_input, city):
     - "אבן גבירול 29" → ("אבן גבירול", "29", True)
     - "עיר תל אביב" → (None, "עיר תל אביב", False)
     """
-    if not user_input or not city or not SETTLEMENTS_N_STREETS:
+    settlement_index = get_settlement_index()
+    if not user_input or not city or not settlement_index:
         return None, user_input or '', False
     
     # Normalize input
@@ -382,13 +286,13 @@ def extract_street_and_apartment(user_input, city):
     
     # Get streets for this city
     city_normalized = city.strip() if isinstance(city, str) else city
-    streets = SETTLEMENTS_N_STREETS.get(city_normalized, [])
-    if not streets:
+    street_index = settlement_index.streets_of(city_normalized)
+    if street_index is None:
         return None, normalized_input, False  # City not in JSON
     
     # **STEP 1: Try normalized matching (handles apostrophes, dashes, commas)**
     # This will match "דולצ׳ין אריה" even if user typed "דולצין אריה"
-    matched_street, was_corrected = find_street_by_normalized_match(normalized_input, streets)
+    matched_street, was_corrected = find_street_by_normalized_match(normalized_input, street_index)
     if matched_street:
         # Extract apartment number (if any) from the input after the matched street
         apartment = normalized_input[len(normalize_special_chars(matched_street)):].strip()
@@ -396,9 +300,7 @@ def extract_street_and_apartment(user_input, city):
     
     # Try to find a street name that matches the beginning or is contained in the input
     # Sort by length (longest first) to match "אבן גבירול" before "אבן"
-    sorted_streets = sorted(streets, key=len, reverse=True)
-    
-    for street in sorted_streets:
+    for street in street_index.by_length:
         street_stripped = street.strip()
         if not street_stripped:
             continue
@@ -435,7 +337,8 @@ def find_best_street_match(user_input, city):
     
     This approach handles special characters (apostrophes, dashes, commas) in street names.
     """
-    if not user_input or not city or not SETTLEMENTS_N_STREETS:
+    settlement_index = get_settlement_index()
+    if not user_input or not city or not settlement_index:
         return user_input, False, False
     
     # Keep original user input before normalization
@@ -447,8 +350,8 @@ def find_best_street_match(user_input, city):
     
     # Get streets for this city
     city_normalized = city.strip() if isinstance(city, str) else city
-    streets = SETTLEMENTS_N_STREETS.get(city_normalized, [])
-    if not streets:
+    street_index = settlement_index.streets_of(city_normalized)
+    if street_index is None:
         return normalized_input, False, False  # City not in JSON, return original street
     
     # **EXACT DIRECT MAPPINGS** - Excel geresh (׳) to DB apostrophe (')
@@ -469,18 +372,18 @@ def find_best_street_match(user_input, city):
     normalized_input = normalize_special_chars(original_input)
     
     # **STEP 2: Try normalized matching (handles apostrophes, dashes, commas)**
-    matched_street, was_corrected = find_street_by_normalized_match(original_input, streets)
+    matched_street, was_corrected = find_street_by_normalized_match(original_input, street_index)
     if matched_street:
         return matched_street, was_corrected, False
     
     # **STEP 3: Check exact match**
-    if normalized_input in streets:
+    if normalized_input in street_index.street_set:
         return normalized_input, False, False
     
     # **STEP 4: Try fuzzy matching**
-    matches = get_close_matches(normalized_input, streets, n=1, cutoff=0.6)
-    if matches:
-        return matches[0], normalized_input != matches[0], False
+    match = street_index.raw_fuzzy.best_match(normalized_input, 0.6)
+    if match:
+        return match, normalized_input != match, False
     
     # **STEP 5: Fallback - Check special values (for the 5 problematic rows that fail everything else)**
     special_value, was_matched = get_special_value_if_matched(original_input)
@@ -2303,7 +2206,7 @@ def update_child_id(request, old_id):
                 api_logger.debug(f"Updated {tutorship_updated} Tutorships records")
             
             # 3. Update Tasks related_child FK (references Children)
-            tasks_updated = Tasks.objects.filter(related_child_id=old_id).update(related_child_id=new_id)
+            tasks_updated = Tasks.objects.filter(related_child_id=old_id).update(related_child_id=new_id, updated_at=now())
             if tasks_updated:
                 affected_tables.append('childsmile_app_tasks')
                 api_logger.debug(f"Updated {tasks_updated} Tasks records")
@@ -2473,11 +2376,6 @@ def import_families_endpoint(request):
         
         api_logger.info(f"Import permission granted for user: {user.email}")
         
-        # Refresh settlements data from database
-        global SETTLEMENTS_N_STREETS
-        SETTLEMENTS_N_STREETS = get_settlements_dict()
-        api_logger.info(f"Loaded {len(SETTLEMENTS_N_STREETS)} settlements from database")
-        
         # Get uploaded file
         if 'file' not in request.FILES:
             return JsonResponse(
@@ -2496,9 +2394,10 @@ def import_families_endpoint(request):
         
         dry_run = request.data.get('dry_run', 'false').lower() == 'true'
         
-        # Read Excel file
+        # Read Excel file (only to reject unreadable / empty files up front — the job re-reads it)
+        upload = file.read()
         try:
-            df = pd.read_excel(file, dtype=str)
+            df = pd.read_excel(BytesIO(upload), dtype=str)
         except Exception as e:
             api_logger.error(f"Failed to read Excel file: {str(e)}")
             return JsonResponse(
@@ -2515,844 +2414,18 @@ def import_families_endpoint(request):
         # Log actual column names for debugging
         api_logger.info(f"Excel columns found: {list(df.columns)}")
         
-        # Create flexible column mapping - try to find columns by name
-        # This handles both "שם מלא" and separate "שם פרטי"/"שם משפחה" columns
-        columns = {col.strip(): col for col in df.columns}  # Normalized column names
-        
-        # Find column names (case-insensitive and trim whitespace)
-        def find_column(potential_names):
-            """Find which column exists from a list of potential names"""
-            for name in potential_names:
-                normalized = name.strip()
-                for col, orig_col in columns.items():
-                    if col == normalized:
-                        return orig_col
-            return None
-        def find_column_contains(substring):
-            for col in df.columns:
-                if substring in col:
-                    return col
-            return None
-
-        # Map all possible column names
-        col_first_name = find_column(['שם פרטי']) or 'שם פרטי'
-        col_last_name = find_column(['שם משפחה']) or 'שם משפחה'
-        col_full_name = find_column(['שם מלא של הילד/ה', 'שם מלא']) or None
-        col_child_id = find_column(['תעודת זהות ילד/ה', 'תעודת זהות', 'ID']) or 'תעודת זהות ילד/ה'
-        col_status = find_column(['סטטוס']) or 'סטטוס'
-        col_marital_status = find_column(['סטטוס זוגי']) or 'סטטוס זוגי'
-        col_tutoring_status = find_column(['מצב חונכות', 'סטטוס חונכות']) or 'מצב חונכות'
-        col_gender = find_column(['מין']) or 'מין'
-        col_city = find_column(['עיר']) or 'עיר'
-        col_phone = find_column(['מספר טלפון של הילד/ה', 'מספר טלפון']) or 'מספר טלפון של הילד/ה'
-        col_hospital = find_column(['בית חולים מטפל', 'בית חולים']) or 'בית חולים מטפל'
-        col_diagnosis = find_column(['אבחנה רפואית', 'אבחנה']) or 'אבחנה רפואית'
-        col_diagnosis_date = find_column(['תאריך אבחון', 'תאריך אבחנה']) or 'תאריך אבחון'
-        col_num_of_siblings = find_column_contains("כמה אחים") or 'כמה אחים יש?'
-        col_registration_date = find_column(['תאריך רישום']) or 'תאריך רישום'
-        # NEW: Find TWO separate columns for street and apartment
-        col_street = find_column(['רחוב']) or 'רחוב'
-        col_apartment = find_column(['מס׳ דירה', 'מס דירה']) or 'מס׳ דירה'
-        col_medical_state = find_column(['מצב רפואי עדכני', 'מצב רפואי']) or 'מצב רפואי עדכני'
-        col_completed_treatments = find_column(['האם סיים/ה טיפולים?', 'סיום טיפולים']) or 'האם סיים/ה טיפולים?'
-        col_treatment_end_protocol = find_column(['צפי סיום על פי פרוטוקול?', 'תאריך סיום צפוי']) or 'צפי סיום על פי פרוטוקול?'
-        col_when_completed_treatments = find_column(['מתי סיים/ה טיפולים?', 'תאריך סיום טיפולים']) or 'מתי סיים/ה טיפולים?'
-        col_father_name = find_column(['שם האב']) or 'שם האב'
-        col_father_phone = find_column_contains("טלפון של האב") or 'מס טלפון של האב'
-        col_mother_name = find_column(['שם האם']) or 'שם האם'
-        col_mother_phone = find_column_contains("טלפון של האם") or 'מס טלפון של האם'
-        col_tutoring_details = find_column(['פרטים לצורך חונכות', 'פרטים לחונכות']) or 'פרטים לצורך חונכות (לצורך ליה ונעם)'
-        col_additional_info = find_column(['האם יש משהו ספציפי שתרצו לבקש/לדעת?', 'מידע נוסף', 'הערות']) or 'האם יש משהו ספציפי שתרצו לבקש/לדעת?'
-        col_is_in_frame = find_column(['האם נמצא במסגרת?']) or 'האם נמצא במסגרת?'
-        col_coordinator_comments = find_column(['הערות רכז', 'הערות רכז/מנהל']) or 'הערות רכז'
-        
-        api_logger.info(f"Column mapping: first_name={col_first_name}, last_name={col_last_name}, full_name={col_full_name}")
-        
-        # Get valid enum values for validation during dry-run
-        valid_marital_statuses = set(get_enum_values("marital_status"))
-        valid_tutoring_statuses = set(get_enum_values("tutoring_status"))
-        valid_statuses = set(get_enum_values("status"))
-        
-        # Process records
-        total_records = len(df)
-        success_count = 0
-        error_count = 0
-        skipped_count = 0
-        invalid_enum_count = 0
-        
-        results = []
-        
-        for idx, row in df.iterrows():
-            row_num = idx + 2
-            
-            # Extract first and last names from separate columns (preferred) or full name
-            first_name_raw = row.get(col_first_name, '')
-            last_name_raw = row.get(col_last_name, '')
-            
-            child_first_name = '' if (first_name_raw is None or pd.isna(first_name_raw) or str(first_name_raw).lower() == 'nan') else str(first_name_raw).strip()
-            child_last_name = '' if (last_name_raw is None or pd.isna(last_name_raw) or str(last_name_raw).lower() == 'nan') else str(last_name_raw).strip()
-            
-            # Fallback to full_name column if separate names are missing
-            if (not child_first_name or not child_last_name) and col_full_name:
-                full_name_raw = row.get(col_full_name, '')
-                full_name = '' if (full_name_raw is None or pd.isna(full_name_raw) or str(full_name_raw).lower() == 'nan') else str(full_name_raw).strip()
-                
-                if full_name:
-                    name_parts = full_name.split()
-                    if not child_last_name:
-                        child_last_name = name_parts[-1]  # Last part is surname
-                    if not child_first_name:
-                        child_first_name = ' '.join(name_parts[:-1]) if len(name_parts) > 1 else name_parts[0]
-            
-            # Parse status early for surname logic
-            status_raw = row.get(col_status, '')
-            status_val = '' if (status_raw is None or pd.isna(status_raw) or str(status_raw).lower() == 'nan') else str(status_raw).strip()
-            
-            # Handle missing surname: if no surname and status is בריא/ז״ל/עזב, use status as surname
-            # Otherwise use "XXX" as placeholder and create update task
-            if not child_last_name:
-                if status_val in ['בריא', 'ז״ל', 'עזב']:
-                    # Use status as surname for healthy/deceased/left children
-                    child_last_name = status_val
-                    needs_surname_task = False
-                else:
-                    # Use XXX as placeholder
-                    child_last_name = 'XXX'
-                    needs_surname_task = True
-            else:
-                needs_surname_task = False
-            
-            result = {
-                'row_num': row_num,
-                'child_first_name': child_first_name,
-                'child_last_name': child_last_name,
-                'child_id': '',
-                'status': '',
-                'details': '',
-                'enum_warnings': []
-            }
-            
-            try:
-                # Parse child ID and pad with leading zeros if needed
-                child_id_raw = row.get(col_child_id, '')
-                child_id = '' if (child_id_raw is None or pd.isna(child_id_raw) or str(child_id_raw).lower() == 'nan') else str(child_id_raw).strip()
-                
-                # Pad with leading zeros to make it 9 digits
-                if child_id:
-                    try:
-                        child_id_int_temp = int(child_id)
-                        child_id = str(child_id_int_temp).zfill(9)  # Pad to 9 digits with leading zeros
-                    except ValueError:
-                        child_id = ''
-                
-                result['child_id'] = child_id
-                
-                # Validate required fields
-                if not child_first_name or not child_last_name:
-                    result['status'] = 'Error'
-                    result['details'] = 'חסר שם פרטי או שם משפחה של ילד'
-                    error_count += 1
-                    results.append(result)
-                    continue
-                
-                if not child_id:
-                    result['status'] = 'Error'
-                    result['details'] = 'חסרה תעודת זהות של ילד'
-                    error_count += 1
-                    results.append(result)
-                    continue
-                
-                try:
-                    child_id_int = int(child_id)
-                except ValueError:
-                    result['status'] = 'Error'
-                    result['details'] = f'תעודת זהות לא מספרית: {child_id}'
-                    error_count += 1
-                    results.append(result)
-                    continue
-                
-                # Check if child already exists
-                if Children.objects.filter(child_id=child_id_int).exists():
-                    result['status'] = 'Skipped'
-                    result['details'] = f'תעודת זהות כבר קיימת במערכת'
-                    skipped_count += 1
-                    results.append(result)
-                    continue
-                
-                # Parse birth_date FIRST (needed for both dry-run age check and live import)
-                date_val = row.get('תאריך לידה', '')
-                birth_date = None
-                if date_val and not pd.isna(date_val) and str(date_val).lower() != 'nan':
-                    try:
-                        from datetime import datetime as dt
-                        # If already a datetime object (from pandas), use it directly
-                        if isinstance(date_val, dt):
-                            birth_date = date_val.date()
-                        else:
-                            date_str = str(date_val).strip()
-                            # Try multiple date formats: ISO, EU (dd/mm/yyyy), US (mm/dd/yyyy), dotted, dashed
-                            date_formats = [
-                                '%Y-%m-%d %H:%M:%S',  # ISO with time
-                                '%Y-%m-%d',           # ISO
-                                '%d/%m/%Y',           # EU: dd/mm/yyyy
-                                '%m/%d/%Y',           # US: mm/dd/yyyy
-                                '%d-%m-%Y',           # dd-mm-yyyy
-                                '%m-%d-%Y',           # mm-dd-yyyy
-                                '%d.%m.%Y',           # dd.mm.yyyy
-                                '%m.%d.%Y',           # mm.dd.yyyy
-                                '%d/%m/%y',           # dd/mm/yy (2-digit year)
-                                '%m/%d/%y',           # mm/dd/yy
-                                '%d-%m-%y',           # dd-mm-yy
-                                '%m-%d-%y',           # mm-dd-yy
-                                '%d.%m.%y',           # dd.mm.yy
-                                '%m.%d.%y',           # mm.dd.yy
-                                '%Y/%m/%d',           # yyyy/mm/dd
-                                '%Y.%m.%d',           # yyyy.mm.dd
-                            ]
-                            for fmt in date_formats:
-                                try:
-                                    birth_date = dt.strptime(date_str, fmt).date()
-                                    break
-                                except ValueError:
-                                    continue
-                    except Exception:
-                        birth_date = None
-                
-                # === CREATE RECORD ===
-                # Parse optional fields
-                city_raw = row.get(col_city, '')
-                city_original = '' if (city_raw is None or pd.isna(city_raw) or str(city_raw).lower() == 'nan') else str(city_raw).strip()
-                
-                # Remove commas and extra spaces from city
-                city_original = city_original.replace(',', '').strip() if city_original else ''
-                
-                # Try EXACT matching FIRST (for Excel data manually copied from system)
-                # Only use smart matching functions if exact match fails
-                if not city_original:
-                    result['status'] = 'Error'
-                    result['details'] = 'שגיאה: עיר חסרה (עמודה K) - חובה מלא'
-                    result['enum_warnings'].append('עיר חסרה')
-                    error_count += 1
-                    results.append(result)
-                    continue
-                
-                # **STEP 1: Try EXACT match first** (for manually entered system values)
-                city_found = None
-                for json_city_key in SETTLEMENTS_N_STREETS.keys():
-                    if json_city_key.strip() == city_original:
-                        city_found = json_city_key
-                        break
-                
-                if city_found:
-                    city = city_found  # Use exact match
-                else:
-                    # **STEP 2: Fallback to smart matching** (find_best_city_match with special fallback values)
-                    city, city_was_corrected = find_best_city_match(city_original)
-                    
-                    if city is None:
-                        result['status'] = 'Error'
-                        result['details'] = f'שגיאה: עיר "{city_original}" לא קיימת במערכת (עמודה K)'
-                        result['enum_warnings'].append(f'עיר "{city_original}" לא קיימת במערכת')
-                        error_count += 1
-                        results.append(result)
-                        continue
-                    
-                    # If city was corrected, note it
-                    if city_was_corrected and city != city_original:
-                        result['enum_warnings'].append(f'עיר תוקנה: "{city_original}" → "{city}"')
-                
-                # Parse street and apartment from Excel - now TWO separate columns
-                street_raw = row.get(col_street, '')
-                street_original = '' if (street_raw is None or pd.isna(street_raw) or str(street_raw).lower() == 'nan') else str(street_raw).strip()
-                street_original = street_original.replace(',', '').strip() if street_original else ''
-                
-                apartment_raw = row.get(col_apartment, '')
-                apartment_original = '' if (apartment_raw is None or pd.isna(apartment_raw) or str(apartment_raw).lower() == 'nan') else str(apartment_raw).strip()
-                apartment_original = apartment_original.replace(',', '').strip() if apartment_original else ''
-                
-                # Validate required address fields: street is REQUIRED
-                if not street_original:
-                    result['status'] = 'Error'
-                    result['details'] = 'שגיאה: רחוב חסר (עמודה J) - חובה מלא'
-                    result['enum_warnings'].append('רחוב חסר')
-                    error_count += 1
-                    results.append(result)
-                    continue
-                
-                # Get the city's streets from JSON
-                city_streets = SETTLEMENTS_N_STREETS.get(city, [])
-                
-                # **STEP 1: Try EXACT match first** (for manually entered system values)
-                matched_street = None
-                if street_original in city_streets:
-                    matched_street = street_original  # Use exact match
-                else:
-                    # **STEP 2: Fallback to smart matching** (find_best_street_match with special fallback values)
-                    matched_street, street_was_corrected, is_placeholder = find_best_street_match(street_original, city)
-                    
-                    # If street is not found and no correction was made, it's an error
-                    if matched_street == street_original and not street_was_corrected:
-                        # Check if it exists in the city's streets as fallback
-                        if street_original not in city_streets:
-                            result['status'] = 'Error'
-                            result['details'] = f'שגיאה: רחוב "{street_original}" לא קיים ברשימת הרחובות של "{city}" (עמודה J)'
-                            result['enum_warnings'].append(f'רחוב "{street_original}" לא קיים ברשימת הרחובות של "{city}"')
-                            error_count += 1
-                            results.append(result)
-                            continue
-                    
-                    # If street was corrected, note it
-                    if street_was_corrected and matched_street != street_original:
-                        result['enum_warnings'].append(f'רחוב תוקן: "{street_original}" → "{matched_street}"')
-                
-                # Concatenate street and apartment for storage
-                street_and_apartment = f"{matched_street} {apartment_original}".strip() if apartment_original else matched_street
-                
-                # Parse ALL fields (for both dry-run and real import)
-                phone_raw = row.get(col_phone, '')
-                phone = '' if (phone_raw is None or pd.isna(phone_raw) or str(phone_raw).lower() == 'nan') else str(phone_raw).strip()
-                # Remove commas from phone
-                phone = phone.replace(',', '').strip() if phone else ''
-                # Format phone: remove dashes/spaces, pad to 10 digits with trailing zeros if needed
-                if phone:
-                    phone_normalized = phone.replace('-', '').replace(' ', '').strip()
-                    # Remove any non-digit characters
-                    phone_normalized = ''.join(c for c in phone_normalized if c.isdigit())
-                    # Pad to 10 digits with trailing zeros if fewer than 10
-                    if phone_normalized:
-                        phone_normalized = phone_normalized.ljust(10, '0')  # Pad with trailing zeros
-                    if phone_normalized and len(phone_normalized) == 10:
-                        phone = f"{phone_normalized[:3]}-{phone_normalized[3:]}"  # Format as XXX-XXXXXXX
-                    else:
-                        phone = ''  # Invalid phone
-                else:
-                    phone = ''
-                
-                hospital_raw = row.get(col_hospital, '')
-                hospital = '' if (hospital_raw is None or pd.isna(hospital_raw) or str(hospital_raw).lower() == 'nan') else str(hospital_raw).strip()
-                # Remove commas and trim spaces
-                hospital = hospital.replace(',', '').strip() if hospital else ''
-                
-                diagnosis_raw = row.get(col_diagnosis, '')
-                diagnosis = '' if (diagnosis_raw is None or pd.isna(diagnosis_raw) or str(diagnosis_raw).lower() == 'nan') else str(diagnosis_raw).strip()
-                # Remove commas and trim spaces
-                diagnosis = diagnosis.replace(',', '').strip() if diagnosis else ''
-                
-                # Parse medical state from Excel
-                medical_state_raw = row.get(col_medical_state, '')
-                medical_state = '' if (medical_state_raw is None or pd.isna(medical_state_raw) or str(medical_state_raw).lower() == 'nan') else str(medical_state_raw).strip()
-                
-                # Parse father details from Excel
-                father_name_raw = row.get(col_father_name, '')
-                father_name = '' if (father_name_raw is None or pd.isna(father_name_raw) or str(father_name_raw).lower() == 'nan') else str(father_name_raw).strip()
-                
-                father_phone_raw = row.get(col_father_phone, '')
-                father_phone = '' if (father_phone_raw is None or pd.isna(father_phone_raw) or str(father_phone_raw).lower() == 'nan') else str(father_phone_raw).strip()
-                # Format father phone similar to child phone
-                if father_phone:
-                    father_phone_normalized = father_phone.replace('-', '').replace(' ', '').strip()
-                    father_phone_normalized = ''.join(c for c in father_phone_normalized if c.isdigit())
-                    if father_phone_normalized:
-                        father_phone_normalized = father_phone_normalized.ljust(10, '0')
-                    if father_phone_normalized and len(father_phone_normalized) == 10:
-                        father_phone = f"{father_phone_normalized[:3]}-{father_phone_normalized[3:]}"
-                    else:
-                        father_phone = ''
-                
-                # Parse mother details from Excel
-                mother_name_raw = row.get(col_mother_name, '')
-                mother_name = '' if (mother_name_raw is None or pd.isna(mother_name_raw) or str(mother_name_raw).lower() == 'nan') else str(mother_name_raw).strip()
-                
-                mother_phone_raw = row.get(col_mother_phone, '')
-                mother_phone = '' if (mother_phone_raw is None or pd.isna(mother_phone_raw) or str(mother_phone_raw).lower() == 'nan') else str(mother_phone_raw).strip()
-                # Format mother phone similar to child phone
-                if mother_phone:
-                    mother_phone_normalized = mother_phone.replace('-', '').replace(' ', '').strip()
-                    mother_phone_normalized = ''.join(c for c in mother_phone_normalized if c.isdigit())
-                    if mother_phone_normalized:
-                        mother_phone_normalized = mother_phone_normalized.ljust(10, '0')
-                    if mother_phone_normalized and len(mother_phone_normalized) == 10:
-                        mother_phone = f"{mother_phone_normalized[:3]}-{mother_phone_normalized[3:]}"
-                    else:
-                        mother_phone = ''
-                
-                # Parse tutoring details from Excel
-                tutoring_details_raw = row.get(col_tutoring_details, '')
-                tutoring_details = '' if (tutoring_details_raw is None or pd.isna(tutoring_details_raw) or str(tutoring_details_raw).lower() == 'nan') else str(tutoring_details_raw).strip()
-                
-                # Parse additional info from Excel
-                additional_info_raw = row.get(col_additional_info, '')
-                additional_info = '' if (additional_info_raw is None or pd.isna(additional_info_raw) or str(additional_info_raw).lower() == 'nan') else str(additional_info_raw).strip()
-
-                # Parse is_in_frame from Excel (frame status)
-                is_in_frame_raw = row.get(col_is_in_frame, '')
-                is_in_frame = '' if (is_in_frame_raw is None or pd.isna(is_in_frame_raw) or str(is_in_frame_raw).lower() == 'nan') else str(is_in_frame_raw).strip()
-
-                # Parse coordinator_comments from Excel
-                coordinator_comments_raw = row.get(col_coordinator_comments, '')
-                coordinator_comments = '' if (coordinator_comments_raw is None or pd.isna(coordinator_comments_raw) or str(coordinator_comments_raw).lower() == 'nan') else str(coordinator_comments_raw).strip()
-
-                
-                # Parse diagnosis_date from Excel - ONLY if valid format found, else stay NULL
-                diagnosis_date = None
-                diagnosis_date_raw = row.get(col_diagnosis_date, '')
-                if diagnosis_date_raw and not pd.isna(diagnosis_date_raw) and str(diagnosis_date_raw).lower() != 'nan':
-                    try:
-                        from datetime import datetime as dt
-                        # If already a datetime object (from pandas), use it directly
-                        if isinstance(diagnosis_date_raw, dt):
-                            diagnosis_date = diagnosis_date_raw.date()
-                        else:
-                            date_str = str(diagnosis_date_raw).strip()
-                            # Try multiple date formats
-                            date_formats = [
-                                '%Y-%m-%d %H:%M:%S',  # ISO with time
-                                '%Y-%m-%d',           # ISO
-                                '%d/%m/%Y',           # EU: dd/mm/yyyy
-                                '%m/%d/%Y',           # US: mm/dd/yyyy
-                                '%d-%m-%Y',           # dd-mm-yyyy
-                                '%m-%d-%Y',           # mm-dd-yyyy
-                                '%d.%m.%Y',           # dd.mm.yyyy
-                                '%m.%d.%Y',           # mm.dd.yyyy
-                                '%d/%m/%y',           # dd/mm/yy (2-digit year)
-                                '%m/%d/%y',           # mm/dd/yy
-                                '%d-%m-%y',           # dd-mm-yy
-                                '%m-%d-%y',           # mm-dd-yy
-                                '%d.%m.%y',           # dd.mm.yy
-                                '%m.%d.%y',           # mm.dd.yy
-                                '%Y/%m/%d',           # yyyy/mm/dd
-                                '%Y.%m.%d',           # yyyy.mm.dd
-                            ]
-                            for fmt in date_formats:
-                                try:
-                                    diagnosis_date = dt.strptime(date_str, fmt).date()
-                                    break
-                                except ValueError:
-                                    continue
-                    except Exception:
-                        # If any error occurs during parsing, leave as None
-                        diagnosis_date = None
-                
-                # Parse registration_date from Excel - use as is, else default to today
-                registration_date = datetime.datetime.now().date()  # Default to today
-                registration_date_raw = row.get(col_registration_date, '')
-                if registration_date_raw and not pd.isna(registration_date_raw) and str(registration_date_raw).lower() != 'nan':
-                    try:
-                        from datetime import datetime as dt
-                        if isinstance(registration_date_raw, dt):
-                            registration_date = registration_date_raw.date()
-                        else:
-                            date_str = str(registration_date_raw).strip()
-                            date_formats = [
-                                '%Y-%m-%d %H:%M:%S', '%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y',
-                                '%d-%m-%Y', '%m-%d-%Y', '%d.%m.%Y', '%m.%d.%Y',
-                                '%d/%m/%y', '%m/%d/%y', '%d-%m-%y', '%m-%d-%y',
-                                '%d.%m.%y', '%m.%d.%y', '%Y/%m/%d', '%Y.%m.%d'
-                            ]
-                            for fmt in date_formats:
-                                try:
-                                    registration_date = dt.strptime(date_str, fmt).date()
-                                    break
-                                except ValueError:
-                                    continue
-                    except Exception:
-                        registration_date = datetime.datetime.now().date()
-                
-                # Parse when_completed_treatments from Excel
-                when_completed_treatments = None
-                when_completed_treatments_raw = row.get(col_when_completed_treatments, '')
-                if when_completed_treatments_raw and not pd.isna(when_completed_treatments_raw) and str(when_completed_treatments_raw).lower() != 'nan':
-                    # Just accept the raw value as-is - this is a freeform text field
-                    when_completed_treatments = str(when_completed_treatments_raw).strip()
-                
-                # Parse expected_end_treatment_by_protocol from Excel
-                expected_end_treatment_by_protocol = None
-                treatment_end_protocol_raw = row.get(col_treatment_end_protocol, '')
-                if treatment_end_protocol_raw and not pd.isna(treatment_end_protocol_raw) and str(treatment_end_protocol_raw).lower() != 'nan':
-                    # Just accept the raw value as-is - this is a freeform text field
-                    expected_end_treatment_by_protocol = str(treatment_end_protocol_raw).strip()
-                
-                # Parse completed_treatments boolean from Excel
-                has_completed_treatments_raw = row.get(col_completed_treatments, '')
-                has_completed_treatments = None  # Can be True, False, or None
-                if has_completed_treatments_raw and not pd.isna(has_completed_treatments_raw) and str(has_completed_treatments_raw).lower() != 'nan':
-                    has_completed_str = str(has_completed_treatments_raw).lower().strip()
-                    if has_completed_str in ['true', 'כן', 'yes', '1', 'true']:
-                        has_completed_treatments = True
-                    elif has_completed_str in ['false', 'לא', 'no', '0', 'false']:
-                        has_completed_treatments = False
-                
-                # Parse marital_status from Excel if provided
-                marital_status_raw = row.get(col_marital_status, '')
-                marital_status = '' if (marital_status_raw is None or pd.isna(marital_status_raw) or str(marital_status_raw).lower() == 'nan') else str(marital_status_raw).strip()
-                
-                # Parse tutoring_status from Excel, default to 'למצוא_חונך' if not provided
-                tutoring_status_raw = row.get(col_tutoring_status, '')
-                tutoring_status_val = '' if (tutoring_status_raw is None or pd.isna(tutoring_status_raw) or str(tutoring_status_raw).lower() == 'nan') else str(tutoring_status_raw).strip()
-                # Normalize: convert spaces to underscores for tutoring_status only
-                tutoring_status_normalized = tutoring_status_val.replace(' ', '_') if tutoring_status_val else ''
-                final_tutoring_status = tutoring_status_normalized if tutoring_status_normalized else 'למצוא_חונך'
-                
-                # Feature #3: Check סוג column for maturity (בוגר/ת = mature)
-                # If סוג contains "בוגר", set need_review=False on import
-                sug_raw = row.get('סוג', '')
-                sug_val = '' if (sug_raw is None or pd.isna(sug_raw) or str(sug_raw).lower() == 'nan') else str(sug_raw).strip()
-                dont_need_review_since_mature = 'בוגר' in sug_val  # Matches "בוגר/ת" and "בוגר"
-                
-                # ALSO check age >= 16 for maturity (independent of סוג column)
-                # If child is 16+, also set need_review=False
-                is_mature_by_age = False
-                if birth_date:
-                    from datetime import date as date_class
-                    today = date_class.today()
-                    age = today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
-                    is_mature_by_age = age >= 16
-                
-                # Parse status from Excel - REQUIRED field
-                status_raw = row.get(col_status, '')
-                status_val = '' if (status_raw is None or pd.isna(status_raw) or str(status_raw).lower() == 'nan') else str(status_raw).strip()
-                
-                # Validate that status is provided
-                if not status_val:
-                    result['status'] = 'Error'
-                    result['details'] = f'סטטוס חובה - חסר או ריק'
-                    error_count += 1
-                    results.append(result)
-                    continue
-                
-                # Validate that status is a valid enum value
-                if status_val not in valid_statuses:
-                    result['status'] = 'Error'
-                    result['details'] = f'סטטוס "{status_val}" לא תקין. ערכים חוקיים: {", ".join(valid_statuses)}'
-                    invalid_enum_count += 1
-                    results.append(result)
-                    continue
-                
-                final_status = status_val
-                
-                # Parse gender from Excel - female=True, male=False
-                gender_val = row.get(col_gender, '')
-                if isinstance(gender_val, bool):
-                    gender = gender_val
-                elif isinstance(gender_val, str):
-                    gender = gender_val.lower() in ['true', 'נקבה', 'female', 'f', '1']
-                else:
-                    gender = False
-                
-                # birth_date already parsed earlier (needed for both dry-run and live import)
-                
-                # Parse שיחת ביקורת (review talk) - maps to last_review_talk_conducted
-                # If value is "לא צריך" (string), set need_review=False; otherwise parse as date
-                review_talk_raw = row.get('שיחת ביקורת', '')
-                review_talk_value = '' if (review_talk_raw is None or pd.isna(review_talk_raw) or str(review_talk_raw).lower() == 'nan') else str(review_talk_raw).strip()
-                last_review_talk_conducted = None
-                need_review_from_review_talk = None  # Will be set if "לא צריך" is found
-                
-                if review_talk_value:
-                    if review_talk_value == 'לא צריך':
-                        # If marked as "לא צריך", set need_review to False
-                        need_review_from_review_talk = False
-                    else:
-                        # Try to parse as date - handle multiple date formats including Hebrew months
-                        try:
-                            from datetime import datetime as dt
-                            import re
-                            
-                            # If already a datetime object (from pandas), use it directly
-                            if isinstance(review_talk_raw, dt):
-                                last_review_talk_conducted = review_talk_raw.date()
-                            else:
-                                date_str = review_talk_value
-                                
-                                # Hebrew month names mapping
-                                hebrew_months = {
-                                    'ינואר': '01', 'יוני': '06', 'יולי': '07', 'אוגוסט': '08',
-                                    'ספטמבר': '09', 'אוקטובר': '10', 'נובמבר': '11', 'דצמבר': '12',
-                                    'ספטמבר': '09', 'אוקטובר': '10', 'נובמבר': '11', 'דצמבר': '12',
-                                    'פברואר': '02', 'מרץ': '03', 'אפריל': '04', 'מאי': '05',
-                                    'יוני': '06', 'יולי': '07', 'אגוסטוס': '08',
-                                    # Short forms
-                                    'ינ': '01', 'פב': '02', 'מר': '03', 'אפ': '04', 'מא': '05',
-                                    'יו': '06', 'יול': '07', 'אוג': '08', 'ספ': '09', 'אוק': '10',
-                                    'נו': '11', 'דצ': '12',
-                                }
-                                
-                                # Try to parse Hebrew date format: "D Month" or "D Month YYYY"
-                                for heb_month, month_num in hebrew_months.items():
-                                    if heb_month in date_str:
-                                        # Extract day and year if present
-                                        day_match = re.search(r'(\d{1,2})\s+' + heb_month, date_str)
-                                        year_match = re.search(heb_month + r'.*?(\d{4})', date_str)
-                                        
-                                        if day_match:
-                                            day = int(day_match.group(1))
-                                            year = int(year_match.group(1)) if year_match else datetime.now().year
-                                            try:
-                                                last_review_talk_conducted = dt(year, int(month_num), day).date()
-                                                break
-                                            except ValueError:
-                                                continue
-                                
-                                # If not parsed yet, try standard formats
-                                if not last_review_talk_conducted:
-                                    date_formats = [
-                                        '%Y-%m-%d %H:%M:%S',  # ISO with time
-                                        '%Y-%m-%d',           # ISO
-                                        '%d/%m/%Y',           # EU: dd/mm/yyyy
-                                        '%m/%d/%Y',           # US: mm/dd/yyyy
-                                        '%d-%m-%Y',           # dd-mm-yyyy
-                                        '%m-%d-%Y',           # mm-dd-yyyy
-                                        '%d.%m.%Y',           # dd.mm.yyyy
-                                        '%m.%d.%Y',           # mm.dd.yyyy
-                                        '%d/%m/%y',           # dd/mm/yy (2-digit year)
-                                        '%m/%d/%y',           # mm/dd/yy
-                                        '%d-%m-%y',           # dd-mm-yy
-                                        '%m-%d-%y',           # mm-dd-yy
-                                        '%d.%m.%y',           # dd.mm.yy
-                                        '%m.%d.%y',           # mm.dd.yy
-                                        '%Y/%m/%d',           # yyyy/mm/dd
-                                        '%Y.%m.%d',           # yyyy.mm.dd
-                                        '%Y',                 # Year only
-                                    ]
-                                    for fmt in date_formats:
-                                        try:
-                                            last_review_talk_conducted = dt.strptime(date_str, fmt).date()
-                                            break
-                                        except ValueError:
-                                            continue
-                        except Exception:
-                            last_review_talk_conducted = None
-                
-                # Parse num_of_siblings from Excel - default to 0 if missing or invalid
-                num_of_siblings = 0
-                num_siblings_raw = row.get(col_num_of_siblings, '')
-                if num_siblings_raw and not pd.isna(num_siblings_raw) and str(num_siblings_raw).lower() != 'nan':
-                    try:
-                        num_of_siblings = int(str(num_siblings_raw).strip())
-                        # Validate reasonable range (0-20)
-                        if num_of_siblings < 0 or num_of_siblings > 20:
-                            num_of_siblings = 0
-                    except (ValueError, TypeError):
-                        num_of_siblings = 0
-                
-                # (Address validation already done earlier - applies to both dry-run and wet-run)
-                
-                # Determine responsible_coordinator based on medical status and tutoring status
-                # Pass child_status (final_status) to handle בריא/ז״ל children (they get "ללא")
-                responsible_coordinator = get_responsible_coordinator_for_family(final_tutoring_status, child_status=final_status)
-                
-                # === DUPLICATE DETECTION ===
-                # Check for duplicates: firstname + surname + city + any matching phone field
-                # This prevents accidentally creating duplicate records
-                duplicate_query = Children.objects.filter(
-                    childfirstname=child_first_name,
-                    childsurname=child_last_name,
-                    city=city
-                )
-                
-                is_duplicate = False
-                if duplicate_query.exists():
-                    # Found same name + city, now check if any phone matches
-                    for existing_child in duplicate_query:
-                        # Check if any of the phone fields match
-                        phones_match = False
-                        if phone and existing_child.child_phone_number and phone == existing_child.child_phone_number:
-                            phones_match = True
-                        if father_phone and existing_child.father_phone and father_phone == existing_child.father_phone:
-                            phones_match = True
-                        if mother_phone and existing_child.mother_phone and mother_phone == existing_child.mother_phone:
-                            phones_match = True
-                        
-                        if phones_match:
-                            is_duplicate = True
-                            break
-                
-                if is_duplicate:
-                    result['status'] = 'Skipped'
-                    result['details'] = f'דילוג: דובליקט חשוד - {child_first_name} {child_last_name} ב{city} קיים כבר במערכת עם טלפון תואם'
-                    result['enum_warnings'].append('דובליקט חשוד - בדוק יד')
-                    skipped_count += 1
-                    results.append(result)
-                    continue
-                
-                # ONLY DO DATABASE WRITES IF NOT DRY RUN
-                if not dry_run:
-                    with transaction.atomic():
-                        child = Children.objects.create(
-                            child_id=child_id_int,
-                            childfirstname=child_first_name,
-                            childsurname=child_last_name,
-                            city=city,
-                            child_phone_number=phone if phone else None,
-                            treating_hospital=hospital,
-                            medical_diagnosis=diagnosis,
-                            diagnosis_date=diagnosis_date,
-                            date_of_birth=birth_date,
-                            marital_status=marital_status,
-                            num_of_siblings=num_of_siblings if num_of_siblings is not None else 0,
-                            registrationdate=registration_date,
-                            lastupdateddate=datetime.datetime.now().date(),
-                            status=final_status,
-                            tutoring_status=final_tutoring_status,
-                            responsible_coordinator=responsible_coordinator,
-                            gender=gender,
-                            last_review_talk_conducted=last_review_talk_conducted,
-                            street_and_apartment_number=street_and_apartment,
-                            current_medical_state=medical_state,
-                            when_completed_treatments=when_completed_treatments,
-                            has_completed_treatments=has_completed_treatments,
-                            expected_end_treatment_by_protocol=expected_end_treatment_by_protocol,
-                            father_name=father_name if father_name else None,
-                            father_phone=father_phone if father_phone else None,
-                            mother_name=mother_name if mother_name else None,
-                            mother_phone=mother_phone if mother_phone else None,
-                            details_for_tutoring=tutoring_details if tutoring_details else None,
-                            additional_info=additional_info if additional_info else None,
-                            is_in_frame=is_in_frame if is_in_frame else None,
-                            coordinator_comments=coordinator_comments if coordinator_comments else None,
-                            # Feature #2 + #3: Auto-set need_review based on:
-                            # - Set to False if: בריא/ז״ל status OR "לא צריך" in review_talk column OR בוגר (סוג column) OR age >= 16
-                            # - Otherwise default to True
-                            need_review=False if (final_status in ['בריא', 'ז״ל', 'עזב'] or need_review_from_review_talk is False or dont_need_review_since_mature or is_mature_by_age) else True
-                        )
-                        
-                        # If surname is "XXX" (missing), create עדכון משפחה task for Families Coordinators
-                        if needs_surname_task:
-                            try:
-                                # Get all Families Coordinators to verify missing surnames
-                                coordinators = Staff.objects.filter(
-                                    roles__role_name='Families Coordinator'
-                                ).distinct()
-                                
-                                if coordinators.exists():
-                                    task_desc = f"עדכון שם משפחה חסר לילד/ה {child_first_name} (כרגע: {child_last_name}) - תעודת זהות: {child_id}"
-                                    for coordinator in coordinators:
-                                        Tasks.objects.create(
-                                            task_type='עדכון משפחה',
-                                            description=task_desc,
-                                            assigned_to=coordinator,
-                                            assigned_by=user,
-                                            date_assigned=datetime.datetime.now(),
-                                            status='חדש'
-                                        )
-                            except Exception as e:
-                                # Log task creation failure but don't fail the import
-                                api_logger.warning(f"Failed to create surname update task for child {child_id}: {str(e)}")
-                
-                # RECORD RESULT (for both dry-run and real import)
-                result['status'] = 'OK'
-                result['details'] = f'נוצרה בהצלחה' if not dry_run else 'בדיקה בלבד: משפחה תקינה'
-                success_count += 1
-                results.append(result)
-                
-            except IntegrityError as e:
-                result['status'] = 'Error'
-                result['details'] = f'שגיאת מסד נתונים: {str(e)[:50]}'
-                error_count += 1
-                results.append(result)
-            except Exception as e:
-                result['status'] = 'Error'
-                result['details'] = f'שגיאה כללית: {str(e)[:50]}'
-                error_count += 1
-                results.append(result)
-        
-        # Create result Excel file
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "תוצאות ייבוא"
-        
-        headers = ['שורה', 'שם פרטי ילד', 'שם משפחה ילד', 'תעודת זהות', 'סטטוס ייבוא', 'פרטים', 'אזהרות שדות']
-        header_fill = PatternFill(start_color='4472C4', end_color='4472C4', fill_type='solid')
-        header_font = Font(color='FFFFFF', bold=True)
-        ok_fill = PatternFill(start_color='C6EFCE', end_color='C6EFCE', fill_type='solid')
-        error_fill = PatternFill(start_color='FFC7CE', end_color='FFC7CE', fill_type='solid')
-        warning_fill = PatternFill(start_color='FFEB9C', end_color='FFEB9C', fill_type='solid')
-        
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal='center')
-        
-        for row_idx, result in enumerate(results, 2):
-            ws.cell(row=row_idx, column=1, value=result.get('row_num', ''))
-            ws.cell(row=row_idx, column=2, value=result['child_first_name'])
-            ws.cell(row=row_idx, column=3, value=result['child_last_name'])
-            ws.cell(row=row_idx, column=4, value=result.get('child_id', ''))
-            
-            status_cell = ws.cell(row=row_idx, column=5, value=result['status'])
-            if result['status'] == 'OK':
-                status_cell.fill = ok_fill
-            elif result['status'] == 'Error':
-                status_cell.fill = error_fill
-            elif result['status'] == 'Skipped' or result['status'] == 'Warning':
-                status_cell.fill = warning_fill
-            
-            ws.cell(row=row_idx, column=6, value=result.get('details', ''))
-            
-            # Add enum warnings if any
-            if result.get('enum_warnings'):
-                warnings_text = ' | '.join(result['enum_warnings'])
-                ws.cell(row=row_idx, column=7, value=warnings_text)
-        
-        ws.column_dimensions['A'].width = 8
-        ws.column_dimensions['B'].width = 15
-        ws.column_dimensions['C'].width = 15
-        ws.column_dimensions['D'].width = 15
-        ws.column_dimensions['E'].width = 12
-        ws.column_dimensions['F'].width = 60
-        ws.column_dimensions['G'].width = 80
-        ws.sheet_view.rightToLeft = True
-        
-        result_excel = BytesIO()
-        wb.save(result_excel)
-        result_excel.seek(0)
-        
-        # Log the import action - Log ALL imports (dry-run or live) as long as there are records processed
-        if total_records > 0:
-            log_api_action(
-                request=request,
-                action='CREATE_FAMILY_SUCCESS',
-                affected_tables=['childsmile_app_children'],
-                entity_type='Bulk Import Families',
-                success=True,
-                additional_data={
-                    'total_records': total_records,
-                    'success_count': success_count,
-                    'error_count': error_count,
-                    'skipped_count': skipped_count,
-                    'dry_run': dry_run,
-                    'is_bulk_import': True
-                }
-            )
-        
-        # Return results
-        response_data = {
-            'total': total_records,
-            'success': success_count,
-            'skipped': skipped_count,
-            'error': error_count,
-            'dry_run': dry_run,
-            'message': f'✅ ייבוא הושלם: {success_count} מתוך {total_records} המשפחות יובאו בהצלחה' if success_count > 0 else '❌ לא הצליח לייבא משפחות',
-            'has_errors': error_count > 0 or skipped_count > 0,
-            'result_file_available': True
-        }
-        
-        # If dry_run, return Excel file for preview
-        if dry_run:
-            response = FileResponse(result_excel, content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-            from datetime import datetime as dt
-            response['Content-Disposition'] = f'attachment; filename="import_preview_families_{dt.now().strftime("%Y%m%d_%H%M%S")}.xlsx"'
-            return response
-        
-        # For regular import, return JSON with Excel file bytes embedded as base64
-        result_excel.seek(0)
-        excel_base64 = base64.b64encode(result_excel.read()).decode('utf-8')
-        response_data['result_file'] = excel_base64
-        from datetime import datetime as dt
-        response_data['result_filename'] = f"import_results_families_{dt.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-
-        return JsonResponse(response_data, status=200)
+        # Validation, inserts and the result workbook run in a background job (see import_jobs);
+        # the frontend polls the returned status_url and downloads the result workbook
+        job = submit_import_job(
+            'families',
+            file.name,
+            upload,
+            total_rows=len(df),
+            dry_run=dry_run,
+            requested_by=user.staff_id,
+            audit_context=capture_audit_event(request, 'CREATE_FAMILY_SUCCESS'),
+        )
+        return JsonResponse(import_job_status(job), status=202)
     
     except Exception as e:
         api_logger.error(f"Import families endpoint error: {str(e)}")
@@ -3387,15 +2460,9 @@ def get_settlements_data(request):
         )
     
     try:        
-        # Get all settlements from database
-        settlements = SettlementsStreets.objects.all().values('city_name', 'streets')
-        
-        # Convert to JSON format matching the old JSON structure
-        settlements_dict = {}
-        for settlement in settlements:
-            city_name = settlement['city_name']
-            streets = settlement['streets'] if settlement['streets'] else []
-            settlements_dict[city_name] = streets
+        # Same {city_name: [streets]} structure as the old JSON file, served
+        # from the in-process settlements index instead of a full table read
+        settlements_dict = get_settlement_index().settlements
         
         return JsonResponse(settlements_dict, status=200, safe=False)
     
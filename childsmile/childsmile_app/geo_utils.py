@@ -0,0 +1,493 @@
+"""
+geo_utils.py
+
+City-to-city distance matrix, computed in one vectorized NumPy pass.
+
+Distances used to be computed strictly per pair: every uncached (city1, city2)
+pair seen by calculate_distances() spawned its own background thread
+(async_calculate_and_store_distance) that geocoded both cities and ran the
+haversine formula for that single pair. A matching run therefore kept
+waiting on per-pair work even when both cities' coordinates were already
+sitting in the CityGeoDistance table.
+
+This module takes the city coordinates already known to the system and
+computes the great-circle distance matrix at once:
+
+  - collect_known_city_coordinates()   one query → {city: (lat, lon)}
+  - haversine_matrix_km(lats, lons)    N×N km matrix (same rounding as the
+                                       per-pair formula: ceil of km)
+  - precompute_city_distances()        writes only missing/changed pairs into
+                                       CityGeoDistance, so calculate_distances() /
+                                       the PossibleMatches SQL keep doing their
+                                       O(1) indexed lookups. Only the pairs that
+                                       can be matched are stored: cities of
+                                       Children × cities of SignedUp, one
+                                       direction (lookups are symmetric) — not
+                                       the full triangle of every known settlement
+  - fill_distances_from_known_coordinates(pairs)
+                                       used by calculate_distances() for pairs
+                                       that appeared since the last precompute;
+                                       computed in memory, stored by the
+                                       background writer (queue_city_distances)
+
+The matrix is persisted in CityGeoDistance (not a file) on purpose: workers
+run on several gunicorn processes/instances and the DB is the one place they
+all share (see migrate_distances_to_db.py — distances moved off JSON files
+for the same reason).
+
+City coordinates come from the CityLocation gazetteer (add_city_location_table.sql):
+
+  - get_city_locations(cities)         one primary-key query, NEVER touches the
+                                       network; unknown cities are registered as
+                                       pending and returned without coordinates
+  - geocode_pending_cities()           background-only geocoding of pending rows
+                                       (Nominatim, 1 request/second, bounded
+                                       attempts per city, until every pending
+                                       city was tried — CITY_GEOCODE_BATCH_LIMIT
+                                       caps a run)
+
+Run: python manage.py precompute_city_distances  (also scheduled nightly)
+     python manage.py geocode_city_locations     (also scheduled nightly)
+"""
+
+import os
+import threading
+import time
+import numpy as np
+from django.db import connection
+from django.db.models import F
+from django.utils import timezone
+from .models import Children, CityGeoDistance, CityLocation, SignedUp
+from .logger import api_logger
+
+EARTH_RADIUS_KM = 6371
+WRITE_BATCH_SIZE = 2000
+
+# Nominatim usage policy: max 1 request/second, identify the application
+GEOCODER_USER_AGENT = "childsmile_app"
+GEOCODE_DELAY_SECONDS = 1.0
+GEOCODE_TIMEOUT_SECONDS = 10
+GEOCODE_BATCH_LIMIT = 100  # pending cities read per query
+GEOCODE_MAX_ATTEMPTS = 5
+
+
+def _env_int(name, default):
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def get_city_locations(cities):
+    """
+    Return {city: {"latitude": lat, "longitude": lon}} for the given cities,
+    from the local CityLocation table in a single indexed query.
+
+    Cities not in the table yet are registered (coordinates NULL) so the
+    background geocoder picks them up; they are simply absent from the result.
+    No network call is ever made here — safe to use on the request path.
+
+    :param cities: iterable of city names
+    """
+    cities = {c.strip() for c in cities if c and c.strip()}
+    if not cities:
+        return {}
+
+    locations = {}
+    seen = set()
+    for city, lat, lon in CityLocation.objects.filter(city_name__in=cities).values_list(
+        "city_name", "latitude", "longitude"
+    ):
+        seen.add(city)
+        if lat is not None and lon is not None:
+            locations[city] = {"latitude": lat, "longitude": lon}
+
+    register_pending_cities(cities - seen)
+    return locations
+
+
+def register_pending_cities(cities):
+    """
+    Add cities missing from the gazetteer with NULL coordinates, so the
+    background geocoder (geocode_pending_cities) picks them up. Existing rows
+    are left alone.
+    """
+    cities = {c.strip() for c in cities if c and c.strip()}
+    if not cities:
+        return
+    try:
+        CityLocation.objects.bulk_create(
+            [CityLocation(city_name=city, source="request") for city in cities],
+            ignore_conflicts=True,
+        )
+        api_logger.debug(f"DEBUG: Registered up to {len(cities)} new cities for background geocoding")
+    except Exception as e:
+        api_logger.warning(f"WARNING: Could not register cities for geocoding: {str(e)[:100]}")
+
+
+def set_city_location(city, latitude, longitude, source="manual"):
+    """Insert or overwrite the coordinates of one city in the gazetteer."""
+    CityLocation.objects.update_or_create(
+        city_name=city.strip(),
+        defaults={"latitude": latitude, "longitude": longitude, "source": source},
+    )
+
+
+def geocode_city(geolocator, city):
+    """
+    Geocode one city name (Israel first, then the bare name).
+    :return: (latitude, longitude) or None when not found
+    """
+    location = geolocator.geocode(f"{city}, ישראל", timeout=GEOCODE_TIMEOUT_SECONDS)
+    if not location:
+        time.sleep(GEOCODE_DELAY_SECONDS)
+        location = geolocator.geocode(city, timeout=GEOCODE_TIMEOUT_SECONDS)
+    if not location:
+        return None
+    return location.latitude, location.longitude
+
+
+def geocode_pending_cities(limit=None, max_attempts=GEOCODE_MAX_ATTEMPTS):
+    """
+    Geocode CityLocation rows that have no coordinates yet. Background only
+    (scheduler / management command) — this is the one place that calls the
+    geocoding API. Requests are spaced GEOCODE_DELAY_SECONDS apart; a city that
+    keeps failing is retried on later runs until max_attempts is reached.
+
+    Pending cities are read GEOCODE_BATCH_LIMIT at a time, cities that children
+    or volunteers live in first, and the run keeps going until every pending
+    city was tried once (or `limit` cities were tried).
+
+    :param limit: max cities to try in this run; None reads CITY_GEOCODE_BATCH_LIMIT
+                  (default 0 = no limit — the ~1,300 seeded settlements take
+                  about half an hour at 1 request/second)
+    :return: dict with stats {'pending', 'geocoded', 'not_found', 'errors'}
+    """
+    from geopy.exc import GeocoderTimedOut, GeocoderUnavailable
+    from geopy.geocoders import Nominatim
+
+    if limit is None:
+        limit = _env_int('CITY_GEOCODE_BATCH_LIMIT', 0)
+    child_cities, volunteer_cities = collect_used_cities()
+    used_cities = child_cities | volunteer_cities
+
+    stats = {'pending': 0, 'geocoded': 0, 'not_found': 0, 'errors': 0}
+    geolocator = None
+    tried = set()
+    while not limit or len(tried) < limit:
+        pending = CityLocation.objects.filter(
+            latitude__isnull=True, geocode_attempts__lt=max_attempts,
+        ).exclude(city_name__in=tried)
+        # Cities somebody lives in first — they are the ones the matrix needs
+        batch = list(
+            pending.filter(city_name__in=used_cities)
+            .order_by("geocode_attempts", "city_name")
+            .values_list("city_name", flat=True)[:GEOCODE_BATCH_LIMIT]
+        ) or list(
+            pending.order_by("geocode_attempts", "city_name")
+            .values_list("city_name", flat=True)[:GEOCODE_BATCH_LIMIT]
+        )
+        if limit:
+            batch = batch[:limit - len(tried)]
+        if not batch:
+            break
+        if geolocator is None:
+            geolocator = Nominatim(user_agent=GEOCODER_USER_AGENT)
+
+        for city in batch:
+            if tried:
+                time.sleep(GEOCODE_DELAY_SECONDS)
+            tried.add(city)
+            try:
+                coordinates = geocode_city(geolocator, city)
+            except (GeocoderUnavailable, GeocoderTimedOut) as e:
+                api_logger.debug(f"DEBUG: Geocoding API unavailable for city '{city}': {type(e).__name__}")
+                stats['errors'] += 1
+                coordinates = False
+            except Exception as e:
+                api_logger.debug(f"DEBUG: Unexpected error geocoding city '{city}': {type(e).__name__}: {str(e)[:100]}")
+                stats['errors'] += 1
+                coordinates = False
+
+            if coordinates:
+                CityLocation.objects.filter(city_name=city).update(
+                    latitude=coordinates[0],
+                    longitude=coordinates[1],
+                    source="geocoder",
+                    geocode_attempts=F("geocode_attempts") + 1,
+                    last_geocode_attempt=timezone.now(),
+                    updated_at=timezone.now(),
+                )
+                stats['geocoded'] += 1
+            else:
+                CityLocation.objects.filter(city_name=city).update(
+                    geocode_attempts=F("geocode_attempts") + 1,
+                    last_geocode_attempt=timezone.now(),
+                )
+                if coordinates is None:
+                    stats['not_found'] += 1
+
+    stats['pending'] = len(tried)
+    if tried:
+        api_logger.info(f"City geocoding run finished: {stats}")
+    return stats
+
+
+def collect_known_city_coordinates(cities=None):
+    """
+    Return {city: (latitude, longitude)} for every city with known coordinates,
+    read from the CityLocation gazetteer in a single query.
+
+    :param cities: optional iterable of city names to restrict the lookup to
+    """
+    rows = CityLocation.objects.filter(latitude__isnull=False, longitude__isnull=False)
+    if cities is not None:
+        cities = [c for c in cities if c]
+        if not cities:
+            return {}
+        rows = rows.filter(city_name__in=cities)
+
+    return {
+        city: (lat, lon)
+        for city, lat, lon in rows.values_list("city_name", "latitude", "longitude")
+    }
+
+
+def collect_used_cities():
+    """
+    Cities that can appear in a match: (child cities, signed-up volunteer cities),
+    trimmed and de-duplicated, read with two DISTINCT queries.
+    """
+    def distinct_cities(model):
+        return {
+            city.strip()
+            for city in model.objects.values_list("city", flat=True).distinct()
+            if city and city.strip()
+        }
+    return distinct_cities(Children), distinct_cities(SignedUp)
+
+
+def haversine_matrix_km(lats, lons):
+    """
+    Great-circle distances between every pair of points, vectorized.
+
+    :param lats: 1-D sequence of latitudes (degrees)
+    :param lons: 1-D sequence of longitudes (degrees)
+    :return: N×N int32 matrix of distances in km, rounded up (ceil) to whole km
+    """
+    lat = np.radians(np.asarray(lats, dtype=np.float64))
+    lon = np.radians(np.asarray(lons, dtype=np.float64))
+
+    dlat = lat[None, :] - lat[:, None]
+    dlon = lon[None, :] - lon[:, None]
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat)[:, None] * np.cos(lat)[None, :] * np.sin(dlon / 2) ** 2
+    a = np.clip(a, 0.0, 1.0)
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    return np.ceil(EARTH_RADIUS_KM * c).astype(np.int32)
+
+
+def _existing_pair_distances(cities=None):
+    """{(city1, city2): distance} for complete cached pairs, stored direction only."""
+    rows = CityGeoDistance.objects.filter(
+        distance__isnull=False,
+        city1_latitude__isnull=False,
+        city2_latitude__isnull=False,
+    ).exclude(city2="")
+    if cities is not None:
+        rows = rows.filter(city1__in=cities, city2__in=cities)
+    return {(c1, c2): d for c1, c2, d in rows.values_list("city1", "city2", "distance")}
+
+
+def _write_pairs(names, coords, matrix, index_pairs, existing):
+    """
+    Upsert the given (i, j) index pairs into CityGeoDistance, skipping pairs
+    that are already cached with the same distance. A pair cached in the
+    reverse direction is updated in that direction (no duplicate rows).
+    :return: number of rows written
+    """
+    to_write = []
+    for i, j in index_pairs:
+        city_a, city_b = names[i], names[j]
+        distance = int(matrix[i, j])
+        if (city_a, city_b) not in existing and (city_b, city_a) in existing:
+            city_a, city_b, i, j = city_b, city_a, j, i
+        if existing.get((city_a, city_b)) == distance:
+            continue
+        to_write.append(CityGeoDistance(
+            city1=city_a,
+            city2=city_b,
+            city1_latitude=coords[i][0],
+            city1_longitude=coords[i][1],
+            city2_latitude=coords[j][0],
+            city2_longitude=coords[j][1],
+            distance=distance,
+        ))
+
+    for start in range(0, len(to_write), WRITE_BATCH_SIZE):
+        CityGeoDistance.objects.bulk_create(
+            to_write[start:start + WRITE_BATCH_SIZE],
+            update_conflicts=True,
+            unique_fields=["city1", "city2"],
+            update_fields=[
+                "city1_latitude", "city1_longitude",
+                "city2_latitude", "city2_longitude",
+                "distance", "updated_at",
+            ],
+        )
+    return len(to_write)
+
+
+def precompute_city_distances():
+    """
+    Compute the distances between every child city and every signed-up
+    volunteer city with known coordinates, and store the missing/changed
+    pairs in CityGeoDistance. Settlements nobody lives in are skipped — the
+    gazetteer holds ~1,300 of them, and their full triangle (~850k rows) would
+    be written and loaded for nothing.
+
+    :return: dict with stats {'cities', 'pairs', 'written'}
+    """
+    child_cities, volunteer_cities = collect_used_cities()
+    coordinates = collect_known_city_coordinates(child_cities | volunteer_cities)
+    names = sorted(coordinates)
+    if not names:
+        return {'cities': 0, 'pairs': 0, 'written': 0}
+
+    coords = [coordinates[name] for name in names]
+    matrix = haversine_matrix_km([c[0] for c in coords], [c[1] for c in coords])
+
+    # Child city × volunteer city, folded onto the upper triangle (including
+    # the diagonal for same-city rows) — lookups are symmetric
+    child_idx = [i for i, name in enumerate(names) if name in child_cities]
+    volunteer_idx = [i for i, name in enumerate(names) if name in volunteer_cities]
+    needed = np.zeros((len(names), len(names)), dtype=bool)
+    needed[np.ix_(child_idx, volunteer_idx)] = True
+    rows_idx, cols_idx = np.nonzero(np.triu(needed | needed.T))
+    written = _write_pairs(names, coords, matrix, zip(rows_idx, cols_idx), _existing_pair_distances(names))
+
+    stats = {'cities': len(names), 'pairs': len(rows_idx), 'written': written}
+    api_logger.info(f"City distance matrix precomputed: {stats}")
+    return stats
+
+
+def _pair_matrix(city_pairs, coordinates):
+    """(names, index, coords, matrix) for the cities of the given pairs."""
+    names = sorted({c for pair in city_pairs for c in pair})
+    index = {name: i for i, name in enumerate(names)}
+    coords = [coordinates[name] for name in names]
+    matrix = haversine_matrix_km([c[0] for c in coords], [c[1] for c in coords])
+    return names, index, coords, matrix
+
+
+def store_city_distances(city_pairs):
+    """
+    Compute and store the distances of the given city pairs whose two cities
+    have known coordinates, then patch the PossibleMatches rows of those pairs.
+    Cities without coordinates are registered for the background geocoder;
+    their pairs are stored by the nightly precompute once geocoded.
+    Runs on the background writer thread (queue_city_distances).
+    :return: number of CityGeoDistance rows written
+    """
+    from .matching_utils import apply_pair_distance
+
+    city_pairs = list(city_pairs)
+    cities = {c for pair in city_pairs for c in pair}
+    coordinates = collect_known_city_coordinates(cities)
+    register_pending_cities(cities - set(coordinates))
+    known_pairs = [p for p in city_pairs if p[0] in coordinates and p[1] in coordinates]
+    if not known_pairs:
+        return 0
+
+    names, index, coords, matrix = _pair_matrix(known_pairs, coordinates)
+    index_pairs = [(index[a], index[b]) for a, b in known_pairs]
+    written = _write_pairs(names, coords, matrix, index_pairs, _existing_pair_distances(names))
+    for i, j in index_pairs:
+        apply_pair_distance(names[i], names[j], int(matrix[i, j]))
+    return written
+
+
+# Background writer: pairs queued by request threads, stored by ONE thread per
+# process (one DB connection) — started on demand, exits when the queue is empty
+_queued_pairs = set()
+_queue_lock = threading.Lock()
+_writer_thread = None
+
+
+def queue_city_distances(city_pairs):
+    """Queue city pairs for store_city_distances() on the background writer thread."""
+    global _writer_thread
+    pairs = {tuple(sorted(pair)) for pair in city_pairs if pair[0] and pair[1]}
+    if not pairs:
+        return
+    with _queue_lock:
+        _queued_pairs.update(pairs)
+        if _writer_thread is None or not _writer_thread.is_alive():
+            _writer_thread = threading.Thread(target=_drain_queued_pairs, name="city-distance-writer", daemon=True)
+            _writer_thread.start()
+
+
+def _drain_queued_pairs():
+    global _writer_thread
+    while True:
+        with _queue_lock:
+            pairs = list(_queued_pairs)
+            _queued_pairs.clear()
+            if not pairs:
+                _writer_thread = None
+                return
+        try:
+            written = store_city_distances(pairs)
+            api_logger.debug(f"DEBUG: Stored {written} of {len(pairs)} queued city distances")
+        except Exception as e:
+            api_logger.warning(f"WARNING: Could not store {len(pairs)} queued city distances: {str(e)[:100]}")
+        finally:
+            connection.close()
+
+
+def fill_distances_from_known_coordinates(city_pairs):
+    """
+    Compute distances for uncached city pairs whose two cities already have
+    known coordinates — one coordinate query + one vectorized pass, no
+    geocoding. Nothing is written on the calling (request) thread: the pairs
+    are handed to the background writer, which also registers the cities
+    without coordinates for the geocoder.
+
+    :param city_pairs: iterable of (city1, city2) tuples missing from the cache
+    :return: (resolved, unresolved) where resolved is a dict in the
+             get_city_distance_map() format (both directions) and unresolved
+             is the list of pairs that still need geocoding
+    """
+    city_pairs = list(city_pairs)
+    if not city_pairs:
+        return {}, []
+
+    coordinates = collect_known_city_coordinates({c for pair in city_pairs for c in pair})
+    known_pairs = [p for p in city_pairs if p[0] in coordinates and p[1] in coordinates]
+    unresolved = [p for p in city_pairs if p[0] not in coordinates or p[1] not in coordinates]
+
+    # Stored (and unknown cities registered for geocoding) off the request thread
+    queue_city_distances(city_pairs)
+    if not known_pairs:
+        return {}, unresolved
+
+    names, index, coords, matrix = _pair_matrix(known_pairs, coordinates)
+    index_pairs = [(index[a], index[b]) for a, b in known_pairs]
+
+    resolved = {}
+    for i, j in index_pairs:
+        distance = int(matrix[i, j])
+        resolved[(names[i], names[j])] = {
+            "distance": distance,
+            "city1_latitude": coords[i][0],
+            "city1_longitude": coords[i][1],
+            "city2_latitude": coords[j][0],
+            "city2_longitude": coords[j][1],
+        }
+        resolved[(names[j], names[i])] = {
+            "distance": distance,
+            "city1_latitude": coords[j][0],
+            "city1_longitude": coords[j][1],
+            "city2_latitude": coords[i][0],
+            "city2_longitude": coords[i][1],
+        }
+    return resolved, unresolved
@@ -0,0 +1,447 @@
+"""
+import_jobs.py
+
+Background job queue for the bulk Excel imports (families, volunteers).
+
+import_families_endpoint / import_volunteers_endpoint used to validate every
+row, insert the records and build the result workbook inside the HTTP
+request — a large file kept a gunicorn worker busy past the proxy timeout,
+the user saw no progress, and a worker restart lost the whole import
+halfway through.
+
+Now:
+  - The endpoints only check the upload and call submit_import_job(), which
+    stores the file in an ImportJob row (add_import_jobs_table.sql) and
+    returns a job id; the frontends poll GET /api/import/jobs/<id>/ for the
+    progress and download the result workbook from .../result/.
+  - A pool of IMPORT_WORKERS threads per process claims queued rows
+    (SELECT ... FOR UPDATE SKIP LOCKED) and feeds the sheet to the importer
+    (family_import.FamiliesImport / volunteer_import.VolunteersImport)
+    IMPORT_CHUNK_SIZE rows at a time. A chunk's inserts and its checkpoint
+    (processed_rows, counts, per-row results, heartbeat) commit in one
+    transaction, so a job whose worker died is claimed again once its
+    heartbeat is IMPORT_JOB_STALE seconds old and resumes after the last
+    committed chunk — no row is imported twice.
+  - Dry runs (the preview) go through the same pipeline without the inserts.
+    They always restart from the first row, as the in-file duplicate check
+    needs the earlier chunks.
+  - cancel_import_job() stops a job after its current chunk; the rows of the
+    committed chunks stay imported and the partial result workbook is kept.
+    resume_import_job() re-queues a cancelled / failed job from its checkpoint.
+  - sweep_import_jobs() — ONE periodic scheduler job — fails jobs that died
+    IMPORT_MAX_ATTEMPTS times, deletes jobs IMPORT_JOB_RETENTION_HOURS after
+    they finish (the rows hold the uploaded personal data) and wakes the pool
+    for orphaned queued / stale jobs.
+
+Environment:
+  IMPORT_WORKERS               worker threads per process (default 1)
+  IMPORT_CHUNK_SIZE            rows per chunk / checkpoint (default 500)
+  IMPORT_JOB_STALE             seconds without a heartbeat after which a running job is reclaimed (default 300)
+  IMPORT_MAX_ATTEMPTS          claims before a repeatedly dying job is failed (default 3)
+  IMPORT_JOB_RETENTION_HOURS   hours a finished job (upload and results) is kept (default 24)
+  IMPORT_POLL_INTERVAL         seconds between idle queue polls of a worker (default 30)
+"""
+
+import json
+import os
+import threading
+import uuid
+from datetime import timedelta
+from io import BytesIO
+import pandas as pd
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from .models import ImportJob
+from .audit_utils import submit_audit_event
+from .settlements_index import get_settlement_index
+from .job_workers import JobWorkerPool
+from .logger import api_logger
+
+FINISHED_STATUSES = (ImportJob.STATUS_COMPLETED, ImportJob.STATUS_FAILED, ImportJob.STATUS_CANCELLED)
+RESULT_STATUSES = (ImportJob.STATUS_COMPLETED, ImportJob.STATUS_CANCELLED)
+
+
+def _families_importer(df, dry_run, counts):
+    from .family_import import FamiliesImport
+    # Rebuilt only if the settlements table changed since it was built
+    return FamiliesImport(df, get_settlement_index(revalidate=True), dry_run=dry_run, counts=counts)
+
+
+def _families_workbook(results):
+    from .family_import import build_families_workbook
+    return build_families_workbook(results)
+
+
+def _volunteers_importer(df, dry_run, counts):
+    from .volunteer_import import VolunteersImport
+    return VolunteersImport(df, get_settlement_index(), dry_run=dry_run, counts=counts)
+
+
+def _volunteers_workbook(results):
+    from .volunteer_import import build_volunteers_workbook
+    return build_volunteers_workbook(results)
+
+
+# Per kind: importer / workbook factories, the audit entry and the texts the frontends show
+IMPORT_KINDS = {
+    'families': {
+        'importer': _families_importer,
+        'workbook': _families_workbook,
+        'audit_action': 'CREATE_FAMILY_SUCCESS',
+        'affected_tables': ['childsmile_app_children'],
+        'entity_type': 'Bulk Import Families',
+        'breakdown': (),
+        'success_message': '✅ ייבוא הושלם: {success} מתוך {total} המשפחות יובאו בהצלחה',
+        'failure_message': '❌ לא הצליח לייבא משפחות',
+        'preview_prefix': 'import_preview_families_',
+        'results_prefix': 'import_results_families_',
+    },
+    'volunteers': {
+        'importer': _volunteers_importer,
+        'workbook': _volunteers_workbook,
+        'audit_action': 'CREATE_VOLUNTEER_SUCCESS',
+        'affected_tables': ['childsmile_app_signedup', 'childsmile_app_staff', 'childsmile_app_general_volunteer', 'childsmile_app_tutors', 'childsmile_app_pending_tutor'],
+        'entity_type': 'Bulk Import',
+        'breakdown': ('general_volunteer', 'tutor_with_tutee', 'tutor_no_tutee', 'pending_tutor'),
+        'success_message': '✅ ייבוא הושלם: {success} מתוך {total} הרשומות יובאו בהצלחה',
+        'failure_message': '❌ לא הצליח לייבא רשומות',
+        'preview_prefix': 'import_preview_',
+        'results_prefix': 'import_results_',
+    },
+}
+
+
+def _env_int(name, default):
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+class ImportJobLost(Exception):
+    """The job was reclaimed by another worker (stale heartbeat) — this run must stop."""
+
+
+def _json_default(value):
+    # numpy scalars that slip into the per-row results
+    try:
+        return value.item()
+    except AttributeError:
+        return str(value)
+
+
+def submit_import_job(kind, file_name, upload, total_rows, dry_run, requested_by, audit_context):
+    """
+    Queue an import job.
+
+    :param kind: 'families' | 'volunteers'
+    :param file_name: name of the uploaded .xlsx
+    :param upload: the uploaded file's bytes
+    :param total_rows: number of data rows in the sheet
+    :param requested_by: staff_id of the requesting user
+    :param audit_context: audit_utils.capture_audit_event() of the request — the
+        audit entry is written by the worker when the job finishes
+    :return: the new ImportJob
+    """
+    context = {key: value for key, value in audit_context.items() if key != 'timestamp'}
+    with transaction.atomic():
+        job = ImportJob.objects.create(
+            job_id=str(uuid.uuid4()),
+            kind=kind,
+            dry_run=dry_run,
+            file_name=file_name[:255],
+            upload=upload,
+            total_rows=total_rows,
+            counts={},
+            audit_context=context,
+            requested_by=requested_by,
+        )
+        transaction.on_commit(get_import_pool().wake)
+
+    api_logger.info(f"📥 Queued {kind} import job {job.job_id} ({total_rows} rows, dry_run={dry_run})")
+    return job
+
+
+def _claimable():
+    stale_before = timezone.now() - timedelta(seconds=_env_int('IMPORT_JOB_STALE', 300))
+    return Q(status=ImportJob.STATUS_QUEUED) | Q(
+        status=ImportJob.STATUS_RUNNING,
+        heartbeat_at__lt=stale_before,
+        attempt__lt=_env_int('IMPORT_MAX_ATTEMPTS', 3),
+    )
+
+
+def claim_next_import_job():
+    """
+    Mark the oldest queued job — or a running job whose worker died — as
+    running and return it (None if there is nothing to do).
+    """
+    with transaction.atomic():
+        job = (
+            ImportJob.objects.select_for_update(skip_locked=True)
+            .defer('results', 'result_file')
+            .filter(_claimable())
+            .order_by('created_at')
+            .first()
+        )
+        if job is None:
+            return None
+        if job.status == ImportJob.STATUS_RUNNING:
+            api_logger.warning(f"⚠️ Import job {job.job_id} lost its worker, resuming at row {job.processed_rows}")
+        now = timezone.now()
+        job.status = ImportJob.STATUS_RUNNING
+        job.started_at = job.started_at or now
+        job.heartbeat_at = now
+        job.attempt += 1
+        job.save(update_fields=['status', 'started_at', 'heartbeat_at', 'attempt'])
+    return job
+
+
+def _checkpoint(job, processed_rows, counts, results):
+    """
+    Record a processed chunk in the caller's transaction.
+    :return: True if a cancel was requested
+    :raises ImportJobLost: another worker owns the job now
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            UPDATE childsmile_app_importjob
+               SET processed_rows = %s,
+                   counts = %s::jsonb,
+                   results = results || %s::jsonb,
+                   heartbeat_at = NOW()
+             WHERE job_id = %s AND attempt = %s AND status = %s
+            RETURNING cancel_requested
+            """,
+            [
+                processed_rows,
+                json.dumps(counts),
+                json.dumps(results, ensure_ascii=False, default=_json_default),
+                job.job_id,
+                job.attempt,
+                ImportJob.STATUS_RUNNING,
+            ],
+        )
+        row = cursor.fetchone()
+    if row is None:
+        raise ImportJobLost(job.job_id)
+    return row[0]
+
+
+def _owned(job):
+    """Queryset of the job row, as long as this run still owns it."""
+    return ImportJob.objects.filter(job_id=job.job_id, attempt=job.attempt, status=ImportJob.STATUS_RUNNING)
+
+
+def _write_audit_entry(job, counts, cancelled):
+    spec = IMPORT_KINDS[job.kind]
+    additional_data = {
+        'total_records': job.total_rows,
+        'success_count': counts.get('success', 0),
+        'error_count': counts.get('error', 0),
+        'skipped_count': counts.get('skipped', 0),
+        'dry_run': job.dry_run,
+        'is_bulk_import': True,
+        'import_job_id': job.job_id,
+    }
+    if spec['breakdown']:
+        additional_data['breakdown'] = {key: counts.get(key, 0) for key in spec['breakdown']}
+    if cancelled:
+        additional_data['cancelled'] = True
+        additional_data['processed_records'] = job.processed_rows
+
+    event = dict(job.audit_context or {})
+    event.update({
+        'action': spec['audit_action'],
+        'timestamp': timezone.now(),
+        'affected_tables': spec['affected_tables'],
+        'entity_type': spec['entity_type'],
+        'entity_ids': [],
+        'status_code': 200,
+        'success': True,
+        'error_message': None,
+        'additional_data': additional_data,
+    })
+    try:
+        submit_audit_event(event)
+    except Exception as e:
+        api_logger.error(f"Failed to create audit log for import job {job.job_id}: {str(e)}")
+
+
+def run_import_job(job):
+    """Process one claimed job from its checkpoint and record the outcome on its row."""
+    spec = IMPORT_KINDS[job.kind]
+    chunk_size = max(1, _env_int('IMPORT_CHUNK_SIZE', 500))
+    try:
+        df = pd.read_excel(BytesIO(bytes(job.upload)), dtype=str)
+
+        if job.dry_run and job.processed_rows:
+            # A preview has nothing in the database to resume from
+            _owned(job).update(processed_rows=0, counts={}, results=[])
+            job.processed_rows, job.counts = 0, {}
+
+        importer = spec['importer'](df, job.dry_run, job.counts)
+        cancelled = job.cancel_requested
+        start = job.processed_rows
+        while start < len(df) and not cancelled:
+            chunk = df.iloc[start:start + chunk_size]
+            with transaction.atomic():
+                results = importer.process_chunk(chunk)
+                cancelled = _checkpoint(job, start + len(chunk), importer.counts, results)
+            start += len(chunk)
+            job.processed_rows = start
+            api_logger.debug(f"DEBUG: Import job {job.job_id}: {start}/{len(df)} rows")
+
+        results = ImportJob.objects.filter(job_id=job.job_id).values_list('results', flat=True).first() or []
+        finished = _owned(job).update(
+            status=ImportJob.STATUS_CANCELLED if cancelled else ImportJob.STATUS_COMPLETED,
+            result_file=spec['workbook'](results),
+            finished_at=timezone.now(),
+        )
+        if not finished:
+            raise ImportJobLost(job.job_id)
+
+        if job.total_rows > 0:
+            _write_audit_entry(job, importer.counts, cancelled)
+        if cancelled:
+            api_logger.info(f"🛑 {job.kind} import job {job.job_id} cancelled after {job.processed_rows} rows")
+        else:
+            api_logger.info(
+                f"✅ {job.kind} import job {job.job_id} done: {importer.counts.get('success', 0)}/{job.total_rows} rows"
+            )
+    except ImportJobLost:
+        api_logger.warning(f"⚠️ Import job {job.job_id} was taken over by another worker, stopping this run")
+    except Exception as e:
+        _owned(job).update(status=ImportJob.STATUS_FAILED, error=str(e)[:1000], finished_at=timezone.now())
+        api_logger.error(f"❌ {job.kind} import job {job.job_id} failed: {str(e)[:200]}")
+    return job
+
+
+def cancel_import_job(job_id):
+    """
+    Cancel a queued job at once, or ask a running one to stop after its current chunk.
+    :return: the ImportJob, or None if unknown
+    """
+    with transaction.atomic():
+        job = ImportJob.objects.select_for_update().defer('upload', 'result_file').filter(job_id=job_id).first()
+        if job is None:
+            return None
+        if job.status == ImportJob.STATUS_QUEUED:
+            job.status = ImportJob.STATUS_CANCELLED
+            job.result_file = IMPORT_KINDS[job.kind]['workbook'](job.results or [])
+            job.finished_at = timezone.now()
+            job.save(update_fields=['status', 'result_file', 'finished_at'])
+        elif job.status == ImportJob.STATUS_RUNNING:
+            job.cancel_requested = True
+            job.save(update_fields=['cancel_requested'])
+    api_logger.info(f"🛑 Cancel requested for import job {job_id} ({job.status})")
+    return job
+
+
+def resume_import_job(job_id):
+    """
+    Re-queue a cancelled / failed job; it continues after its last committed chunk.
+    :return: the ImportJob, or None if unknown or not resumable
+    """
+    with transaction.atomic():
+        job = ImportJob.objects.select_for_update().defer('upload', 'results', 'result_file').filter(job_id=job_id).first()
+        if job is None or job.status not in (ImportJob.STATUS_CANCELLED, ImportJob.STATUS_FAILED):
+            return None
+        job.status = ImportJob.STATUS_QUEUED
+        job.cancel_requested = False
+        job.error = None
+        job.finished_at = None
+        job.result_file = None
+        job.attempt = 0
+        job.save(update_fields=['status', 'cancel_requested', 'error', 'finished_at', 'result_file', 'attempt'])
+        transaction.on_commit(get_import_pool().wake)
+    api_logger.info(f"▶️ Import job {job_id} re-queued at row {job.processed_rows}")
+    return job
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_import_pool():
+    """Process-wide import JobWorkerPool (created on first use)."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = JobWorkerPool(
+                    'import-worker', claim_next_import_job, run_import_job,
+                    workers=_env_int('IMPORT_WORKERS', 1),
+                    poll_interval=_env_int('IMPORT_POLL_INTERVAL', 30),
+                )
+    return _pool
+
+
+def sweep_import_jobs():
+    """
+    Periodic housekeeping (scheduler, IMPORT_SWEEP_INTERVAL):
+      - fail running jobs that died IMPORT_MAX_ATTEMPTS times (e.g. a file that
+        kills its worker every time) — they can still be resumed by hand
+      - delete finished jobs older than IMPORT_JOB_RETENTION_HOURS
+      - wake the pool if queued or stale jobs are waiting (e.g. after a restart)
+    :return: Dictionary with the counts per step
+    """
+    now = timezone.now()
+    result = {'abandoned': 0, 'deleted_jobs': 0}
+
+    result['abandoned'] = ImportJob.objects.filter(
+        status=ImportJob.STATUS_RUNNING,
+        heartbeat_at__lt=now - timedelta(seconds=_env_int('IMPORT_JOB_STALE', 300)),
+        attempt__gte=_env_int('IMPORT_MAX_ATTEMPTS', 3),
+    ).update(status=ImportJob.STATUS_FAILED, error='Import worker died repeatedly', finished_at=now)
+
+    result['deleted_jobs'], _ = ImportJob.objects.filter(
+        status__in=FINISHED_STATUSES,
+        finished_at__lt=now - timedelta(hours=_env_int('IMPORT_JOB_RETENTION_HOURS', 24)),
+    ).delete()
+
+    if ImportJob.objects.filter(_claimable()).exists():
+        get_import_pool().wake()
+    return result
+
+
+def import_job_status(job):
+    """JSON payload of the submit / status endpoints (job loaded without upload, results, result_file)."""
+    spec = IMPORT_KINDS[job.kind]
+    counts = job.counts or {}
+    total = job.total_rows
+    success = counts.get('success', 0)
+    payload = {
+        'job_id': job.job_id,
+        'kind': job.kind,
+        'status': job.status,
+        'dry_run': job.dry_run,
+        'file_name': job.file_name,
+        'total': total,
+        'processed': job.processed_rows,
+        'progress': int(job.processed_rows * 100 / total) if total else 100,
+        'success': success,
+        'skipped': counts.get('skipped', 0),
+        'error': counts.get('error', 0),
+        'cancel_requested': job.cancel_requested,
+        'status_url': f'/api/import/jobs/{job.job_id}/',
+    }
+    if spec['breakdown']:
+        payload['breakdown'] = {key: counts.get(key, 0) for key in spec['breakdown']}
+    if job.status == ImportJob.STATUS_QUEUED:
+        payload['queue_position'] = ImportJob.objects.filter(
+            status=ImportJob.STATUS_QUEUED, created_at__lt=job.created_at,
+        ).count() + 1
+    if job.status in RESULT_STATUSES:
+        prefix = spec['preview_prefix'] if job.dry_run else spec['results_prefix']
+        payload['message'] = (
+            spec['success_message'].format(success=success, total=total) if success > 0 else spec['failure_message']
+        )
+        payload['has_errors'] = counts.get('error', 0) > 0 or counts.get('skipped', 0) > 0
+        payload['result_url'] = f'/api/import/jobs/{job.job_id}/result/'
+        payload['result_filename'] = f"{prefix}{timezone.localtime(job.finished_at).strftime('%Y%m%d_%H%M%S')}.xlsx"
+    if job.status == ImportJob.STATUS_FAILED:
+        payload['error_message'] = job.error
+    return payload
@@ -0,0 +1,151 @@
+"""
+Status, result download, cancel and resume endpoints of the background Excel
+import jobs (import_jobs). The jobs are started by import_families_endpoint /
+import_volunteers_endpoint; a job is visible to the user who started it and
+to System Administrators.
+
+Cancel and resume are audited like the other write endpoints
+(CANCEL_IMPORT_JOB / RESUME_IMPORT_JOB, *_FAILED on failure).
+"""
+import json
+
+from django.http import JsonResponse, HttpResponse
+from rest_framework.decorators import api_view
+
+from .models import Staff, ImportJob
+from .utils import conditional_csrf, block_viewer_writes, is_admin
+from .audit_utils import log_api_action
+from .logger import api_logger
+from .import_jobs import import_job_status, cancel_import_job, resume_import_job
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+def _visible_job(request, job_id, *deferred):
+    """
+    (job, None) if the session user may see the job, else (None, error response).
+    """
+    user_id = request.session.get("user_id")
+    if not user_id:
+        return None, JsonResponse(
+            {"detail": "Authentication credentials were not provided."}, status=403
+        )
+    try:
+        staff = Staff.objects.get(staff_id=user_id)
+    except Staff.DoesNotExist:
+        return None, JsonResponse({"error": "Staff member not found."}, status=403)
+
+    job = ImportJob.objects.defer('upload', *deferred).filter(job_id=job_id).first()
+    if job is None or (job.requested_by != staff.staff_id and not is_admin(staff)):
+        return None, JsonResponse({'error': 'Import job not found or expired'}, status=404)
+    return job, None
+
+
+@conditional_csrf
+@api_view(['GET'])
+def import_job_status_view(request, job_id):
+    """GET /api/import/jobs/<job_id>/ — progress of an import job (polled by the frontends)"""
+    job, error = _visible_job(request, job_id, 'results', 'result_file')
+    if error:
+        return error
+    return JsonResponse(import_job_status(job))
+
+
+@conditional_csrf
+@api_view(['GET'])
+def import_job_result(request, job_id):
+    """GET /api/import/jobs/<job_id>/result/ — the result / preview workbook"""
+    job, error = _visible_job(request, job_id, 'results')
+    if error:
+        return error
+    if job.status not in (ImportJob.STATUS_COMPLETED, ImportJob.STATUS_CANCELLED) or job.result_file is None:
+        return JsonResponse({'error': 'Import results are not ready'}, status=409)
+
+    filename = import_job_status(job)['result_filename']
+    response = HttpResponse(bytes(job.result_file), content_type=XLSX_CONTENT_TYPE)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def _log_job_failure(request, action, job_id, response):
+    """Audit a failed cancel / resume request (<action>_FAILED) and return its response."""
+    body = json.loads(response.content)
+    log_api_action(
+        request=request,
+        action=f'{action}_FAILED',
+        affected_tables=['childsmile_app_importjob'],
+        entity_type='ImportJob',
+        entity_ids=[job_id],
+        success=False,
+        error_message=body.get('error') or body.get('detail'),
+        status_code=response.status_code,
+    )
+    return response
+
+
+@conditional_csrf
+@api_view(['POST'])
+@block_viewer_writes
+def cancel_import_job_view(request, job_id):
+    """POST /api/import/jobs/<job_id>/cancel/ — stop the job after its current chunk"""
+    job, error = _visible_job(request, job_id, 'results', 'result_file')
+    if error:
+        return _log_job_failure(request, 'CANCEL_IMPORT_JOB', job_id, error)
+    if job.status not in (ImportJob.STATUS_QUEUED, ImportJob.STATUS_RUNNING):
+        return _log_job_failure(request, 'CANCEL_IMPORT_JOB', job_id, JsonResponse(
+            {'error': f'Import job is already {job.status}'}, status=409,
+        ))
+
+    try:
+        cancel_import_job(job_id)
+        job = ImportJob.objects.defer('upload', 'results', 'result_file').get(job_id=job_id)
+    except Exception as e:
+        api_logger.error(f"Error cancelling import job {job_id}: {str(e)}")
+        return _log_job_failure(request, 'CANCEL_IMPORT_JOB', job_id, JsonResponse({'error': str(e)}, status=500))
+
+    api_logger.info(f"Import job {job_id} cancel requested by user {request.session.get('user_id')}")
+    log_api_action(
+        request=request,
+        action='CANCEL_IMPORT_JOB',
+        affected_tables=['childsmile_app_importjob'],
+        entity_type='ImportJob',
+        entity_ids=[job_id],
+        success=True,
+        status_code=200,
+        additional_data={'kind': job.kind, 'processed_rows': job.processed_rows, 'total_rows': job.total_rows},
+    )
+    return JsonResponse(import_job_status(job))
+
+
+@conditional_csrf
+@api_view(['POST'])
+@block_viewer_writes
+def resume_import_job_view(request, job_id):
+    """POST /api/import/jobs/<job_id>/resume/ — continue a cancelled / failed job from its last chunk"""
+    job, error = _visible_job(request, job_id, 'results', 'result_file')
+    if error:
+        return _log_job_failure(request, 'RESUME_IMPORT_JOB', job_id, error)
+
+    try:
+        resumed = resume_import_job(job_id)
+    except Exception as e:
+        api_logger.error(f"Error resuming import job {job_id}: {str(e)}")
+        return _log_job_failure(request, 'RESUME_IMPORT_JOB', job_id, JsonResponse({'error': str(e)}, status=500))
+    if resumed is None:
+        return _log_job_failure(request, 'RESUME_IMPORT_JOB', job_id, JsonResponse(
+            {'error': f'Import job cannot be resumed ({job.status})'}, status=409,
+        ))
+
+    api_logger.info(f"Import job {job_id} resumed by user {request.session.get('user_id')}")
+    job = ImportJob.objects.defer('upload', 'results', 'result_file').get(job_id=job_id)
+    log_api_action(
+        request=request,
+        action='RESUME_IMPORT_JOB',
+        affected_tables=['childsmile_app_importjob'],
+        entity_type='ImportJob',
+        entity_ids=[job_id],
+        success=True,
+        status_code=202,
+        additional_data={'kind': job.kind, 'processed_rows': job.processed_rows, 'total_rows': job.total_rows},
+    )
+    return JsonResponse(import_job_status(job), status=202)
@@ -0,0 +1,78 @@
+"""
+job_workers.py
+
+In-process worker threads for the database-backed job queues (render_jobs,
+import_jobs).
+
+The jobs live in database rows; a JobWorkerPool only runs them. Each worker
+repeatedly claims a row with the queue's `claim` function (SELECT ... FOR
+UPDATE SKIP LOCKED, so every process can run a pool without two workers
+taking the same job) and hands it to `run`. Idle workers wake up every
+poll_interval seconds, or at once when wake() is called after a submit.
+
+Threads are started lazily and re-created after a fork (gunicorn preload), the
+same way as the audit writer.
+"""
+
+import os
+import threading
+from django.db import close_old_connections
+from .logger import api_logger
+
+
+class JobWorkerPool:
+    """Fixed number of threads per process that drain one job queue."""
+
+    def __init__(self, name, claim, run, workers=1, poll_interval=30):
+        """
+        :param name: thread name prefix (e.g. 'render-worker')
+        :param claim: callable() -> claimed job, or None if the queue is empty
+        :param run: callable(job) that executes a claimed job
+        """
+        self.name = name
+        self.claim = claim
+        self.run = run
+        self.workers = max(1, workers)
+        self.poll_interval = poll_interval
+        self._wake = threading.Event()
+        self._threads = []
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def wake(self):
+        """Start the pool if needed and make an idle worker check the queue now."""
+        self._ensure_started()
+        self._wake.set()
+
+    def _ensure_started(self):
+        pid = os.getpid()
+        if self._pid == pid and all(thread.is_alive() for thread in self._threads):
+            return
+        with self._lock:
+            if self._pid != pid:
+                # Forked child: the parent's threads are not ours
+                self._threads = []
+                self._pid = pid
+            self._threads = [thread for thread in self._threads if thread.is_alive()]
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(
+                    target=self._run, name=f"{self.name}-{len(self._threads)}", daemon=True,
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            try:
+                while True:
+                    close_old_connections()
+                    job = self.claim()
+                    if job is None:
+                        break
+                    self.run(job)
+            except Exception as e:
+                api_logger.error(f"{self.name} error: {str(e)[:200]}")
+            finally:
+                close_old_connections()
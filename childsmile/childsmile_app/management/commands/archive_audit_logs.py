@@ -0,0 +1,59 @@
+"""
+Management command: python manage.py archive_audit_logs
+
+Audit log retention without the browser: every monthly audit_log partition
+that is entirely older than the retention window (AUDIT_RETENTION_DAYS) is
+streamed to a gzip NDJSON archive in AUDIT_ARCHIVE_DIR and then detached and
+dropped (metadata only). Also creates the monthly partitions ahead.
+
+    python manage.py archive_audit_logs --dry-run          # show what would go
+    python manage.py archive_audit_logs                    # archive + drop
+    python manage.py archive_audit_logs --partitions-only  # only create partitions
+"""
+
+from django.core.management.base import BaseCommand
+from childsmile_app.audit_archive_utils import (
+    audit_log_is_partitioned,
+    ensure_audit_partitions,
+    get_archive_dir,
+    purge_expired_audit_partitions,
+)
+from childsmile_app.audit_query_utils import retention_cutoff
+
+
+class Command(BaseCommand):
+    help = "Archive expired audit log months to gzip NDJSON and drop their partitions"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true",
+                            help="Count what would be archived, change nothing")
+        parser.add_argument("--partitions-only", action="store_true",
+                            help="Only create the upcoming monthly partitions")
+
+    def handle(self, *args, **options):
+        if not audit_log_is_partitioned():
+            self.stdout.write(self.style.WARNING(
+                "⚠️ audit_log is not partitioned yet (run partition_audit_log_by_month.sql); "
+                "expired rows are archived and DELETEd instead"
+            ))
+
+        created = ensure_audit_partitions()
+        if created:
+            self.stdout.write(f"🗂️ Created partitions: {', '.join(created)}")
+        if options["partitions_only"]:
+            self.stdout.write(self.style.SUCCESS("✅ Partitions are up to date"))
+            return
+
+        cutoff = retention_cutoff()
+        self.stdout.write(f"📦 Archiving audit logs older than {cutoff:%d/%m/%Y} to {get_archive_dir()}...")
+        result = purge_expired_audit_partitions(cutoff, dry_run=options["dry_run"])
+
+        if options["dry_run"]:
+            for archive in result["archives"]:
+                self.stdout.write(f"  {archive.get('partition') or 'expired rows'}: {archive['rows']} logs")
+            self.stdout.write(f"Would archive and drop {result['deleted_count']} audit logs")
+            return
+
+        for archive in result["archives"]:
+            self.stdout.write(f"  {archive['file']}: {archive['rows']} logs (sha256 {archive['sha256'][:12]}…)")
+        self.stdout.write(self.style.SUCCESS(f"✅ Purged {result['deleted_count']} audit logs"))
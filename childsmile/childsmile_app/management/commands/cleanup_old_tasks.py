@@ -1,9 +1,12 @@
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 from datetime import timedelta
-from childsmile_app.models import Tasks, AuditLog
+from childsmile_app.models import Tasks, AuditLog, TaskTombstone
 from django.db import transaction
 
+# Same value as task_views.TASK_TOMBSTONE_RETENTION_DAYS
+TOMBSTONE_RETENTION_DAYS = 30
+
 
 class Command(BaseCommand):
     help = 'Delete completed tasks older than 1 week'
@@ -29,6 +32,14 @@ class Command(BaseCommand):
         # Calculate the cutoff date
         cutoff_date = timezone.now() - timedelta(days=days)
         
+        # Prune delta-sync tombstones past their retention (task board clients
+        # with an older watermark get a full reload instead)
+        tombstones_deleted, _ = TaskTombstone.objects.filter(
+            deleted_at__lt=timezone.now() - timedelta(days=TOMBSTONE_RETENTION_DAYS)
+        ).delete()
+        if tombstones_deleted:
+            self.stdout.write(f'Pruned {tombstones_deleted} task tombstones older than {TOMBSTONE_RETENTION_DAYS} days')
+
         # Find tasks to delete
         tasks_to_delete = Tasks.objects.filter(
             status='הושלמה',
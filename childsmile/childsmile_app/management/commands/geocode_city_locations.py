@@ -0,0 +1,51 @@
+"""
+Management command: python manage.py geocode_city_locations
+
+Geocodes CityLocation rows that have no coordinates yet (cities registered by
+request paths or seeded from the settlements list). This is the only place the
+geocoding API is called; requests are rate-limited to 1/second.
+Also run nightly by the scheduler (CITY_GEOCODE_TIME), before the distance matrix.
+  --limit N          Max cities to geocode in this run
+                     (default CITY_GEOCODE_BATCH_LIMIT, 0 = until every pending city was tried)
+  --max-attempts N   Skip cities that already failed N times (default 5)
+  --set CITY LAT LON Store coordinates for one city manually (no API call)
+"""
+
+from django.core.management.base import BaseCommand
+from childsmile_app.geo_utils import (
+    GEOCODE_MAX_ATTEMPTS,
+    geocode_pending_cities,
+    set_city_location,
+)
+
+
+class Command(BaseCommand):
+    help = "Geocode cities in the CityLocation gazetteer that have no coordinates yet"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=None)
+        parser.add_argument("--max-attempts", type=int, default=GEOCODE_MAX_ATTEMPTS)
+        parser.add_argument(
+            "--set",
+            nargs=3,
+            metavar=("CITY", "LAT", "LON"),
+            help="Manually store coordinates for a city instead of geocoding",
+        )
+
+    def handle(self, *args, **options):
+        if options["set"]:
+            city, lat, lon = options["set"]
+            set_city_location(city, float(lat), float(lon), source="manual")
+            self.stdout.write(self.style.SUCCESS(f"✅ Stored coordinates for {city}: ({lat}, {lon})"))
+            return
+
+        self.stdout.write("🗺️ Geocoding pending cities...")
+        stats = geocode_pending_cities(limit=options["limit"], max_attempts=options["max_attempts"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ Pending: {stats['pending']} | Geocoded: {stats['geocoded']} | "
+                f"Not found: {stats['not_found']} | Errors: {stats['errors']}"
+            )
+        )
+        if stats["geocoded"]:
+            self.stdout.write("ℹ️ Run precompute_city_distances to add the new cities to the distance matrix")
@@ -0,0 +1,39 @@
+"""
+Management command: python manage.py precompute_city_distances
+
+Computes the city-to-city distances (geo_utils) between every child city and
+every signed-up volunteer city with known coordinates and stores
+missing/changed pairs in CityGeoDistance.
+Also run nightly by the scheduler (CITY_DISTANCE_MATRIX_TIME).
+  --no-sync        Don't refresh PossibleMatches distances/grades afterwards
+"""
+
+from django.core.management.base import BaseCommand
+from childsmile_app.geo_utils import precompute_city_distances
+from childsmile_app.matching_utils import sync_possible_matches
+
+
+class Command(BaseCommand):
+    help = "Precompute the city-to-city distance matrix from known city coordinates"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--no-sync",
+            action="store_true",
+            help="Skip the PossibleMatches reconcile after writing new distances",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write("📐 Precomputing city distance matrix...")
+        stats = precompute_city_distances()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ Cities: {stats['cities']} | Pairs: {stats['pairs']} | Written: {stats['written']}"
+            )
+        )
+
+        if stats["written"] and not options["no_sync"]:
+            sync_stats = sync_possible_matches()
+            self.stdout.write(
+                self.style.SUCCESS(f"✅ PossibleMatches refreshed | Updated: {sync_stats['upserted']}")
+            )
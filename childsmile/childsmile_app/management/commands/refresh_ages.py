@@ -0,0 +1,26 @@
+"""
+Management command: python manage.py refresh_ages
+
+Recomputes every SignedUp age from birth_date and every child age stored in
+PossibleMatches — set-based UPDATEs, only changed rows are written — and
+marks the age refresh as done for today (JobRun 'age_refresh'), so the
+matching requests skip it until tomorrow.
+Also run daily by the scheduler (AGE_REFRESH_TIME).
+"""
+
+from django.core.management.base import BaseCommand
+from childsmile_app.utils import refresh_all_ages
+
+
+class Command(BaseCommand):
+    help = "Refresh volunteer/tutor ages and children ages in PossibleMatches"
+
+    def handle(self, *args, **options):
+        self.stdout.write("🎂 Refreshing ages...")
+        result = refresh_all_ages()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ Volunteers updated: {result['volunteers_updated']} | "
+                f"Children updated: {result['children_updated']}"
+            )
+        )
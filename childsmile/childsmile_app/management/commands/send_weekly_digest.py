@@ -9,6 +9,7 @@ Run manually or called by the scheduler.
 from django.core.management.base import BaseCommand
 from childsmile_app.weekly_digest import send_weekly_digest, build_digest_data, build_digest_html
 from childsmile_app.logger import api_logger
+from childsmile_app.email_outbox import flush_email_outbox
 from django.conf import settings
 from django.core.mail import send_mail
 
@@ -58,13 +59,17 @@ class Command(BaseCommand):
             return
 
         self.stdout.write("📤 Sending weekly digest...")
-        result = send_weekly_digest()
+        # Queue without waking the dispatcher: its daemon threads die with this
+        # process — deliver the queued digests from this thread instead
+        result = send_weekly_digest(wake=False)
+        if not result.get("error"):
+            result["delivered"] = flush_email_outbox()
 
         if result.get("error"):
             self.stderr.write(self.style.ERROR(f"❌ Error: {result['error']}"))
         else:
             self.stdout.write(
                 self.style.SUCCESS(
-                    f"✅ Sent: {result['sent']} | Failed: {result.get('failed', 0)}"
+                    f"✅ Queued: {result['sent']} | Delivered: {result['delivered']} | Skipped: {result.get('failed', 0)}"
                 )
             )
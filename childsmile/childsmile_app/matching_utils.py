@@ -0,0 +1,555 @@
+"""
+matching_utils.py
+
+Incremental maintenance of the PossibleMatches table.
+
+Until now every click on "calculate matches" in the tutorship wizard computed
+the full children × tutors CROSS JOIN, TRUNCATEd childsmile_app_possiblematches
+and re-inserted every row. With a few hundred tutors and a few thousand
+children that is hundreds of thousands of rows per click, and the TRUNCATE
+takes an ACCESS EXCLUSIVE lock that blocks every concurrent report reader.
+
+Instead, the table is now kept up to date incrementally:
+
+  - sync_possible_matches(child_ids=..., tutor_ids=...) recomputes ONLY the
+    candidate pairs for the given children / tutors inside Postgres
+    (INSERT ... SELECT ... ON CONFLICT DO UPDATE + DELETE of stale pairs).
+    Unchanged rows are not rewritten, and only row-level locks are taken.
+  - Django signals on Children, Tutors, SignedUp, Tutorships and Staff schedule
+    a scoped sync after the surrounding transaction commits.
+  - sync_possible_matches() without a scope is the full reconcile used to
+    bootstrap an empty table and by the nightly scheduler job. It is the same
+    diff-based upsert, so it never empties the table under readers.
+
+Distances and grades are resolved in SQL from the CityGeoDistance cache while
+the rows are written. Pairs whose distance is not cached yet are stored with
+distance NULL / grade MIN_GRADE — ranked after every pair within the cutoff,
+never inside it — and queued for the background distance writer
+(geo_utils.queue_city_distances); once the pair is stored,
+apply_pair_distance() patches just those rows.
+
+get_wizard_page() serves the wizard with keyset (cursor) pagination over the
+pre-filtered childsmile_app_wizard_matches view (add_wizard_matches_view.sql).
+
+get_top_matches() is the top-K mode on top of the maintained table: the best K
+tutors per waiting child (or K children per tutor), with the distance cutoff
+and gender filter applied in SQL and ranking done by a window function over
+one page of children (or tutors) only.
+
+REQUIRES: the unique (child_id, tutor_id) index from
+add_possible_matches_pair_index.sql (ON CONFLICT target).
+"""
+
+import base64
+from django.db import connection, transaction
+from django.db.models.signals import post_save, post_delete
+from .logger import api_logger
+
+POSSIBLE_MATCHES_TABLE = "childsmile_app_possiblematches"
+
+# Same scoring rules as utils.calculate_grades() — keep both in sync.
+PENALTY_DISTANCE_THRESHOLD = 50  # km
+PENALTY_GRADE = -5
+MAX_GRADE = 100
+MIN_GRADE = 0
+DISTANCE_MULTIPLIER = 2  # grade decreases by 2 points per km
+
+# Children in these statuses are never offered a tutor
+EXCLUDED_CHILD_STATUSES = ('ז״ל', 'בריא', 'עזב')
+EXCLUDED_TUTORING_STATUSES = ('לא_רוצים', 'לא_רלוונטי')
+MAX_CHILD_AGE = 16
+
+
+def _grade_sql(distance_expr):
+    """SQL expression computing the match grade from a distance expression (NULL = pending)."""
+    return (
+        f"CASE WHEN ({distance_expr}) IS NULL THEN {MIN_GRADE} "
+        f"WHEN ({distance_expr}) > {PENALTY_DISTANCE_THRESHOLD} THEN {PENALTY_GRADE} "
+        f"ELSE GREATEST({MIN_GRADE}, {MAX_GRADE} - ({distance_expr}) * {DISTANCE_MULTIPLIER}) END"
+    )
+
+
+# Candidate pairs — the rules that used to live in utils.fetch_possible_matches():
+# - ALL children are included (the report uses them for multi-tutor matching);
+#   the wizard filters out children that already have a tutor at read time
+# - only the specific child+tutor pair that already has a non-inactive
+#   tutorship is excluded
+# - tutors with ANY active/pending tutorship are excluded (1 tutee max)
+# - only active staff, no deceased/healthy/left children, no irrelevant
+#   tutoring statuses, children under 16 only
+# {scope} is replaced by an optional "AND child.child_id = ANY(%s)" /
+# "AND tutor.id_id = ANY(%s)" filter.
+_CANDIDATES_SQL = f"""
+    SELECT
+        child.child_id,
+        tutor.id_id AS tutor_id,
+        CONCAT(child.childfirstname, ' ', child.childsurname) AS child_full_name,
+        CONCAT(signedup.first_name, ' ', signedup.surname) AS tutor_full_name,
+        child.city AS child_city,
+        signedup.city AS tutor_city,
+        EXTRACT(YEAR FROM AGE(current_date, child.date_of_birth))::int AS child_age,
+        signedup.age AS tutor_age,
+        child.gender AS child_gender,
+        signedup.gender AS tutor_gender,
+        dist.distance AS distance_between_cities,
+        {_grade_sql('dist.distance')} AS grade
+    FROM childsmile_app_children child
+    CROSS JOIN childsmile_app_tutors tutor
+    JOIN childsmile_app_signedup signedup
+        ON signedup.id = tutor.id_id
+    JOIN childsmile_app_staff staff
+        ON tutor.staff_id = staff.staff_id
+    LEFT JOIN LATERAL (
+        SELECT geo.distance
+        FROM childsmile_app_citygeodistance geo
+        WHERE geo.distance IS NOT NULL
+        AND (
+            (geo.city1 = TRIM(child.city) AND geo.city2 = TRIM(signedup.city))
+            OR (geo.city1 = TRIM(signedup.city) AND geo.city2 = TRIM(child.city))
+        )
+        LIMIT 1
+    ) cached ON TRUE
+    CROSS JOIN LATERAL (
+        SELECT CASE
+            WHEN TRIM(child.city) = TRIM(signedup.city) THEN 0
+            ELSE cached.distance  -- NULL until the pair is stored
+        END AS distance
+    ) dist
+    WHERE
+        NOT EXISTS (
+            SELECT 1
+            FROM childsmile_app_tutorships tutorship
+            WHERE tutorship.child_id = child.child_id
+            AND tutorship.tutor_id = tutor.id_id
+            AND tutorship.tutorship_activation <> 'inactive'
+        )
+        AND NOT EXISTS (
+            SELECT 1
+            FROM childsmile_app_tutorships tutorship
+            WHERE tutorship.tutor_id = tutor.id_id
+            AND tutorship.tutorship_activation <> 'inactive'
+        )
+        AND staff.is_active = TRUE
+        AND child.status NOT IN (%s, %s, %s)
+        AND child.tutoring_status NOT IN (%s, %s)
+        AND EXTRACT(YEAR FROM AGE(current_date, child.date_of_birth)) < {MAX_CHILD_AGE}
+        {{scope}}
+"""
+
+_UPSERT_SQL = f"""
+    INSERT INTO {POSSIBLE_MATCHES_TABLE} AS pm (
+        child_id, tutor_id, child_full_name, tutor_full_name,
+        child_city, tutor_city, child_age, tutor_age,
+        child_gender, tutor_gender, distance_between_cities, grade, is_used
+    )
+    SELECT
+        c.child_id, c.tutor_id, c.child_full_name, c.tutor_full_name,
+        c.child_city, c.tutor_city, c.child_age, c.tutor_age,
+        c.child_gender, c.tutor_gender, c.distance_between_cities, c.grade, FALSE
+    FROM ({{candidates}}) c
+    ON CONFLICT (child_id, tutor_id) DO UPDATE SET
+        child_full_name = EXCLUDED.child_full_name,
+        tutor_full_name = EXCLUDED.tutor_full_name,
+        child_city = EXCLUDED.child_city,
+        tutor_city = EXCLUDED.tutor_city,
+        child_age = EXCLUDED.child_age,
+        tutor_age = EXCLUDED.tutor_age,
+        child_gender = EXCLUDED.child_gender,
+        tutor_gender = EXCLUDED.tutor_gender,
+        distance_between_cities = EXCLUDED.distance_between_cities,
+        grade = EXCLUDED.grade
+    WHERE (
+        pm.child_full_name, pm.tutor_full_name, pm.child_city, pm.tutor_city,
+        pm.child_age, pm.tutor_age, pm.child_gender, pm.tutor_gender,
+        pm.distance_between_cities, pm.grade
+    ) IS DISTINCT FROM (
+        EXCLUDED.child_full_name, EXCLUDED.tutor_full_name, EXCLUDED.child_city, EXCLUDED.tutor_city,
+        EXCLUDED.child_age, EXCLUDED.tutor_age, EXCLUDED.child_gender, EXCLUDED.tutor_gender,
+        EXCLUDED.distance_between_cities, EXCLUDED.grade
+    )
+"""
+
+_DELETE_STALE_SQL = f"""
+    WITH candidates AS ({{candidates}})
+    DELETE FROM {POSSIBLE_MATCHES_TABLE} pm
+    WHERE TRUE {{pm_scope}}
+    AND NOT EXISTS (
+        SELECT 1 FROM candidates c
+        WHERE c.child_id = pm.child_id AND c.tutor_id = pm.tutor_id
+    )
+"""
+
+_MISSING_DISTANCES_SQL = f"""
+    SELECT DISTINCT TRIM(pm.child_city), TRIM(pm.tutor_city)
+    FROM {POSSIBLE_MATCHES_TABLE} pm
+    WHERE TRIM(pm.child_city) <> '' AND TRIM(pm.tutor_city) <> ''
+    AND TRIM(pm.child_city) <> TRIM(pm.tutor_city)
+    {{pm_scope}}
+    AND NOT EXISTS (
+        SELECT 1 FROM childsmile_app_citygeodistance geo
+        WHERE geo.distance IS NOT NULL
+        AND (
+            (geo.city1 = TRIM(pm.child_city) AND geo.city2 = TRIM(pm.tutor_city))
+            OR (geo.city1 = TRIM(pm.tutor_city) AND geo.city2 = TRIM(pm.child_city))
+        )
+    )
+"""
+
+
+def _build_scope(child_ids, tutor_ids):
+    """
+    Return (candidate_scope_sql, pm_scope_sql, params) for the given ids.
+    Exactly one of child_ids / tutor_ids may be given; None means "everything".
+    """
+    if child_ids is not None:
+        return "AND child.child_id = ANY(%s)", "AND pm.child_id = ANY(%s)", [list(child_ids)]
+    if tutor_ids is not None:
+        return "AND tutor.id_id = ANY(%s)", "AND pm.tutor_id = ANY(%s)", [list(tutor_ids)]
+    return "", "", []
+
+
+def sync_possible_matches(child_ids=None, tutor_ids=None):
+    """
+    Bring PossibleMatches up to date for the given children OR tutors
+    (or for everything when neither is given).
+
+    - New candidate pairs are inserted, changed pairs (names, cities, ages,
+      distance...) are updated in place, pairs that stopped being valid are
+      deleted. Untouched rows are not rewritten.
+    - Runs in one transaction with row-level locks only — concurrent readers
+      of the report / wizard are never blocked.
+    - City pairs without a cached distance are queued for the background
+      distance writer (un-geocoded cities wait for the nightly geocoder).
+
+    :param child_ids: iterable of Children.child_id to re-evaluate
+    :param tutor_ids: iterable of Tutors.id_id to re-evaluate
+    :return: dict with stats {'upserted', 'deleted', 'missing_distances'}
+    """
+    if child_ids is not None and tutor_ids is not None:
+        raise ValueError("Pass either child_ids or tutor_ids, not both")
+    if (child_ids is not None and not child_ids) or (tutor_ids is not None and not tutor_ids):
+        return {'upserted': 0, 'deleted': 0, 'missing_distances': 0}
+
+    scope_sql, pm_scope_sql, scope_params = _build_scope(child_ids, tutor_ids)
+    candidates_sql = _CANDIDATES_SQL.format(scope=scope_sql)
+    candidate_params = list(EXCLUDED_CHILD_STATUSES + EXCLUDED_TUTORING_STATUSES) + scope_params
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                _DELETE_STALE_SQL.format(candidates=candidates_sql, pm_scope=pm_scope_sql),
+                candidate_params + scope_params,
+            )
+            deleted = cursor.rowcount
+
+            cursor.execute(_UPSERT_SQL.format(candidates=candidates_sql), candidate_params)
+            upserted = cursor.rowcount
+
+            cursor.execute(_MISSING_DISTANCES_SQL.format(pm_scope=pm_scope_sql), scope_params)
+            missing_pairs = cursor.fetchall()
+
+    _queue_missing_distances(missing_pairs)
+
+    stats = {
+        'upserted': upserted,
+        'deleted': deleted,
+        'missing_distances': len(missing_pairs),
+    }
+    scope_label = (
+        f"children={len(child_ids)}" if child_ids is not None
+        else f"tutors={len(tutor_ids)}" if tutor_ids is not None
+        else "full"
+    )
+    api_logger.debug(f"DEBUG: PossibleMatches sync ({scope_label}): {stats}")
+    return stats
+
+
+def _queue_missing_distances(city_pairs):
+    """Hand uncached city pairs to the background distance writer (geo_utils)."""
+    if not city_pairs:
+        return
+    from .geo_utils import queue_city_distances
+
+    queue_city_distances(city_pairs)
+
+
+def apply_pair_distance(city1, city2, distance):
+    """
+    Patch distance + grade on every PossibleMatches row for a freshly
+    calculated city pair (in either direction). Called by the background
+    distance writer (geo_utils.store_city_distances) after it stores the pair.
+    """
+    city1, city2 = (city1 or "").strip(), (city2 or "").strip()
+    if not city1 or not city2 or distance is None:
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            UPDATE {POSSIBLE_MATCHES_TABLE}
+            SET distance_between_cities = %s, grade = {_grade_sql('%s')}
+            WHERE (
+                (TRIM(child_city) = %s AND TRIM(tutor_city) = %s)
+                OR (TRIM(child_city) = %s AND TRIM(tutor_city) = %s)
+            )
+            AND (distance_between_cities, grade) IS DISTINCT FROM (%s, {_grade_sql('%s')})
+            """,
+            [distance, distance, distance, city1, city2, city2, city1,
+             distance, distance, distance],
+        )
+        return cursor.rowcount
+
+
+# ============================================================================
+# WIZARD PAGES — keyset pagination over the pre-filtered wizard view
+# ============================================================================
+
+# Columns returned to the wizard / top-K API
+_MATCH_COLUMNS = (
+    "match_id", "child_id", "tutor_id", "child_full_name", "tutor_full_name",
+    "child_city", "tutor_city", "child_age", "tutor_age",
+    "child_gender", "tutor_gender", "distance_between_cities", "grade", "is_used",
+)
+
+# Gender groups as in the wizard: 0 = male/male, 1 = female/female, 2 = cross.
+# Must match the index expression in add_wizard_matches_view.sql.
+_GENDER_GROUP_SQL = (
+    "CASE WHEN pm.child_gender = FALSE AND pm.tutor_gender = FALSE THEN 0 "
+    "WHEN pm.child_gender = TRUE AND pm.tutor_gender = TRUE THEN 1 ELSE 2 END"
+)
+
+# Pre-filtered wizard list (add_wizard_matches_view.sql): children with no
+# active/pending tutorship, plus gender_group. Served by
+# idx_possiblematches_wizard_order for keyset pagination.
+WIZARD_VIEW = "childsmile_app_wizard_matches"
+WIZARD_PAGE_SIZE = 200
+WIZARD_PAGE_MAX = 1000
+
+_WIZARD_PAGE_SQL = f"""
+    SELECT {{columns}}, gender_group
+    FROM {WIZARD_VIEW}
+    {{where}}
+    ORDER BY gender_group, -grade, match_id
+    LIMIT %s
+"""
+
+
+def encode_wizard_cursor(row):
+    """Opaque cursor pointing just after the given wizard row."""
+    raw = f"{row['gender_group']}:{row['grade']}:{row['match_id']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_wizard_cursor(cursor):
+    """(gender_group, grade, match_id) from a cursor; ValueError if malformed."""
+    try:
+        gender_group, grade, match_id = base64.urlsafe_b64decode(cursor.encode()).decode().split(":")
+        return int(gender_group), int(grade), int(match_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def get_wizard_page(cursor=None, limit=WIZARD_PAGE_SIZE):
+    """
+    One page of wizard matches (children with no active/pending tutorship),
+    male/female/cross groups then best grade first, match_id as tiebreak.
+
+    Keyset pagination: the page after `cursor` is one index range scan, and
+    rows inserted/deleted by the incremental sync never shift or duplicate
+    rows between pages the way OFFSET did.
+
+    :param cursor: value of next_cursor from the previous page (None = first page)
+    :param limit: page size (capped at WIZARD_PAGE_MAX)
+    :return: (matches, next_cursor) — next_cursor is None on the last page
+    """
+    limit = max(1, min(int(limit), WIZARD_PAGE_MAX))
+    where, params = "", []
+    if cursor:
+        gender_group, grade, match_id = decode_wizard_cursor(cursor)
+        where = "WHERE (gender_group, -grade, match_id) > (%s, %s, %s)"
+        params = [gender_group, -grade, match_id]
+
+    with connection.cursor() as db_cursor:
+        db_cursor.execute(
+            _WIZARD_PAGE_SQL.format(columns=", ".join(_MATCH_COLUMNS), where=where),
+            params + [limit + 1],
+        )
+        columns = [col[0] for col in db_cursor.description]
+        rows = [dict(zip(columns, row)) for row in db_cursor.fetchall()]
+    for row in rows:
+        row["distance_pending"] = row["distance_between_cities"] is None
+
+    next_cursor = encode_wizard_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+
+# ============================================================================
+# TOP-K MATCHING — best K tutors per child (or K children per tutor)
+# ============================================================================
+
+TOP_K_DEFAULT = 5
+TOP_K_MAX = 50
+TOP_K_PAGE_SIZE = 100
+TOP_K_PAGE_MAX = 500
+
+# Filtering (distance cutoff, gender, scope) and ranking happen inside Postgres;
+# only K rows per child/tutor ever reach Python. The page of children / tutors
+# is picked first (targets), so the window function only ranks their rows
+# instead of partitioning the whole table. Pending (NULL) distances sort last.
+_TOP_K_SQL = f"""
+    WITH targets AS (
+        SELECT DISTINCT pm.{{partition}} AS target_id
+        FROM {POSSIBLE_MATCHES_TABLE} pm
+        WHERE pm.{{partition}} > %s {{filters}}
+        ORDER BY 1
+        LIMIT %s
+    )
+    SELECT {{columns}}, gender_group, rank
+    FROM (
+        SELECT pm.*,
+            {_GENDER_GROUP_SQL} AS gender_group,
+            ROW_NUMBER() OVER (
+                PARTITION BY pm.{{partition}}
+                ORDER BY {_GENDER_GROUP_SQL}, pm.grade DESC,
+                         pm.distance_between_cities NULLS LAST, pm.match_id
+            ) AS rank
+        FROM targets
+        JOIN {POSSIBLE_MATCHES_TABLE} pm ON pm.{{partition}} = targets.target_id
+        WHERE TRUE {{filters}}
+    ) ranked
+    WHERE rank <= %s
+    ORDER BY {{partition}}, rank
+"""
+
+
+def get_top_matches(k=TOP_K_DEFAULT, per="child", max_distance=PENALTY_DISTANCE_THRESHOLD,
+                    same_gender_only=False, waiting_only=True, child_ids=None, tutor_ids=None,
+                    after=None, limit=TOP_K_PAGE_SIZE):
+    """
+    Best K candidates per waiting child (per="child") or per tutor (per="tutor"),
+    ranked like the wizard: same-gender groups first, then grade, then distance.
+    Pairs with a pending (NULL) distance never pass the max_distance cutoff;
+    without a cutoff they rank after every pair with a known distance.
+
+    :param k: candidates per child/tutor (capped at TOP_K_MAX)
+    :param per: "child" → K tutors per child, "tutor" → K children per tutor
+    :param max_distance: km cutoff pushed into SQL (default: the 50 km penalty
+                         threshold); None keeps every distance
+    :param same_gender_only: drop cross-gender pairs in SQL
+    :param waiting_only: only children with no active/pending tutorship (wizard rule)
+    :param child_ids / tutor_ids: optional scope
+    :param after: return children/tutors with an id greater than this (the
+                  next_after of the previous page; None = first page)
+    :param limit: children/tutors per page (capped at TOP_K_PAGE_MAX)
+    :return: (groups, next_after) — groups is a list of
+             {"id": ..., "matches": [match dicts, best first]} in id order,
+             next_after is None on the last page
+    """
+    if per not in ("child", "tutor"):
+        raise ValueError("per must be 'child' or 'tutor'")
+    k = max(1, min(int(k), TOP_K_MAX))
+    limit = max(1, min(int(limit), TOP_K_PAGE_MAX))
+    partition = f"{per}_id"
+
+    filters, params = [], []
+    if max_distance is not None:
+        filters.append("AND pm.distance_between_cities <= %s")
+        params.append(max_distance)
+    if same_gender_only:
+        filters.append("AND pm.child_gender = pm.tutor_gender")
+    if waiting_only:
+        filters.append(
+            "AND NOT EXISTS (SELECT 1 FROM childsmile_app_tutorships tutorship "
+            "WHERE tutorship.child_id = pm.child_id AND tutorship.tutorship_activation <> 'inactive')"
+        )
+    if child_ids is not None:
+        filters.append("AND pm.child_id = ANY(%s)")
+        params.append(list(child_ids))
+    if tutor_ids is not None:
+        filters.append("AND pm.tutor_id = ANY(%s)")
+        params.append(list(tutor_ids))
+
+    sql = _TOP_K_SQL.format(
+        columns=", ".join(_MATCH_COLUMNS),
+        partition=partition,
+        filters="\n        ".join(filters),
+    )
+    after = -1 if after is None else int(after)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [after] + params + [limit] + params + [k])
+        columns = [col[0] for col in cursor.description]
+        rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    groups = []
+    for row in rows:
+        row["distance_pending"] = row["distance_between_cities"] is None
+        if not groups or groups[-1]["id"] != row[partition]:
+            groups.append({"id": row[partition], "matches": []})
+        groups[-1]["matches"].append(row)
+    next_after = groups[-1]["id"] if len(groups) == limit else None
+    return groups, next_after
+
+
+# ============================================================================
+# SIGNAL HOOKS — keep PossibleMatches in sync with its source tables
+# ============================================================================
+
+def _sync_after_commit(child_ids=None, tutor_ids=None):
+    """Run a scoped sync once the current transaction commits; never raise into the caller."""
+    def run():
+        try:
+            sync_possible_matches(child_ids=child_ids, tutor_ids=tutor_ids)
+        except Exception as e:
+            api_logger.error(
+                f"PossibleMatches incremental sync failed (children={child_ids}, tutors={tutor_ids}): {str(e)[:200]}"
+            )
+
+    transaction.on_commit(run)
+
+
+def _on_child_changed(sender, instance, **kwargs):
+    _sync_after_commit(child_ids=[instance.child_id])
+
+
+def _on_tutor_changed(sender, instance, **kwargs):
+    _sync_after_commit(tutor_ids=[instance.id_id])
+
+
+def _on_tutorship_changed(sender, instance, **kwargs):
+    # A tutorship only changes which tutors are available (1 tutee max) and
+    # whether this exact pair is excluded — both are covered by the tutor scope.
+    # Children that got/lost a tutor are filtered by the wizard at read time.
+    _sync_after_commit(tutor_ids=[instance.tutor_id])
+
+
+def _on_signedup_changed(sender, instance, **kwargs):
+    from .models import Tutors
+
+    if kwargs.get('created'):
+        return  # Not a tutor yet — the Tutors row triggers the sync
+    if Tutors.objects.filter(id_id=instance.id).exists():
+        _sync_after_commit(tutor_ids=[instance.id])
+
+
+def _on_staff_changed(sender, instance, **kwargs):
+    from .models import Tutors
+
+    update_fields = kwargs.get('update_fields')
+    if update_fields is not None and 'is_active' not in update_fields:
+        return
+    tutor_ids = list(Tutors.objects.filter(staff_id=instance.staff_id).values_list('id_id', flat=True))
+    if tutor_ids:
+        _sync_after_commit(tutor_ids=tutor_ids)
+
+
+def connect_matching_signals():
+    """Connect the PossibleMatches maintenance hooks (called from AppConfig.ready)."""
+    from .models import Children, Tutors, Tutorships, SignedUp, Staff
+
+    post_save.connect(_on_child_changed, sender=Children, dispatch_uid="pm_child_saved")
+    post_delete.connect(_on_child_changed, sender=Children, dispatch_uid="pm_child_deleted")
+    post_save.connect(_on_tutor_changed, sender=Tutors, dispatch_uid="pm_tutor_saved")
+    post_delete.connect(_on_tutor_changed, sender=Tutors, dispatch_uid="pm_tutor_deleted")
+    post_save.connect(_on_tutorship_changed, sender=Tutorships, dispatch_uid="pm_tutorship_saved")
+    post_delete.connect(_on_tutorship_changed, sender=Tutorships, dispatch_uid="pm_tutorship_deleted")
+    post_save.connect(_on_signedup_changed, sender=SignedUp, dispatch_uid="pm_signedup_saved")
+    post_save.connect(_on_staff_changed, sender=Staff, dispatch_uid="pm_staff_saved")
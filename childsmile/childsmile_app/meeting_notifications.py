@@ -8,8 +8,6 @@ Reminder schedule per meeting:
   • Same day       — "היום!"
 """
 
-from django.core.mail import send_mail
-from django.conf import settings
 from django.db.models import Q
 import datetime
 from datetime import datetime as dt
@@ -17,6 +15,8 @@ from .logger import api_logger
 from .whatsapp_utils import send_meeting_reminder_whatsapp, send_meeting_event_notification_whatsapp
 from .models import Staff, StaffMeeting
 from .notification_mute import is_whatsapp_muted
+from .email_outbox import enqueue_email
+from .notification_templates import register_template
 
 
 # ──────────────────────────────────────────────
@@ -41,6 +41,56 @@ def _format_meeting_date(meeting_date, meeting_time):
     return f"יום {day_name} {meeting_date.strftime('%d/%m/%Y')} בשעה {meeting_time.strftime('%H:%M')}"
 
 
+# ──────────────────────────────────────────────
+# Email layouts (compiled once — notification_templates)
+# ──────────────────────────────────────────────
+
+MEETING_NOTES_ROW = register_template(
+    "meeting_notes_row",
+    '<tr{row_style}><td style="padding:8px;font-weight:bold">{label}</td><td style="padding:8px">{notes}</td></tr>',
+)
+MEETING_URGENCY = register_template(
+    "meeting_urgency",
+    '<p style="margin-top:20px;color:#3BC1C8;font-weight:bold">{urgency}</p>',
+)
+
+MEETING_REMINDER_EMAIL = register_template("meeting_reminder", """
+<div dir="rtl" style="font-family:Arial,sans-serif;font-size:16px;color:#333">
+  <h2 style="color:#143852">{header}</h2>
+  <table style="border-collapse:collapse;width:100%;max-width:500px">
+    <tr><td style="padding:8px;font-weight:bold">📅 תאריך ושעה</td><td style="padding:8px">{date_str}</td></tr>
+    <tr style="background:#f5f5f5"><td style="padding:8px;font-weight:bold">📍 מיקום</td><td style="padding:8px">{location}</td></tr>
+    {notes_row}
+  </table>
+  {urgency_html}
+  <hr style="margin-top:30px;border:1px solid #eee"/>
+  <small style="color:#999">– מערכת ChildSmile</small>
+</div>
+""")
+
+# Created / updated / cancelled share one layout; the colours are bound per event below
+MEETING_EVENT_EMAIL = register_template("meeting_event", """
+<div dir="rtl" style="font-family:Arial,sans-serif;font-size:16px;color:#333">
+  <h2 style="color:{header_color}">{header}</h2>{intro}
+  <table style="border-collapse:collapse;width:100%;max-width:500px">
+    <tr><td style="padding:8px;font-weight:bold">📅 תאריך ושעה</td><td style="padding:8px">{date_str}</td></tr>
+    <tr style="background:#f5f5f5"><td style="padding:8px;font-weight:bold">📍 מיקום</td><td style="padding:8px">{location}</td></tr>
+    <tr><td style="padding:8px;font-weight:bold">📝 כותרת</td><td style="padding:8px">{title}</td></tr>
+    {notes_row}
+  </table>
+  <p style="margin-top:20px;color:{urgency_color};font-weight:bold">{urgency}</p>
+  <hr style="margin-top:30px;border:1px solid #eee"/>
+  <small style="color:#999">– מערכת ChildSmile</small>
+</div>
+""")
+MEETING_CREATED_EMAIL = MEETING_EVENT_EMAIL.bind(header_color='#2196F3', urgency_color='#1976D2', intro='')
+MEETING_UPDATED_EMAIL = MEETING_EVENT_EMAIL.bind(header_color='#FF9800', urgency_color='#E65100', intro='')
+MEETING_CANCELLED_EMAIL = MEETING_EVENT_EMAIL.bind(
+    header_color='#F44336', urgency_color='#C62828', notes_row='',
+    intro='\n  <p style="font-size:18px;margin:15px 0">פגישה בוטלה:</p>',
+)
+
+
 # ──────────────────────────────────────────────
 # Core send function
 # ──────────────────────────────────────────────
@@ -89,41 +139,27 @@ def send_meeting_reminder(meeting, reminder_type):
         f"– מערכת ChildSmile"
     )
 
-    body_html = f"""
-<div dir="rtl" style="font-family:Arial,sans-serif;font-size:16px;color:#333">
-  <h2 style="color:#143852">{header}</h2>
-  <table style="border-collapse:collapse;width:100%;max-width:500px">
-    <tr><td style="padding:8px;font-weight:bold">📅 תאריך ושעה</td><td style="padding:8px">{date_str}</td></tr>
-    <tr style="background:#f5f5f5"><td style="padding:8px;font-weight:bold">📍 מיקום</td><td style="padding:8px">{location}</td></tr>
-    {'<tr><td style="padding:8px;font-weight:bold">📝 הערות</td><td style="padding:8px">' + notes + '</td></tr>' if notes else ''}
-  </table>
-  {'<p style="margin-top:20px;color:#3BC1C8;font-weight:bold">' + urgency + '</p>' if urgency else ''}
-  <hr style="margin-top:30px;border:1px solid #eee"/>
-  <small style="color:#999">– מערכת ChildSmile</small>
-</div>
-"""
+    body_html = MEETING_REMINDER_EMAIL.render(
+        header=header,
+        date_str=date_str,
+        location=location,
+        notes_row=MEETING_NOTES_ROW.render(row_style='', label='📝 הערות', notes=notes) if notes else '',
+        urgency_html=MEETING_URGENCY.render(urgency=urgency) if urgency else '',
+    )
 
     _mute_key = {'week_before': 'meeting_reminder_week', 'two_days_before': 'meeting_reminder_two_days', 'same_day': 'meeting_reminder_same_day'}.get(reminder_type)
 
-    sent_email = 0
+    queued_email = 0
     failed_email = 0
 
-    # Send email to each invitee (skip anyone who muted this reminder — mute covers email too)
-    for staff in recipients:
-        if staff.email and not is_whatsapp_muted(staff, _mute_key):
-            try:
-                send_mail(
-                    subject=subject,
-                    message=body_text,
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=[staff.email],
-                    html_message=body_html,
-                    fail_silently=False,
-                )
-                sent_email += 1
-            except Exception as e:
-                failed_email += 1
-                api_logger.error(f"meeting_reminder email failed for {staff.email}: {e}")
+    # Queue one email per invitee (skip anyone who muted this notification — mute covers email too);
+    # the email dispatcher sends them over a single SMTP connection.
+    emails = [staff.email for staff in recipients if staff.email and not is_whatsapp_muted(staff, _mute_key)]
+    try:
+        queued_email = len(enqueue_email(emails, subject, body_text, html_message=body_html, source=f'meeting_{reminder_type}'))
+    except Exception as e:
+        failed_email = len(emails)
+        api_logger.error(f"meeting_reminder email queueing failed: {e}")
 
     # WhatsApp — only for coordinators/admins (they are Staff with staff_phone).
     # Other staff (non-coordinator) get email only — no WhatsApp.
@@ -157,7 +193,7 @@ def send_meeting_reminder(meeting, reminder_type):
 
     api_logger.info(
         f"meeting_reminder [{reminder_type}] meeting_id={meeting.id} | "
-        f"email sent={sent_email} failed={failed_email} | "
+        f"email queued={queued_email} failed={failed_email} | "
         f"whatsapp sent={wa_sent} failed={wa_failed}"
     )
 
@@ -243,40 +279,26 @@ def notify_meeting_created(meeting):
         f"– מערכת ChildSmile"
     )
 
-    body_html = f"""
-<div dir="rtl" style="font-family:Arial,sans-serif;font-size:16px;color:#333">
-  <h2 style="color:#2196F3">{header}</h2>
-  <table style="border-collapse:collapse;width:100%;max-width:500px">
-    <tr><td style="padding:8px;font-weight:bold">📅 תאריך ושעה</td><td style="padding:8px">{date_str}</td></tr>
-    <tr style="background:#f5f5f5"><td style="padding:8px;font-weight:bold">📍 מיקום</td><td style="padding:8px">{location}</td></tr>
-    <tr><td style="padding:8px;font-weight:bold">📝 כותרת</td><td style="padding:8px">{meeting.title}</td></tr>
-    {'<tr style="background:#f5f5f5"><td style="padding:8px;font-weight:bold">הערות</td><td style="padding:8px">' + notes + '</td></tr>' if notes else ''}
-  </table>
-  <p style="margin-top:20px;color:#1976D2;font-weight:bold">{urgency}</p>
-  <hr style="margin-top:30px;border:1px solid #eee"/>
-  <small style="color:#999">– מערכת ChildSmile</small>
-</div>
-"""
+    body_html = MEETING_CREATED_EMAIL.render(
+        header=header,
+        date_str=date_str,
+        location=location,
+        title=meeting.title,
+        notes_row=MEETING_NOTES_ROW.render(row_style=' style="background:#f5f5f5"', label='הערות', notes=notes) if notes else '',
+        urgency=urgency,
+    )
 
-    sent_email = 0
+    queued_email = 0
     failed_email = 0
 
-    # Send email to each invitee (skip anyone who muted this notification — mute covers email too)
-    for staff in recipients:
-        if staff.email and not is_whatsapp_muted(staff, 'meeting_created'):
-            try:
-                send_mail(
-                    subject=subject,
-                    message=body_text,
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=[staff.email],
-                    html_message=body_html,
-                    fail_silently=False,
-                )
-                sent_email += 1
-            except Exception as e:
-                failed_email += 1
-                api_logger.error(f"notify_meeting_created email failed for {staff.email}: {e}")
+    # Queue one email per invitee (skip anyone who muted this notification — mute covers email too);
+    # the email dispatcher sends them over a single SMTP connection.
+    emails = [staff.email for staff in recipients if staff.email and not is_whatsapp_muted(staff, 'meeting_created')]
+    try:
+        queued_email = len(enqueue_email(emails, subject, body_text, html_message=body_html, source='meeting_created'))
+    except Exception as e:
+        failed_email = len(emails)
+        api_logger.error(f"notify_meeting_created email queueing failed: {e}")
 
     # WhatsApp — only for coordinators/admins
     wa_sent = 0
@@ -302,7 +324,7 @@ def notify_meeting_created(meeting):
 
     api_logger.info(
         f"notify_meeting_created meeting_id={meeting.id} | "
-        f"email sent={sent_email} failed={failed_email} | "
+        f"email queued={queued_email} failed={failed_email} | "
         f"whatsapp sent={wa_sent} failed={wa_failed}"
     )
 
@@ -348,39 +370,26 @@ def notify_meeting_updated(meeting):
         f"– מערכת ChildSmile"
     )
 
-    body_html = f"""
-<div dir="rtl" style="font-family:Arial,sans-serif;font-size:16px;color:#333">
-  <h2 style="color:#FF9800">{header}</h2>
-  <table style="border-collapse:collapse;width:100%;max-width:500px">
-    <tr><td style="padding:8px;font-weight:bold">📅 תאריך ושעה</td><td style="padding:8px">{date_str}</td></tr>
-    <tr style="background:#f5f5f5"><td style="padding:8px;font-weight:bold">📍 מיקום</td><td style="padding:8px">{location}</td></tr>
-    <tr><td style="padding:8px;font-weight:bold">📝 כותרת</td><td style="padding:8px">{meeting.title}</td></tr>
-    {'<tr style="background:#f5f5f5"><td style="padding:8px;font-weight:bold">הערות</td><td style="padding:8px">' + notes + '</td></tr>' if notes else ''}
-  </table>
-  <p style="margin-top:20px;color:#E65100;font-weight:bold">{urgency}</p>
-  <hr style="margin-top:30px;border:1px solid #eee"/>
-  <small style="color:#999">– מערכת ChildSmile</small>
-</div>
-"""
+    body_html = MEETING_UPDATED_EMAIL.render(
+        header=header,
+        date_str=date_str,
+        location=location,
+        title=meeting.title,
+        notes_row=MEETING_NOTES_ROW.render(row_style=' style="background:#f5f5f5"', label='הערות', notes=notes) if notes else '',
+        urgency=urgency,
+    )
 
-    sent_email = 0
+    queued_email = 0
     failed_email = 0
 
-    for staff in recipients:
-        if staff.email and not is_whatsapp_muted(staff, 'meeting_updated'):
-            try:
-                send_mail(
-                    subject=subject,
-                    message=body_text,
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=[staff.email],
-                    html_message=body_html,
-                    fail_silently=False,
-                )
-                sent_email += 1
-            except Exception as e:
-                failed_email += 1
-                api_logger.error(f"notify_meeting_updated email failed for {staff.email}: {e}")
+    # Queue one email per invitee (skip anyone who muted this notification — mute covers email too);
+    # the email dispatcher sends them over a single SMTP connection.
+    emails = [staff.email for staff in recipients if staff.email and not is_whatsapp_muted(staff, 'meeting_updated')]
+    try:
+        queued_email = len(enqueue_email(emails, subject, body_text, html_message=body_html, source='meeting_updated'))
+    except Exception as e:
+        failed_email = len(emails)
+        api_logger.error(f"notify_meeting_updated email queueing failed: {e}")
 
     # WhatsApp — only for coordinators/admins
     wa_sent = 0
@@ -406,7 +415,7 @@ def notify_meeting_updated(meeting):
 
     api_logger.info(
         f"notify_meeting_updated meeting_id={meeting.id} | "
-        f"email sent={sent_email} failed={failed_email} | "
+        f"email queued={queued_email} failed={failed_email} | "
         f"whatsapp sent={wa_sent} failed={wa_failed}"
     )
 
@@ -451,39 +460,25 @@ def notify_meeting_cancelled(meeting):
         f"– מערכת ChildSmile"
     )
 
-    body_html = f"""
-<div dir="rtl" style="font-family:Arial,sans-serif;font-size:16px;color:#333">
-  <h2 style="color:#F44336">{header}</h2>
-  <p style="font-size:18px;margin:15px 0">פגישה בוטלה:</p>
-  <table style="border-collapse:collapse;width:100%;max-width:500px">
-    <tr><td style="padding:8px;font-weight:bold">📅 תאריך ושעה</td><td style="padding:8px">{date_str}</td></tr>
-    <tr style="background:#f5f5f5"><td style="padding:8px;font-weight:bold">📍 מיקום</td><td style="padding:8px">{location}</td></tr>
-    <tr><td style="padding:8px;font-weight:bold">📝 כותרת</td><td style="padding:8px">{meeting.title}</td></tr>
-  </table>
-  <p style="margin-top:20px;color:#C62828;font-weight:bold">{urgency}</p>
-  <hr style="margin-top:30px;border:1px solid #eee"/>
-  <small style="color:#999">– מערכת ChildSmile</small>
-</div>
-"""
+    body_html = MEETING_CANCELLED_EMAIL.render(
+        header=header,
+        date_str=date_str,
+        location=location,
+        title=meeting.title,
+        urgency=urgency,
+    )
 
-    sent_email = 0
+    queued_email = 0
     failed_email = 0
 
-    for staff in recipients:
-        if staff.email and not is_whatsapp_muted(staff, 'meeting_cancelled'):
-            try:
-                send_mail(
-                    subject=subject,
-                    message=body_text,
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=[staff.email],
-                    html_message=body_html,
-                    fail_silently=False,
-                )
-                sent_email += 1
-            except Exception as e:
-                failed_email += 1
-                api_logger.error(f"notify_meeting_cancelled email failed for {staff.email}: {e}")
+    # Queue one email per invitee (skip anyone who muted this notification — mute covers email too);
+    # the email dispatcher sends them over a single SMTP connection.
+    emails = [staff.email for staff in recipients if staff.email and not is_whatsapp_muted(staff, 'meeting_cancelled')]
+    try:
+        queued_email = len(enqueue_email(emails, subject, body_text, html_message=body_html, source='meeting_cancelled'))
+    except Exception as e:
+        failed_email = len(emails)
+        api_logger.error(f"notify_meeting_cancelled email queueing failed: {e}")
 
     # WhatsApp — only for coordinators/admins
     wa_sent = 0
@@ -509,7 +504,7 @@ def notify_meeting_cancelled(meeting):
 
     api_logger.info(
         f"notify_meeting_cancelled meeting_id={meeting.id} | "
-        f"email sent={sent_email} failed={failed_email} | "
+        f"email queued={queued_email} failed={failed_email} | "
         f"whatsapp sent={wa_sent} failed={wa_failed}"
     )
 
@@ -497,7 +497,8 @@ class PossibleMatches(models.Model):
     tutor_age = models.IntegerField()
     child_gender = models.BooleanField()
     tutor_gender = models.BooleanField()
-    distance_between_cities = models.IntegerField(default=0)
+    # NULL = not known yet (a city waiting for the geocoder, see add_possible_matches_pending_distance.sql)
+    distance_between_cities = models.IntegerField(null=True, blank=True)
     grade = models.IntegerField()
     is_used = models.BooleanField(default=False)
 
@@ -506,6 +507,17 @@ class PossibleMatches(models.Model):
 
     class Meta:
         db_table = "childsmile_app_possiblematches"
+        # One row per pair — ON CONFLICT target of matching_utils.sync_possible_matches()
+        # (see add_possible_matches_pair_index.sql)
+        constraints = [
+            models.UniqueConstraint(
+                fields=['child_id', 'tutor_id'],
+                name='uq_possiblematches_child_tutor',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['tutor_id'], name='idx_possiblematches_tutor'),
+        ]
 
 
 class InitialFamilyData(models.Model):
@@ -613,6 +625,225 @@ class CityGeoDistance(models.Model):
         return f"{self.city1} <-> {self.city2}: {self.distance}km"
 
 
+class TaskTombstone(models.Model):
+    """
+    One row per deleted task — and per previous assignee of a reassigned task —
+    written by DB triggers (add_task_tombstones.sql) so the task board's delta
+    sync can tell clients which tasks disappeared from their board.
+    """
+    id = models.BigAutoField(primary_key=True)
+    task_id = models.IntegerField()
+    assigned_to_id = models.IntegerField(null=True, blank=True)
+    task_type_id = models.IntegerField(null=True, blank=True)
+    deleted_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        db_table = "childsmile_app_task_tombstones"
+
+    def __str__(self):
+        return f"Tombstone task {self.task_id} (assignee {self.assigned_to_id}) @ {self.deleted_at}"
+
+
+class JobRun(models.Model):
+    """
+    Last successful run of a periodic maintenance job (see add_job_run_table.sql).
+    Shared by all gunicorn workers, so request paths can cheaply check
+    "already done today" instead of redoing the work (e.g. the age refresh).
+    """
+    job_name = models.CharField(max_length=100, primary_key=True)
+    last_run_date = models.DateField()
+    last_run_at = models.DateTimeField(auto_now=True)
+    last_result = models.JSONField(default=dict, blank=True)
+
+    class Meta:
+        db_table = "childsmile_app_jobrun"
+
+    def __str__(self):
+        return f"{self.job_name} @ {self.last_run_at}"
+
+
+class RenderJob(models.Model):
+    """
+    Background AI video / PPT generation job (see add_render_jobs_table.sql).
+    Created by the dashboard endpoints and executed by render_jobs' worker
+    pool; the status / download endpoints read it from any gunicorn worker.
+    """
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_COMPLETED = "completed"
+    STATUS_FAILED = "failed"
+    STATUS_EXPIRED = "expired"
+
+    job_id = models.CharField(max_length=36, primary_key=True)  # uuid4
+    kind = models.CharField(max_length=10, choices=[("video", "Video"), ("ppt", "PPT")])
+    params = models.JSONField(default=dict, blank=True)
+    dedup_key = models.CharField(max_length=64)  # sha256 of kind + params
+    status = models.CharField(max_length=20, default=STATUS_QUEUED)
+    file_path = models.CharField(max_length=500, null=True, blank=True)
+    file_size = models.BigIntegerField(null=True, blank=True)
+    error = models.TextField(null=True, blank=True)
+    requested_by = models.IntegerField(null=True, blank=True)  # staff_id
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "childsmile_app_renderjob"
+        indexes = [
+            models.Index(fields=["status", "created_at"], name="idx_renderjob_status"),
+            models.Index(fields=["dedup_key", "created_at"], name="idx_renderjob_dedup"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} job {self.job_id} ({self.status})"
+
+
+class ImportJob(models.Model):
+    """
+    Background Excel import of families / volunteers (see add_import_jobs_table.sql).
+    The upload is stored on the row and processed in chunks by import_jobs'
+    worker pool; progress, per-row results and the result workbook are kept
+    here so any gunicorn worker can answer the status / download endpoints.
+    """
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_COMPLETED = "completed"
+    STATUS_FAILED = "failed"
+    STATUS_CANCELLED = "cancelled"
+
+    job_id = models.CharField(max_length=36, primary_key=True)  # uuid4
+    kind = models.CharField(max_length=20, choices=[("families", "Families"), ("volunteers", "Volunteers")])
+    dry_run = models.BooleanField(default=False)
+    status = models.CharField(max_length=20, default=STATUS_QUEUED)
+    file_name = models.CharField(max_length=255)
+    upload = models.BinaryField()
+    total_rows = models.IntegerField(default=0)
+    processed_rows = models.IntegerField(default=0)  # checkpoint: rows whose results are committed
+    counts = models.JSONField(default=dict, blank=True)
+    results = models.JSONField(default=list, blank=True)
+    result_file = models.BinaryField(null=True, blank=True)
+    audit_context = models.JSONField(default=dict, blank=True)  # request details for the final audit entry
+    error = models.TextField(null=True, blank=True)
+    cancel_requested = models.BooleanField(default=False)
+    attempt = models.IntegerField(default=0)  # incremented on every claim
+    requested_by = models.IntegerField(null=True, blank=True)  # staff_id
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "childsmile_app_importjob"
+        indexes = [
+            models.Index(fields=["status", "created_at"], name="idx_importjob_status"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} import {self.job_id} ({self.status})"
+
+
+class WhatsAppOutbox(models.Model):
+    """
+    Queued outgoing WhatsApp message (see add_whatsapp_outbox_table.sql).
+    Inserted by whatsapp_outbox.enqueue_whatsapp() and sent by its dispatcher
+    threads; delivery_status is updated by the Twilio status callback.
+    """
+    STATUS_QUEUED = "queued"
+    STATUS_SENDING = "sending"
+    STATUS_SENT = "sent"
+    STATUS_FAILED = "failed"
+
+    to_phone = models.CharField(max_length=32)  # whatsapp:+972...
+    body = models.TextField(null=True, blank=True)
+    template_sid = models.CharField(max_length=64, null=True, blank=True)
+    template_variables = models.JSONField(null=True, blank=True)
+    source = models.CharField(max_length=50, null=True, blank=True)
+    status = models.CharField(max_length=20, default=STATUS_QUEUED)
+    attempts = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    message_sid = models.CharField(max_length=64, null=True, blank=True)
+    delivery_status = models.CharField(max_length=20, null=True, blank=True)  # Twilio message status
+    error_code = models.CharField(max_length=20, null=True, blank=True)
+    last_error = models.TextField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "childsmile_app_whatsapp_outbox"
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="idx_whatsapp_outbox_due"),
+        ]
+
+    def __str__(self):
+        return f"WhatsApp #{self.id} to {self.to_phone} ({self.status})"
+
+
+class EmailOutbox(models.Model):
+    """
+    Queued outgoing notification email (see add_email_outbox_table.sql).
+    Inserted by email_outbox.enqueue_email() and sent in batches over one SMTP
+    connection by its dispatcher threads.
+    """
+    STATUS_QUEUED = "queued"
+    STATUS_SENDING = "sending"
+    STATUS_SENT = "sent"
+    STATUS_FAILED = "failed"
+
+    to_email = models.CharField(max_length=254)
+    from_email = models.CharField(max_length=254)
+    subject = models.TextField()
+    body = models.TextField(default="", blank=True)  # plain-text part
+    html_body = models.TextField(null=True, blank=True)
+    source = models.CharField(max_length=50, null=True, blank=True)
+    status = models.CharField(max_length=20, default=STATUS_QUEUED)
+    attempts = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "childsmile_app_email_outbox"
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="idx_email_outbox_due"),
+        ]
+
+    def __str__(self):
+        return f"Email #{self.id} to {self.to_email} ({self.status})"
+
+
+class CityLocation(models.Model):
+    """
+    Local city-coordinate gazetteer (see add_city_location_table.sql).
+    Request paths look coordinates up here by primary key and NEVER call the
+    geocoding API; rows with NULL coordinates are filled in the background by
+    geo_utils.geocode_pending_cities() (scheduler / geocode_city_locations command).
+    """
+    SOURCE_CHOICES = [
+        ('citygeodistance', 'Migrated from CityGeoDistance'),
+        ('settlements', 'Settlements list'),
+        ('geocoder', 'Geocoding API'),
+        ('manual', 'Manual'),
+        ('request', 'Seen on request path'),
+    ]
+
+    city_name = models.CharField(max_length=255, primary_key=True)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES, default='request')
+    geocode_attempts = models.IntegerField(default=0)
+    last_geocode_attempt = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "childsmile_app_citylocation"
+
+    def __str__(self):
+        return f"{self.city_name} ({self.latitude}, {self.longitude})"
+
+
 class PrevTutorshipStatuses(models.Model):
     prev_id = models.AutoField(primary_key=True, serialize=False)
     tutor_id = models.ForeignKey(Tutors, on_delete=models.CASCADE, null=False)
@@ -725,14 +956,43 @@ class AuditLog(models.Model):
             models.Index(fields=['action', 'timestamp']),
             models.Index(fields=['entity_type', 'timestamp']),
             models.Index(fields=['success', 'timestamp']),
-            # make the description field indexed for faster search
-            models.Index(fields=['description'], name='idx_auditlog_description'),
+            # keyset pagination cursor (add_audit_log_keyset_index.sql)
+            models.Index(fields=['timestamp', 'audit_id'], name='idx_auditlog_ts_id'),
+            # description / error_message / additional_data search uses the
+            # idx_auditlog_search GIN expression index (add_audit_log_search_index.sql)
         ]
         ordering = ['-timestamp']  # Most recent first
     
     def __str__(self):
         return f"{self.timestamp} - {self.username} - {self.action} - {self.endpoint}"
 
+class AuditStatsRollup(models.Model):
+    """
+    Hourly audit_log counts per action / user / success / endpoint
+    (see add_audit_stats_rollup_table.sql). Maintained by
+    audit_stats_utils.refresh_audit_rollups(); read by get_audit_statistics.
+    """
+    id = models.BigAutoField(primary_key=True)
+    bucket = models.DateTimeField()  # start of the hour
+    action = models.CharField(max_length=100)
+    user_email = models.CharField(max_length=255)
+    success = models.BooleanField()
+    endpoint = models.CharField(max_length=255)
+    count = models.IntegerField()
+
+    class Meta:
+        db_table = "childsmile_app_auditstatsrollup"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["bucket", "action", "user_email", "success", "endpoint"],
+                name="idx_auditstatsrollup_key",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.bucket} - {self.action} - {self.user_email}: {self.count}"
+
+
 class AuditTranslation(models.Model):
     id = models.AutoField(primary_key=True)
     action = models.CharField(max_length=100, unique=True)
@@ -867,6 +1127,31 @@ class CoordinatorChatMessage(models.Model):
     def __str__(self):
         return f"Message from {self.sender_type} to {self.coordinator.username}"
 
+
+class CoordinatorChatSummary(models.Model):
+    """
+    Per-coordinator conversation summary for the admin inbox (see
+    add_coordinator_chat_summary_table.sql). Maintained by database triggers on
+    CoordinatorChatMessage — never written from Python.
+    """
+    coordinator = models.OneToOneField(
+        Staff, on_delete=models.CASCADE, primary_key=True, related_name='chat_summary'
+    )
+    total_messages = models.IntegerField(default=0)
+    unread_count = models.IntegerField(default=0)  # coordinator replies not read by the admins
+    last_message = models.ForeignKey(
+        CoordinatorChatMessage, null=True, blank=True, on_delete=models.DO_NOTHING,
+        db_constraint=False, related_name='+'
+    )
+    last_message_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = "childsmile_app_coordinator_chat_summary"
+
+    def __str__(self):
+        return f"Chat summary for coordinator {self.coordinator_id} ({self.total_messages} messages)"
+
 class ExpenseRefund(models.Model):
     """
     Tracks volunteer expense reimbursement requests (החזרי הוצאות).
@@ -1367,6 +1652,33 @@ class NotificationMessage(models.Model):
         ordering = ['-created_at']
 
 
+class RealtimeEvent(models.Model):
+    """
+    Change log of CoordinatorChatMessage and NotificationMessage rows, written
+    by DB triggers (add_realtime_events_table.sql) and read by the
+    /api/updates/ long-poll feed. The id is the clients' cursor.
+    """
+    STREAM_CHAT = "chat"
+    STREAM_NOTIFICATION = "notification"
+
+    ACTION_INSERT = "insert"
+    ACTION_UPDATE = "update"
+    ACTION_DELETE = "delete"
+
+    id = models.BigAutoField(primary_key=True)
+    stream = models.CharField(max_length=20)
+    object_id = models.IntegerField()
+    action = models.CharField(max_length=10)
+    coordinator_id = models.IntegerField(null=True, blank=True)  # chat events only
+    created_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        db_table = "childsmile_app_realtime_event"
+
+    def __str__(self):
+        return f"#{self.id} {self.stream} {self.action} {self.object_id}"
+
+
 class ActivityRound(models.Model):
     """
     A single registration window (מחזור בקשות) for fun-day / house-visit activity
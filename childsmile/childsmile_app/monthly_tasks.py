@@ -275,7 +275,6 @@ def refresh_all_ages_monthly():
         return {
             'status': 'completed',
             'volunteers_updated': volunteer_result['updated'],
-            'volunteers_skipped': volunteer_result.get('skipped', 0),
             'children_updated': children_result['updated'],
             'errors': 0
         }
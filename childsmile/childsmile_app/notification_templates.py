@@ -0,0 +1,126 @@
+"""
+notification_templates.py
+
+Compiled registry of the notification email layouts.
+
+The HTML bodies of the coordinator notifications (coordinator_utils), meeting
+notifications, views_staff TOTP mails and the weekly digest used to be large
+inline f-strings re-assembled for every recipient — a fan-out to N
+coordinators built the same ~6 KB document N times to change one greeting.
+
+Now:
+  - Each layout is registered once, at module import (= app startup), with
+    str.format-style {field} placeholders. register_template() splits it into
+    its static chunks and field slots, so rendering never re-parses it.
+  - render(**fields) only substitutes the fields between the static chunks.
+  - bind(**shared) pre-renders the fields shared by a whole fan-out (the
+    family / volunteer details) into a smaller template whose only remaining
+    slots are the per-recipient ones (coordinator_name). bind_template()
+    caches bound templates (LRU), so repeated events reuse them.
+
+Values are inserted as-is (no HTML escaping), exactly like the f-strings
+they replace.
+"""
+
+import string
+from functools import lru_cache
+
+_formatter = string.Formatter()
+_registry = {}
+
+
+def _format_field(slot, fields):
+    name, conversion, spec = slot
+    value = fields[name]
+    if conversion == 'r':
+        value = repr(value)
+    elif conversion == 'a':
+        value = ascii(value)
+    elif conversion == 's':
+        value = str(value)
+    return format(value, spec or '')
+
+
+class NotificationTemplate:
+    """A layout split into static chunks and {field} slots (chunk, slot, chunk, ..., chunk)."""
+
+    __slots__ = ('name', '_parts', 'fields')
+
+    def __init__(self, name, parts):
+        self.name = name
+        self._parts = parts
+        self.fields = frozenset(slot[0] for slot in parts[1::2])
+
+    @classmethod
+    def compile(cls, name, source):
+        parts = []
+        literal = []
+        for text, field, spec, conversion in _formatter.parse(source):
+            literal.append(text)
+            if field is None:
+                continue
+            if not field.isidentifier():
+                raise ValueError(f"Template '{name}': only plain {{name}} fields are supported, got {{{field}}}")
+            parts.append(''.join(literal))
+            parts.append((field, conversion, spec))
+            literal = []
+        parts.append(''.join(literal))
+        return cls(name, tuple(parts))
+
+    def render(self, **fields):
+        """Substitute the fields; raises KeyError for a missing one (like str.format)."""
+        parts = self._parts
+        out = [parts[0]]
+        for i in range(1, len(parts), 2):
+            out.append(_format_field(parts[i], fields))
+            out.append(parts[i + 1])
+        return ''.join(out)
+
+    def bind(self, **shared):
+        """Return a template with the given fields rendered into its static chunks."""
+        parts = self._parts
+        bound = []
+        literal = [parts[0]]
+        for i in range(1, len(parts), 2):
+            slot = parts[i]
+            if slot[0] in shared:
+                literal.append(_format_field(slot, shared))
+            else:
+                bound.append(''.join(literal))
+                bound.append(slot)
+                literal = []
+            literal.append(parts[i + 1])
+        bound.append(''.join(literal))
+        return NotificationTemplate(self.name, tuple(bound))
+
+    def __repr__(self):
+        return f"<NotificationTemplate {self.name} fields={sorted(self.fields)}>"
+
+
+def register_template(name, source):
+    """
+    Compile a layout and add it to the registry.
+    :return: the compiled NotificationTemplate (kept as a module constant by the caller)
+    """
+    template = NotificationTemplate.compile(name, source)
+    _registry[name] = template
+    return template
+
+
+def get_template(name):
+    """Registered template by name (KeyError if it was never registered)."""
+    return _registry[name]
+
+
+def render_template(name, **fields):
+    return _registry[name].render(**fields)
+
+
+@lru_cache(maxsize=128)
+def _bound(name, shared_items):
+    return _registry[name].bind(**dict(shared_items))
+
+
+def bind_template(name, **shared):
+    """Cached get_template(name).bind(**shared) — the shared values must be hashable."""
+    return _bound(name, tuple(sorted(shared.items())))
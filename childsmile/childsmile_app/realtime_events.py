@@ -0,0 +1,196 @@
+"""
+realtime_events.py
+
+Change feed behind the /api/updates/ long-poll endpoint (realtime_views).
+
+The admin chat page re-fetched the conversation list every 5 s and the open
+chat history every 3 s, and the notification bell re-fetched the whole list
+on a timer — for every open tab, whether anything had changed or not.
+
+Now:
+  - DB triggers (add_realtime_events_table.sql) append a RealtimeEvent row for
+    every insert / update / delete of a CoordinatorChatMessage (including the
+    WhatsApp replies stored by whatsapp_webhook) and of a NotificationMessage.
+  - Clients keep the last event id they saw (the cursor) and long-poll.
+    wait_for_events() blocks until an event past the cursor exists or
+    REALTIME_WAIT_SECONDS pass. All waiting requests of a process share ONE
+    "latest event id" lookup (a primary-key index probe) every
+    REALTIME_CHECK_INTERVAL seconds, so idle clients cost no message-table
+    queries at all.
+  - changed_objects() returns which messages changed after the cursor; the
+    view loads just those rows. Events committed out of id order are re-sent
+    for REALTIME_SYNC_OVERLAP_SECONDS so a slow transaction is never skipped;
+    clients merge by message id.
+  - prune_realtime_events() — scheduler — deletes events older than
+    REALTIME_EVENT_RETENTION_HOURS. A cursor older than that (or one that is
+    more than REALTIME_MAX_EVENTS behind) gets reset=True: reload everything.
+
+Long polls hold a gunicorn thread while they wait, so the app runs with
+threaded workers (azure-deploy.yml: --worker-class gthread --threads 16) and at
+most REALTIME_MAX_WAITERS requests per process wait at once; the rest (and
+every request when REALTIME_WAIT_SECONDS=0) are answered at once and told to
+poll again in REALTIME_RETRY_SECONDS.
+
+Environment:
+  REALTIME_WAIT_SECONDS            max seconds a long poll waits for events (default 25)
+  REALTIME_CHECK_INTERVAL          seconds between latest-event checks while waiting (default 1)
+  REALTIME_MAX_WAITERS             long polls waiting at once per process (default 8)
+  REALTIME_RETRY_SECONDS           poll delay sent to clients that could not wait (default 5)
+  REALTIME_MAX_EVENTS              events returned per poll before a reset is sent (default 500)
+  REALTIME_EVENT_RETENTION_HOURS   hours events are kept (default 24)
+"""
+
+import os
+import threading
+import time
+from datetime import timedelta
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+from .models import RealtimeEvent
+from .logger import api_logger
+
+REALTIME_SYNC_OVERLAP_SECONDS = 5
+
+
+def _env_int(name, default):
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def latest_event_id():
+    """Id of the newest event (0 if there are none) — the cursor of an up-to-date client."""
+    return RealtimeEvent.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+
+class _EventWatermark:
+    """
+    Process-wide cache of latest_event_id(). Waiting requests take turns
+    refreshing it at most once per interval; the others sleep on the condition
+    and are woken when the refresh lands.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._latest = None
+        self._checked_at = 0.0
+        self._checking = False
+        self.waiters = 0
+
+    def wait(self, cursor, timeout, interval):
+        """
+        Block until an event newer than cursor exists or timeout seconds pass.
+        :return: the latest known event id
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._cond:
+                now = time.monotonic()
+                if self._latest is not None and self._latest > cursor:
+                    return self._latest
+                stale = now - self._checked_at >= interval
+                if now >= deadline and not stale:
+                    return self._latest or 0
+                if self._checking or not stale:
+                    self._cond.wait(max(0.05, min(deadline - now, interval - (now - self._checked_at))))
+                    continue
+                self._checking = True
+            latest = None
+            try:
+                latest = latest_event_id()
+            finally:
+                # Don't keep a connection open for the rest of the wait
+                connection.close()
+                with self._cond:
+                    self._checking = False
+                    self._checked_at = time.monotonic()
+                    if latest is not None:
+                        self._latest = latest
+                    self._cond.notify_all()
+            if latest > cursor or time.monotonic() >= deadline:
+                return latest
+
+
+_watermark = _EventWatermark()
+
+
+def wait_for_events(cursor, timeout=None):
+    """
+    Long-poll wait: return as soon as an event with id > cursor exists, or
+    after timeout seconds (default and maximum REALTIME_WAIT_SECONDS).
+    At most REALTIME_MAX_WAITERS requests per process wait at once — the
+    others are answered at once, so long polls never take every gunicorn thread.
+    :return: (latest known event id, whether the request actually waited)
+    """
+    max_wait = _env_int('REALTIME_WAIT_SECONDS', 25)
+    timeout = max_wait if timeout is None else min(timeout, max_wait)
+    interval = max(1, _env_int('REALTIME_CHECK_INTERVAL', 1))
+    with _watermark._cond:
+        waited = timeout > 0 and _watermark.waiters < _env_int('REALTIME_MAX_WAITERS', 8)
+        if waited:
+            _watermark.waiters += 1
+    try:
+        return _watermark.wait(cursor, timeout if waited else 0, interval), waited
+    finally:
+        if waited:
+            with _watermark._cond:
+                _watermark.waiters -= 1
+
+
+def poll_retry_seconds():
+    """Delay sent to clients whose poll was answered without waiting (REALTIME_RETRY_SECONDS)."""
+    return max(1, _env_int('REALTIME_RETRY_SECONDS', 5))
+
+
+def changed_objects(cursor, streams, latest=0):
+    """
+    Messages changed after the cursor.
+
+    :param cursor: last event id the client has seen
+    :param streams: RealtimeEvent streams the caller may see
+    :param latest: latest event id from wait_for_events() — the new cursor
+                   skips past events of the other streams too
+    :return: (new_cursor, {stream: [object ids]}, reset) — reset=True means
+             events past the cursor were pruned or are too many to replay,
+             and the client must reload everything
+    """
+    oldest = RealtimeEvent.objects.order_by('id').values_list('id', flat=True).first()
+    if oldest is not None and oldest > cursor + 1:
+        return latest_event_id(), {}, True
+
+    limit = max(1, _env_int('REALTIME_MAX_EVENTS', 500))
+    overlap_start = timezone.now() - timedelta(seconds=REALTIME_SYNC_OVERLAP_SECONDS)
+    events = list(
+        RealtimeEvent.objects
+        .filter(Q(id__gt=cursor) | Q(created_at__gte=overlap_start), stream__in=streams)
+        .order_by('id')
+        .values_list('id', 'stream', 'object_id')[:limit + 1]
+    )
+    if len(events) > limit:
+        return latest_event_id(), {}, True
+
+    changed = {}
+    new_cursor = max(cursor, latest)
+    for event_id, stream, object_id in events:
+        ids = changed.setdefault(stream, [])
+        if object_id not in ids:
+            ids.append(object_id)
+        new_cursor = max(new_cursor, event_id)
+    return new_cursor, changed, False
+
+
+def prune_realtime_events():
+    """
+    Periodic housekeeping (scheduler, REALTIME_EVENT_SWEEP_INTERVAL): delete
+    events older than REALTIME_EVENT_RETENTION_HOURS. The newest event is
+    always kept, so an up-to-date cursor is never mistaken for a pruned one.
+    :return: number of events deleted
+    """
+    latest = latest_event_id()
+    cutoff = timezone.now() - timedelta(hours=_env_int('REALTIME_EVENT_RETENTION_HOURS', 24))
+    deleted, _ = RealtimeEvent.objects.filter(created_at__lt=cutoff, id__lt=latest).delete()
+    if deleted:
+        api_logger.debug(f"DEBUG: Pruned {deleted} realtime event(s) older than {cutoff.isoformat()}")
+    return deleted
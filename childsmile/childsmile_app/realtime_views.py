@@ -0,0 +1,137 @@
+"""
+realtime_views.py
+
+Long-poll change feed for the admin coordinator chat and the notification
+bell (see realtime_events for how the wait and the cursor work).
+
+Endpoint:
+  GET /api/updates/?cursor=<id>[&wait=<seconds>]
+
+The first call (no cursor) answers at once with the current cursor and
+reset=True; the client loads its lists normally and then polls with the
+cursor it got back. Each response carries the next cursor.
+"""
+
+import os
+from django.db import connection
+from django.http import JsonResponse
+from rest_framework.decorators import api_view
+from .models import CoordinatorChatMessage, NotificationMessage, RealtimeEvent, Staff
+from .utils import conditional_csrf, is_admin
+from .logger import api_logger
+from .realtime_events import changed_objects, latest_event_id, poll_retry_seconds, wait_for_events
+from .coordinator_chat_views import _message_to_dict
+from .notification_views import _serialize as _serialize_notification
+
+# Template rows the bell never shows (see get_notifications)
+BIRTHDAY_TEMPLATE_TYPES = ('birthday_today', 'birthday_this_week', 'birthday_next_week')
+
+
+def _get_user(request):
+    user_id = request.session.get("user_id")
+    if not user_id:
+        return None
+    try:
+        return Staff.objects.get(staff_id=user_id)
+    except Staff.DoesNotExist:
+        return None
+
+
+def _chat_enabled():
+    return os.getenv('WEEKLY_COORDINATOR_REPORTS_ENABLED', 'true').lower() in ('true', '1', 'yes')
+
+
+def _int_param(request, name):
+    try:
+        value = int(request.GET.get(name))
+    except (TypeError, ValueError):
+        return None
+    return value if value >= 0 else None
+
+
+def _feed_response(cursor, reset, changed=None, retry_in=0):
+    """
+    Response body. Changed rows are re-read by id: rows that still exist are
+    sent in full, the others (and hidden notifications) as removed ids.
+    """
+    data = {
+        "cursor": cursor,
+        "reset": reset,
+        "notifications": [],
+        "notifications_removed": [],
+        "chat": [],
+        "chat_deleted": [],
+        "retry_in": retry_in,
+    }
+    changed = changed or {}
+
+    notification_ids = changed.get(RealtimeEvent.STREAM_NOTIFICATION)
+    if notification_ids:
+        found = set()
+        for msg in NotificationMessage.objects.filter(id__in=notification_ids).select_related("child", "created_by"):
+            found.add(msg.id)
+            if msg.is_active and msg.message_type not in BIRTHDAY_TEMPLATE_TYPES:
+                data["notifications"].append(_serialize_notification(msg))
+            else:
+                data["notifications_removed"].append(msg.id)
+        data["notifications_removed"] += [i for i in notification_ids if i not in found]
+
+    chat_ids = changed.get(RealtimeEvent.STREAM_CHAT)
+    if chat_ids:
+        found = set()
+        for msg in CoordinatorChatMessage.objects.filter(id__in=chat_ids).order_by('created_at', 'id'):
+            found.add(msg.id)
+            data["chat"].append(_message_to_dict(msg))
+        data["chat_deleted"] = [i for i in chat_ids if i not in found]
+
+    return data
+
+
+@conditional_csrf
+@api_view(["GET"])
+def realtime_updates(request):
+    """
+    GET: Wait for chat / notification changes after the cursor.
+    Query params:
+      - cursor: the cursor of the previous response (omit on the first call)
+      - wait: max seconds to wait (default and max REALTIME_WAIT_SECONDS, 0 = answer at once)
+    Returns:
+      cursor, reset (reload everything), notifications (new / changed bell rows),
+      notifications_removed (ids), chat (new / changed messages, admins only),
+      chat_deleted (ids, admins only),
+      retry_in (seconds to wait before the next poll when the request was not held open)
+    The DB connection is closed before the wait (CONN_MAX_AGE=0 and the
+    database has few connection slots): a waiting request holds a gunicorn
+    thread but no connection. The queries after the wait reopen one.
+    """
+    user = _get_user(request)
+    if not user:
+        return JsonResponse({"detail": "Authentication credentials were not provided."}, status=403)
+
+    # Coordinator chat messages are admin-only, like the chat endpoints
+    streams = [RealtimeEvent.STREAM_NOTIFICATION]
+    if _chat_enabled() and is_admin(user):
+        streams.append(RealtimeEvent.STREAM_CHAT)
+
+    cursor = _int_param(request, 'cursor')
+    if cursor is None:
+        return JsonResponse(_feed_response(latest_event_id(), True))
+
+    try:
+        wait = _int_param(request, 'wait')
+        connection.close()
+        latest, waited = wait_for_events(cursor, wait)
+        new_cursor, changed, reset = changed_objects(cursor, streams, latest)
+        # Not held open (busy process / long poll disabled): tell the client to back off
+        retry_in = 0 if waited or wait == 0 else poll_retry_seconds()
+        data = _feed_response(new_cursor, reset, changed, retry_in)
+    except Exception as e:
+        api_logger.error(f"[REALTIME] Error in realtime_updates: {str(e)}", exc_info=True)
+        return JsonResponse({"error": f"Server error: {str(e)}"}, status=500)
+
+    if reset or changed:
+        api_logger.debug(
+            f"DEBUG: Realtime feed for user {user.staff_id}: cursor {cursor} -> {new_cursor}, "
+            f"reset={reset}, {len(data['chat'])} chat / {len(data['notifications'])} notification row(s)"
+        )
+    return JsonResponse(data)
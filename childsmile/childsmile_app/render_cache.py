@@ -0,0 +1,154 @@
+"""
+render_cache.py
+
+Content-addressed cache for the rendered dashboard assets: slide PNGs,
+narration audio segments and finished MP4 / PPTX files.
+
+Every video request used to redraw all slides and re-synthesize the whole
+Hebrew narration with gTTS (network round trips), and every export re-ran the
+full encode — even when the dashboard numbers hadn't changed.
+
+Each asset is stored under a key = sha256 of everything that determines its
+bytes (the numbers on a slide, the text of a narration sentence, the script +
+slide keys of a video, ...) plus RENDER_CACHE_VERSION:
+
+  <RENDER_CACHE_DIR>/<kind>/<key[:2]>/<key><suffix>
+
+so a repeated export is served straight from the cache, and when the numbers
+change only the slides / sentences that show them are rendered again. Files
+are written to a temp name and renamed, so a reader never sees a partial
+file. Job outputs are hard links (or copies) of the cached file, so the
+render job sweeper can delete them without touching the cache.
+
+prune_render_cache() (called by render_jobs.sweep_render_jobs) removes files
+not used for RENDER_CACHE_MAX_AGE_DAYS and then the least recently used ones
+above RENDER_CACHE_MAX_MB.
+
+Environment:
+  RENDER_CACHE_DIR            cache directory (default <BASE_DIR>/render_cache)
+  RENDER_CACHE_MAX_MB         size cap (default 1024)
+  RENDER_CACHE_MAX_AGE_DAYS   files unused for longer are removed (default 30)
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from django.conf import settings
+from .logger import api_logger
+
+# Bump when the slide / narration / video rendering code changes output
+RENDER_CACHE_VERSION = 1
+
+
+def _env_int(name, default):
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def get_render_cache_dir():
+    """Root of the render cache (created on first use)."""
+    path = os.environ.get('RENDER_CACHE_DIR') or os.path.join(settings.BASE_DIR, 'render_cache')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def content_key(*parts):
+    """sha256 of the JSON form of `parts` (+ RENDER_CACHE_VERSION)."""
+    payload = json.dumps([RENDER_CACHE_VERSION, *parts], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def cache_path(kind, key, suffix):
+    return os.path.join(get_render_cache_dir(), kind, key[:2], f"{key}{suffix}")
+
+
+def get_cached(kind, key, suffix):
+    """Path of a cached asset (marked as recently used), or None."""
+    path = cache_path(kind, key, suffix)
+    try:
+        os.utime(path)
+    except OSError:
+        return None
+    return path
+
+
+def cached_file(kind, key, suffix, build):
+    """
+    Return the cached asset, building it on a miss.
+
+    :param build: callable(temp_path) that writes the asset to temp_path
+                  (temp_path keeps `suffix`, for tools that infer the format)
+    :return: (path, hit)
+    """
+    path = get_cached(kind, key, suffix)
+    if path is not None:
+        return path, True
+
+    path = cache_path(kind, key, suffix)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path[:-len(suffix)] if suffix else path}.tmp{os.getpid()}_{threading.get_ident()}{suffix}"
+    try:
+        build(temp_path)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return path, False
+
+
+def materialize(cached, target):
+    """Expose a cached asset at `target` (hard link, or a copy across filesystems)."""
+    if os.path.exists(target):
+        os.remove(target)
+    try:
+        os.link(cached, target)
+    except OSError:
+        shutil.copyfile(cached, target)
+    return target
+
+
+def prune_render_cache():
+    """
+    Remove cache files unused for RENDER_CACHE_MAX_AGE_DAYS, then the least
+    recently used ones until the cache fits in RENDER_CACHE_MAX_MB.
+    :return: number of files removed
+    """
+    root = get_render_cache_dir()
+    max_age = _env_int('RENDER_CACHE_MAX_AGE_DAYS', 30) * 86400
+    max_bytes = _env_int('RENDER_CACHE_MAX_MB', 1024) * 1024 * 1024
+    now = time.time()
+
+    files = []
+    for directory, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+
+    removed = 0
+    total = sum(size for _, size, _ in files)
+    for mtime, size, path in sorted(files):
+        if '.tmp' in os.path.basename(path):
+            # In-progress write, or the leftover of a crashed render after an hour
+            if now - mtime <= 3600:
+                continue
+        elif not (now - mtime > max_age or total > max_bytes):
+            continue
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+
+    if removed:
+        api_logger.info(f"🧹 Pruned {removed} render cache files ({total / (1024 * 1024):.1f} MB left)")
+    return removed
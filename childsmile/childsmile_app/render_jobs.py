@@ -0,0 +1,279 @@
+"""
+render_jobs.py
+
+Background job queue for the AI video and PPT generators.
+
+generate_video_ai used to run gTTS, the PIL slide rendering and a MoviePy
+libx264 encode inside the HTTP request — 30-60 s holding a gunicorn worker —
+and cleanup_temp_files parked one sleeping thread per file for an hour.
+
+Now:
+  - submit_render_job() inserts a RenderJob row (add_render_jobs_table.sql)
+    and returns at once. An identical request — same kind, timeframe, style
+    and pages — while a job is queued / running, or completed less than
+    RENDER_DEDUP_WINDOW seconds ago, gets that job back instead of a new one.
+  - A bounded pool of RENDER_WORKERS threads per process claims queued rows
+    (SELECT ... FOR UPDATE SKIP LOCKED, oldest first) and renders them. The
+    rows live in the database, so the status / download endpoints work from
+    any worker and queued jobs survive a restart (picked up on the next poll).
+  - sweep_render_jobs() — ONE periodic scheduler job — deletes files older
+    than RENDER_FILE_TTL, fails jobs whose worker died mid-render, prunes the
+    render cache and wakes the pool for orphaned queued jobs.
+
+Environment:
+  RENDER_WORKERS          worker threads per process (default 1 — encodes are CPU bound)
+  RENDER_QUEUE_MAX        max queued + running jobs; further submits get 429 (default 10)
+  RENDER_DEDUP_WINDOW     seconds a completed job is reused for an identical request (default 300)
+  RENDER_FILE_TTL         seconds a rendered file is kept (default 3600)
+  RENDER_JOB_TIMEOUT      seconds after which a running job counts as dead (default 900)
+  RENDER_POLL_INTERVAL    seconds between idle queue polls of a worker (default 30)
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from datetime import timedelta
+from pathlib import Path
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from .models import RenderJob
+from .render_cache import prune_render_cache
+from .job_workers import JobWorkerPool
+from .logger import api_logger
+
+VIDEO_DIR = Path(tempfile.gettempdir()) / 'childsmile_videos'
+PPT_DIR = Path(tempfile.gettempdir()) / 'childsmile_ppts'
+
+RENDER_KINDS = ('video', 'ppt')
+RENDER_JOB_RETENTION = timedelta(days=7)  # job rows are deleted after this
+
+
+def _env_int(name, default):
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+class RenderQueueFull(Exception):
+    """Too many render jobs are queued / running (RENDER_QUEUE_MAX)."""
+
+
+def render_dedup_key(kind, params):
+    """sha256 of the parameters that determine the rendered file."""
+    identity = {
+        'kind': kind,
+        'timeframe': params.get('timeframe'),
+        'style': params.get('style'),
+        'pages': sorted(params.get('pages') or []),
+    }
+    return hashlib.sha256(json.dumps(identity, sort_keys=True, ensure_ascii=False).encode()).hexdigest()
+
+
+def _reusable_job(dedup_key):
+    reuse_since = timezone.now() - timedelta(seconds=_env_int('RENDER_DEDUP_WINDOW', 300))
+    candidates = (
+        RenderJob.objects.filter(dedup_key=dedup_key)
+        .filter(
+            Q(status__in=[RenderJob.STATUS_QUEUED, RenderJob.STATUS_RUNNING])
+            | Q(status=RenderJob.STATUS_COMPLETED, finished_at__gte=reuse_since)
+        )
+        .order_by('-created_at')
+    )
+    for job in candidates:
+        if job.status != RenderJob.STATUS_COMPLETED or (job.file_path and os.path.exists(job.file_path)):
+            return job
+    return None
+
+
+def submit_render_job(kind, params, requested_by=None):
+    """
+    Queue a render job, or return the identical in-flight / recent one.
+
+    :param kind: 'video' | 'ppt'
+    :param params: generator parameters (timeframe, duration, pages, style)
+    :param requested_by: staff_id of the requesting user
+    :return: (RenderJob, created)
+    :raises RenderQueueFull: RENDER_QUEUE_MAX jobs are already queued / running
+    """
+    dedup_key = render_dedup_key(kind, params)
+    with transaction.atomic():
+        # Serialize identical submits so two clicks can't both create a job
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", [dedup_key])
+
+        job = _reusable_job(dedup_key)
+        if job is not None:
+            api_logger.debug(f"DEBUG: Render request deduplicated onto {kind} job {job.job_id} ({job.status})")
+            return job, False
+
+        active = RenderJob.objects.filter(status__in=[RenderJob.STATUS_QUEUED, RenderJob.STATUS_RUNNING]).count()
+        if active >= _env_int('RENDER_QUEUE_MAX', 10):
+            raise RenderQueueFull(f"{active} render jobs are already queued")
+
+        job = RenderJob.objects.create(
+            job_id=str(uuid.uuid4()),
+            kind=kind,
+            params=params,
+            dedup_key=dedup_key,
+            requested_by=requested_by,
+        )
+        transaction.on_commit(get_render_pool().wake)
+
+    api_logger.info(f"🎬 Queued {kind} render job {job.job_id}")
+    return job, True
+
+
+def claim_next_render_job():
+    """Mark the oldest queued job as running and return it (None if the queue is empty)."""
+    with transaction.atomic():
+        job = (
+            RenderJob.objects.select_for_update(skip_locked=True)
+            .filter(status=RenderJob.STATUS_QUEUED)
+            .order_by('created_at')
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = RenderJob.STATUS_RUNNING
+        job.started_at = timezone.now()
+        job.save(update_fields=['status', 'started_at'])
+    return job
+
+
+def run_render_job(job):
+    """Render one claimed job and record the result on its row."""
+    from .dashboard_services import generate_dashboard_data, generate_ai_video, generate_ppt_slide
+
+    params = job.params or {}
+    started = time.monotonic()
+    try:
+        if job.kind == 'video':
+            timeframe = params.get('timeframe', 'חודש אחרון')
+            file_path = generate_ai_video(
+                video_id=job.job_id,
+                dashboard_data=generate_dashboard_data(timeframe),
+                timeframe=timeframe,
+                duration=params.get('duration'),
+                pages=params.get('pages', []),
+                style=params.get('style'),
+            )
+        else:
+            file_path = generate_ppt_slide(job.job_id, generate_dashboard_data(params.get('timeframe', 'month')))
+
+        job.status = RenderJob.STATUS_COMPLETED
+        job.file_path = str(file_path)
+        job.file_size = os.path.getsize(file_path)
+        api_logger.info(f"✅ {job.kind} render job {job.job_id} done in {time.monotonic() - started:.1f}s")
+    except Exception as e:
+        job.status = RenderJob.STATUS_FAILED
+        job.error = str(e)[:1000]
+        api_logger.error(f"❌ {job.kind} render job {job.job_id} failed: {str(e)[:200]}")
+
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'file_path', 'file_size', 'error', 'finished_at'])
+    return job
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_render_pool():
+    """Process-wide render JobWorkerPool (created on first use)."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = JobWorkerPool(
+                    'render-worker', claim_next_render_job, run_render_job,
+                    workers=_env_int('RENDER_WORKERS', 1),
+                    poll_interval=_env_int('RENDER_POLL_INTERVAL', 30),
+                )
+    return _pool
+
+
+def _remove_file(path):
+    try:
+        if path and os.path.exists(path):
+            os.remove(path)
+    except OSError as e:
+        api_logger.error(f"Could not remove rendered file {path}: {e}")
+
+
+def sweep_render_jobs():
+    """
+    Periodic housekeeping (scheduler, RENDER_SWEEP_INTERVAL):
+      - expire completed jobs older than RENDER_FILE_TTL and delete their files
+      - fail running jobs older than RENDER_JOB_TIMEOUT (worker died mid-render)
+      - delete leftover files in the render dirs older than RENDER_FILE_TTL
+        (slides / audio of crashed renders)
+      - delete job rows older than RENDER_JOB_RETENTION
+      - prune the render cache (render_cache.prune_render_cache)
+      - wake the pool if queued jobs are waiting (e.g. after a restart)
+    :return: Dictionary with the counts per step
+    """
+    now = timezone.now()
+    file_ttl = _env_int('RENDER_FILE_TTL', 3600)
+    result = {'expired': 0, 'timed_out': 0, 'orphan_files': 0, 'deleted_jobs': 0, 'cache_pruned': 0}
+
+    expired = RenderJob.objects.filter(
+        status=RenderJob.STATUS_COMPLETED, finished_at__lt=now - timedelta(seconds=file_ttl),
+    )
+    for job in expired:
+        _remove_file(job.file_path)
+    result['expired'] = expired.update(status=RenderJob.STATUS_EXPIRED)
+
+    result['timed_out'] = RenderJob.objects.filter(
+        status=RenderJob.STATUS_RUNNING,
+        started_at__lt=now - timedelta(seconds=_env_int('RENDER_JOB_TIMEOUT', 900)),
+    ).update(status=RenderJob.STATUS_FAILED, error='Render timed out', finished_at=now)
+
+    live_files = set(
+        RenderJob.objects.filter(status=RenderJob.STATUS_COMPLETED).values_list('file_path', flat=True)
+    )
+    cutoff = time.time() - file_ttl
+    for directory in (VIDEO_DIR, PPT_DIR):
+        if not directory.exists():
+            continue
+        for path in directory.iterdir():
+            try:
+                if path.is_file() and str(path) not in live_files and path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    result['orphan_files'] += 1
+            except OSError:
+                continue
+
+    result['deleted_jobs'], _ = RenderJob.objects.filter(created_at__lt=now - RENDER_JOB_RETENTION).delete()
+    result['cache_pruned'] = prune_render_cache()
+
+    if RenderJob.objects.filter(status=RenderJob.STATUS_QUEUED).exists():
+        get_render_pool().wake()
+    return result
+
+
+def render_job_status(job, download_url):
+    """JSON payload of the status endpoints."""
+    payload = {
+        'job_id': job.job_id,
+        'kind': job.kind,
+        # 'generating' while queued / running — the status the frontends poll for
+        'status': 'generating' if job.status in (RenderJob.STATUS_QUEUED, RenderJob.STATUS_RUNNING) else job.status,
+        'job_status': job.status,
+        'created_at': job.created_at.isoformat() if job.created_at else None,
+    }
+    if job.status == RenderJob.STATUS_QUEUED:
+        payload['queue_position'] = RenderJob.objects.filter(
+            status=RenderJob.STATUS_QUEUED, created_at__lt=job.created_at,
+        ).count() + 1
+    if job.status == RenderJob.STATUS_COMPLETED:
+        payload['file_size'] = job.file_size
+        payload['download_url'] = download_url
+    if job.status == RenderJob.STATUS_FAILED:
+        payload['error'] = job.error
+    return payload
@@ -100,16 +100,20 @@ def get_families_per_location_report(request):
         if to_date:
             children = children.filter(registrationdate__lte=to_date)
 
+        # One gazetteer lookup for all cities (no geocoding on the request path);
+        # cities without coordinates yet are queued for the background geocoder
+        from .geo_utils import get_city_locations
+        children = list(children)
+        city_locations = get_city_locations(child.city for child in children)
+
         children_data = []
         for child in children:
-            location = get_or_update_city_location(
-                child.city
-            )  # Use the helper function
-            
-            # Handle case where location is None (geocoding API unavailable or city not found)
+            location = city_locations.get((child.city or "").strip())
+
+            # Handle case where location is None (city not geocoded yet)
             if location is None:
                 location = {"latitude": None, "longitude": None}
-            
+
             children_data.append(
                 {
                     "first_name": child.childfirstname,
@@ -397,18 +401,32 @@ def possible_tutorship_matches_report(request):
         )
 
     try:
-        # Refresh all ages (tutors and children) before returning report data
-        from .utils import refresh_all_ages_for_matching, format_date_to_string
-        age_refresh_result = refresh_all_ages_for_matching()
+        # Make sure ages were refreshed today before returning report data
+        from .utils import ensure_ages_refreshed_today, format_date_to_string
+        age_refresh_result = ensure_ages_refreshed_today()
         api_logger.debug(f"Ages refreshed for matches report - tutors: {age_refresh_result['tutors_updated']}, children: {age_refresh_result['children_updated']}")
         
-        # Fetch all data from the PossibleMatches table
-        possible_matches = PossibleMatches.objects.all()
+        # Fetch all data from the PossibleMatches table (kept in sync incrementally
+        # by matching_utils — no recalculation here)
+        possible_matches = list(PossibleMatches.objects.all())
+
+        # Enrich with birth dates from source tables — one query per table, not per row
+        child_birth_dates = dict(
+            Children.objects.filter(
+                child_id__in={m.child_id for m in possible_matches}
+            ).values_list('child_id', 'date_of_birth')
+        )
+        tutor_birth_dates = dict(
+            SignedUp.objects.filter(
+                id__in={m.tutor_id for m in possible_matches}
+            ).values_list('id', 'birth_date')
+        )
 
-        # Enrich with birth_date from source tables
         possible_matches_data = []
         for match in possible_matches:
-            match_dict = {
+            child_birth_date = child_birth_dates.get(match.child_id)
+            tutor_birth_date = tutor_birth_dates.get(match.tutor_id)
+            possible_matches_data.append({
                 'match_id': match.match_id,
                 'child_id': match.child_id,
                 'tutor_id': match.tutor_id,
@@ -421,33 +439,14 @@ def possible_tutorship_matches_report(request):
                 'child_gender': match.child_gender,
                 'tutor_gender': match.tutor_gender,
                 'distance_between_cities': match.distance_between_cities,
+                'distance_pending': match.distance_between_cities is None,
                 'grade': match.grade,
                 'is_used': match.is_used,
-            }
-            
-            # Get child birth_date from Children table
-            try:
-                child = Children.objects.filter(child_id=match.child_id).first()
-                if child and child.birthday:
-                    match_dict['child_birth_date'] = format_date_to_string(child.birthday)
-                else:
-                    match_dict['child_birth_date'] = None
-            except Exception:
-                match_dict['child_birth_date'] = None
-            
-            # Get tutor birth_date from SignedUp table
-            try:
-                tutor = SignedUp.objects.filter(id=match.tutor_id).first()
-                if tutor and tutor.birth_date:
-                    match_dict['tutor_birth_date'] = format_date_to_string(tutor.birth_date)
-                else:
-                    match_dict['tutor_birth_date'] = None
-            except Exception:
-                match_dict['tutor_birth_date'] = None
-            
-            possible_matches_data.append(match_dict)
-        
-        api_logger.debug(f"Possible matches data: {possible_matches_data}")
+                'child_birth_date': format_date_to_string(child_birth_date) if child_birth_date else None,
+                'tutor_birth_date': format_date_to_string(tutor_birth_date) if tutor_birth_date else None,
+            })
+
+        api_logger.debug(f"Possible matches report rows: {len(possible_matches_data)}")
 
         # Return the data as JSON
         return JsonResponse(
@@ -8,6 +8,19 @@ Scheduled Jobs:
   4. Meeting reminders (daily)
   5. Cleanup old tasks (weekly)
   6. Monthly ongoing-expenses WhatsApp summary (last day of every month)
+  7. Nightly PossibleMatches reconcile (safety net for the incremental sync)
+  8. Nightly city-to-city distance matrix precompute
+  9. Nightly background geocoding of new cities (CityLocation gazetteer)
+ 10. Daily set-based age refresh (volunteers/tutors + children in PossibleMatches)
+ 11. Audit statistics rollup (closed hours of audit_log → hourly counts)
+ 12. Daily creation of the upcoming monthly audit_log partitions
+ 13. Render job sweep (expired AI video / PPT files, dead jobs, orphaned queue,
+     render cache pruning)
+ 14. Import job sweep (expired families / volunteers import jobs, dead workers,
+     orphaned queue)
+ 15. WhatsApp outbox sweep (due / retried messages after a restart, old rows)
+ 16. Email outbox sweep (due / retried emails after a restart, old rows)
+ 17. Realtime event pruning (change feed of the chat / notification long poll)
 
 Environment Variables:
   MONTHLY_CREATOR_TIME          - Daily check time for review task creation (default disabled)
@@ -22,6 +35,22 @@ Environment Variables:
                                    HH:MM, on the last day of the month (default disabled)
   TWILIO_MONTHLY_EXPENSES_SUMMARY_SID - Twilio template SID for the above (see
                                    TWILIO_MONTHLY_EXPENSES_SUMMARY_TEMPLATE.txt)
+  MATCHES_RECONCILE_TIME        - Daily full PossibleMatches reconcile (default "03:30")
+  CITY_DISTANCE_MATRIX_TIME     - Daily city distance matrix precompute (default "03:00",
+                                   runs before the reconcile so it picks up new distances)
+  CITY_GEOCODE_TIME             - Daily geocoding of cities without coordinates (default "02:30",
+                                   runs before the distance matrix so new cities are included)
+  CITY_GEOCODE_BATCH_LIMIT      - Max cities geocoded per run (default 0 = every pending city,
+                                   1 request/second, cities in use first)
+  AGE_REFRESH_TIME              - Daily age refresh (default "00:15"); matching requests
+                                   only re-run it if it has not run yet today
+  AUDIT_ROLLUP_INTERVAL         - Seconds between audit statistics rollups (default 900)
+  AUDIT_PARTITION_TIME          - Daily creation of upcoming audit_log partitions (default "01:00")
+  RENDER_SWEEP_INTERVAL         - Seconds between render job sweeps (default 600)
+  IMPORT_SWEEP_INTERVAL         - Seconds between import job sweeps (default 300)
+  WHATSAPP_OUTBOX_SWEEP_INTERVAL - Seconds between WhatsApp outbox sweeps (default 120)
+  EMAIL_OUTBOX_SWEEP_INTERVAL   - Seconds between email outbox sweeps (default 120)
+  REALTIME_EVENT_SWEEP_INTERVAL - Seconds between realtime event prunes (default 3600)
 
 Timezone: All times in Asia/Jerusalem (Israel Time)
 
@@ -195,6 +224,173 @@ def start_scheduler():
             else:
                 api_logger.info('Monthly ongoing-expenses WhatsApp summary: Feature disabled (MONTHLY_EXPENSES_SUMMARY_TIME not set)')
 
+            # Add job: Daily age refresh right after Israeli midnight. Two set-based
+            # UPDATEs; stamps the JobRun marker the matching requests check.
+            age_refresh_time = os.environ.get('AGE_REFRESH_TIME', '00:15').strip()
+            try:
+                ar_hour, ar_minute = map(int, age_refresh_time.split(':'))
+                _scheduler.add_job(
+                    func=_run_age_refresh,
+                    trigger=CronTrigger(hour=ar_hour, minute=ar_minute, timezone=israel_tz),
+                    id='age_refresh',
+                    name='Daily Age Refresh',
+                    replace_existing=True,
+                    misfire_grace_time=600,
+                )
+                api_logger.info(f'🎂 Age refresh scheduled daily at {age_refresh_time} Israel time')
+            except Exception as ar_err:
+                api_logger.error(f'❌ Could not schedule age refresh: {ar_err}')
+
+            # Add job: Nightly geocoding of cities registered without coordinates.
+            # The only caller of the geocoding API — request paths read CityLocation only.
+            geocode_time = os.environ.get('CITY_GEOCODE_TIME', '02:30').strip()
+            try:
+                gc_hour, gc_minute = map(int, geocode_time.split(':'))
+                _scheduler.add_job(
+                    func=_run_city_geocoding,
+                    trigger=CronTrigger(hour=gc_hour, minute=gc_minute, timezone=israel_tz),
+                    id='city_geocoding',
+                    name='Nightly City Geocoding',
+                    replace_existing=True,
+                    misfire_grace_time=600,
+                )
+                api_logger.info(f'🗺️ City geocoding scheduled daily at {geocode_time} Israel time')
+            except Exception as gc_err:
+                api_logger.error(f'❌ Could not schedule city geocoding: {gc_err}')
+
+            # Add job: Nightly city-to-city distance matrix (geo_utils). One vectorized
+            # pass over every city with known coordinates; only new/changed pairs are written.
+            matrix_time = os.environ.get('CITY_DISTANCE_MATRIX_TIME', '03:00').strip()
+            try:
+                dm_hour, dm_minute = map(int, matrix_time.split(':'))
+                _scheduler.add_job(
+                    func=_run_city_distance_matrix,
+                    trigger=CronTrigger(hour=dm_hour, minute=dm_minute, timezone=israel_tz),
+                    id='city_distance_matrix',
+                    name='Nightly City Distance Matrix',
+                    replace_existing=True,
+                    misfire_grace_time=600,
+                )
+                api_logger.info(f'📐 City distance matrix scheduled daily at {matrix_time} Israel time')
+            except Exception as dm_err:
+                api_logger.error(f'❌ Could not schedule city distance matrix: {dm_err}')
+
+            # Add job: Nightly full reconcile of PossibleMatches. The table is kept in
+            # sync incrementally by signals (matching_utils); this catches what signals
+            # can't see — children crossing the age limit, raw-SQL/bulk .update() edits.
+            # Diff-based upsert, no TRUNCATE — safe while the report is being read.
+            reconcile_time = os.environ.get('MATCHES_RECONCILE_TIME', '03:30').strip()
+            try:
+                rc_hour, rc_minute = map(int, reconcile_time.split(':'))
+                _scheduler.add_job(
+                    func=_run_possible_matches_reconcile,
+                    trigger=CronTrigger(hour=rc_hour, minute=rc_minute, timezone=israel_tz),
+                    id='possible_matches_reconcile',
+                    name='Nightly PossibleMatches Reconcile',
+                    replace_existing=True,
+                    misfire_grace_time=600,
+                )
+                api_logger.info(f'🔗 PossibleMatches reconcile scheduled daily at {reconcile_time} Israel time')
+            except Exception as rc_err:
+                api_logger.error(f'❌ Could not schedule PossibleMatches reconcile: {rc_err}')
+
+            # Add job: Roll closed hours of audit_log into the hourly statistics
+            # table (audit_stats_utils). get_audit_statistics counts only the
+            # rows after the last rollup live, so this keeps that tail short.
+            rollup_interval = int(os.environ.get('AUDIT_ROLLUP_INTERVAL', '900'))
+            _scheduler.add_job(
+                func=_run_audit_rollup,
+                trigger=IntervalTrigger(seconds=rollup_interval, timezone=israel_tz),
+                id='audit_rollup',
+                name='Audit Statistics Rollup',
+                replace_existing=True,
+                misfire_grace_time=300,
+            )
+            api_logger.info(f'📈 Audit statistics rollup scheduled every {rollup_interval}s (AUDIT_ROLLUP_INTERVAL)')
+
+            # Add job: Create the next months' audit_log partitions ahead of time
+            # (audit_archive_utils). Rows outside every partition would otherwise
+            # land in audit_log_default, which whole-month retention can't drop.
+            partition_time = os.environ.get('AUDIT_PARTITION_TIME', '01:00').strip()
+            try:
+                ap_hour, ap_minute = map(int, partition_time.split(':'))
+                _scheduler.add_job(
+                    func=_run_audit_partition_maintenance,
+                    trigger=CronTrigger(hour=ap_hour, minute=ap_minute, timezone=israel_tz),
+                    id='audit_partition_maintenance',
+                    name='Audit Log Partition Maintenance',
+                    replace_existing=True,
+                    misfire_grace_time=600,
+                )
+                api_logger.info(f'🗂️ Audit log partition maintenance scheduled daily at {partition_time} Israel time')
+            except Exception as ap_err:
+                api_logger.error(f'❌ Could not schedule audit partition maintenance: {ap_err}')
+
+            # Add job: One sweeper for the AI video / PPT render jobs (render_jobs)
+            # instead of one sleeping thread per generated file.
+            sweep_interval = int(os.environ.get('RENDER_SWEEP_INTERVAL', '600'))
+            _scheduler.add_job(
+                func=_run_render_sweep,
+                trigger=IntervalTrigger(seconds=sweep_interval, timezone=israel_tz),
+                id='render_sweep',
+                name='Render Job Sweep',
+                replace_existing=True,
+                misfire_grace_time=300,
+            )
+            api_logger.info(f'🧹 Render job sweep scheduled every {sweep_interval}s (RENDER_SWEEP_INTERVAL)')
+
+            # Add job: Sweeper for the Excel import jobs (import_jobs) — re-wakes
+            # the pool for jobs whose worker died and deletes expired uploads.
+            import_sweep_interval = int(os.environ.get('IMPORT_SWEEP_INTERVAL', '300'))
+            _scheduler.add_job(
+                func=_run_import_sweep,
+                trigger=IntervalTrigger(seconds=import_sweep_interval, timezone=israel_tz),
+                id='import_sweep',
+                name='Import Job Sweep',
+                replace_existing=True,
+                misfire_grace_time=300,
+            )
+            api_logger.info(f'🧹 Import job sweep scheduled every {import_sweep_interval}s (IMPORT_SWEEP_INTERVAL)')
+
+            # Add job: WhatsApp outbox sweeper (whatsapp_outbox) — starts the
+            # dispatcher for messages queued before a restart and prunes old rows.
+            outbox_sweep_interval = int(os.environ.get('WHATSAPP_OUTBOX_SWEEP_INTERVAL', '120'))
+            _scheduler.add_job(
+                func=_run_whatsapp_outbox_sweep,
+                trigger=IntervalTrigger(seconds=outbox_sweep_interval, timezone=israel_tz),
+                id='whatsapp_outbox_sweep',
+                name='WhatsApp Outbox Sweep',
+                replace_existing=True,
+                misfire_grace_time=120,
+            )
+            api_logger.info(f'🧹 WhatsApp outbox sweep scheduled every {outbox_sweep_interval}s (WHATSAPP_OUTBOX_SWEEP_INTERVAL)')
+
+            # Add job: Email outbox sweeper (email_outbox) — starts the batched
+            # SMTP dispatcher for emails queued before a restart and prunes old rows.
+            email_sweep_interval = int(os.environ.get('EMAIL_OUTBOX_SWEEP_INTERVAL', '120'))
+            _scheduler.add_job(
+                func=_run_email_outbox_sweep,
+                trigger=IntervalTrigger(seconds=email_sweep_interval, timezone=israel_tz),
+                id='email_outbox_sweep',
+                name='Email Outbox Sweep',
+                replace_existing=True,
+                misfire_grace_time=120,
+            )
+            api_logger.info(f'🧹 Email outbox sweep scheduled every {email_sweep_interval}s (EMAIL_OUTBOX_SWEEP_INTERVAL)')
+
+            # Add job: Realtime event pruning (realtime_events) — keeps the
+            # /api/updates/ change feed to REALTIME_EVENT_RETENTION_HOURS.
+            realtime_sweep_interval = int(os.environ.get('REALTIME_EVENT_SWEEP_INTERVAL', '3600'))
+            _scheduler.add_job(
+                func=_run_realtime_event_prune,
+                trigger=IntervalTrigger(seconds=realtime_sweep_interval, timezone=israel_tz),
+                id='realtime_event_prune',
+                name='Realtime Event Prune',
+                replace_existing=True,
+                misfire_grace_time=600,
+            )
+            api_logger.info(f'🧹 Realtime event prune scheduled every {realtime_sweep_interval}s (REALTIME_EVENT_SWEEP_INTERVAL)')
+
             _scheduler.start()
             api_logger.info(f'✅ Scheduler started | Monthly review: {scheduled_time} Israel time | Cleanup: Friday 11 PM Israel time')
             
@@ -361,3 +557,175 @@ def _run_monthly_expense_summary():
         api_logger.info('✅ Monthly ongoing-expenses summary check completed')
     except Exception as e:
         api_logger.error(f'❌ Error in scheduled monthly expenses summary: {str(e)}')
+
+
+def _run_possible_matches_reconcile():
+    """
+    Full diff-based reconcile of the PossibleMatches table.
+    Called daily at MATCHES_RECONCILE_TIME (default 03:30 Israel time).
+    """
+    try:
+        from .matching_utils import sync_possible_matches
+        api_logger.info('🔗 PossibleMatches reconcile triggered by scheduler')
+        stats = sync_possible_matches()
+        api_logger.info(
+            f'✅ PossibleMatches reconcile done | upserted={stats["upserted"]} '
+            f'deleted={stats["deleted"]} missing_distances={stats["missing_distances"]}'
+        )
+    except Exception as e:
+        api_logger.error(f'❌ Error in scheduled PossibleMatches reconcile: {str(e)}')
+
+
+def _run_city_distance_matrix():
+    """
+    Precompute the city-to-city distance matrix from known coordinates.
+    Called daily at CITY_DISTANCE_MATRIX_TIME (default 03:00 Israel time).
+    """
+    try:
+        from .geo_utils import precompute_city_distances
+        api_logger.info('📐 City distance matrix triggered by scheduler')
+        stats = precompute_city_distances()
+        api_logger.info(
+            f'✅ City distance matrix done | cities={stats["cities"]} '
+            f'pairs={stats["pairs"]} written={stats["written"]}'
+        )
+    except Exception as e:
+        api_logger.error(f'❌ Error in scheduled city distance matrix: {str(e)}')
+
+
+def _run_city_geocoding():
+    """
+    Geocode CityLocation rows that have no coordinates yet (rate-limited).
+    Called daily at CITY_GEOCODE_TIME (default 02:30 Israel time).
+    """
+    try:
+        from .geo_utils import geocode_pending_cities
+        api_logger.info('🗺️ City geocoding triggered by scheduler')
+        stats = geocode_pending_cities()
+        api_logger.info(
+            f'✅ City geocoding done | pending={stats["pending"]} geocoded={stats["geocoded"]} '
+            f'not_found={stats["not_found"]} errors={stats["errors"]}'
+        )
+    except Exception as e:
+        api_logger.error(f'❌ Error in scheduled city geocoding: {str(e)}')
+
+
+def _run_audit_rollup():
+    """
+    Aggregate closed hours of audit_log into childsmile_app_auditstatsrollup.
+    Called every AUDIT_ROLLUP_INTERVAL seconds (default 900).
+    """
+    try:
+        from .audit_stats_utils import refresh_audit_rollups
+        result = refresh_audit_rollups()
+        if result['rows']:
+            api_logger.info(f'📈 Audit rollup done | rows={result["rows"]} up to {result["rolled_up_to"]}')
+    except Exception as e:
+        api_logger.error(f'❌ Error in scheduled audit rollup: {str(e)}')
+
+
+def _run_audit_partition_maintenance():
+    """
+    Create the upcoming monthly audit_log partitions.
+    Called daily at AUDIT_PARTITION_TIME (default 01:00 Israel time).
+    """
+    try:
+        from .audit_archive_utils import ensure_audit_partitions
+        created = ensure_audit_partitions()
+        if created:
+            api_logger.info(f'🗂️ Audit partitions created: {", ".join(created)}')
+    except Exception as e:
+        api_logger.error(f'❌ Error in scheduled audit partition maintenance: {str(e)}')
+
+
+def _run_render_sweep():
+    """
+    Delete expired AI video / PPT files and fail / resume stranded render jobs.
+    Called every RENDER_SWEEP_INTERVAL seconds (default 600).
+    """
+    try:
+        from .render_jobs import sweep_render_jobs
+        result = sweep_render_jobs()
+        if any(result.values()):
+            api_logger.info(
+                f'🧹 Render sweep done | expired={result["expired"]} timed_out={result["timed_out"]} '
+                f'orphan_files={result["orphan_files"]} deleted_jobs={result["deleted_jobs"]} '
+                f'cache_pruned={result["cache_pruned"]}'
+            )
+    except Exception as e:
+        api_logger.error(f'❌ Error in scheduled render sweep: {str(e)}')
+
+
+def _run_import_sweep():
+    """
+    Delete expired import jobs and resume / fail import jobs whose worker died.
+    Called every IMPORT_SWEEP_INTERVAL seconds (default 300).
+    """
+    try:
+        from .import_jobs import sweep_import_jobs
+        result = sweep_import_jobs()
+        if any(result.values()):
+            api_logger.info(
+                f'🧹 Import sweep done | abandoned={result["abandoned"]} deleted_jobs={result["deleted_jobs"]}'
+            )
+    except Exception as e:
+        api_logger.error(f'❌ Error in scheduled import sweep: {str(e)}')
+
+
+def _run_whatsapp_outbox_sweep():
+    """
+    Wake the WhatsApp dispatcher for due messages and delete old outbox rows.
+    Called every WHATSAPP_OUTBOX_SWEEP_INTERVAL seconds (default 120).
+    """
+    try:
+        from .whatsapp_outbox import sweep_whatsapp_outbox
+        result = sweep_whatsapp_outbox()
+        if any(result.values()):
+            api_logger.info(f'🧹 WhatsApp outbox sweep done | due={result["due"]} deleted={result["deleted"]}')
+    except Exception as e:
+        api_logger.error(f'❌ Error in scheduled WhatsApp outbox sweep: {str(e)}')
+
+
+def _run_email_outbox_sweep():
+    """
+    Wake the email dispatcher for due messages and delete old outbox rows.
+    Called every EMAIL_OUTBOX_SWEEP_INTERVAL seconds (default 120).
+    """
+    try:
+        from .email_outbox import sweep_email_outbox
+        result = sweep_email_outbox()
+        if any(result.values()):
+            api_logger.info(f'🧹 Email outbox sweep done | due={result["due"]} deleted={result["deleted"]}')
+    except Exception as e:
+        api_logger.error(f'❌ Error in scheduled email outbox sweep: {str(e)}')
+
+
+def _run_realtime_event_prune():
+    """
+    Delete change feed events older than REALTIME_EVENT_RETENTION_HOURS.
+    Called every REALTIME_EVENT_SWEEP_INTERVAL seconds (default 3600).
+    """
+    try:
+        from .realtime_events import prune_realtime_events
+        deleted = prune_realtime_events()
+        if deleted:
+            api_logger.info(f'🧹 Realtime event prune done | deleted={deleted}')
+    except Exception as e:
+        api_logger.error(f'❌ Error in scheduled realtime event prune: {str(e)}')
+
+
+def _run_age_refresh():
+    """
+    Set-based refresh of volunteer/tutor ages and children ages in PossibleMatches.
+    Called daily at AGE_REFRESH_TIME (default 00:15 Israel time).
+    """
+    try:
+        from .utils import refresh_all_ages
+        api_logger.info('🎂 Age refresh triggered by scheduler')
+        result = refresh_all_ages()
+        api_logger.info(
+            f'✅ Age refresh done | volunteers={result["volunteers_updated"]} '
+            f'children={result["children_updated"]}'
+        )
+    except Exception as e:
+        api_logger.error(f'❌ Error in scheduled age refresh: {str(e)}')
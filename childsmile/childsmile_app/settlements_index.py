@@ -0,0 +1,272 @@
+"""
+settlements_index.py
+
+Prebuilt lookup index over SettlementsStreets for the family import and
+address validation.
+
+The import used to reload every settlement (with all of its streets) from the
+database on each upload, and for every input row:
+  - scanned all settlements to find an exact (stripped) name,
+  - called normalize_special_chars() on every settlement / street of the city,
+  - ran difflib.get_close_matches() over the whole list.
+
+SettlementIndex is built once per process and holds:
+  - hash maps from stripped and from normalized names to the DB value
+    (O(1) exact / normalized lookups),
+  - FuzzyNameIndex: a bigram inverted index, so the difflib ratio is computed
+    only for names sharing a bigram with the input (instead of for all),
+  - a StreetIndex per city with the same structures, built on first use.
+
+Fuzzy results are the ones get_close_matches(n=1) would return — the same
+SequenceMatcher filters and ratio, the same tie-break — among the names that
+share at least one bigram (word boundaries included) with the input.
+
+The index is invalidated when the table changes: every
+SETTLEMENTS_INDEX_CHECK_INTERVAL seconds (and on every import) a cheap
+fingerprint query — row count, hash of the names, sum of the row xmins (any
+INSERT / UPDATE changes it) — is compared with the one the index was built
+from; ORM saves / deletes force the check on commit (connect_settlements_signals).
+Loads done with raw SQL (create_settlements_table.sql) are picked up by the
+fingerprint.
+"""
+
+import threading
+import time
+from collections import defaultdict
+from difflib import SequenceMatcher
+from django.db import connection, transaction
+from django.db.models.signals import post_delete, post_save
+from .models import SettlementsStreets
+from .logger import api_logger
+
+SETTLEMENTS_INDEX_CHECK_INTERVAL = 60  # seconds between fingerprint checks
+
+_FINGERPRINT_SQL = """
+    SELECT COUNT(*),
+           COALESCE(SUM(hashtext(city_name)::bigint), 0),
+           COALESCE(SUM(xmin::text::bigint), 0)
+    FROM childsmile_app_settlementsstreets
+"""
+
+
+def normalize_special_chars(text):
+    """
+    Normalize special characters for fuzzy matching.
+    Removes/normalizes: apostrophes, commas, dashes, quotes, etc.
+    Returns normalized text suitable for comparison.
+
+    Examples:
+    - "מג׳ד אל-כרום" → "מגד אל כרום"
+    - "דולצ׳ין אריה" → "דולצין אריה"
+    - "בן-גוריון" → "בן גוריון"
+    """
+    if not text:
+        return ""
+
+    # Replace various quote/apostrophe characters with nothing
+    text = text.replace("׳", "")  # Hebrew geresh (׳)
+    text = text.replace("'", "")  # Regular apostrophe (')
+    text = text.replace("`", "")  # Backtick
+    text = text.replace("´", "")  # Acute accent
+
+    # Replace dashes/hyphens with space
+    text = text.replace("-", " ")
+    text = text.replace("–", " ")  # En dash
+    text = text.replace("—", " ")  # Em dash
+
+    # Replace commas with space
+    text = text.replace(",", " ")
+
+    # Normalize multiple spaces to single space
+    text = " ".join(text.split())
+
+    return text.strip()
+
+
+def _bigrams(text):
+    padded = f"\x02{text}\x03"
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+
+class FuzzyNameIndex:
+    """Bigram inverted index with a difflib.get_close_matches(n=1)-compatible lookup."""
+
+    def __init__(self, names):
+        self.names = list(dict.fromkeys(names))
+        self._postings = defaultdict(list)
+        for position, name in enumerate(self.names):
+            for gram in _bigrams(name):
+                self._postings[gram].append(position)
+
+    def best_match(self, word, cutoff):
+        """Closest name with a ratio >= cutoff, or None."""
+        candidates = set()
+        for gram in _bigrams(word):
+            candidates.update(self._postings.get(gram, ()))
+
+        matcher = SequenceMatcher()
+        matcher.set_seq2(word)
+        best = None
+        for position in candidates:
+            name = self.names[position]
+            matcher.set_seq1(name)
+            if matcher.real_quick_ratio() >= cutoff and matcher.quick_ratio() >= cutoff:
+                score = matcher.ratio()
+                if score >= cutoff and (best is None or (score, name) > best):
+                    best = (score, name)
+        return best[1] if best else None
+
+
+def _normalized_maps(names):
+    """
+    ({normalized: first name}, {normalized: last name}) — the exact-match scan
+    returned the first name with that normalized form, the fuzzy mapping the
+    last one.
+    """
+    first, last = {}, {}
+    for name in names:
+        normalized = normalize_special_chars(name)
+        first.setdefault(normalized, name)
+        last[normalized] = name
+    return first, last
+
+
+class _NameIndex:
+    def __init__(self, names):
+        self.first_by_normalized, self.last_by_normalized = _normalized_maps(names)
+        self.fuzzy = FuzzyNameIndex(self.last_by_normalized.keys())
+
+    def find_normalized(self, user_input, cutoff=0.75):
+        """
+        (matched_name, was_corrected): exact match after normalization, then
+        the closest normalized name (ratio >= cutoff).
+        """
+        if not user_input:
+            return None, False
+        normalized_input = normalize_special_chars(user_input.strip())
+        if not normalized_input:
+            return None, False
+
+        matched = self.first_by_normalized.get(normalized_input)
+        if matched is None:
+            normalized_match = self.fuzzy.best_match(normalized_input, cutoff)
+            if normalized_match is None:
+                return None, False
+            matched = self.last_by_normalized[normalized_match]
+        return matched, user_input.strip() != matched
+
+
+class StreetIndex(_NameIndex):
+    """Lookup structures over the streets of one settlement."""
+
+    def __init__(self, streets):
+        self.streets = list(streets)
+        self.street_set = set(self.streets)
+        self.by_length = sorted(self.streets, key=len, reverse=True)
+        self.raw_fuzzy = FuzzyNameIndex(self.streets)
+        super().__init__(self.streets)
+
+
+class SettlementIndex(_NameIndex):
+    """All settlements and their streets, with per-city street indexes built on demand."""
+
+    def __init__(self, settlements, fingerprint=None):
+        self.settlements = settlements  # {city_name: [streets]}
+        self.fingerprint = fingerprint
+        self.city_by_stripped = {}
+        for city in settlements:
+            self.city_by_stripped.setdefault(city.strip(), city)
+        self._streets = {}
+        self._streets_lock = threading.Lock()
+        super().__init__(settlements.keys())
+
+    def __len__(self):
+        return len(self.settlements)
+
+    def __bool__(self):
+        return bool(self.settlements)
+
+    def __contains__(self, city):
+        return city in self.settlements
+
+    def exact_city(self, user_input):
+        """DB city name whose stripped form equals the input, or None."""
+        return self.city_by_stripped.get(user_input) if user_input else None
+
+    def streets_of(self, city):
+        """StreetIndex of a city (None if the city is unknown or has no streets)."""
+        streets = self.settlements.get(city)
+        if not streets:
+            return None
+        index = self._streets.get(city)
+        if index is None:
+            with self._streets_lock:
+                index = self._streets.get(city)
+                if index is None:
+                    index = self._streets[city] = StreetIndex(streets)
+        return index
+
+
+def _fingerprint():
+    with connection.cursor() as cursor:
+        cursor.execute(_FINGERPRINT_SQL)
+        return tuple(cursor.fetchone())
+
+
+def _load_index(fingerprint):
+    started = time.monotonic()
+    settlements = {
+        city_name: streets or []
+        for city_name, streets in SettlementsStreets.objects.values_list('city_name', 'streets')
+    }
+    index = SettlementIndex(settlements, fingerprint)
+    api_logger.info(
+        f"🏙️ Settlements index built: {len(index)} settlements in {time.monotonic() - started:.2f}s"
+    )
+    return index
+
+
+_index = None
+_checked_at = None
+_index_lock = threading.Lock()
+
+
+def get_settlement_index(revalidate=False):
+    """
+    Process-wide SettlementIndex, rebuilt when the table's fingerprint changed.
+    :param revalidate: check the fingerprint now (e.g. at the start of an import)
+    """
+    global _index, _checked_at
+    with _index_lock:
+        now = time.monotonic()
+        if (_index is not None and not revalidate and _checked_at is not None
+                and now - _checked_at < SETTLEMENTS_INDEX_CHECK_INTERVAL):
+            return _index
+        try:
+            fingerprint = _fingerprint()
+            if _index is None or _index.fingerprint != fingerprint:
+                _index = _load_index(fingerprint)
+            _checked_at = now
+        except Exception as e:
+            api_logger.warning(f"Failed to load settlements from database: {str(e)}")
+            if _index is None:
+                return SettlementIndex({})
+        return _index
+
+
+def invalidate_settlement_index():
+    """Make the next get_settlement_index() re-check the fingerprint."""
+    global _checked_at
+    _checked_at = None
+
+
+def _on_settlements_changed(sender, **kwargs):
+    transaction.on_commit(invalidate_settlement_index)
+
+
+def connect_settlements_signals():
+    """Re-check the settlements index after ORM changes (AppConfig.ready)."""
+    post_save.connect(_on_settlements_changed, sender=SettlementsStreets,
+                      dispatch_uid="settlements_index_saved")
+    post_delete.connect(_on_settlements_changed, sender=SettlementsStreets,
+                        dispatch_uid="settlements_index_deleted")
@@ -16,6 +16,7 @@ from .models import (
     Task_Types,
     PossibleMatches,
     InitialFamilyData,
+    TaskTombstone,
 )
 from .unused_views import (
     PermissionsViewSet,
@@ -48,7 +49,9 @@ from django.views.decorators.csrf import csrf_exempt
 from django.utils import timezone
 from django.utils.timezone import make_aware
 from django.views import View
-from django.http import HttpResponse, JsonResponse
+from django.http import HttpResponse, HttpResponseNotModified, JsonResponse, StreamingHttpResponse
+from django.utils.dateparse import parse_datetime
+from django.core.serializers.json import DjangoJSONEncoder
 from rest_framework import viewsets, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -63,15 +66,18 @@ from .whatsapp_utils import send_dev_task_assigned_whatsapp, send_dev_task_compl
 from django.utils import timezone
 import datetime
 from datetime import datetime, date, timedelta
+from datetime import timezone as dt_timezone
 import urllib3
 from geopy.exc import GeocoderTimedOut
 from geopy.geocoders import Nominatim
 import threading, time
 from time import sleep
 from math import sin, cos, sqrt, atan2, radians, ceil
+import hashlib
+from itertools import chain, islice
 import json
 import os
-from django.db.models import Count, F
+from django.db.models import Count, F, Exists, OuterRef, Max
 from .utils import *
 from .audit_utils import log_api_action
 from .logger import api_logger
@@ -88,6 +94,258 @@ warnings.filterwarnings(
     category=RuntimeWarning
 )
 
+TASK_FEED_CHUNK_SIZE = 500
+TASK_FEED_MAX_PAGE_SIZE = 500
+TASK_TYPES_CACHE_KEY = "task_types_data"
+TASK_SYNC_OVERLAP_SECONDS = 5
+TASK_TOMBSTONE_RETENTION_DAYS = 30  # keep in sync with cleanup_old_tasks
+
+# Columns loaded for the task board (select_related joins included)
+TASK_FEED_FIELDS = (
+    "task_id", "description", "due_date", "status", "created_at", "updated_at",
+    "names", "phones", "other_information", "user_info", "explanation",
+    "initial_family_data_id_fk_id",
+    "task_type__task_type",
+    "assigned_to__username",
+    "pending_tutor__id__first_name", "pending_tutor__id__surname",
+    "related_tutor__tutor_email",
+    "related_tutor__id__first_name", "related_tutor__id__surname",
+    "related_tutor__id__phone", "related_tutor__id__email",
+    "related_child__childfirstname", "related_child__childsurname",
+    "related_child__last_review_talk_conducted",
+    "related_child__father_name", "related_child__father_phone",
+    "related_child__mother_name", "related_child__mother_phone",
+    "related_child__date_of_birth", "related_child__gender", "related_child__city",
+    "related_child__treating_hospital", "related_child__tutoring_status",
+    "related_child__status", "related_child__registrationdate",
+)
+
+
+def get_task_types_data():
+    """All task types for the board's filters (cached for 5 minutes, like the family enums)."""
+    task_types_data = cache.get(TASK_TYPES_CACHE_KEY)
+    if task_types_data is None:
+        task_types_data = [
+            {
+                "id": t.id,
+                "name": t.task_type,
+                "resource": t.resource,
+                "action": t.action,
+            }
+            for t in Task_Types.objects.all()  # exclude(task_type="אישור הרשמה") --- IGNORE ---
+        ]
+        cache.set(TASK_TYPES_CACHE_KEY, task_types_data, timeout=300)
+    return task_types_data
+
+
+def _child_age_display(date_of_birth, today):
+    """Age label for family tasks, e.g. "7 שנים" or "5 חודשים"."""
+    if not date_of_birth:
+        return "לא זמין"
+    age_years = (
+        today.year
+        - date_of_birth.year
+        - ((today.month, today.day) < (date_of_birth.month, date_of_birth.day))
+    )
+    if age_years < 1:
+        if today.month >= date_of_birth.month:
+            age_number = today.month - date_of_birth.month
+        else:
+            age_number = 12 + today.month - date_of_birth.month
+        return f"{age_number} חודשים"
+    return f"{age_years} שנים"
+
+
+def _family_details(child, today):
+    """Family fields shown on group join/removal tasks (same as the WhatsApp notification)."""
+    parent_phone = "לא זמין"
+    if child.mother_phone:
+        parent_phone = str(child.mother_phone)
+    elif child.father_phone:
+        parent_phone = str(child.father_phone)
+    return {
+        "child_name": f"{child.childfirstname} {child.childsurname}",
+        "age_display": _child_age_display(child.date_of_birth, today),
+        "gender": child.gender,
+        "city": child.city or "לא זמין",
+        "parent_phone": parent_phone,
+        "hospital": child.treating_hospital or "לא זמין",
+        "registration_date": child.registrationdate.strftime("%d/%m/%Y") if child.registrationdate else "לא זמין",
+    }
+
+
+def serialize_task(task, today):
+    """One task board row. `task` comes from the get_user_tasks queryset (annotated)."""
+    child = task.related_child
+    type_name = task.task_type.task_type if task.task_type else None
+    task_dict = {
+        "id": task.task_id,
+        "description": task.description,
+        "due_date": task.due_date.strftime("%d/%m/%Y"),
+        "status": task.status,
+        "created": task.created_at.strftime("%d/%m/%Y"),
+        "updated": task.updated_at.strftime("%d/%m/%Y"),
+        "assignee": task.assigned_to.username,
+        "child": task.related_child_id,
+        "child_name": f"{child.childfirstname} {child.childsurname}" if child else None,
+        "child_last_review_talk_conducted": (
+            child.last_review_talk_conducted.strftime("%d/%m/%Y")
+            if child and child.last_review_talk_conducted
+            else None
+        ),
+        "father_name": child.father_name if child else None,
+        "father_phone": child.father_phone if child else None,
+        "mother_name": child.mother_name if child else None,
+        "mother_phone": child.mother_phone if child else None,
+        "tutor": task.related_tutor_id,
+        "type": task.task_type_id,
+        "type_name": type_name,  # task type name for frontend
+        "pending_tutor": (
+            {
+                "id": task.pending_tutor.id_id,
+                "first_name": task.pending_tutor.id.first_name,
+                "surname": task.pending_tutor.id.surname,
+            }
+            if task.pending_tutor
+            else None
+        ),
+        "names": task.names,
+        "phones": task.phones,
+        "other_information": task.other_information,
+        "user_info": task.user_info,  # Include user_info for registration approval tasks
+        "initial_family_data_id_fk": task.initial_family_data_id_fk_id,
+        "explanation": task.explanation,
+    }
+
+    # Add extra info for "התאמת חניך" tasks
+    if type_name == "התאמת חניך":
+        if task.related_tutor:
+            tutor = task.related_tutor
+            signedup = tutor.id  # SignedUp instance
+            task_dict["tutee_match_info"] = {
+                "tutor_name": f"{signedup.first_name} {signedup.surname}" if signedup else "לא ידוע",
+                "tutor_phone": signedup.phone if signedup else "לא ידוע",
+                "tutor_email": tutor.tutor_email or (signedup.email if signedup else "לא ידוע"),
+                # "כשירות" - eligibility: is the tutor still in Pending_Tutor (annotated)
+                "eligibility": "ממתין לראיון" if task.tutor_pending_interview else "עבר ראיון",
+            }
+        if child:
+            task_dict["tutee_match_info"] = task_dict.get("tutee_match_info", {})
+            task_dict["tutee_match_info"]["child_name"] = f"{child.childfirstname} {child.childsurname}"
+
+    # Add extra info for "צירוף משפחה לקבוצה" tasks - same 9 fields as WhatsApp notification
+    if type_name == "צירוף משפחה לקבוצה" and child:
+        task_dict["family_details"] = _family_details(child, today)
+        task_dict["family_details"]["tutoring_status"] = child.tutoring_status or "לא זמין"
+
+    # Add extra info for "הסרת משפחה מקבוצה" tasks - same fields + status
+    if type_name == "הסרת משפחה מקבוצה" and child:
+        task_dict["family_details"] = _family_details(child, today)
+        task_dict["family_details"].update({
+            "father_phone": str(child.father_phone) if child.father_phone else None,
+            "mother_phone": str(child.mother_phone) if child.mother_phone else None,
+            "status": child.status or "לא זמין",
+        })
+
+    return task_dict
+
+
+def parse_task_sync_watermark(value):
+    """
+    Aware datetime from a ?since= watermark, or None when it is missing.
+    Raises ValueError for an unparseable value (e.g. an unencoded "+00:00"
+    offset that arrived as " 00:00") instead of silently doing a full load.
+    """
+    if not value:
+        return None
+    try:
+        since = parse_datetime(value)
+    except ValueError:
+        since = None
+    if since is None:
+        raise ValueError(f"Invalid since watermark: {value!r}")
+    return make_aware(since) if timezone.is_naive(since) else since
+
+
+def format_task_sync_watermark(moment):
+    """Watermark sent to clients: UTC with a "Z" suffix, safe to put in a URL as is."""
+    return moment.astimezone(dt_timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def tutor_pending_interview():
+    """EXISTS subquery: is the task's tutor still in Pending_Tutor ("כשירות" on the board)."""
+    return Exists(Pending_Tutor.objects.filter(id_id=OuterRef("related_tutor_id")))
+
+
+def parse_if_none_match(header):
+    """ETags listed in an If-None-Match header (weak prefixes ignored)."""
+    return {tag.strip().removeprefix("W/") for tag in header.split(",") if tag.strip()}
+
+
+def task_feed_etag(request, in_range, scope=None, since=None, task_types_data=None):
+    """
+    Fingerprint of what get_user_tasks would return: the query string, user,
+    and a hash of every value the board shows for the matching tasks — the
+    task columns AND the joined child / tutor / assignee / pending-tutor
+    columns (TASK_FEED_FIELDS) plus the Pending_Tutor eligibility, so an edit
+    to a joined row changes it although the task's updated_at did not move.
+    Hashed inside Postgres in one aggregate query; nothing is serialized here.
+    The task types list is hashed too. In delta mode the latest tombstone and
+    out-of-range change in scope are included as well.
+    """
+    rows = in_range.annotate(tutor_pending_interview=tutor_pending_interview()).values_list(
+        *TASK_FEED_FIELDS, "tutor_pending_interview"
+    )
+    sql, params = rows.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT COUNT(*), md5(COALESCE(string_agg(row_hash, '' ORDER BY row_hash), '')) "
+            f"FROM (SELECT md5(feed_row::text) AS row_hash FROM ({sql}) feed_row) hashes",
+            params,
+        )
+        count, digest = cursor.fetchone()
+    parts = [
+        request.session.get("user_id"),
+        request.META.get("QUERY_STRING", ""),
+        count, digest, task_types_data,
+    ]
+    if since is not None:
+        parts.append(TaskTombstone.objects.filter(deleted_at__gt=since).aggregate(m=Max("deleted_at"))["m"])
+        parts.append(scope.filter(updated_at__gt=since).aggregate(m=Max("updated_at"))["m"])
+    return '"%s"' % hashlib.md5(repr(parts).encode()).hexdigest()
+
+
+def stream_task_feed(tasks, task_types_data, extra=None):
+    """
+    Yield the get_user_tasks JSON body ({"tasks": [...], "task_types": [...]})
+    one task at a time, so the full list is never held as one string.
+    `extra` holds additional top-level keys (watermark, deleted, pagination).
+
+    The status line is already sent when later chunks are read, so a failure
+    mid-stream still ends the body as valid JSON, with an "error" key and the
+    tasks read so far — clients must treat the list as incomplete.
+    """
+    today = date.today()
+    count = 0
+    yield '{"tasks": ['
+    try:
+        for task in tasks:
+            yield ("," if count else "") + json.dumps(serialize_task(task, today), cls=DjangoJSONEncoder)
+            count += 1
+    except Exception as e:
+        api_logger.error(f"Task feed failed after {count} tasks: {str(e)}")
+        yield "]"
+        yield ', "error": ' + json.dumps(f"Task feed interrupted: {str(e)}") + "}"
+        return
+    yield "]"
+    if task_types_data is not None:
+        yield ', "task_types": ' + json.dumps(task_types_data, cls=DjangoJSONEncoder)
+    for key, value in (extra or {}).items():
+        yield f', "{key}": ' + json.dumps(value, cls=DjangoJSONEncoder)
+    yield "}"
+    api_logger.debug(f"Streamed {count} tasks")
+
+
 @conditional_csrf
 @api_view(["GET"])
 def get_user_tasks(request):
@@ -139,204 +397,113 @@ def get_user_tasks(request):
         if date_field not in allowed_fields:
             date_field = 'due_date'
 
-        # Always fetch tasks from DB, no cache
-        base_query = Tasks.objects.select_related("task_type", "assigned_to", "pending_tutor__id", "related_child", "related_tutor", "related_tutor__id")
-
-        # Apply date range filter (inclusive)
-        filter_kwargs = {f'{date_field}__gte': start_date, f'{date_field}__lte': end_date}
-        base_query = base_query.filter(**filter_kwargs)
-
-        # Apply task type filter if provided
+        # Visible tasks (user + task type) and the board's date range
+        scope = Tasks.objects.all()
         if task_type_id:
-            base_query = base_query.filter(task_type_id=task_type_id)
-
+            scope = scope.filter(task_type_id=task_type_id)
         if user_is_admin:
             api_logger.debug("Fetching all tasks for admin user.")
-            tasks = base_query.order_by("-updated_at")
         else:
             api_logger.debug(f"Fetching tasks assigned to user '{user.username}'.")
-            tasks = base_query.filter(assigned_to_id=user_id).order_by("-updated_at")
+            scope = scope.filter(assigned_to_id=user_id)
+        # Apply date range filter (inclusive)
+        date_range = {f'{date_field}__gte': start_date, f'{date_field}__lte': end_date}
+        in_range = scope.filter(**date_range)
 
-        # Build tasks_data for the response
-        tasks_data = []
-        for task in tasks:
-            task_dict = {
-                "id": task.task_id,
-                "description": task.description,
-                "due_date": task.due_date.strftime("%d/%m/%Y"),
-                "status": task.status,
-                "created": task.created_at.strftime("%d/%m/%Y"),
-                "updated": task.updated_at.strftime("%d/%m/%Y"),
-                "assignee": task.assigned_to.username,
-                "child": task.related_child_id,
-                "child_name": (
-                    f"{task.related_child.childfirstname} {task.related_child.childsurname}"
-                    if task.related_child else None
-                ),
-                "child_last_review_talk_conducted": (
-                    task.related_child.last_review_talk_conducted.strftime("%d/%m/%Y")
-                    if task.related_child and task.related_child.last_review_talk_conducted
-                    else None
-                ),
-                "father_name": task.related_child.father_name if task.related_child else None,
-                "father_phone": task.related_child.father_phone if task.related_child else None,
-                "mother_name": task.related_child.mother_name if task.related_child else None,
-                "mother_phone": task.related_child.mother_phone if task.related_child else None,
-                "tutor": task.related_tutor_id,
-                "type": task.task_type_id,
-                "type_name": task.task_type.task_type if task.task_type else None,  # ADD: task type name for frontend
-                "pending_tutor": (
-                    {
-                        "id": task.pending_tutor.id_id,
-                        "first_name": task.pending_tutor.id.first_name,
-                        "surname": task.pending_tutor.id.surname,
-                    }
-                    if task.pending_tutor
-                    else None
-                ),
-                "names": task.names,
-                "phones": task.phones,
-                "other_information": task.other_information,
-                "user_info": task.user_info,  # Include user_info for registration approval tasks
-                "initial_family_data_id_fk": (
-                    task.initial_family_data_id_fk.initial_family_data_id
-                    if task.initial_family_data_id_fk
-                    else None
-                ),
-                "explanation": task.explanation,
-            }
-            
-            # Add extra info for "התאמת חניך" tasks
-            if task.task_type and task.task_type.task_type == "התאמת חניך":
-                # Get tutor info
-                if task.related_tutor:
-                    tutor = task.related_tutor
-                    signedup = tutor.id  # SignedUp instance
-                    task_dict["tutee_match_info"] = {
-                        "tutor_name": f"{signedup.first_name} {signedup.surname}" if signedup else "לא ידוע",
-                        "tutor_phone": signedup.phone if signedup else "לא ידוע",
-                        "tutor_email": tutor.tutor_email or (signedup.email if signedup else "לא ידוע"),
-                        # "כשירות" - eligibility: check if tutor is still in Pending_Tutor table
-                        "eligibility": "ממתין לראיון" if Pending_Tutor.objects.filter(id_id=tutor.id_id).exists() else "עבר ראיון",
-                    }
-                # Get child info
-                if task.related_child:
-                    child = task.related_child
-                    task_dict["tutee_match_info"] = task_dict.get("tutee_match_info", {})
-                    task_dict["tutee_match_info"]["child_name"] = f"{child.childfirstname} {child.childsurname}"
-            
-            # Add extra info for "צירוף משפחה לקבוצה" tasks - same 9 fields as WhatsApp notification
-            if task.task_type and task.task_type.task_type == "צירוף משפחה לקבוצה":
-                if task.related_child:
-                    from datetime import date as date_class
-                    child = task.related_child
-                    
-                    # Calculate age display (e.g., "7 שנים" or "5 חודשים")
-                    age_display = "לא זמין"
-                    if child.date_of_birth:
-                        today = date_class.today()
-                        age_years = (
-                            today.year
-                            - child.date_of_birth.year
-                            - (
-                                (today.month, today.day)
-                                < (child.date_of_birth.month, child.date_of_birth.day)
-                            )
-                        )
-                        
-                        if age_years < 1:
-                            # Calculate months
-                            if today.month >= child.date_of_birth.month:
-                                age_number = today.month - child.date_of_birth.month
-                            else:
-                                age_number = 12 + today.month - child.date_of_birth.month
-                            age_display = f"{age_number} חודשים"
-                        else:
-                            age_display = f"{age_years} שנים"
-                    
-                    # Get parent phone
-                    parent_phone = "לא זמין"
-                    if child.mother_phone:
-                        parent_phone = str(child.mother_phone)
-                    elif child.father_phone:
-                        parent_phone = str(child.father_phone)
-                    
-                    task_dict["family_details"] = {
-                        "child_name": f"{child.childfirstname} {child.childsurname}",
-                        "age_display": age_display,
-                        "gender": child.gender,
-                        "city": child.city or "לא זמין",
-                        "parent_phone": parent_phone,
-                        "hospital": child.treating_hospital or "לא זמין",
-                        "tutoring_status": child.tutoring_status or "לא זמין",
-                        "registration_date": child.registrationdate.strftime("%d/%m/%Y") if child.registrationdate else "לא זמין",
-                    }
-            
-            # Add extra info for "הסרת משפחה מקבוצה" tasks - same fields + status
-            if task.task_type and task.task_type.task_type == "הסרת משפחה מקבוצה":
-                if task.related_child:
-                    from datetime import date as date_class
-                    child = task.related_child
-                    
-                    # Calculate age display (e.g., "7 שנים" or "5 חודשים")
-                    age_display = "לא זמין"
-                    if child.date_of_birth:
-                        today = date_class.today()
-                        age_years = (
-                            today.year
-                            - child.date_of_birth.year
-                            - (
-                                (today.month, today.day)
-                                < (child.date_of_birth.month, child.date_of_birth.day)
-                            )
-                        )
-                        
-                        if age_years < 1:
-                            # Calculate months
-                            if today.month >= child.date_of_birth.month:
-                                age_number = today.month - child.date_of_birth.month
-                            else:
-                                age_number = 12 + today.month - child.date_of_birth.month
-                            age_display = f"{age_number} חודשים"
-                        else:
-                            age_display = f"{age_years} שנים"
-                    
-                    # Get parent phone
-                    parent_phone = "לא זמין"
-                    if child.mother_phone:
-                        parent_phone = str(child.mother_phone)
-                    elif child.father_phone:
-                        parent_phone = str(child.father_phone)
-                    
-                    task_dict["family_details"] = {
-                        "child_name": f"{child.childfirstname} {child.childsurname}",
-                        "age_display": age_display,
-                        "gender": child.gender,
-                        "city": child.city or "לא זמין",
-                        "parent_phone": parent_phone,
-                        "father_phone": str(child.father_phone) if child.father_phone else None,
-                        "mother_phone": str(child.mother_phone) if child.mother_phone else None,
-                        "hospital": child.treating_hospital or "לא זמין",
-                        "status": child.status or "לא זמין",
-                        "registration_date": child.registrationdate.strftime("%d/%m/%Y") if child.registrationdate else "לא זמין",
-                    }
-            
-            tasks_data.append(task_dict)
-            
-        api_logger.debug(f"Fetched tasks: {tasks_data}")
-        # Always fetch all task types, EXCLUDING internal-only types (registration approval)
-        task_types = Task_Types.objects.all() # exclude(task_type="אישור הרשמה") --- IGNORE ---
-        task_types_data = [
-            {
-                "id": t.id,
-                "name": t.task_type,
-                "resource": t.resource,
-                "action": t.action,
+        # Delta sync (?since=<watermark from the previous response>): only tasks
+        # changed after the watermark + ids of tasks deleted / moved out of range.
+        # Watermarks older than the tombstone retention get a full reload.
+        sync_started = timezone.now()
+        try:
+            since = parse_task_sync_watermark(request.GET.get('since'))
+        except ValueError as e:
+            return JsonResponse({"error": str(e)}, status=400)
+        if since and since < sync_started - timedelta(days=TASK_TOMBSTONE_RETENTION_DAYS):
+            since = None
+            full_reload = True
+        else:
+            full_reload = False
+
+        include_task_types = request.GET.get('include_task_types', 'true').lower() != 'false'
+        task_types_data = get_task_types_data() if include_task_types else None
+
+        # Conditional GET: one aggregate query fingerprints the board; an
+        # unchanged board is answered 304 without serializing anything.
+        etag = task_feed_etag(request, in_range, scope if since else None, since, task_types_data)
+        if etag in parse_if_none_match(request.META.get("HTTP_IF_NONE_MATCH", "")):
+            response = HttpResponseNotModified()
+            response["ETag"] = etag
+            return response
+
+        # Always fetch tasks from DB, no cache. Only the columns the board shows;
+        # tutor eligibility ("כשירות") is an EXISTS subquery, not a query per task.
+        tasks = (
+            in_range.select_related(
+                "task_type", "assigned_to", "pending_tutor__id",
+                "related_child", "related_tutor", "related_tutor__id",
+            )
+            .only(*TASK_FEED_FIELDS)
+            .annotate(tutor_pending_interview=tutor_pending_interview())
+            .order_by("-updated_at", "-task_id")
+        )
+
+        extra = {
+            "delta": since is not None,
+            "full_reload": full_reload,
+            # Small overlap so rows committed while this request ran are re-sent,
+            # never missed; clients merge by task id.
+            "watermark": format_task_sync_watermark(sync_started - timedelta(seconds=TASK_SYNC_OVERLAP_SECONDS)),
+        }
+        if since:
+            tasks = tasks.filter(updated_at__gt=since)
+            deleted_ids = set(
+                TaskTombstone.objects.filter(
+                    deleted_at__gt=since,
+                    **({} if user_is_admin else {"assigned_to_id": user_id}),
+                    **({"task_type_id": task_type_id} if task_type_id else {}),
+                ).values_list("task_id", flat=True)
+            )
+            deleted_ids.update(
+                scope.filter(updated_at__gt=since).exclude(**date_range).values_list("task_id", flat=True)
+            )
+            # Tombstones also mark tasks reassigned AWAY from an assignee; a task
+            # this user still sees (e.g. an admin, or one reassigned back) is not gone
+            deleted_ids.difference_update(
+                in_range.filter(task_id__in=deleted_ids).values_list("task_id", flat=True)
+            )
+            extra["deleted"] = sorted(deleted_ids)
+
+        # Optional server-side pagination (?page=1&page_size=100). Without it the
+        # whole feed is streamed row by row instead of built as one big list.
+        page_size = request.GET.get('page_size')
+        if page_size:
+            try:
+                page_size = max(1, min(int(page_size), TASK_FEED_MAX_PAGE_SIZE))
+                page = max(1, int(request.GET.get('page', 1)))
+            except ValueError:
+                return JsonResponse({"error": "page and page_size must be integers."}, status=400)
+            offset = (page - 1) * page_size
+            page_rows = list(tasks[offset:offset + page_size + 1])
+            extra["pagination"] = {
+                "page": page,
+                "page_size": page_size,
+                "has_more": len(page_rows) > page_size,
             }
-            for t in task_types
-        ]
-        api_logger.debug(f"Fetched task types: {task_types_data}")
-        return JsonResponse({"tasks": tasks_data, "task_types": task_types_data})
+            tasks = page_rows[:page_size]
+        else:
+            # Read the first chunk here: a failing query still gets a proper
+            # error response instead of a 200 with a cut-off body
+            task_iterator = tasks.iterator(chunk_size=TASK_FEED_CHUNK_SIZE)
+            first_chunk = list(islice(task_iterator, TASK_FEED_CHUNK_SIZE))
+            tasks = chain(first_chunk, task_iterator)
+
+        response = StreamingHttpResponse(
+            stream_task_feed(tasks, task_types_data, extra),
+            content_type="application/json",
+        )
+        response["ETag"] = etag
+        response["Cache-Control"] = "private, no-cache"
+        return response
 
     except Staff.DoesNotExist:
         log_api_action(
@@ -1175,7 +1342,7 @@ def update_task_status(request, task_id):
                         status="לא הושלמה"
                     ).exclude(task_id=task_id)  # Don't update the current task (already completed)
                     
-                    updated_count = pending_audit_tasks.update(description=new_description)
+                    updated_count = pending_audit_tasks.update(description=new_description, updated_at=timezone.now())
                     if updated_count > 0:
                         api_logger.info(f"✅ Updated descriptions of {updated_count} pending audit-call tasks for child {task.related_child.child_id} with new date {date_str}")
                 except Exception as e:
@@ -2034,7 +2201,7 @@ def update_task(request, task_id):
                         status="לא הושלמה"
                     ).exclude(task_id=task_id)
                     
-                    updated_count = pending_audit_tasks.update(description=new_description)
+                    updated_count = pending_audit_tasks.update(description=new_description, updated_at=timezone.now())
                     if updated_count > 0:
                         api_logger.info(f"✅ Updated descriptions of {updated_count} pending audit-call tasks for child {task.related_child.child_id} with new date {date_str}")
                 except Exception as e:
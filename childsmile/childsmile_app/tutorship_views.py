@@ -65,6 +65,14 @@ import json
 import os
 from django.db.models import Count, F, Q , Prefetch
 from .utils import *
+from .matching_utils import (
+    sync_possible_matches,
+    get_wizard_page,
+    get_top_matches,
+    WIZARD_PAGE_SIZE,
+    PENALTY_DISTANCE_THRESHOLD,
+    TOP_K_PAGE_SIZE,
+)
 from .audit_utils import log_api_action
 from .logger import api_logger
 
@@ -81,78 +89,41 @@ def calculate_possible_matches(request):
         check_matches_permissions(request, ["CREATE", "UPDATE", "DELETE", "VIEW"])
         api_logger.debug("DEBUG: User has all required permissions.")
 
-        # Step 1.5: Refresh all ages (tutors and children) before calculating matches
-        from .utils import refresh_all_ages_for_matching
-        age_refresh_result = refresh_all_ages_for_matching()
+        # Step 1.5: Make sure ages were refreshed today (marker check; the daily
+        # refresh job normally did it already)
+        from .utils import ensure_ages_refreshed_today
+        age_refresh_result = ensure_ages_refreshed_today()
         api_logger.debug(f"DEBUG: Ages refreshed - tutors: {age_refresh_result['tutors_updated']}, children: {age_refresh_result['children_updated']}")
 
-        # Step 2: Fetch possible matches
-        possible_matches = fetch_possible_matches()
-        api_logger.debug(f"DEBUG: Fetched {len(possible_matches)} possible matches.")
-
-        # Step 3a: Calculate distances and coordinates for FIRST 200 MATCHES (pagination)
-        # This gives user ~28 pages of results (7 rows per page) to see pagination benefits
-        paginated_matches = calculate_distances(possible_matches, limit=200)
-        api_logger.debug(f"DEBUG: Calculated distances for first 200 matches (total {len(possible_matches)} available).")
+        # Step 2: PossibleMatches is maintained incrementally (see matching_utils) —
+        # only bootstrap an empty table or reconcile on explicit request.
+        # Never TRUNCATE: the report keeps reading while this runs.
+        rebuild = str(request.data.get("rebuild", "")).lower() in ("true", "1", "yes")
+        if rebuild or not PossibleMatches.objects.exists():
+            sync_stats = sync_possible_matches()
+            api_logger.debug(f"DEBUG: Full PossibleMatches reconcile - {sync_stats}")
 
-        # Step 3b: Async calculate distances for REST OF MATCHES in background (fire-and-forget)
-        # This runs concurrently while user browses the first 200
-        if len(possible_matches) > 200:
-            rest_of_matches = possible_matches[200:]
-            def async_calculate_rest():
-                try:
-                    calculate_distances(rest_of_matches)
-                    api_logger.debug(f"DEBUG: Background distance calculation completed for {len(rest_of_matches)} matches")
-                except Exception as e:
-                    api_logger.warning(f"WARNING: Background distance calculation failed: {str(e)[:100]}")
-            
-            threading.Thread(target=async_calculate_rest, daemon=True).start()
-
-        # Step 4: Calculate grades for paginated matches only
-        graded_matches = calculate_grades(paginated_matches)
-        api_logger.debug(f"DEBUG: Calculated grades for {len(graded_matches)} paginated matches.")
-
-        # --- PRINT ALL TUTORS INCLUDED IN MATCHES ---
-        tutor_ids = set(match["tutor_id"] for match in graded_matches)
-        tutors = Tutors.objects.filter(id_id__in=tutor_ids).select_related("staff")
-        api_logger.verbose("VERBOSE: Tutors included in first 30 matches:")
-        for t in tutors:
-            api_logger.verbose(
-                f"VERBOSE: staff={t.staff.first_name} {t.staff.last_name}, id={t.id_id}"
-            )
+        # Step 3: Read the first wizard page (children with 0 active/pending tutors)
+        # from the pre-filtered wizard view, male/female/cross groups then best grade first
+        wizard_rows, next_cursor = get_wizard_page(limit=WIZARD_PAGE_SIZE)
 
-        # Step 5: Upsert ALL MATCHES (including those not yet with distances calculated)
-        # This populates the database for report + lazy-loading
-        api_logger.debug("DEBUG: Upserting ALL possible matches to database (including rest).")
-        upsert_stats = upsert_possible_matches(possible_matches)
-        api_logger.debug(f"DEBUG: Upsert complete - {upsert_stats}")
+        # Step 4: Attach coordinates for the map + grades for the page only
+        paginated_matches = calculate_distances(wizard_rows)
+        wizard_matches = calculate_grades(paginated_matches)
 
-        api_logger.debug("DEBUG: Possible matches calculation completed.")
+        # Total (all rows, including children that already have tutors) for pagination
+        total_possible = PossibleMatches.objects.count()
 
-        # Step 6: Filter matches for wizard UI - only show children with 0 active/pending tutors
-        # The full data is in PossibleMatches table for the report to use
-        children_with_tutors = set(
-            Tutorships.objects.filter(
-                ~Q(tutorship_activation='inactive')
-            ).values_list('child_id', flat=True)
-        )
-        wizard_matches = [
-            match for match in graded_matches 
-            if match['child_id'] not in children_with_tutors
-        ]
-        
-        # Compute total (before filtering) for pagination
-        total_possible = len(possible_matches)
-        
-        api_logger.debug(f"DEBUG: Filtered to {len(wizard_matches)} matches for wizard (children with 0 tutors). Total available: {total_possible}.")
+        api_logger.debug(f"DEBUG: Returning {len(wizard_matches)} wizard matches. Total available: {total_possible}.")
 
         return JsonResponse(
             {
                 "message": "Possible matches calculated successfully.",
                 "matches": wizard_matches,
                 "total_count": total_possible,
-                "has_more": total_possible > 200,
-                "page_size": 200,
+                "has_more": next_cursor is not None,
+                "next_cursor": next_cursor,
+                "page_size": WIZARD_PAGE_SIZE,
             },
             status=200,
         )
@@ -184,97 +155,143 @@ def calculate_possible_matches(request):
 @api_view(["GET"])
 def get_more_possible_matches(request):
     """
-    Lazy-load pagination endpoint for possible matches.
-    
+    Cursor pagination endpoint for the wizard's possible matches.
+
     Query params:
-    - offset: Starting index (default 30 for second page)
-    - limit: Number of results per page (default 100)
-    
+    - cursor: next_cursor from the previous page (omit for the first page)
+    - limit: Number of results per page (default 200, max 1000)
+
     Returns:
-    - matches: Array of match objects
-    - offset: Current offset
+    - matches: Array of match objects (children with no active/pending tutor)
+    - next_cursor: Cursor for the following page, null on the last page
     - limit: Items per page
     - has_more: Whether there are more results
-    - total_count: Total number of matches available
+
+    Each page is one index range scan on the wizard view — stable ordering,
+    no OFFSET, no COUNT(*), no Python-side filtering.
     """
     api_logger.info("get_more_possible_matches called")
     try:
         # Check permissions
         check_matches_permissions(request, ["VIEW"])
-        
-        # Get pagination parameters
-        offset = int(request.GET.get('offset', 30))
-        limit = int(request.GET.get('limit', 100))
-        
-        # Validate parameters
-        if offset < 0:
-            offset = 30
+
+        cursor = request.GET.get('cursor') or None
+        try:
+            limit = int(request.GET.get('limit', WIZARD_PAGE_SIZE))
+        except ValueError:
+            limit = WIZARD_PAGE_SIZE
         if limit < 1 or limit > 1000:
-            limit = 100
-        
-        api_logger.debug(f"DEBUG: Fetching matches from offset {offset} with limit {limit}")
-        
-        # Fetch matches from database (already calculated and stored by calculate_possible_matches)
-        all_matches = PossibleMatches.objects.all().order_by('grade').reverse()
-        total_count = all_matches.count()
-        
-        # Paginate
-        paginated_matches = all_matches[offset:offset + limit]
-        
-        # Convert to dict format
-        matches_data = [
-            {
-                "child_id": m.child_id,
-                "tutor_id": m.tutor_id,
-                "child_full_name": m.child_full_name,
-                "tutor_full_name": m.tutor_full_name,
-                "child_city": m.child_city,
-                "tutor_city": m.tutor_city,
-                "child_age": m.child_age,
-                "tutor_age": m.tutor_age,
-                "child_gender": m.child_gender,
-                "tutor_gender": m.tutor_gender,
-                "distance_between_cities": m.distance_between_cities,
-                "grade": m.grade,
-                "is_used": m.is_used,
-            }
-            for m in paginated_matches
-        ]
-        
-        # Filter for wizard (children with 0 active tutors)
-        children_with_tutors = set(
-            Tutorships.objects.filter(
-                ~Q(tutorship_activation='inactive')
-            ).values_list('child_id', flat=True)
-        )
-        wizard_matches = [
-            m for m in matches_data
-            if m['child_id'] not in children_with_tutors
-        ]
-        
-        api_logger.debug(f"DEBUG: Returning {len(wizard_matches)} matches from offset {offset}")
-        
+            limit = WIZARD_PAGE_SIZE
+
+        try:
+            wizard_matches, next_cursor = get_wizard_page(cursor=cursor, limit=limit)
+        except ValueError as e:
+            return JsonResponse({"error": str(e)}, status=400)
+
+        api_logger.debug(f"DEBUG: Returning {len(wizard_matches)} matches (has_more={next_cursor is not None})")
+
         return JsonResponse(
             {
                 "message": "Matches retrieved successfully.",
                 "matches": wizard_matches,
-                "offset": offset,
+                "next_cursor": next_cursor,
                 "limit": limit,
-                "total_count": total_count,
-                "has_more": (offset + limit) < total_count,
+                "has_more": next_cursor is not None,
             },
             status=200,
         )
-    
+
     except PermissionError as e:
         api_logger.error(f"Permission error: {str(e)}")
         return JsonResponse({"error": str(e)}, status=403)
-    
+
     except Exception as e:
         api_logger.error(f"An error occurred in get_more_possible_matches: {str(e)}")
         return JsonResponse({"error": str(e)}, status=500)
 
 
+@conditional_csrf
+@api_view(["GET"])
+def get_top_possible_matches(request):
+    """
+    Top-K matching mode: the best K tutors for every waiting child
+    (per=child, default) or the best K children for every tutor (per=tutor).
+
+    Query params:
+    - k: candidates per child/tutor (default 5, max 50)
+    - per: "child" | "tutor"
+    - max_distance: km cutoff (default 50 = the grade penalty threshold; "all" = no cutoff)
+    - same_gender: "true" to drop cross-gender pairs
+    - child_id / tutor_id: restrict to one child / tutor
+    - after: next_after of the previous page (children / tutors are paged by id)
+    - limit: children / tutors per page (default 100, max 500)
+
+    Filtering and ranking run in SQL on PossibleMatches — only K rows per
+    child/tutor of the requested page are loaded. Pairs whose distance is
+    still pending are marked distance_pending and never pass max_distance.
+    """
+    api_logger.info("get_top_possible_matches called")
+    try:
+        check_matches_permissions(request, ["VIEW"])
+
+        per = request.GET.get("per", "child")
+        if per not in ("child", "tutor"):
+            return JsonResponse({"error": "per must be 'child' or 'tutor'"}, status=400)
+        try:
+            k = int(request.GET.get("k", 5))
+            max_distance_param = request.GET.get("max_distance", "").strip().lower()
+            if max_distance_param == "all":
+                max_distance = None
+            elif max_distance_param:
+                max_distance = int(max_distance_param)
+            else:
+                max_distance = PENALTY_DISTANCE_THRESHOLD
+            child_id = request.GET.get("child_id")
+            tutor_id = request.GET.get("tutor_id")
+            child_ids = [int(child_id)] if child_id else None
+            tutor_ids = [int(tutor_id)] if tutor_id else None
+            after = int(request.GET["after"]) if request.GET.get("after") else None
+            limit = int(request.GET.get("limit", TOP_K_PAGE_SIZE))
+        except ValueError:
+            return JsonResponse(
+                {"error": "k, max_distance, child_id, tutor_id, after and limit must be integers"}, status=400
+            )
+        same_gender = request.GET.get("same_gender", "").lower() in ("true", "1", "yes")
+
+        groups, next_after = get_top_matches(
+            k=k,
+            per=per,
+            max_distance=max_distance,
+            same_gender_only=same_gender,
+            child_ids=child_ids,
+            tutor_ids=tutor_ids,
+            after=after,
+            limit=limit,
+        )
+
+        api_logger.debug(f"DEBUG: Returning top-{k} matches for {len(groups)} {per}s")
+
+        return JsonResponse(
+            {
+                "message": "Top matches retrieved successfully.",
+                "per": per,
+                "k": k,
+                "max_distance": max_distance,
+                "groups": groups,
+                "next_after": next_after,
+            },
+            status=200,
+        )
+
+    except PermissionError as e:
+        api_logger.error(f"Permission error: {str(e)}")
+        return JsonResponse({"error": str(e)}, status=403)
+
+    except Exception as e:
+        api_logger.error(f"An error occurred in get_top_possible_matches: {str(e)}")
+        return JsonResponse({"error": str(e)}, status=500)
+
+
 @conditional_csrf
 @api_view(["GET"])
 def get_tutorships(request):
@@ -1145,9 +1162,9 @@ def calculate_manual_match(request):
         # Check permissions
         check_matches_permissions(request, ["VIEW"])
         
-        # Refresh all ages (tutors and children) before calculating manual match
-        from .utils import refresh_all_ages_for_matching
-        age_refresh_result = refresh_all_ages_for_matching()
+        # Make sure ages were refreshed today before calculating manual match
+        from .utils import ensure_ages_refreshed_today
+        age_refresh_result = ensure_ages_refreshed_today()
         api_logger.debug(f"DEBUG: Ages refreshed for manual match - tutors: {age_refresh_result['tutors_updated']}, children: {age_refresh_result['children_updated']}")
         
         data = request.data
@@ -1162,9 +1179,9 @@ def calculate_manual_match(request):
         
         api_logger.debug(f"DEBUG: Calculating match for child {child_id} and tutor {tutor_id}")
         
-        # Use the same SQL logic as fetch_possible_matches but for this specific pair
+        # Use the same SQL logic as the PossibleMatches candidates (matching_utils) but for this specific pair
         # IMPORTANT: Manual match does NOT allow re-creating inactive tutorships
-        # Only the wizard allows that via fetch_possible_matches filtering
+        # Only the wizard allows that via the PossibleMatches candidate filtering
         query = """
         SELECT
             child.child_id,
@@ -83,6 +83,7 @@ from .feedback_views import (
 from .tutorship_views import (
     calculate_possible_matches,
     get_more_possible_matches,
+    get_top_possible_matches,
     get_tutorships,
     create_tutorship,
     update_tutorship,
@@ -111,12 +112,25 @@ from .unused_views import (
 )
 from .audit_views import (
     get_audit_logs,
+    export_audit_logs,
+    search_audit_logs,
     get_audit_statistics,
     audit_action,
     purge_old_audit_logs,
+    preview_audit_purge,
+    get_audit_archives,
+    download_audit_archive,
 )
 from .whatsapp_webhook import (
     whatsapp_incoming,
+    whatsapp_status_callback,
+)
+from .realtime_views import realtime_updates
+from .import_views import (
+    import_job_status_view,
+    import_job_result,
+    cancel_import_job_view,
+    resume_import_job_view,
 )
 
 
@@ -238,6 +252,11 @@ urlpatterns = [
         get_more_possible_matches,
         name="get_more_possible_matches",
     ),
+    path(
+        "api/get_top_possible_matches/",
+        get_top_possible_matches,
+        name="get_top_possible_matches",
+    ),
     path(
         "api/get_tutorships/",
         get_tutorships,
@@ -421,12 +440,21 @@ urlpatterns = [
         name="staff_creation_verify_totp",
     ),
     path("api/audit-logs/", get_audit_logs, name="get_audit_logs"),
+    path("api/audit-logs/export/", export_audit_logs, name="export_audit_logs"),
+    path("api/audit-logs/search/", search_audit_logs, name="search_audit_logs"),
     path("api/audit-statistics/", get_audit_statistics, name="get_audit_statistics"),
     path("api/audit-action/", audit_action, name="audit_action"),
     path("api/purge-old-audit-logs/", purge_old_audit_logs, name="purge_old_audit_logs"),
+    path("api/purge-old-audit-logs/preview/", preview_audit_purge, name="preview_audit_purge"),
+    path("api/audit-archives/", get_audit_archives, name="get_audit_archives"),
+    path("api/audit-archives/<str:file_name>/", download_audit_archive, name="download_audit_archive"),
     # Import endpoints
     path("api/import/volunteers/", import_volunteers_endpoint, name="import_volunteers"),
     path("api/import/families/", import_families_endpoint, name="import_families"),
+    path("api/import/jobs/<str:job_id>/", import_job_status_view, name="import_job_status"),
+    path("api/import/jobs/<str:job_id>/result/", import_job_result, name="import_job_result"),
+    path("api/import/jobs/<str:job_id>/cancel/", cancel_import_job_view, name="cancel_import_job"),
+    path("api/import/jobs/<str:job_id>/resume/", resume_import_job_view, name="resume_import_job"),
     # Settlements endpoint (replaces JSON file)
     path("api/settlements/", get_settlements_data, name="get_settlements"),
     # Dashboard endpoints
@@ -451,6 +479,9 @@ urlpatterns = [
     path("api/activities/", include("childsmile_app.urls_activities")),
     # Twilio WhatsApp webhooks
     path("api/webhooks/whatsapp-incoming/", whatsapp_incoming, name="whatsapp_incoming"),
+    path("api/webhooks/whatsapp-status/", whatsapp_status_callback, name="whatsapp_status_callback"),
     # Notification Center
     path("api/notifications/", include("childsmile_app.urls_notifications")),
+    # Realtime change feed (long poll) for the coordinator chat and notification bell
+    path("api/updates/", realtime_updates, name="realtime_updates"),
 ]
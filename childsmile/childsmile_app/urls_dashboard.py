@@ -12,6 +12,7 @@ urlpatterns = [
     path('video-status/<str:video_id>/', dashboard_views.video_generation_status, name='video_status'),
     path('download-video/<str:video_id>/', dashboard_views.download_video, name='download_video'),
     path('export-ppt/', dashboard_views.export_ppt, name='export_ppt'),
+    path('ppt-status/<str:ppt_id>/', dashboard_views.ppt_generation_status, name='ppt_status'),
     path('download-ppt/<str:ppt_id>/', dashboard_views.download_ppt, name='download_ppt'),
     path('ai-chat/', dashboard_views.ai_chat, name='ai_chat'),
 ]
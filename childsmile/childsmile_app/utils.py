@@ -18,6 +18,7 @@ from .models import (
     PrevTutorshipStatuses,
     InitialFamilyData,
     CityGeoDistance,
+    JobRun,
 )
 from .unused_views import (
     PermissionsViewSet,
@@ -61,11 +62,9 @@ from .audit_utils import log_api_action
 import datetime
 import urllib3
 from django.utils.timezone import make_aware
-from geopy.exc import GeocoderTimedOut, GeocoderUnavailable
-from geopy.geocoders import Nominatim
 import threading, time
 from time import sleep
-from math import sin, cos, sqrt, atan2, radians, ceil
+from math import ceil
 import json
 import os
 from django.db.models import Count, F, Q
@@ -137,57 +136,67 @@ def is_nonempty_phone(phone):
     """Helper: Returns True if phone is not None and not empty after stripping."""
     return bool(phone and str(phone).strip())
     
+def israel_today():
+    """Today's date in Israel time (TIME_ZONE is UTC; ages roll over at Israeli midnight)."""
+    import pytz
+    return datetime.datetime.now(pytz.timezone('Asia/Jerusalem')).date()
+
+
+# Set-based age recomputation — one UPDATE instead of save() per row.
+# Only rows whose age actually changes are written.
+_REFRESH_SIGNEDUP_AGES_SQL = """
+    UPDATE childsmile_app_signedup s
+    SET age = EXTRACT(YEAR FROM AGE(%s::date, s.birth_date))::int
+    WHERE s.birth_date IS NOT NULL
+    AND s.age IS DISTINCT FROM EXTRACT(YEAR FROM AGE(%s::date, s.birth_date))::int
+    {tutors_only}
+"""
+
+# PossibleMatches copies tutor_age; keep it in line after the bulk update
+# (bulk UPDATEs don't fire the signals matching_utils relies on).
+_REFRESH_MATCHES_TUTOR_AGES_SQL = """
+    UPDATE childsmile_app_possiblematches pm
+    SET tutor_age = s.age
+    FROM childsmile_app_signedup s
+    WHERE pm.tutor_id = s.id
+    AND pm.tutor_age IS DISTINCT FROM s.age
+"""
+
+
+def _refresh_signedup_ages(tutors_only):
+    today = israel_today()
+    tutors_only_sql = (
+        "AND EXISTS (SELECT 1 FROM childsmile_app_tutors t WHERE t.id_id = s.id)"
+        if tutors_only else ""
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(_REFRESH_SIGNEDUP_AGES_SQL.format(tutors_only=tutors_only_sql), [today, today])
+        updated_count = cursor.rowcount
+        if updated_count:
+            cursor.execute(_REFRESH_MATCHES_TUTOR_AGES_SQL)
+    return updated_count
+
+
 def refresh_volunteer_ages():
     """
     Refresh/recalculate ages for all volunteers and tutors in SignedUp table
-    based on their birth_date field.
+    based on their birth_date field (single set-based UPDATE).
     :return: Dictionary with counts of updated records.
     """
-    updated_count = 0
-    skipped_count = 0
-    
-    # Get all SignedUp records with birth_date
-    signedups = SignedUp.objects.filter(birth_date__isnull=False)
-    
-    for signedup in signedups:
-        new_age = calculate_age_from_birth_date(signedup.birth_date)
-        if new_age is not None and new_age != signedup.age:
-            signedup.age = new_age
-            signedup.save(update_fields=['age'])
-            updated_count += 1
-        else:
-            skipped_count += 1
-    
-    api_logger.info(f"Volunteer ages refreshed: {updated_count} updated, {skipped_count} unchanged")
-    return {'updated': updated_count, 'skipped': skipped_count}
+    updated_count = _refresh_signedup_ages(tutors_only=False)
+    api_logger.info(f"Volunteer ages refreshed: {updated_count} updated")
+    return {'updated': updated_count}
 
 
 def refresh_tutor_ages_only():
     """
     Refresh/recalculate ages only for tutors (not general volunteers) in SignedUp table
-    based on their birth_date field. Used for tutorship matching.
+    based on their birth_date field (single set-based UPDATE). Used for tutorship matching.
     :return: Dictionary with counts of updated records.
     """
-    updated_count = 0
-    skipped_count = 0
-    
-    # Get tutor IDs from Tutors table
-    tutor_ids = Tutors.objects.values_list('id_id', flat=True)
-    
-    # Get SignedUp records for tutors with birth_date
-    signedups = SignedUp.objects.filter(id__in=tutor_ids, birth_date__isnull=False)
-    
-    for signedup in signedups:
-        new_age = calculate_age_from_birth_date(signedup.birth_date)
-        if new_age is not None and new_age != signedup.age:
-            signedup.age = new_age
-            signedup.save(update_fields=['age'])
-            updated_count += 1
-        else:
-            skipped_count += 1
-    
-    api_logger.info(f"Tutor ages refreshed: {updated_count} updated, {skipped_count} unchanged")
-    return {'updated': updated_count, 'skipped': skipped_count}
+    updated_count = _refresh_signedup_ages(tutors_only=True)
+    api_logger.info(f"Tutor ages refreshed: {updated_count} updated")
+    return {'updated': updated_count}
 
 
 def refresh_children_ages():
@@ -205,11 +214,11 @@ def refresh_children_ages():
     with connection.cursor() as cursor:
         cursor.execute("""
             UPDATE childsmile_app_possiblematches pm
-            SET child_age = EXTRACT(YEAR FROM AGE(current_date, c.date_of_birth))::int
+            SET child_age = EXTRACT(YEAR FROM AGE(%s::date, c.date_of_birth))::int
             FROM childsmile_app_children c
             WHERE pm.child_id = c.child_id
-            AND pm.child_age != EXTRACT(YEAR FROM AGE(current_date, c.date_of_birth))::int
-        """)
+            AND pm.child_age != EXTRACT(YEAR FROM AGE(%s::date, c.date_of_birth))::int
+        """, [israel_today(), israel_today()])
         updated_count = cursor.rowcount
     
     api_logger.info(f"Children ages in PossibleMatches refreshed: {updated_count} updated")
@@ -228,11 +237,50 @@ def refresh_all_ages_for_matching():
     
     return {
         'tutors_updated': tutor_result['updated'],
-        'tutors_skipped': tutor_result.get('skipped', 0),
         'children_updated': children_result['updated']
     }
 
 
+AGE_REFRESH_JOB = 'age_refresh'
+
+
+def refresh_all_ages():
+    """
+    Daily age refresh (scheduler / refresh_ages command): every SignedUp age
+    plus children ages in PossibleMatches, then stamps the JobRun marker so
+    request paths can skip the work for the rest of the day.
+    :return: Dictionary with combined counts.
+    """
+    volunteer_result = refresh_volunteer_ages()
+    children_result = refresh_children_ages()
+    result = {
+        'volunteers_updated': volunteer_result['updated'],
+        'children_updated': children_result['updated'],
+    }
+    JobRun.objects.update_or_create(
+        job_name=AGE_REFRESH_JOB,
+        defaults={'last_run_date': israel_today(), 'last_result': result},
+    )
+    return result
+
+
+def ensure_ages_refreshed_today():
+    """
+    Used by the matching requests instead of refreshing ages on every call:
+    one indexed lookup of the JobRun marker; the set-based refresh only runs
+    if nothing refreshed ages yet today (e.g. the scheduler is disabled).
+    :return: Dictionary with counts (zeros when already refreshed today).
+    """
+    if JobRun.objects.filter(job_name=AGE_REFRESH_JOB, last_run_date=israel_today()).exists():
+        return {'tutors_updated': 0, 'children_updated': 0, 'already_refreshed': True}
+    result = refresh_all_ages()
+    return {
+        'tutors_updated': result['volunteers_updated'],
+        'children_updated': result['children_updated'],
+        'already_refreshed': False,
+    }
+
+
 # ============================================================================
 # END OF AGE CALCULATION UTILITIES
 # ============================================================================
@@ -244,55 +292,19 @@ def get_enum_values(enum_type):
         cursor.execute(f"SELECT unnest(enum_range(NULL::{enum_type}))")
         return [row[0] for row in cursor.fetchall()]
 
-def get_or_update_city_location(city, retries=3, delay=2):
-    """
-    Retrieve the latitude and longitude of a city from the DB.
-    If the city is not found, geocode it and update the DB.
-    
-    Gracefully handles API unavailability by returning None instead of crashing.
-    This allows matches to proceed without distance data when the geocoding API is down.
+def get_or_update_city_location(city):
     """
-    # Try to find any record where city is city1 or city2
-    geo = CityGeoDistance.objects.filter(city1=city).first() or CityGeoDistance.objects.filter(city2=city).first()
-    if geo:
-        if geo.city1 == city and geo.city1_latitude and geo.city1_longitude:
-            return {"latitude": geo.city1_latitude, "longitude": geo.city1_longitude}
-        if geo.city2 == city and geo.city2_latitude and geo.city2_longitude:
-            return {"latitude": geo.city2_latitude, "longitude": geo.city2_longitude}
+    Retrieve the latitude and longitude of a city from the local CityLocation
+    gazetteer (indexed primary-key lookup, no network call).
 
-    # If not found, try to geocode and store in DB
-    # But gracefully handle API unavailability
+    If the city is unknown it is registered for the background geocoder
+    (geo_utils.geocode_pending_cities) and None is returned, so callers proceed
+    without coordinates instead of waiting on the geocoding API.
+    """
+    from .geo_utils import get_city_locations
     try:
-        geolocator = Nominatim(user_agent="childsmile_app")
-        for attempt in range(retries):
-            try:
-                location = geolocator.geocode(f"{city}, ישראל", timeout=10) or geolocator.geocode(city, timeout=10)
-                if location:
-                    # Save a dummy CityGeoDistance row with city as city1 and empty city2
-                    CityGeoDistance.objects.get_or_create(
-                        city1=city, city2="",
-                        defaults={
-                            "city1_latitude": location.latitude,
-                            "city1_longitude": location.longitude,
-                        }
-                    )
-                    return {"latitude": location.latitude, "longitude": location.longitude}
-            except (GeocoderUnavailable, GeocoderTimedOut) as e:
-                # API is unavailable or timed out - log and return None (graceful degradation)
-                api_logger.debug(f"DEBUG: Geocoding API unavailable for city '{city}' (attempt {attempt+1}/{retries}): {type(e).__name__}")
-                if attempt < retries - 1:
-                    time.sleep(delay)
-                else:
-                    # After all retries, log as warning and return None
-                    api_logger.warning(f"WARNING: Geocoding API unavailable for city '{city}' after {retries} attempts. Proceeding without coordinates.")
-                    return None
-            except Exception as e:
-                # Unexpected error - log and continue
-                api_logger.debug(f"DEBUG: Unexpected error geocoding city '{city}': {type(e).__name__}: {str(e)[:100]}")
-                time.sleep(delay)
-        return None
+        return get_city_locations([city]).get((city or "").strip())
     except Exception as e:
-        # Catch-all for any unexpected errors in the entire function
         api_logger.warning(f"WARNING: get_or_update_city_location failed for city '{city}': {str(e)[:100]}")
         return None
 
@@ -356,157 +368,12 @@ def check_matches_permissions(request, required_permissions):
         )
 
 
-def fetch_possible_matches():
-    """
-    Fetch possible matches from the database.
-    
-    This populates the PossibleMatches table used by BOTH:
-    - Wizard (will be filtered to show only children with 0 tutors)
-    - Report (shows ALL matches for manual multi-tutor matching)
-    
-    RULES:
-    - Include ALL children (even those with existing tutors) for the report
-    - Only exclude specific child+tutor pairs that already have a non-inactive tutorship
-    - Only show tutors who do NOT have any active/pending tutorship (tutor = 1 tutee max)
-    """
-    query = """
-    SELECT
-        child.child_id,
-        tutor.id_id AS tutor_id,
-        CONCAT(child.childfirstname, ' ', child.childsurname) AS child_full_name,
-        CONCAT(signedup.first_name, ' ', signedup.surname) AS tutor_full_name,
-        child.city AS child_city,
-        signedup.city AS tutor_city,
-        child.date_of_birth AS child_birth_date,
-        EXTRACT(YEAR FROM AGE(current_date, child.date_of_birth))::int AS child_age,
-        signedup.birth_date AS tutor_birth_date,
-        signedup.age AS tutor_age,
-        child.gender AS child_gender,
-        signedup.gender AS tutor_gender,
-        0 AS distance_between_cities,
-        100 AS grade,
-        FALSE AS is_used
-    FROM childsmile_app_children child
-    CROSS JOIN childsmile_app_signedup signedup
-    JOIN childsmile_app_tutors tutor
-        ON signedup.id = tutor.id_id
-    JOIN childsmile_app_staff staff
-        ON tutor.staff_id = staff.staff_id
-    WHERE 
-        -- Only exclude THIS SPECIFIC child+tutor pair if already matched (allows multi-tutor via report)
-        NOT EXISTS (
-            SELECT 1
-            FROM childsmile_app_tutorships tutorship
-            WHERE tutorship.child_id = child.child_id 
-            AND tutorship.tutor_id = tutor.id_id
-            AND tutorship.tutorship_activation <> 'inactive'
-        )
-        -- Exclude tutors that have ANY active/pending tutorship (tutor can only have ONE tutee)
-        AND NOT EXISTS (
-            SELECT 1
-            FROM childsmile_app_tutorships tutorship
-            WHERE tutorship.tutor_id = tutor.id_id
-            AND tutorship.tutorship_activation <> 'inactive'
-        )
-        -- Only include active staff members
-        AND staff.is_active = TRUE
-        -- Exclude deceased, healthy, and left children (use parameterized query to avoid encoding issues)
-        AND child.status NOT IN (%s, %s, %s)
-        -- Exclude irrelevant tutoring statuses (no point matching if they don't want/aren't relevant)
-        AND child.tutoring_status NOT IN (%s, %s)
-        -- Exclude age >=16 which are matures and not relevant for tutoring
-        -- Smart SQL age calculation matching Python logic: 
-        -- age = year_diff - (1 if today's month/day is before birth month/day else 0)
-        -- This ensures we only get children under 16 (< 16 years old)
-        AND (
-            EXTRACT(YEAR FROM AGE(current_date, child.date_of_birth))::int -
-            CASE WHEN (EXTRACT(MONTH FROM current_date), EXTRACT(DAY FROM current_date)) < 
-                      (EXTRACT(MONTH FROM child.date_of_birth), EXTRACT(DAY FROM current_date))
-                 THEN 1 ELSE 0 END
-        ) < 16
-    """
-    # Use parameterized query for Hebrew values to avoid encoding issues with special characters
-    excluded_statuses = ('ז״ל', 'בריא', 'עזב')
-    excluded_tutoring_statuses = ('לא_רוצים', 'לא_רלוונטי')
-    with connection.cursor() as cursor:
-        cursor.execute(query, excluded_statuses + excluded_tutoring_statuses)
-        rows = cursor.fetchall()
-        if not rows:
-            return []  # Ensure it returns a list
-        return [
-            {
-                "child_id": row[0],
-                "tutor_id": row[1],
-                "child_full_name": row[2],
-                "tutor_full_name": row[3],
-                "child_city": row[4],
-                "tutor_city": row[5],
-                "child_birth_date": format_date_to_string(row[6]) if row[6] else None,
-                "child_age": row[7],
-                "tutor_birth_date": format_date_to_string(row[8]) if row[8] else None,
-                "tutor_age": row[9],
-                "child_gender": row[10],
-                "tutor_gender": row[11],
-                "distance_between_cities": row[12],
-                "grade": row[13],
-                "is_used": row[14],
-            }
-            for row in rows
-        ]
-
-
-def upsert_possible_matches(matches):
-    """
-    Lightning-fast upsert using RAW SQL instead of Python loops.
-    - Deletes all existing matches and inserts new ones in ONE batch operation
-    - Uses RAW SQL TRUNCATE for instant deletion (~100x faster than ORM delete)
-    - Uses bulk_create for instant insertion
-    
-    WARNING: This approach discards old data! Only use if you're okay with full replacement.
-    If you need incremental updates, use a different strategy.
-    
-    :param matches: List of match objects to be upserted.
-    :return: dict with stats {'inserted': count, 'deleted': count, 'total': count}
-    """
-    # Step 1: Delete all existing records FAST using raw SQL (not ORM which is slow)
-    with connection.cursor() as cursor:
-        cursor.execute("TRUNCATE TABLE childsmile_app_possiblematches")
-    
-    # Step 2: Bulk insert all new matches using ORM (still fast with bulk_create)
-    new_records = [
-        PossibleMatches(
-            child_id=match["child_id"],
-            tutor_id=match["tutor_id"],
-            child_full_name=match["child_full_name"],
-            tutor_full_name=match["tutor_full_name"],
-            child_city=match["child_city"],
-            tutor_city=match["tutor_city"],
-            child_age=match["child_age"],
-            tutor_age=match["tutor_age"],
-            child_gender=match["child_gender"],
-            tutor_gender=match["tutor_gender"],
-            distance_between_cities=match["distance_between_cities"],
-            grade=match["grade"],
-            is_used=match["is_used"],
-        )
-        for match in matches
-    ]
-    PossibleMatches.objects.bulk_create(new_records, batch_size=1000)
-    
-    stats = {
-        'inserted': len(new_records),
-        'deleted': '(truncated all)',
-        'total': len(matches)
-    }
-    api_logger.debug(f"DEBUG: Upserted PossibleMatches (TRUNCATE + bulk_insert): {stats}")
-    return stats
-
-
 def clear_possible_matches():
     """
     Clear the possible matches table.
     This function deletes all records from the PossibleMatches table.
-    DEPRECATED: Use upsert_possible_matches() instead for better performance.
+    DEPRECATED: PossibleMatches is maintained incrementally by
+    matching_utils.sync_possible_matches().
     """
     PossibleMatches.objects.all().delete()
     api_logger.debug("DEBUG: Emptied the possiblematches table.")
@@ -515,7 +382,8 @@ def clear_possible_matches():
 def insert_new_matches(matches):
     """
     Insert new matches into the PossibleMatches table.
-    DEPRECATED: Use upsert_possible_matches() instead for better performance.
+    DEPRECATED: PossibleMatches is maintained incrementally by
+    matching_utils.sync_possible_matches().
     :param matches: List of match objects to be inserted.
     """
     new_matches = [
@@ -540,18 +408,72 @@ def insert_new_matches(matches):
     api_logger.debug(f"DEBUG: Inserted {len(new_matches)} new records into possiblematches.")
 
 
+def get_city_distance_map(city_pairs):
+    """
+    Resolve many city pairs from the CityGeoDistance cache in ONE query.
+
+    Loads every cached row whose both cities are among the requested cities
+    and indexes it in both directions, so callers can look up (a, b) or (b, a)
+    in O(1) without any further DB round-trips.
+
+    :param city_pairs: iterable of (city1, city2) tuples (already stripped)
+    :return: dict {(city_a, city_b): {"distance", "city1_latitude", "city1_longitude",
+             "city2_latitude", "city2_longitude"}} where city1_* are city_a's coordinates.
+             Only complete rows (distance + both coordinates) are included.
+    """
+    cities = set()
+    for city1, city2 in city_pairs:
+        cities.add(city1)
+        cities.add(city2)
+    if not cities:
+        return {}
+
+    rows = CityGeoDistance.objects.filter(
+        city1__in=cities,
+        city2__in=cities,
+        distance__isnull=False,
+        city1_latitude__isnull=False,
+        city1_longitude__isnull=False,
+        city2_latitude__isnull=False,
+        city2_longitude__isnull=False,
+    ).values_list(
+        "city1", "city2", "distance",
+        "city1_latitude", "city1_longitude", "city2_latitude", "city2_longitude",
+    )
+
+    distance_map = {}
+    for city1, city2, distance, lat1, lon1, lat2, lon2 in rows:
+        distance_map[(city1, city2)] = {
+            "distance": distance,
+            "city1_latitude": lat1,
+            "city1_longitude": lon1,
+            "city2_latitude": lat2,
+            "city2_longitude": lon2,
+        }
+        # Symmetric entry (don't override a row stored in this exact direction)
+        distance_map.setdefault((city2, city1), {
+            "distance": distance,
+            "city1_latitude": lat2,
+            "city1_longitude": lon2,
+            "city2_latitude": lat1,
+            "city2_longitude": lon1,
+        })
+    return distance_map
+
+
 def calculate_distances(matches, limit=None):
     """
     Fast distance calculation using cached data.
     
     Strategy:
     1. Collect all unique city pairs from matches (optionally limited to first N)
-    2. Look up distances in CityGeoDistance cache (instant DB query)
-    3. For missing pairs, START ASYNC JOBS but DON'T WAIT (fire-and-forget)
-    4. Return matches immediately (~1-2 seconds max, even for 10,000+ matches)
-    5. Missing distances will have distance_pending=True, UI can show "calculating..."
+    2. Resolve ALL of them from the CityGeoDistance cache in ONE query
+       (get_city_distance_map) — O(1) queries however many matches there are
+    3. Fill distance + coordinates for every match in memory
+    4. Pairs with an un-geocoded city get distance_pending=True, UI can show "calculating..."
     
-    Background jobs populate cache, next time calculate_distances runs, data is there!
+    The background geocoder / distance writer (geo_utils) populate the cache,
+    next time calculate_distances runs, data is there!
     
     :param matches: List of match objects, each containing child_city and tutor_city.
     :param limit: Optional - only process first N matches for pagination
@@ -565,64 +487,51 @@ def calculate_distances(matches, limit=None):
     # Step 1: Collect all unique city pairs
     city_pairs = set()
     for match in matches_to_process:
-        child_city = match.get("child_city", "").strip()
-        tutor_city = match.get("tutor_city", "").strip()
-        if child_city and tutor_city and child_city != tutor_city:
-            pair = tuple(sorted([child_city, tutor_city]))
-            city_pairs.add(pair)
-    
-    api_logger.debug(f"DEBUG: Found {len(city_pairs)} unique city pairs")
-    
-    # Step 2: Identify missing pairs (quick DB query, instant)
-    missing_pairs = []
-    for city1, city2 in city_pairs:
-        geo = CityGeoDistance.objects.filter(
-            (Q(city1=city1, city2=city2) | Q(city1=city2, city2=city1))
-        ).first()
-        
-        if not geo or not all([
-            geo.city1_latitude,
-            geo.city1_longitude,
-            geo.city2_latitude,
-            geo.city2_longitude,
-            geo.distance is not None
-        ]):
-            missing_pairs.append((city1, city2))
-    
-    api_logger.debug(f"DEBUG: {len(missing_pairs)} city pairs missing from cache - starting async jobs")
-    
-    # Step 3: START async jobs for missing pairs (fire-and-forget, don't wait)
-    # These will run in background and populate the cache
-    for city1, city2 in missing_pairs:
-        async_calculate_and_store_distance(city1, city2)
-    
-    # Step 4: Populate match data from cache (instant, no waiting)
+        child_city = (match.get("child_city") or "").strip()
+        tutor_city = (match.get("tutor_city") or "").strip()
+        if child_city and tutor_city:
+            city_pairs.add((child_city, tutor_city))
+    
+    # Step 2: One set-based lookup for every pair
+    distance_map = get_city_distance_map(city_pairs)
+    missing_pairs = {
+        tuple(sorted(pair)) for pair in city_pairs if pair not in distance_map
+    }
+    api_logger.debug(f"DEBUG: Found {len(city_pairs)} unique city pairs, {len(missing_pairs)} missing from cache")
+
+    # Step 2b: Pairs whose cities both have known coordinates are computed right
+    # here in one vectorized pass (geo_utils) and stored by its background
+    # writer, which also registers un-geocoded cities for the nightly geocoder
+    if missing_pairs:
+        from .geo_utils import fill_distances_from_known_coordinates
+        resolved, unresolved = fill_distances_from_known_coordinates(missing_pairs)
+        distance_map.update(resolved)
+        missing_pairs = unresolved
+    
+    # Step 3: Populate match data from the map (in memory, no queries)
     for match in matches_to_process:
-        result = calculate_distance_between_cities(
-            match["child_city"], match["tutor_city"]
+        pair = (
+            (match.get("child_city") or "").strip(),
+            (match.get("tutor_city") or "").strip(),
         )
-
+        result = distance_map.get(pair)
         if result:
-            try:
-                match["distance_between_cities"] = result["distance"]
-                match["child_latitude"] = result["city1_latitude"]
-                match["child_longitude"] = result["city1_longitude"]
-                match["tutor_latitude"] = result["city2_latitude"]
-                match["tutor_longitude"] = result["city2_longitude"]
-                match["distance_pending"] = result.get("distance_pending", False)
-            except KeyError as e:
-                api_logger.error(f"DEBUG: KeyError while accessing result: {e}")
-                raise
+            match["distance_between_cities"] = result["distance"]
+            match["child_latitude"] = result["city1_latitude"]
+            match["child_longitude"] = result["city1_longitude"]
+            match["tutor_latitude"] = result["city2_latitude"]
+            match["tutor_longitude"] = result["city2_longitude"]
+            match["distance_pending"] = False
         else:
-            # No data yet (being calculated in background)
-            match["distance_between_cities"] = 0
+            # No data yet (a city is waiting for the background geocoder)
+            match["distance_between_cities"] = None
             match["child_latitude"] = None
             match["child_longitude"] = None
             match["tutor_latitude"] = None
             match["tutor_longitude"] = None
             match["distance_pending"] = True
     
-    api_logger.debug(f"DEBUG: calculate_distances completed (async jobs started, not waited for)")
+    api_logger.debug(f"DEBUG: calculate_distances completed ({len(missing_pairs)} pairs pending geocoding)")
     return matches_to_process
 
 
@@ -631,34 +540,23 @@ def calculate_distances(matches, limit=None):
 def calculate_distance_between_cities(city1, city2):
     """
     Calculate the distance between two cities in kilometers and return their coordinates.
-    First, check the CityGeoDistance table for the distance and coordinates.
-    If not found or incomplete, trigger async calculation and return pending.
+    First, check the CityGeoDistance table for the distance and coordinates (one query,
+    either direction). If not found, compute it from the known city coordinates
+    (geo_utils); if a city has no coordinates yet, return pending.
     """
     api_logger.debug(f"DEBUG: Calculating distance between {city1} and {city2}")
 
-    geo = CityGeoDistance.objects.filter(city1=city1, city2=city2).first() or \
-          CityGeoDistance.objects.filter(city1=city2, city2=city1).first()
-
-    if geo and all([
-        geo.city1_latitude is not None,
-        geo.city1_longitude is not None,
-        geo.city2_latitude is not None,
-        geo.city2_longitude is not None,
-        geo.distance is not None
-    ]):
-        return {
-            "distance": geo.distance,
-            "city1_latitude": geo.city1_latitude,
-            "city1_longitude": geo.city1_longitude,
-            "city2_latitude": geo.city2_latitude,
-            "city2_longitude": geo.city2_longitude,
-            "distance_pending": False,
-        }
+    city1, city2 = (city1 or "").strip(), (city2 or "").strip()
+    result = get_city_distance_map([(city1, city2)]).get((city1, city2))
+    if not result and city1 and city2:
+        from .geo_utils import fill_distances_from_known_coordinates
+        resolved, _ = fill_distances_from_known_coordinates([(city1, city2)])
+        result = resolved.get((city1, city2))
+    if result:
+        return dict(result, distance_pending=False)
 
-    # If not found or incomplete, trigger async calculation and return pending
-    async_calculate_and_store_distance(city1, city2)
     return {
-        "distance": 0,
+        "distance": None,
         "city1_latitude": None,
         "city1_longitude": None,
         "city2_latitude": None,
@@ -688,6 +586,7 @@ def calculate_grades(possible_matches):
     - Grade is 100% distance-based
     - Distance > 50km: grade = -5 (hard penalty/invalid)
     - Distance <= 50km: grade = 100 - (distance * 2), minimum 0
+    - Distance unknown (distance_pending): grade = 0, ranked after every pair within 50km
     
     Gender Grouping: Maintains separation into male_matches, female_matches, and cross_matches
     for UI structure consistency, but all groups use the same distance-only scoring formula.
@@ -738,8 +637,11 @@ def calculate_grades(possible_matches):
         for match in matches:
             distance = match.get("distance_between_cities")
             
+            # Unknown distance: never rank it as if the cities were next to each other
+            if distance is None:
+                match["grade"] = MIN_GRADE
             # Hard penalty for distances > 50km
-            if distance > PENALTY_DISTANCE_THRESHOLD:
+            elif distance > PENALTY_DISTANCE_THRESHOLD:
                 match["grade"] = PENALTY_GRADE
             else:
                 # Linear scoring: 100 at 0km, decreases by 2 per km
@@ -1203,99 +1105,12 @@ def delete_other_tasks_with_initial_family_data_async(task):
     thread.start()
 
 
-in_progress_pairs = set()
-# Semaphore to limit concurrent database connections
-# Azure Standard_B1ms (burstable) has VERY limited connection slots (~10 total, some reserved for replication)
-# Only allow 2-3 concurrent threads to avoid "connection slots reserved for azure replication" errors
-_distance_semaphore = threading.Semaphore(2)
-
-
-def async_calculate_and_store_distance(city1, city2):
-    pair = tuple(sorted([city1, city2]))
-    if pair in in_progress_pairs:
-        return  # Already being calculated
-    in_progress_pairs.add(pair)
-
-    def worker():
-        try:
-            # Acquire semaphore - wait if we're at max concurrent threads
-            _distance_semaphore.acquire()
-            try:
-                calculate_and_store_distance_force(city1, city2)
-            finally:
-                _distance_semaphore.release()
-        finally:
-            in_progress_pairs.discard(pair)
-
-    threading.Thread(target=worker, daemon=True).start()
-
-
-def calculate_and_store_distance_force(city1, city2):
-    """
-    Always calculate and store the distance between city1 and city2 if not present.
-    This function does NOT call async_calculate_and_store_distance.
-    
-    Gracefully handles API unavailability and connection pool exhaustion.
-    Azure Standard_B1ms has very limited connections - if pool is full, just silently skip.
-    """
-    try:
-        api_logger.debug(
-            f"DEBUG: [FORCE] Calculating and storing distance between {city1} and {city2}"
-        )
-
-        # Ensure both cities have coordinates
-        loc1 = get_or_update_city_location(city1)
-        loc2 = get_or_update_city_location(city2)
-        
-        # Graceful degradation: if geocoding failed (returns None), just return
-        if not loc1 or not loc1.get("latitude") or not loc2 or not loc2.get("latitude"):
-            api_logger.debug(f"DEBUG: [FORCE] Could not geocode one or both cities: {city1}, {city2} - skipping distance calculation")
-            return
-
-        lat1, lon1 = loc1["latitude"], loc1["longitude"]
-        lat2, lon2 = loc2["latitude"], loc2["longitude"]
-
-        # Haversine formula
-        R = 6371
-        dlat = radians(lat2 - lat1)
-        dlon = radians(lon2 - lon1)
-        a = (sin(dlat / 2) ** 2) + cos(radians(lat1)) * cos(radians(lat2)) * (
-            sin(dlon / 2) ** 2
-        )
-        c = 2 * atan2(sqrt(a), sqrt(1 - a))
-        distance = ceil(R * c)
-
-        # Save city2 data under city1 using the safe updater
-        add_city_distance(city1, city2, distance, lat2, lon2)
-
-        api_logger.debug(
-            f"DEBUG: [FORCE] Calculated and saved distance for {city1} and {city2}: {distance} km"
-        )
-    except Exception as e:
-        error_str = str(e).lower()
-        # Check for connection pool exhaustion (Azure B1ms tier issue)
-        if "connection slots" in error_str or "connection pool" in error_str or "too many connections" in error_str:
-            # Silently skip - this is expected during heavy load on Azure B1ms
-            # The next calculation cycle will try again when connections are available
-            api_logger.debug(
-                f"DEBUG: Database connection pool exhausted - will retry {city1}<->{city2} later"
-            )
-        elif "timeout" in error_str or "timed out" in error_str:
-            # Connection timeout - likely due to load
-            api_logger.debug(
-                f"DEBUG: Database connection timeout for {city1}<->{city2} - will retry later"
-            )
-        else:
-            # Other errors - log at debug level (not warning to reduce noise)
-            api_logger.debug(f"DEBUG: [FORCE] Exception calculating distance for {city1} <-> {city2}: {str(e)[:100]}")
-
 def add_city_location(city, lat, lon):
-    # Update all records where city is city1 or city2
+    from .geo_utils import set_city_location
+    set_city_location(city, lat, lon)
+    # Keep the coordinates cached on existing distance rows consistent
     CityGeoDistance.objects.filter(city1=city).update(city1_latitude=lat, city1_longitude=lon)
     CityGeoDistance.objects.filter(city2=city).update(city2_latitude=lat, city2_longitude=lon)
-    # Or create a dummy record if none exists
-    if not CityGeoDistance.objects.filter(city1=city).exists() and not CityGeoDistance.objects.filter(city2=city).exists():
-        CityGeoDistance.objects.create(city1=city, city2="", city1_latitude=lat, city1_longitude=lon)
 
 def add_city_distance(city1, city2, distance, lat2, lon2):
     # Get city1's coordinates from geocoding or other source
@@ -1310,6 +1125,10 @@ def add_city_distance(city1, city2, distance, lat2, lon2):
     obj.distance = distance
     obj.save()
 
+    # Patch the already-stored PossibleMatches rows for this pair
+    from .matching_utils import apply_pair_distance
+    apply_pair_distance(city1, city2, distance)
+
 def is_valid_bigint_child_id(child_id):
     """
     Validate child_id as a bigint (9-digit ID)
@@ -15,11 +15,111 @@ from .audit_utils import log_api_action
 from .logger import api_logger
 from .notification_mute import MUTEABLE_WHATSAPP_NOTIFICATIONS, sanitize_muted_notifications
 from .whatsapp_utils import send_totp_login_code_whatsapp
+from .notification_templates import register_template
 import json
 import datetime
 import traceback
 
 
+# Verification-code email layout shared by the deactivation / reactivation /
+# email change / staff creation TOTP mails (compiled once — notification_templates);
+# each variant binds its colour and wording, the request only renders the code.
+TOTP_CODE_EMAIL = register_template("totp_code", """<!DOCTYPE html>
+<html dir="rtl" lang="he">
+<head>
+    <meta charset="UTF-8">
+    <meta http-equiv="Content-Type" content="text/html; charset=UTF-8">
+</head>
+<body dir="rtl" style="direction: rtl; text-align: right; font-family: Arial, sans-serif; line-height: 1.6; margin: 0; padding: 20px; background-color: #f5f5f5;">
+    <table width="100%" cellpadding="0" cellspacing="0" style="background-color: #f5f5f5;">
+        <tr>
+            <td align="right" style="padding: 0;">
+                <table width="600" cellpadding="0" cellspacing="0" style="background-color: #f9f9f9; margin: 0 auto;">
+                    <!-- HEADER -->
+                    <tr>
+                        <td style="background-color: {accent}; color: white; padding: 20px; text-align: center; font-size: 20px; font-weight: bold;">
+                            {title}
+                        </td>
+                    </tr>
+                    <!-- CONTENT -->
+                    <tr>
+                        <td style="background-color: white; padding: 30px;">
+                            <p dir="rtl" style="text-align: right; margin: 15px 0;">{greeting}</p>
+                            
+                            {intro}
+                            
+                            <hr style="border: none; border-top: 1px solid #ddd; margin: 20px 0;">
+                            
+                            <p dir="rtl" style="text-align: right; margin: 15px 0;">קוד האימות שלך הוא:</p>
+                            
+                            <table width="100%" cellpadding="0" cellspacing="0" style="margin: 20px 0;">
+                                <tr>
+                                    <td style="text-align: center; padding: 20px; background-color: #f0f0f0; border: 2px solid {accent}; border-radius: 8px;">
+                                        <span style="font-size: 32px; font-weight: bold; color: {accent}; letter-spacing: 8px; direction: ltr; unicode-bidi: embed;">{code}</span>
+                                    </td>
+                                </tr>
+                            </table>
+                            
+                            <hr style="border: none; border-top: 1px solid #ddd; margin: 20px 0;">
+                            
+                            {expiry}
+                            
+                            {closing}
+                        </td>
+                    </tr>
+                    <!-- FOOTER -->
+                    <tr>
+                        <td style="background-color: #f0f0f0; padding: 15px; text-align: center; font-size: 12px; color: #666;">
+                            <p dir="rtl" style="text-align: center; margin: 0;">בברכה,</p>
+                            <p dir="rtl" style="text-align: center; margin: 0;">צוות חיוך של ילד</p>
+                        </td>
+                    </tr>
+                </table>
+            </td>
+        </tr>
+    </table>
+</body>
+</html>""")
+_TOTP_WARNING = '<p dir="rtl" style="text-align: right; margin: 15px 0;"><strong>⚠️ אם לא ביקשת זאת, אנא צור קשר עם מנהלי המערכת בדחיפות!</strong></p>'
+DEACTIVATION_CODE_EMAIL = TOTP_CODE_EMAIL.bind(
+    accent="#d32f2f",
+    title="אישור כיבוי חשבון",
+    greeting="שלום,",
+    intro='<p dir="rtl" style="text-align: right; margin: 15px 0; color: #d32f2f; font-weight: bold;">בקשה לכיבוי חשבון במערכת חיוך של ילד.</p>',
+    expiry='<p dir="rtl" style="text-align: right; margin: 15px 0; color: #d32f2f;">⏱ הקוד יפוג תוקף בעוד 5 דקות.</p>',
+    closing=_TOTP_WARNING,
+)
+_REACTIVATION_CODE = dict(
+    accent="#28a745",
+    title="אישור הפעלה של חשבון",
+    greeting="שלום,",
+    expiry='<p dir="rtl" style="text-align: right; margin: 15px 0;">⏱ הקוד יפוג תוקף בעוד 5 דקות.</p>',
+    closing=_TOTP_WARNING,
+)
+REACTIVATION_CODE_EMAIL = TOTP_CODE_EMAIL.bind(
+    intro='<p dir="rtl" style="text-align: right; margin: 15px 0;">בקשה להפעלה של חשבון במערכת חיוך של ילד.</p>',
+    **_REACTIVATION_CODE,
+)
+REACTIVATION_EMAIL_CHANGE_CODE_EMAIL = TOTP_CODE_EMAIL.bind(
+    intro='<p dir="rtl" style="text-align: right; margin: 15px 0;">בקשה להפעלה של חשבון במערכת חיוך של ילדושינוי כתובת מייל.</p>',
+    **_REACTIVATION_CODE,
+)
+EMAIL_CHANGE_CODE_EMAIL = TOTP_CODE_EMAIL.bind(
+    accent="#2196F3",
+    title="אימות שינוי כתובת מייל",
+    intro='<p dir="rtl" style="text-align: right; margin: 15px 0;">מייל זה נשלח לשם אימות שינוי כתובת המייל שלך במערכת חיוך של ילד.</p>',
+    expiry='<p dir="rtl" style="text-align: right; margin: 15px 0;">⏱ קוד זה יפוג תוך 5 דקות.</p>',
+    closing='<p dir="rtl" style="text-align: right; margin: 15px 0;">אנא הזן את הקוד במערכת כדי לאמת ולהשלים את שינוי כתובת המייל.</p>',
+)
+STAFF_CREATION_CODE_EMAIL = TOTP_CODE_EMAIL.bind(
+    accent="#2196F3",
+    title="קוד אימות יצירת חשבון",
+    intro='<p dir="rtl" style="text-align: right; margin: 15px 0;">מנהל מערכת יוצר לך חשבון סגל.</p>',
+    expiry='<p dir="rtl" style="text-align: right; margin: 15px 0;">⏱ הקוד יפוג בעוד 5 דקות.</p>',
+    closing='<p dir="rtl" style="text-align: right; margin: 15px 0;">אנא מסור קוד זה למנהל המערכת כדי להשלים את יצירת החשבון.</p>',
+)
+
+
 @conditional_csrf
 @api_view(["PUT"])
 @block_viewer_writes
@@ -225,62 +325,7 @@ def update_staff_member(request, staff_id):
                     # print(f"[DEACTIVATION DEBUG] Verification code for {staff_member.email}: {code}")
                     
                     subject = "אישור כיבוי חשבון - חיוך של ילד"
-                    html_message = f"""<!DOCTYPE html>
-<html dir="rtl" lang="he">
-<head>
-    <meta charset="UTF-8">
-    <meta http-equiv="Content-Type" content="text/html; charset=UTF-8">
-</head>
-<body dir="rtl" style="direction: rtl; text-align: right; font-family: Arial, sans-serif; line-height: 1.6; margin: 0; padding: 20px; background-color: #f5f5f5;">
-    <table width="100%" cellpadding="0" cellspacing="0" style="background-color: #f5f5f5;">
-        <tr>
-            <td align="right" style="padding: 0;">
-                <table width="600" cellpadding="0" cellspacing="0" style="background-color: #f9f9f9; margin: 0 auto;">
-                    <!-- HEADER -->
-                    <tr>
-                        <td style="background-color: #d32f2f; color: white; padding: 20px; text-align: center; font-size: 20px; font-weight: bold;">
-                            אישור כיבוי חשבון
-                        </td>
-                    </tr>
-                    <!-- CONTENT -->
-                    <tr>
-                        <td style="background-color: white; padding: 30px;">
-                            <p dir="rtl" style="text-align: right; margin: 15px 0;">שלום,</p>
-                            
-                            <p dir="rtl" style="text-align: right; margin: 15px 0; color: #d32f2f; font-weight: bold;">בקשה לכיבוי חשבון במערכת חיוך של ילד.</p>
-                            
-                            <hr style="border: none; border-top: 1px solid #ddd; margin: 20px 0;">
-                            
-                            <p dir="rtl" style="text-align: right; margin: 15px 0;">קוד האימות שלך הוא:</p>
-                            
-                            <table width="100%" cellpadding="0" cellspacing="0" style="margin: 20px 0;">
-                                <tr>
-                                    <td style="text-align: center; padding: 20px; background-color: #f0f0f0; border: 2px solid #d32f2f; border-radius: 8px;">
-                                        <span style="font-size: 32px; font-weight: bold; color: #d32f2f; letter-spacing: 8px; direction: ltr; unicode-bidi: embed;">{code}</span>
-                                    </td>
-                                </tr>
-                            </table>
-                            
-                            <hr style="border: none; border-top: 1px solid #ddd; margin: 20px 0;">
-                            
-                            <p dir="rtl" style="text-align: right; margin: 15px 0; color: #d32f2f;">⏱ הקוד יפוג תוקף בעוד 5 דקות.</p>
-                            
-                            <p dir="rtl" style="text-align: right; margin: 15px 0;"><strong>⚠️ אם לא ביקשת זאת, אנא צור קשר עם מנהלי המערכת בדחיפות!</strong></p>
-                        </td>
-                    </tr>
-                    <!-- FOOTER -->
-                    <tr>
-                        <td style="background-color: #f0f0f0; padding: 15px; text-align: center; font-size: 12px; color: #666;">
-                            <p dir="rtl" style="text-align: center; margin: 0;">בברכה,</p>
-                            <p dir="rtl" style="text-align: center; margin: 0;">צוות חיוך של ילד</p>
-                        </td>
-                    </tr>
-                </table>
-            </td>
-        </tr>
-    </table>
-</body>
-</html>"""
+                    html_message = DEACTIVATION_CODE_EMAIL.render(code=code)
                     
                     try:
                         send_mail(subject, f"קוד האימות שלך: {code}", settings.DEFAULT_FROM_EMAIL, [staff_member.email], html_message=html_message)
@@ -459,62 +504,7 @@ def update_staff_member(request, staff_id):
                 if new_email:
                     subject = "אישור הפעלה של חשבון ושינוי מייל - חיוך של ילד"
                 
-                html_message = f"""<!DOCTYPE html>
-<html dir="rtl" lang="he">
-<head>
-    <meta charset="UTF-8">
-    <meta http-equiv="Content-Type" content="text/html; charset=UTF-8">
-</head>
-<body dir="rtl" style="direction: rtl; text-align: right; font-family: Arial, sans-serif; line-height: 1.6; margin: 0; padding: 20px; background-color: #f5f5f5;">
-    <table width="100%" cellpadding="0" cellspacing="0" style="background-color: #f5f5f5;">
-        <tr>
-            <td align="right" style="padding: 0;">
-                <table width="600" cellpadding="0" cellspacing="0" style="background-color: #f9f9f9; margin: 0 auto;">
-                    <!-- HEADER -->
-                    <tr>
-                        <td style="background-color: #28a745; color: white; padding: 20px; text-align: center; font-size: 20px; font-weight: bold;">
-                            אישור הפעלה של חשבון
-                        </td>
-                    </tr>
-                    <!-- CONTENT -->
-                    <tr>
-                        <td style="background-color: white; padding: 30px;">
-                            <p dir="rtl" style="text-align: right; margin: 15px 0;">שלום,</p>
-                            
-                            <p dir="rtl" style="text-align: right; margin: 15px 0;">בקשה להפעלה של חשבון במערכת חיוך של ילד{'ושינוי כתובת מייל' if new_email else ''}.</p>
-                            
-                            <hr style="border: none; border-top: 1px solid #ddd; margin: 20px 0;">
-                            
-                            <p dir="rtl" style="text-align: right; margin: 15px 0;">קוד האימות שלך הוא:</p>
-                            
-                            <table width="100%" cellpadding="0" cellspacing="0" style="margin: 20px 0;">
-                                <tr>
-                                    <td style="text-align: center; padding: 20px; background-color: #f0f0f0; border: 2px solid #28a745; border-radius: 8px;">
-                                        <span style="font-size: 32px; font-weight: bold; color: #28a745; letter-spacing: 8px; direction: ltr; unicode-bidi: embed;">{code}</span>
-                                    </td>
-                                </tr>
-                            </table>
-                            
-                            <hr style="border: none; border-top: 1px solid #ddd; margin: 20px 0;">
-                            
-                            <p dir="rtl" style="text-align: right; margin: 15px 0;">⏱ הקוד יפוג תוקף בעוד 5 דקות.</p>
-                            
-                            <p dir="rtl" style="text-align: right; margin: 15px 0;"><strong>⚠️ אם לא ביקשת זאת, אנא צור קשר עם מנהלי המערכת בדחיפות!</strong></p>
-                        </td>
-                    </tr>
-                    <!-- FOOTER -->
-                    <tr>
-                        <td style="background-color: #f0f0f0; padding: 15px; text-align: center; font-size: 12px; color: #666;">
-                            <p dir="rtl" style="text-align: center; margin: 0;">בברכה,</p>
-                            <p dir="rtl" style="text-align: center; margin: 0;">צוות חיוך של ילד</p>
-                        </td>
-                    </tr>
-                </table>
-            </td>
-        </tr>
-    </table>
-</body>
-</html>"""
+                html_message = (REACTIVATION_EMAIL_CHANGE_CODE_EMAIL if new_email else REACTIVATION_CODE_EMAIL).render(code=code)
                 
                 try:
                     send_mail(subject, f"קוד האימות שלך: {code}", settings.DEFAULT_FROM_EMAIL, [email_for_totp], html_message=html_message)
@@ -771,62 +761,10 @@ def update_staff_member(request, staff_id):
                 TOTPCode.objects.create(email=new_email, code=code)
                 
                 subject = "אימות שינוי כתובת מייל - חיוך של ילד"
-                html_message = f"""<!DOCTYPE html>
-<html dir="rtl" lang="he">
-<head>
-    <meta charset="UTF-8">
-    <meta http-equiv="Content-Type" content="text/html; charset=UTF-8">
-</head>
-<body dir="rtl" style="direction: rtl; text-align: right; font-family: Arial, sans-serif; line-height: 1.6; margin: 0; padding: 20px; background-color: #f5f5f5;">
-    <table width="100%" cellpadding="0" cellspacing="0" style="background-color: #f5f5f5;">
-        <tr>
-            <td align="right" style="padding: 0;">
-                <table width="600" cellpadding="0" cellspacing="0" style="background-color: #f9f9f9; margin: 0 auto;">
-                    <!-- HEADER -->
-                    <tr>
-                        <td style="background-color: #2196F3; color: white; padding: 20px; text-align: center; font-size: 20px; font-weight: bold;">
-                            אימות שינוי כתובת מייל
-                        </td>
-                    </tr>
-                    <!-- CONTENT -->
-                    <tr>
-                        <td style="background-color: white; padding: 30px;">
-                            <p dir="rtl" style="text-align: right; margin: 15px 0;">שלום {data.get('first_name', staff_member.first_name)},</p>
-                            
-                            <p dir="rtl" style="text-align: right; margin: 15px 0;">מייל זה נשלח לשם אימות שינוי כתובת המייל שלך במערכת חיוך של ילד.</p>
-                            
-                            <hr style="border: none; border-top: 1px solid #ddd; margin: 20px 0;">
-                            
-                            <p dir="rtl" style="text-align: right; margin: 15px 0;">קוד האימות שלך הוא:</p>
-                            
-                            <table width="100%" cellpadding="0" cellspacing="0" style="margin: 20px 0;">
-                                <tr>
-                                    <td style="text-align: center; padding: 20px; background-color: #f0f0f0; border: 2px solid #2196F3; border-radius: 8px;">
-                                        <span style="font-size: 32px; font-weight: bold; color: #2196F3; letter-spacing: 8px; direction: ltr; unicode-bidi: embed;">{code}</span>
-                                    </td>
-                                </tr>
-                            </table>
-                            
-                            <hr style="border: none; border-top: 1px solid #ddd; margin: 20px 0;">
-                            
-                            <p dir="rtl" style="text-align: right; margin: 15px 0;">⏱ קוד זה יפוג תוך 5 דקות.</p>
-                            
-                            <p dir="rtl" style="text-align: right; margin: 15px 0;">אנא הזן את הקוד במערכת כדי לאמת ולהשלים את שינוי כתובת המייל.</p>
-                        </td>
-                    </tr>
-                    <!-- FOOTER -->
-                    <tr>
-                        <td style="background-color: #f0f0f0; padding: 15px; text-align: center; font-size: 12px; color: #666;">
-                            <p dir="rtl" style="text-align: center; margin: 0;">בברכה,</p>
-                            <p dir="rtl" style="text-align: center; margin: 0;">צוות חיוך של ילד</p>
-                        </td>
-                    </tr>
-                </table>
-            </td>
-        </tr>
-    </table>
-</body>
-</html>"""
+                html_message = EMAIL_CHANGE_CODE_EMAIL.render(
+                    greeting=f"שלום {data.get('first_name', staff_member.first_name)},",
+                    code=code,
+                )
                 message = f"""
                 שלום {data.get('first_name', staff_member.first_name)},
                 
@@ -2038,62 +1976,7 @@ def staff_creation_send_totp(request):
         TOTPCode.objects.create(email=email, code=code)
 
         subject = "אימות יצירת חשבון סגל - חיוך של ילד"
-        html_message = f"""<!DOCTYPE html>
-<html dir="rtl" lang="he">
-<head>
-    <meta charset="UTF-8">
-    <meta http-equiv="Content-Type" content="text/html; charset=UTF-8">
-</head>
-<body dir="rtl" style="direction: rtl; text-align: right; font-family: Arial, sans-serif; line-height: 1.6; margin: 0; padding: 20px; background-color: #f5f5f5;">
-    <table width="100%" cellpadding="0" cellspacing="0" style="background-color: #f5f5f5;">
-        <tr>
-            <td align="right" style="padding: 0;">
-                <table width="600" cellpadding="0" cellspacing="0" style="background-color: #f9f9f9; margin: 0 auto;">
-                    <!-- HEADER -->
-                    <tr>
-                        <td style="background-color: #2196F3; color: white; padding: 20px; text-align: center; font-size: 20px; font-weight: bold;">
-                            קוד אימות יצירת חשבון
-                        </td>
-                    </tr>
-                    <!-- CONTENT -->
-                    <tr>
-                        <td style="background-color: white; padding: 30px;">
-                            <p dir="rtl" style="text-align: right; margin: 15px 0;">שלום {first_name},</p>
-                            
-                            <p dir="rtl" style="text-align: right; margin: 15px 0;">מנהל מערכת יוצר לך חשבון סגל.</p>
-                            
-                            <hr style="border: none; border-top: 1px solid #ddd; margin: 20px 0;">
-                            
-                            <p dir="rtl" style="text-align: right; margin: 15px 0;">קוד האימות שלך הוא:</p>
-                            
-                            <table width="100%" cellpadding="0" cellspacing="0" style="margin: 20px 0;">
-                                <tr>
-                                    <td style="text-align: center; padding: 20px; background-color: #f0f0f0; border: 2px solid #2196F3; border-radius: 8px;">
-                                        <span style="font-size: 32px; font-weight: bold; color: #2196F3; letter-spacing: 8px; direction: ltr; unicode-bidi: embed;">{code}</span>
-                                    </td>
-                                </tr>
-                            </table>
-                            
-                            <hr style="border: none; border-top: 1px solid #ddd; margin: 20px 0;">
-                            
-                            <p dir="rtl" style="text-align: right; margin: 15px 0;">⏱ הקוד יפוג בעוד 5 דקות.</p>
-                            
-                            <p dir="rtl" style="text-align: right; margin: 15px 0;">אנא מסור קוד זה למנהל המערכת כדי להשלים את יצירת החשבון.</p>
-                        </td>
-                    </tr>
-                    <!-- FOOTER -->
-                    <tr>
-                        <td style="background-color: #f0f0f0; padding: 15px; text-align: center; font-size: 12px; color: #666;">
-                            <p dir="rtl" style="text-align: center; margin: 0;">בברכה,</p>
-                            <p dir="rtl" style="text-align: center; margin: 0;">צוות חיוך של ילד</p>
-                        </td>
-                    </tr>
-                </table>
-            </td>
-        </tr>
-    </table>
-</body>
-</html>"""
+        html_message = STAFF_CREATION_CODE_EMAIL.render(greeting=f"שלום {first_name},", code=code)
         message = f"""
         שלום {first_name},
 
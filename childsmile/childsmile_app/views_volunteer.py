@@ -5,8 +5,6 @@ import os
 import base64
 import pandas as pd
 from io import BytesIO
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment
 
 from django.http import JsonResponse, FileResponse
 from django.views.decorators.csrf import csrf_exempt
@@ -28,7 +26,8 @@ from .models import (
 )
 from .utils import *
 from .coordinator_utils import create_tasks_for_admins_async
-from .audit_utils import log_api_action
+from .audit_utils import log_api_action, capture_audit_event
+from .import_jobs import submit_import_job, import_job_status
 from .logger import api_logger
 import json
 import datetime
@@ -1054,7 +1053,7 @@ def update_volunteer_id(request, old_id):
                 affected_tables.append('childsmile_app_tutorships')
             
             # 3. Update Tasks related_tutor FK (references Tutors) - MUST be before Tutors update
-            tasks_updated = Tasks.objects.filter(related_tutor_id=old_id).update(related_tutor_id=new_id)
+            tasks_updated = Tasks.objects.filter(related_tutor_id=old_id).update(related_tutor_id=new_id, updated_at=now())
             if tasks_updated:
                 affected_tables.append('childsmile_app_tasks')
             
@@ -1633,9 +1632,10 @@ def import_volunteers_endpoint(request):
         
         dry_run = request.data.get('dry_run', 'false').lower() == 'true'
         
-        # Read Excel file
+        # Read Excel file (only to reject unreadable / empty files up front — the job re-reads it)
+        upload = file.read()
         try:
-            df = pd.read_excel(file, dtype=str)
+            df = pd.read_excel(BytesIO(upload), dtype=str)
         except Exception as e:
             api_logger.error(f"Failed to read Excel file: {str(e)}")
             return JsonResponse(
@@ -1649,9 +1649,9 @@ def import_volunteers_endpoint(request):
                 status=400
             )
         
-        # Get required roles
+        # Required roles (checked here so a missing role is reported before the job is queued)
         try:
-            general_volunteer_role = Role.objects.get(role_name="General Volunteer")
+            Role.objects.get(role_name="General Volunteer")
         except Role.DoesNotExist:
             return JsonResponse(
                 {'error': 'Role "General Volunteer" not found in database'},
@@ -1659,480 +1659,25 @@ def import_volunteers_endpoint(request):
             )
         
         try:
-            tutor_role = Role.objects.get(role_name="Tutor")
+            Role.objects.get(role_name="Tutor")
         except Role.DoesNotExist:
             return JsonResponse(
                 {'error': 'Role "Tutor" not found in database'},
                 status=500
             )
         
-        # Process records
-        total_records = len(df)
-        success_count = 0
-        error_count = 0
-        skipped_count = 0
-        general_volunteer_count = 0
-        tutor_with_tutee_count = 0
-        tutor_no_tutee_count = 0
-        pending_tutor_count = 0
-        
-        results = []
-        
-        for idx, row in df.iterrows():
-            row_num = idx + 2
-            # get_clean_string inline for names
-            first_name_raw = row.get('שם פרטי', '')
-            first_name = '' if (first_name_raw is None or pd.isna(first_name_raw) or str(first_name_raw).lower() == 'nan') else str(first_name_raw).strip()
-            
-            surname_raw = row.get('שם משפחה', '')
-            surname = '' if (surname_raw is None or pd.isna(surname_raw) or str(surname_raw).lower() == 'nan') else str(surname_raw).strip()
-            
-            result = {
-                'row_num': row_num,
-                'first_name': first_name,
-                'surname': surname,
-                'email': '',
-                'status': '',
-                'record_type': '',
-                'details': ''
-            }
-            
-            try:
-                # Parse data - INLINE, NO HELPER METHODS
-                # get_clean_string inline
-                id_number_raw = row.get('תעודת זהות', '')
-                id_number = '' if (id_number_raw is None or pd.isna(id_number_raw) or str(id_number_raw).lower() == 'nan') else str(id_number_raw).strip()
-                
-                phone_raw = row.get('מספר טלפון', '')
-                phone = '' if (phone_raw is None or pd.isna(phone_raw) or str(phone_raw).lower() == 'nan') else str(phone_raw).strip()
-                
-                # Format phone number - ensure leading zero and remove dashes/spaces
-                if phone:
-                    phone_normalized = phone.replace('-', '').replace(' ', '').strip()
-                    # If doesn't start with 0, add it
-                    if phone_normalized and not phone_normalized.startswith('0'):
-                        phone_normalized = '0' + phone_normalized
-                    # Validate it's 10 digits
-                    if phone_normalized.isdigit() and len(phone_normalized) == 10:
-                        phone = f"{phone_normalized[:3]}-{phone_normalized[3:]}"  # Format as XXX-XXXXXXX
-                    else:
-                        phone = ''  # Invalid phone, set to empty
-                else:
-                    phone = ''
-                
-                # clean_email inline
-                email_raw = row.get('מייל')
-                if email_raw and not pd.isna(email_raw):
-                    email = str(email_raw).strip().replace('\n', '').replace('\r', '')
-                    if not email or email.lower() == 'nan':
-                        email = None
-                else:
-                    email = None
-                
-                # clean_city inline
-                city_raw = row.get('עיר מגורים', '')
-                city_val = '' if (city_raw is None or pd.isna(city_raw) or str(city_raw).lower() == 'nan') else str(city_raw).strip()
-                city_mapping = {
-                    'תל אביב': 'תל אביב - יפו',
-                    'מודיעין': 'מודיעין-מכבים-רעות',
-                    'מודעין': 'מודיעין-מכבים-רעות',
-                    'פתח תקוה': 'פתח תקווה',
-                    'קריית אתא': 'קרית אתא',
-                    'קריית נטפים': 'קרית נטפים',
-                    'יהוד מונוסון': 'יהוד-מונוסון',
-                    'קיבוץ חפץ חיים': 'חפץ חיים',
-                    'מושב בני ראם': 'בני ראם',
-                    'מושב חמד': 'חמד',
-                    'מושב פורת': 'פורת',
-                    'יד רמב״ם (מושב)': 'יד רמבם',
-                    'יישוב נופים': 'נופים',
-                    'מגד אל כרום': 'מג\'ד אל-כרום',
-                    'גבעת שמואל אבל עושה שירות': 'גבעת שמואל',
-                    'מושה טפחות': 'טפחות',
-                    'עלי זהב לומד בשדרות': 'עלי זהב',
-                    'ירושלים- תא': 'ירושלים',
-                    'ראשל״צ': 'ראשון לציון',
-                    'הדר גנים': 'גנות הדר',
-                    'רעננה(מגדל עוז)': 'רעננה',
-                }
-                city = city_val.replace('\n', ' ').replace('\r', '').strip() if city_val else ''
-                for separator in ['/', ',']:
-                    if separator in city:
-                        city = city.split(separator)[0].strip()
-                if city in city_mapping:
-                    city = city_mapping[city]
-                else:
-                    for key, value in city_mapping.items():
-                        if key in city:
-                            city = value
-                            break
-                
-                # parse_birth_date inline
-                date_val = row.get('תאריך לידה', '')
-                if not date_val or pd.isna(date_val) or str(date_val).lower() == 'nan':
-                    birth_date = None
-                else:
-                    try:
-                        from datetime import datetime as dt
-                        if isinstance(date_val, dt):
-                            birth_date = date_val.date()
-                        else:
-                            date_str = str(date_val).strip()
-                            birth_date = None
-                            for fmt in ['%Y-%m-%d %H:%M:%S', '%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y', '%d.%m.%Y', '%m/%d/%Y', '%m-%d-%Y', '%m.%d.%Y']:
-                                try:
-                                    parsed_date = dt.strptime(date_str, fmt).date()
-                                    today = dt.now().date()
-                                    age_check = today.year - parsed_date.year
-                                    if (today.month, today.day) < (parsed_date.month, parsed_date.day):
-                                        age_check -= 1
-                                    if 13 <= age_check <= 120:
-                                        birth_date = parsed_date
-                                        break
-                                except ValueError:
-                                    continue
-                    except Exception:
-                        birth_date = None
-                
-                # calculate_age_from_birth_date inline
-                if birth_date:
-                    from datetime import datetime as dt
-                    today = dt.now().date()
-                    calculated_age = today.year - birth_date.year
-                    if (today.month, today.day) < (birth_date.month, birth_date.day):
-                        calculated_age -= 1
-                    calculated_age = max(0, calculated_age)
-                else:
-                    calculated_age = 0
-                
-                # parse_gender inline
-                gender_val = row.get('מין', '')
-                if isinstance(gender_val, bool):
-                    gender = gender_val
-                elif isinstance(gender_val, str):
-                    gender_lower = gender_val.lower().strip()
-                    gender = gender_lower in ['true', 'נקבה', 'female', 'f', '1']
-                else:
-                    gender = False
-                
-                # parse_want_tutor inline
-                want_tutor_val = row.get('סוג התנדבות', '')
-                if isinstance(want_tutor_val, bool):
-                    want_tutor = want_tutor_val
-                elif isinstance(want_tutor_val, str):
-                    val_lower = want_tutor_val.lower().strip()
-                    want_tutor = val_lower in ['true', 'כן', 'yes', '1']
-                else:
-                    want_tutor = False
-                
-                # parse_status inline
-                status_raw = row.get('סטטוס', '')
-                if not status_raw or pd.isna(status_raw) or str(status_raw).lower() == 'nan':
-                    status_val = None
-                else:
-                    status_val = str(status_raw).strip()
-                
-                # get_clean_string inline for comments
-                volunteer_comment_raw = row.get('הערות המתנדב', '')
-                volunteer_comment = '' if (volunteer_comment_raw is None or pd.isna(volunteer_comment_raw) or str(volunteer_comment_raw).lower() == 'nan') else str(volunteer_comment_raw).strip()
-                
-                coordinator_comment_raw = row.get('הערות הרכז', '')
-                coordinator_comment = '' if (coordinator_comment_raw is None or pd.isna(coordinator_comment_raw) or str(coordinator_comment_raw).lower() == 'nan') else str(coordinator_comment_raw).strip()
-                
-                # Validate city exists in settlements table if provided
-                if city:
-                    if not SettlementsStreets.objects.filter(city_name=city).exists():
-                        result['status'] = 'Error'
-                        result['details'] = f'עיר לא קיימת במערכת: {city}'
-                        error_count += 1
-                        results.append(result)
-                        continue
-                
-                result['email'] = email or ''
-                
-                # Build comments
-                signedup_comment_parts = []
-                tutor_preferences = None
-                
-                if want_tutor:
-                    if volunteer_comment:
-                        tutor_preferences = volunteer_comment
-                    if coordinator_comment:
-                        signedup_comment_parts.append(f"הערות רכז: {coordinator_comment}")
-                else:
-                    if volunteer_comment:
-                        signedup_comment_parts.append(f"הערות מתנדב: {volunteer_comment}")
-                    if coordinator_comment:
-                        signedup_comment_parts.append(f"הערות רכז: {coordinator_comment}")
-                
-                signedup_comment = ' | '.join(signedup_comment_parts) if signedup_comment_parts else None
-                
-                # Validate
-                if not first_name or not surname:
-                    result['status'] = 'Error'
-                    result['details'] = 'חסר שם פרטי או שם משפחה'
-                    error_count += 1
-                    results.append(result)
-                    continue
-                
-                if not id_number:
-                    result['status'] = 'Error'
-                    result['details'] = 'חסרה תעודת זהות'
-                    error_count += 1
-                    results.append(result)
-                    continue
-                
-                try:
-                    id_int = int(id_number)
-                except ValueError:
-                    result['status'] = 'Error'
-                    result['details'] = f'תעודת זהות לא מספרית: {id_number}'
-                    error_count += 1
-                    results.append(result)
-                    continue
-                
-                # Check duplicates
-                if SignedUp.objects.filter(id=id_int).exists():
-                    result['status'] = 'Skipped'
-                    result['details'] = f'ת.ז. כבר קיימת במערכת'
-                    skipped_count += 1
-                    results.append(result)
-                    continue
-                
-                if email and Staff.objects.filter(email__iexact=email).exists():
-                    result['status'] = 'Skipped'
-                    result['details'] = f'מייל כבר קיים במערכת'
-                    skipped_count += 1
-                    results.append(result)
-                    continue
-                
-                # Determine record type
-                if want_tutor:
-                    if status_val == "יש חניך":
-                        record_type = "חונך - יש חניך"
-                    elif status_val == "אין חניך":
-                        record_type = "חונך - אין חניך"
-                    else:
-                        record_type = f"חונך ממתין - {status_val or 'ללא סטטוס'}"
-                else:
-                    record_type = "מתנדב כללי"
-                
-                result['record_type'] = record_type
-                
-                if dry_run:
-                    result['status'] = 'OK'
-                    result['details'] = f'בדיקה בלבד: {record_type}'
-                    success_count += 1
-                    results.append(result)
-                    continue
-                
-                # === CREATE RECORDS ===
-                with transaction.atomic():
-                    # 1. Create SignedUp
-                    signedup = SignedUp.objects.create(
-                        id=id_int,
-                        first_name=first_name,
-                        surname=surname,
-                        age=calculated_age,
-                        birth_date=birth_date,
-                        gender=gender,
-                        phone=phone,
-                        city=city,
-                        comment=signedup_comment,
-                        email=email,
-                        want_tutor=want_tutor,
-                    )
-                    
-                    # 2. Create Staff with unique username
-                    username = f"{first_name}_{surname}"
-                    index = 1
-                    original_username = username
-                    while Staff.objects.filter(username=username).exists():
-                        username = f"{original_username}_{index}"
-                        index += 1
-                    
-                    staff = Staff.objects.create(
-                        username=username,
-                        email=email,
-                        first_name=first_name,
-                        last_name=surname,
-                        created_at=now(),
-                        registration_approved=True,
-                        is_active=True,
-                        deactivation_reason="suspended"
-                    )
-                    
-                    # 3. Create role-specific record
-                    if want_tutor:
-                        staff.roles.add(tutor_role)
-                        
-                        if status_val == "יש חניך":
-                            Tutors.objects.create(
-                                id_id=signedup.id,
-                                staff=staff,
-                                tutorship_status="יש_חניך",
-                                tutor_email=email,
-                                preferences=tutor_preferences,
-                                is_t_imported=True,
-                            )
-                            tutor_with_tutee_count += 1
-                        elif status_val == "אין חניך":
-                            Tutors.objects.create(
-                                id_id=signedup.id,
-                                staff=staff,
-                                tutorship_status="אין_חניך",
-                                tutor_email=email,
-                                preferences=tutor_preferences,
-                                is_t_imported=True,
-                            )
-                            tutor_no_tutee_count += 1
-                        else:
-                            Tutors.objects.create(
-                                id_id=signedup.id,
-                                staff=staff,
-                                tutorship_status="אין_חניך",
-                                tutor_email=email,
-                                preferences=tutor_preferences,
-                                is_t_imported=True,
-                            )
-                            Pending_Tutor.objects.create(
-                                id_id=signedup.id,
-                                pending_status="ממתין",
-                            )
-                            pending_tutor_count += 1
-                    else:
-                        staff.roles.add(general_volunteer_role)
-                        General_Volunteer.objects.create(
-                            id_id=signedup.id,
-                            staff_id=staff.staff_id,
-                            signupdate=now().date(),
-                            comments=signedup_comment,
-                        )
-                        general_volunteer_count += 1
-                
-                result['status'] = 'OK'
-                result['details'] = f'נוצר בהצלחה: {record_type}'
-                success_count += 1
-                results.append(result)
-                
-            except IntegrityError as e:
-                result['status'] = 'Error'
-                result['details'] = f'שגיאת מסד נתונים: {str(e)}'
-                error_count += 1
-                results.append(result)
-            except Exception as e:
-                result['status'] = 'Error'
-                result['details'] = f'שגיאה כללית: {str(e)}'
-                error_count += 1
-                results.append(result)
-        
-        # Create result Excel file - INLINE, NO HELPER METHODS
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "תוצאות ייבוא"
-        
-        headers = ['שורה', 'שם פרטי', 'שם משפחה', 'מייל', 'סטטוס ייבוא', 'סוג רשומה', 'פרטים']
-        header_fill = PatternFill(start_color='4472C4', end_color='4472C4', fill_type='solid')
-        header_font = Font(color='FFFFFF', bold=True)
-        ok_fill = PatternFill(start_color='C6EFCE', end_color='C6EFCE', fill_type='solid')
-        error_fill = PatternFill(start_color='FFC7CE', end_color='FFC7CE', fill_type='solid')
-        warning_fill = PatternFill(start_color='FFEB9C', end_color='FFEB9C', fill_type='solid')
-        
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal='center')
-        
-        for row_idx, result in enumerate(results, 2):
-            ws.cell(row=row_idx, column=1, value=result.get('row_num', ''))
-            ws.cell(row=row_idx, column=2, value=result['first_name'])
-            ws.cell(row=row_idx, column=3, value=result['surname'])
-            ws.cell(row=row_idx, column=4, value=result.get('email', ''))
-            
-            status_cell = ws.cell(row=row_idx, column=5, value=result['status'])
-            if result['status'] == 'OK':
-                status_cell.fill = ok_fill
-            elif result['status'] == 'Error':
-                status_cell.fill = error_fill
-            elif result['status'] == 'Warning':
-                status_cell.fill = warning_fill
-            
-            ws.cell(row=row_idx, column=6, value=result.get('record_type', ''))
-            ws.cell(row=row_idx, column=7, value=result.get('details', ''))
-        
-        ws.column_dimensions['A'].width = 8
-        ws.column_dimensions['B'].width = 15
-        ws.column_dimensions['C'].width = 15
-        ws.column_dimensions['D'].width = 30
-        ws.column_dimensions['E'].width = 12
-        ws.column_dimensions['F'].width = 20
-        ws.column_dimensions['G'].width = 60
-        ws.sheet_view.rightToLeft = True
-        
-        result_excel = BytesIO()
-        wb.save(result_excel)
-        result_excel.seek(0)
-        
-        # Log the import action
-        # Log ALL imports (dry-run or live) as long as there are records processed
-        if total_records > 0:
-            log_api_action(
-                request=request,
-                action='CREATE_VOLUNTEER_SUCCESS',  # Always use SUCCESS for imports (both dry-run and live)
-                affected_tables=['childsmile_app_signedup', 'childsmile_app_staff', 'childsmile_app_general_volunteer', 'childsmile_app_tutors', 'childsmile_app_pending_tutor'],
-                entity_type='Bulk Import',
-                success=True,  # Both dry-run and live imports are successful operations
-                additional_data={
-                    'total_records': total_records,
-                    'success_count': success_count,
-                    'error_count': error_count,
-                    'skipped_count': skipped_count,
-                    'dry_run': dry_run,
-                    'breakdown': {
-                        'general_volunteer': general_volunteer_count,
-                        'tutor_with_tutee': tutor_with_tutee_count,
-                        'tutor_no_tutee': tutor_no_tutee_count,
-                        'pending_tutor': pending_tutor_count,
-                    },
-                    'is_bulk_import': True
-                }
-            )
-        
-        # Return results
-        response_data = {
-            'total': total_records,
-            'success': success_count,
-            'skipped': skipped_count,
-            'error': error_count,
-            'dry_run': dry_run,
-            'breakdown': {
-                'general_volunteer': general_volunteer_count,
-                'tutor_with_tutee': tutor_with_tutee_count,
-                'tutor_no_tutee': tutor_no_tutee_count,
-                'pending_tutor': pending_tutor_count,
-            },
-            'message': f'✅ ייבוא הושלם: {success_count} מתוך {total_records} הרשומות יובאו בהצלחה' if success_count > 0 else '❌ לא הצליח לייבא רשומות',
-            'has_errors': error_count > 0 or skipped_count > 0,
-            'result_file_available': True
-        }
-        
-        # If dry_run, return Excel file for preview
-        if dry_run:
-            response = FileResponse(result_excel, content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-            from datetime import datetime as dt
-            response['Content-Disposition'] = f'attachment; filename="import_preview_{dt.now().strftime("%Y%m%d_%H%M%S")}.xlsx"'
-            return response
-        
-        # For regular import, return JSON with Excel file bytes embedded as base64
-        # This allows frontend to download the results file
-        result_excel.seek(0)
-        excel_base64 = base64.b64encode(result_excel.read()).decode('utf-8')
-        response_data['result_file'] = excel_base64
-        from datetime import datetime as dt
-        response_data['result_filename'] = f"import_results_{dt.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-
-        return JsonResponse(response_data, status=200)
+        # Validation, inserts and the result workbook run in a background job (see import_jobs);
+        # the frontend polls the returned status_url and downloads the result workbook
+        job = submit_import_job(
+            'volunteers',
+            file.name,
+            upload,
+            total_rows=len(df),
+            dry_run=dry_run,
+            requested_by=user.staff_id,
+            audit_context=capture_audit_event(request, 'CREATE_VOLUNTEER_SUCCESS'),
+        )
+        return JsonResponse(import_job_status(job), status=202)
     
     except Exception as e:
         api_logger.error(f"Import endpoint error: {str(e)}")
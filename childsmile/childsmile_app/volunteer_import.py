@@ -0,0 +1,374 @@
+"""
+volunteer_import.py
+
+Import engine of the bulk Excel import of volunteers / tutors
+(import_volunteers_endpoint), moved out of the view so import_jobs can run it
+chunk by chunk in a background job.
+
+Each row is validated and — unless it's a dry run — created (SignedUp, Staff
+with a unique username, then Tutors / Pending_Tutor or General_Volunteer) in
+its own savepoint, so a failing row doesn't undo the rest of its chunk.
+build_volunteers_workbook() renders the result / preview workbook.
+"""
+
+from datetime import datetime as dt
+from io import BytesIO
+import pandas as pd
+from django.db import IntegrityError, transaction
+from django.utils.timezone import now
+from openpyxl import Workbook
+from openpyxl.styles import Alignment, Font, PatternFill
+from .models import General_Volunteer, Pending_Tutor, Role, SignedUp, Staff, Tutors
+
+CITY_MAPPING = {
+    'תל אביב': 'תל אביב - יפו',
+    'מודיעין': 'מודיעין-מכבים-רעות',
+    'מודעין': 'מודיעין-מכבים-רעות',
+    'פתח תקוה': 'פתח תקווה',
+    'קריית אתא': 'קרית אתא',
+    'קריית נטפים': 'קרית נטפים',
+    'יהוד מונוסון': 'יהוד-מונוסון',
+    'קיבוץ חפץ חיים': 'חפץ חיים',
+    'מושב בני ראם': 'בני ראם',
+    'מושב חמד': 'חמד',
+    'מושב פורת': 'פורת',
+    'יד רמב״ם (מושב)': 'יד רמבם',
+    'יישוב נופים': 'נופים',
+    'מגד אל כרום': 'מג\'ד אל-כרום',
+    'גבעת שמואל אבל עושה שירות': 'גבעת שמואל',
+    'מושה טפחות': 'טפחות',
+    'עלי זהב לומד בשדרות': 'עלי זהב',
+    'ירושלים- תא': 'ירושלים',
+    'ראשל״צ': 'ראשון לציון',
+    'הדר גנים': 'גנות הדר',
+    'רעננה(מגדל עוז)': 'רעננה',
+}
+BIRTH_DATE_FORMATS = ['%Y-%m-%d %H:%M:%S', '%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y', '%d.%m.%Y', '%m/%d/%Y', '%m-%d-%Y', '%m.%d.%Y']
+
+
+def _clean(row, column):
+    value = row.get(column, '')
+    return '' if (value is None or pd.isna(value) or str(value).lower() == 'nan') else str(value).strip()
+
+
+def _clean_phone(phone):
+    """XXX-XXXXXXX with a leading zero, '' if not 10 digits."""
+    if not phone:
+        return ''
+    phone_normalized = phone.replace('-', '').replace(' ', '').strip()
+    # If doesn't start with 0, add it
+    if phone_normalized and not phone_normalized.startswith('0'):
+        phone_normalized = '0' + phone_normalized
+    if phone_normalized.isdigit() and len(phone_normalized) == 10:
+        return f"{phone_normalized[:3]}-{phone_normalized[3:]}"
+    return ''
+
+
+def _clean_email(row):
+    email_raw = row.get('מייל')
+    if email_raw and not pd.isna(email_raw):
+        email = str(email_raw).strip().replace('\n', '').replace('\r', '')
+        if email and email.lower() != 'nan':
+            return email
+    return None
+
+
+def _clean_city(city_val):
+    city = city_val.replace('\n', ' ').replace('\r', '').strip() if city_val else ''
+    for separator in ['/', ',']:
+        if separator in city:
+            city = city.split(separator)[0].strip()
+    if city in CITY_MAPPING:
+        return CITY_MAPPING[city]
+    for key, value in CITY_MAPPING.items():
+        if key in city:
+            return value
+    return city
+
+
+def _age(birth_date, today):
+    age = today.year - birth_date.year
+    if (today.month, today.day) < (birth_date.month, birth_date.day):
+        age -= 1
+    return age
+
+
+def _parse_birth_date(date_val):
+    """First format giving an age of 13-120, else None."""
+    if not date_val or pd.isna(date_val) or str(date_val).lower() == 'nan':
+        return None
+    if isinstance(date_val, dt):
+        return date_val.date()
+    date_str = str(date_val).strip()
+    today = dt.now().date()
+    for fmt in BIRTH_DATE_FORMATS:
+        try:
+            parsed_date = dt.strptime(date_str, fmt).date()
+        except ValueError:
+            continue
+        if 13 <= _age(parsed_date, today) <= 120:
+            return parsed_date
+    return None
+
+
+def _parse_flag(value, true_values):
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        return value.lower().strip() in true_values
+    return False
+
+
+class VolunteersImport:
+    """One volunteers import, fed chunk by chunk (import_jobs)."""
+
+    EMPTY_COUNTS = {
+        'success': 0, 'error': 0, 'skipped': 0,
+        'general_volunteer': 0, 'tutor_with_tutee': 0, 'tutor_no_tutee': 0, 'pending_tutor': 0,
+    }
+
+    def __init__(self, df, settlement_index, dry_run=False, counts=None):
+        """
+        :param df: the whole sheet (unused — the columns have fixed names)
+        :param settlement_index: settlements_index.SettlementIndex for the city check
+        :param dry_run: only validate — every valid row is reported as OK
+        :param counts: counters of the chunks already processed (resume)
+        :raises Role.DoesNotExist: the General Volunteer / Tutor role is missing
+        """
+        self.settlement_index = settlement_index
+        self.dry_run = dry_run
+        self.counts = dict(self.EMPTY_COUNTS, **(counts or {}))
+        self.general_volunteer_role = Role.objects.get(role_name="General Volunteer")
+        self.tutor_role = Role.objects.get(role_name="Tutor")
+
+    def process_chunk(self, chunk):
+        """
+        Validate (and unless dry_run, create) the rows of one chunk of the sheet.
+        Call inside a transaction to commit the rows with the caller's checkpoint.
+        :return: the chunk's per-row results, in file order
+        """
+        results = []
+        for idx, row in chunk.iterrows():
+            first_name = _clean(row, 'שם פרטי')
+            surname = _clean(row, 'שם משפחה')
+            result = {
+                'row_num': idx + 2,
+                'first_name': first_name,
+                'surname': surname,
+                'email': '',
+                'status': '',
+                'record_type': '',
+                'details': ''
+            }
+            results.append(result)
+            try:
+                self._process_row(row, result)
+            except IntegrityError as e:
+                result['status'] = 'Error'
+                result['details'] = f'שגיאת מסד נתונים: {str(e)}'
+                self.counts['error'] += 1
+            except Exception as e:
+                result['status'] = 'Error'
+                result['details'] = f'שגיאה כללית: {str(e)}'
+                self.counts['error'] += 1
+        return results
+
+    def _mark(self, result, counter, status, details):
+        result['status'] = status
+        result['details'] = details
+        self.counts[counter] += 1
+
+    def _process_row(self, row, result):
+        first_name = result['first_name']
+        surname = result['surname']
+        id_number = _clean(row, 'תעודת זהות')
+        phone = _clean_phone(_clean(row, 'מספר טלפון'))
+        email = _clean_email(row)
+        city = _clean_city(_clean(row, 'עיר מגורים'))
+
+        birth_date = _parse_birth_date(row.get('תאריך לידה', ''))
+        calculated_age = max(0, _age(birth_date, dt.now().date())) if birth_date else 0
+
+        gender = _parse_flag(row.get('מין', ''), ['true', 'נקבה', 'female', 'f', '1'])
+        want_tutor = _parse_flag(row.get('סוג התנדבות', ''), ['true', 'כן', 'yes', '1'])
+
+        status_raw = row.get('סטטוס', '')
+        if not status_raw or pd.isna(status_raw) or str(status_raw).lower() == 'nan':
+            status_val = None
+        else:
+            status_val = str(status_raw).strip()
+
+        volunteer_comment = _clean(row, 'הערות המתנדב')
+        coordinator_comment = _clean(row, 'הערות הרכז')
+
+        # Validate city exists in settlements table if provided
+        if city and city not in self.settlement_index:
+            return self._mark(result, 'error', 'Error', f'עיר לא קיימת במערכת: {city}')
+
+        result['email'] = email or ''
+
+        # Build comments
+        signedup_comment_parts = []
+        tutor_preferences = None
+        if want_tutor:
+            if volunteer_comment:
+                tutor_preferences = volunteer_comment
+            if coordinator_comment:
+                signedup_comment_parts.append(f"הערות רכז: {coordinator_comment}")
+        else:
+            if volunteer_comment:
+                signedup_comment_parts.append(f"הערות מתנדב: {volunteer_comment}")
+            if coordinator_comment:
+                signedup_comment_parts.append(f"הערות רכז: {coordinator_comment}")
+        signedup_comment = ' | '.join(signedup_comment_parts) if signedup_comment_parts else None
+
+        # Validate
+        if not first_name or not surname:
+            return self._mark(result, 'error', 'Error', 'חסר שם פרטי או שם משפחה')
+        if not id_number:
+            return self._mark(result, 'error', 'Error', 'חסרה תעודת זהות')
+        try:
+            id_int = int(id_number)
+        except ValueError:
+            return self._mark(result, 'error', 'Error', f'תעודת זהות לא מספרית: {id_number}')
+
+        # Check duplicates
+        if SignedUp.objects.filter(id=id_int).exists():
+            return self._mark(result, 'skipped', 'Skipped', 'ת.ז. כבר קיימת במערכת')
+        if email and Staff.objects.filter(email__iexact=email).exists():
+            return self._mark(result, 'skipped', 'Skipped', 'מייל כבר קיים במערכת')
+
+        # Determine record type
+        if want_tutor:
+            if status_val == "יש חניך":
+                record_type = "חונך - יש חניך"
+            elif status_val == "אין חניך":
+                record_type = "חונך - אין חניך"
+            else:
+                record_type = f"חונך ממתין - {status_val or 'ללא סטטוס'}"
+        else:
+            record_type = "מתנדב כללי"
+        result['record_type'] = record_type
+
+        if self.dry_run:
+            return self._mark(result, 'success', 'OK', f'בדיקה בלבד: {record_type}')
+
+        # === CREATE RECORDS ===
+        with transaction.atomic():
+            # 1. Create SignedUp
+            signedup = SignedUp.objects.create(
+                id=id_int,
+                first_name=first_name,
+                surname=surname,
+                age=calculated_age,
+                birth_date=birth_date,
+                gender=gender,
+                phone=phone,
+                city=city,
+                comment=signedup_comment,
+                email=email,
+                want_tutor=want_tutor,
+            )
+
+            # 2. Create Staff with unique username
+            username = f"{first_name}_{surname}"
+            index = 1
+            original_username = username
+            while Staff.objects.filter(username=username).exists():
+                username = f"{original_username}_{index}"
+                index += 1
+
+            staff = Staff.objects.create(
+                username=username,
+                email=email,
+                first_name=first_name,
+                last_name=surname,
+                created_at=now(),
+                registration_approved=True,
+                is_active=True,
+                deactivation_reason="suspended"
+            )
+
+            # 3. Create role-specific record
+            if want_tutor:
+                staff.roles.add(self.tutor_role)
+                Tutors.objects.create(
+                    id_id=signedup.id,
+                    staff=staff,
+                    tutorship_status="יש_חניך" if status_val == "יש חניך" else "אין_חניך",
+                    tutor_email=email,
+                    preferences=tutor_preferences,
+                    is_t_imported=True,
+                )
+                if status_val == "יש חניך":
+                    counter = 'tutor_with_tutee'
+                elif status_val == "אין חניך":
+                    counter = 'tutor_no_tutee'
+                else:
+                    Pending_Tutor.objects.create(
+                        id_id=signedup.id,
+                        pending_status="ממתין",
+                    )
+                    counter = 'pending_tutor'
+            else:
+                staff.roles.add(self.general_volunteer_role)
+                General_Volunteer.objects.create(
+                    id_id=signedup.id,
+                    staff_id=staff.staff_id,
+                    signupdate=now().date(),
+                    comments=signedup_comment,
+                )
+                counter = 'general_volunteer'
+
+        self.counts[counter] += 1
+        self._mark(result, 'success', 'OK', f'נוצר בהצלחה: {record_type}')
+
+
+def build_volunteers_workbook(results):
+    """The result / preview .xlsx of a volunteers import, as bytes."""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "תוצאות ייבוא"
+
+    headers = ['שורה', 'שם פרטי', 'שם משפחה', 'מייל', 'סטטוס ייבוא', 'סוג רשומה', 'פרטים']
+    header_fill = PatternFill(start_color='4472C4', end_color='4472C4', fill_type='solid')
+    header_font = Font(color='FFFFFF', bold=True)
+    ok_fill = PatternFill(start_color='C6EFCE', end_color='C6EFCE', fill_type='solid')
+    error_fill = PatternFill(start_color='FFC7CE', end_color='FFC7CE', fill_type='solid')
+    warning_fill = PatternFill(start_color='FFEB9C', end_color='FFEB9C', fill_type='solid')
+
+    for col, header in enumerate(headers, 1):
+        cell = ws.cell(row=1, column=col, value=header)
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.alignment = Alignment(horizontal='center')
+
+    for row_idx, result in enumerate(results, 2):
+        ws.cell(row=row_idx, column=1, value=result.get('row_num', ''))
+        ws.cell(row=row_idx, column=2, value=result['first_name'])
+        ws.cell(row=row_idx, column=3, value=result['surname'])
+        ws.cell(row=row_idx, column=4, value=result.get('email', ''))
+
+        status_cell = ws.cell(row=row_idx, column=5, value=result['status'])
+        if result['status'] == 'OK':
+            status_cell.fill = ok_fill
+        elif result['status'] == 'Error':
+            status_cell.fill = error_fill
+        elif result['status'] == 'Warning':
+            status_cell.fill = warning_fill
+
+        ws.cell(row=row_idx, column=6, value=result.get('record_type', ''))
+        ws.cell(row=row_idx, column=7, value=result.get('details', ''))
+
+    ws.column_dimensions['A'].width = 8
+    ws.column_dimensions['B'].width = 15
+    ws.column_dimensions['C'].width = 15
+    ws.column_dimensions['D'].width = 30
+    ws.column_dimensions['E'].width = 12
+    ws.column_dimensions['F'].width = 20
+    ws.column_dimensions['G'].width = 60
+    ws.sheet_view.rightToLeft = True
+
+    output = BytesIO()
+    wb.save(output)
+    return output.getvalue()
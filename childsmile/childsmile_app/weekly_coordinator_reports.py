@@ -19,7 +19,7 @@ import tempfile
 from datetime import datetime as dt
 from .logger import api_logger
 from .models import Staff, WeeklyCoordinatorRequest, CoordinatorProgressReport, CoordinatorChatMessage
-from .whatsapp_utils import send_whatsapp_message
+from .whatsapp_utils import queue_whatsapp_message
 
 # File-based lock to prevent duplicate sends across processes (Django runserver spawns 2)
 _LOCK_FILE = os.path.join(tempfile.gettempdir(), 'childsmile_weekly_coordinator.lock')
@@ -123,35 +123,41 @@ def send_weekly_coordinator_request():
             api_logger.error(f"[WEEKLY_REPORTS] Error creating request records: {e}")
             return
         
-        # Send WhatsApp messages one by one
+        # Queue the WhatsApp messages (sent by the WhatsApp outbox dispatcher)
         for coordinator in coordinators_to_send:
             try:
                 if template_sid:
                     coordinator_name = coordinator.first_name if coordinator.first_name else coordinator.username
-                    send_whatsapp_message(
+                    result = queue_whatsapp_message(
                         recipient_phone=coordinator.staff_phone,
                         message_body="",
                         use_template=True,
                         template_sid=template_sid,
-                        template_variables={"1": coordinator_name}
+                        template_variables={"1": coordinator_name},
+                        source='weekly_coordinator_request',
                     )
-                    api_logger.info(f"[WEEKLY_REPORTS] Sent request to {coordinator.username} ({coordinator.staff_phone}) using template {template_sid}")
+                    api_logger.info(f"[WEEKLY_REPORTS] Queued request to {coordinator.username} ({coordinator.staff_phone}) using template {template_sid}")
                 else:
-                    send_whatsapp_message(
+                    result = queue_whatsapp_message(
                         recipient_phone=coordinator.staff_phone,
                         message_body=message_text,
-                        use_template=False
+                        use_template=False,
+                        source='weekly_coordinator_request',
                     )
-                    api_logger.warning(f"[WEEKLY_REPORTS] Sent request to {coordinator.username} ({coordinator.staff_phone}) as plain text (template SID not configured)")
+                    api_logger.warning(f"[WEEKLY_REPORTS] Queued request to {coordinator.username} ({coordinator.staff_phone}) as plain text (template SID not configured)")
                 
-                sent_count += 1
+                if result.get('success'):
+                    sent_count += 1
+                else:
+                    failed_count += 1
+                    api_logger.error(f"[WEEKLY_REPORTS] Failed to queue WhatsApp to {coordinator.username}: {result.get('error')}")
                 
             except Exception as e:
                 failed_count += 1
                 api_logger.error(f"[WEEKLY_REPORTS] Failed to send WhatsApp to {coordinator.username}: {e}")
         
         api_logger.info(
-            f"[WEEKLY_REPORTS] ✅ Requests sent: {sent_count} successful, {failed_count} failed out of {len(coordinators_to_send)} | Template: {'✅ ' + template_sid if template_sid else '❌ NOT SET (using fallback)'}"
+            f"[WEEKLY_REPORTS] ✅ Requests queued: {sent_count} successful, {failed_count} failed out of {len(coordinators_to_send)} | Template: {'✅ ' + template_sid if template_sid else '❌ NOT SET (using fallback)'}"
         )
     finally:
         fcntl.flock(lock_fd, fcntl.LOCK_UN)
@@ -243,7 +249,6 @@ def handle_coordinator_response(phone, message_text, received_at):
     if liam and liam.staff_phone:
         try:
             import os
-            from .whatsapp_utils import send_whatsapp_message
             coordinator_name = f"{coordinator.first_name} {coordinator.last_name}"
             
             # Try to use existing admin message template
@@ -252,7 +257,7 @@ def handle_coordinator_response(phone, message_text, received_at):
             if template_sid:
                 # Use template with coordinator name and message
                 # Template variables: {{1}} = name, {{2}} = message
-                send_whatsapp_message(
+                queue_whatsapp_message(
                     recipient_phone=liam.staff_phone,
                     message_body="",
                     use_template=True,
@@ -260,18 +265,20 @@ def handle_coordinator_response(phone, message_text, received_at):
                     template_variables={
                         "1": coordinator_name,
                         "2": message_text
-                    }
+                    },
+                    source='weekly_coordinator_response',
                 )
             else:
                 # Fallback to plain text if template not configured
                 wa_message = f"הודעה חדשה מ{coordinator_name}:\n\n{message_text}"
-                send_whatsapp_message(
+                queue_whatsapp_message(
                     recipient_phone=liam.staff_phone,
                     message_body=wa_message,
-                    use_template=False
+                    use_template=False,
+                    source='weekly_coordinator_response',
                 )
             
-            api_logger.info(f"[WEEKLY_REPORTS] WhatsApp notification sent to ליאם אביבי about response from {coordinator_name}")
+            api_logger.info(f"[WEEKLY_REPORTS] WhatsApp notification queued for ליאם אביבי about response from {coordinator_name}")
         except Exception as wa_error:
             api_logger.warning(f"[WEEKLY_REPORTS] Failed to send WhatsApp to ליאם אביבי: {wa_error}")
     else:
@@ -22,12 +22,12 @@ import urllib.request
 import urllib.parse
 import pytz
 
-from django.conf import settings
-from django.core.mail import send_mail
 from django.utils import timezone
 
 from .models import Children, Tasks, Staff, Role
 from .logger import api_logger
+from .email_outbox import enqueue_email
+from .notification_templates import register_template, bind_template
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -521,236 +521,113 @@ def _td_cell(label, value, accent=None):
     </tr>"""
 
 
-def _section_header(title, bg_color, emoji=""):
-    return f"""
+# ── compiled layouts (notification_templates) — style tokens bound once ─────
+_STYLE = dict(primary=_C_PRIMARY, border=_C_BORDER, bglight=_C_BGLIGHT, font=_FONT)
+
+_SECTION_HEADER = register_template("digest_section_header", """
     <tr>
-      <td style="background:{bg_color};color:#fff;padding:12px 20px;font-family:{_FONT};font-size:16px;font-weight:700;text-align:right;direction:rtl;">
+      <td style="background:{bg_color};color:#fff;padding:12px 20px;font-family:{font};font-size:16px;font-weight:700;text-align:right;direction:rtl;">
         {emoji}&nbsp;{title}
       </td>
-    </tr>"""
-
-
-def _small_table_header(*cols):
-    ths = "".join(
-        f'<td style="background:{_C_PRIMARY};color:#fff;padding:8px 10px;font-family:{_FONT};font-size:13px;font-weight:700;text-align:right;border:1px solid {_C_BORDER};">{c}</td>'
-        for c in cols
-    )
-    return f"<tr>{ths}</tr>"
+    </tr>""").bind(font=_FONT)
 
+_HEADER_CELL = register_template(
+    "digest_header_cell",
+    '<td style="background:{primary};color:#fff;padding:8px 10px;font-family:{font};font-size:13px;font-weight:700;text-align:right;border:1px solid {border};">{cell}</td>',
+).bind(**_STYLE)
 
-def _small_table_row(*cells, bg="#fff"):
-    tds = "".join(
-        f'<td style="padding:7px 10px;font-family:{_FONT};font-size:13px;color:#333;text-align:right;border:1px solid {_C_BORDER};background:{bg};">{c}</td>'
-        for c in cells
-    )
-    return f"<tr>{tds}</tr>"
+register_template(
+    "digest_row_cell",
+    '<td style="padding:7px 10px;font-family:{font};font-size:13px;color:#333;text-align:right;border:1px solid {border};background:{bg};">{cell}</td>',
+)
 
+_BADGE = register_template(
+    "digest_badge",
+    '<span style="display:inline-block;padding:2px 10px;border-radius:10px;font-size:12px;font-weight:700;background:{color}20;color:{color};font-family:{font};">{text}</span>',
+).bind(font=_FONT)
 
-def _badge(text, color):
-    return f'<span style="display:inline-block;padding:2px 10px;border-radius:10px;font-size:12px;font-weight:700;background:{color}20;color:{color};font-family:{_FONT};">{text}</span>'
+_EMPTY_ROW = register_template(
+    "digest_empty_row",
+    '<tr><td colspan="{colspan}" style="padding:14px;text-align:center;color:#aaa;font-family:Arial;font-size:14px;">{text}</td></tr>',
+)
 
+_SECTION = register_template("digest_section", """
+    <tr><td style="padding:0 0 2px 0;">
+    <table width="100%" cellpadding="0" cellspacing="0" style="border-collapse:collapse;">
+      {header}
+      {columns}
+      {rows}
+    </table>
+    </td></tr>""")
 
-def build_digest_html(data):
-    generated   = data["generated_at"]
-    week_start  = data["week_start"]
-    total_open  = data["total_open_tasks"]
-    total_over  = data["total_overdue"]
-    wait_count  = data["waiting_families_count"]
-    tasks_staff = data["tasks_by_staff"]
-    git_changes = data["git_changes"]
-    new_fams    = data["new_families"]
-    new_vols    = data["new_volunteers"]
-    completed_by_staff = data["completed_by_staff"]
-    total_completed    = data["total_completed"]
-
-    # ── KPI bar ─────────────────────────────────────────────────────────────
-    kpi_html = f"""
+_KPI = register_template("digest_kpi", """
     <tr>
       <td style="background:#fff;padding:20px 20px 10px 20px;">
         <table width="100%" cellpadding="0" cellspacing="0">
           <tr>
             <td width="33%" style="text-align:center;padding:10px;">
-              <div style="font-size:36px;font-weight:900;color:{_C_ORANGE};font-family:{_FONT};">{total_open}</div>
-              <div style="font-size:13px;color:#777;font-family:{_FONT};">משימות פתוחות</div>
+              <div style="font-size:36px;font-weight:900;color:{orange};font-family:{font};">{total_open}</div>
+              <div style="font-size:13px;color:#777;font-family:{font};">משימות פתוחות</div>
             </td>
-            <td width="33%" style="text-align:center;padding:10px;border-right:2px solid {_C_BORDER};border-left:2px solid {_C_BORDER};">
-              <div style="font-size:36px;font-weight:900;color:{_C_RED};font-family:{_FONT};">{total_over}</div>
-              <div style="font-size:13px;color:#777;font-family:{_FONT};">משימות באיחור</div>
+            <td width="33%" style="text-align:center;padding:10px;border-right:2px solid {border};border-left:2px solid {border};">
+              <div style="font-size:36px;font-weight:900;color:{red};font-family:{font};">{total_over}</div>
+              <div style="font-size:13px;color:#777;font-family:{font};">משימות באיחור</div>
             </td>
             <td width="33%" style="text-align:center;padding:10px;">
-              <div style="font-size:36px;font-weight:900;color:{_C_BLUE};font-family:{_FONT};">{wait_count}</div>
-              <div style="font-size:13px;color:#777;font-family:{_FONT};">משפחות ממתינות לחונך</div>
+              <div style="font-size:36px;font-weight:900;color:{blue};font-family:{font};">{wait_count}</div>
+              <div style="font-size:13px;color:#777;font-family:{font};">משפחות ממתינות לחונך</div>
             </td>
           </tr>
         </table>
       </td>
-    </tr>"""
+    </tr>""").bind(orange=_C_ORANGE, red=_C_RED, blue=_C_BLUE, border=_C_BORDER, font=_FONT)
 
-    # ── Open / Overdue tasks per staff ───────────────────────────────────────
-    tasks_rows = ""
-    for sid, info in sorted(tasks_staff.items(), key=lambda x: -len(x[1]["overdue"])):
-        overdue_count = len(info["overdue"])
-        open_count    = len(info["open"])
-        if not overdue_count and not open_count:
-            continue
-        name_badge = (
-            _badge(f"⚠️ {overdue_count} באיחור", _C_RED) if overdue_count else ""
-        )
-        tasks_rows += f"""
+_TASKS_COLUMNS = register_template("digest_tasks_columns", """<tr style="background:{bglight};">
+        <td style="padding:6px 12px;font-family:{font};font-size:13px;font-weight:700;color:{primary};text-align:right;">רכז/ת</td>
+        <td style="padding:6px 12px;font-family:{font};font-size:13px;font-weight:700;color:{primary};text-align:center;">פתוחות</td>
+        <td style="padding:6px 12px;font-family:{font};font-size:13px;font-weight:700;color:{red};text-align:center;">באיחור</td>
+      </tr>""").bind(red=_C_RED, **_STYLE).render()
+
+_TASKS_STAFF_ROW = register_template("digest_tasks_staff_row", """
         <tr>
-          <td style="padding:6px 12px;font-family:{_FONT};font-size:14px;font-weight:700;color:#333;text-align:right;border-bottom:1px solid {_C_BORDER};">
-            {info['name']} &nbsp; {name_badge}
+          <td style="padding:6px 12px;font-family:{font};font-size:14px;font-weight:700;color:#333;text-align:right;border-bottom:1px solid {border};">
+            {name} &nbsp; {name_badge}
           </td>
-          <td style="padding:6px 12px;font-family:{_FONT};font-size:14px;color:#555;text-align:center;border-bottom:1px solid {_C_BORDER};">
+          <td style="padding:6px 12px;font-family:{font};font-size:14px;color:#555;text-align:center;border-bottom:1px solid {border};">
             {open_count}
           </td>
-          <td style="padding:6px 12px;font-family:{_FONT};font-size:14px;color:{_C_RED if overdue_count else '#555'};font-weight:{'700' if overdue_count else '400'};text-align:center;border-bottom:1px solid {_C_BORDER};">
+          <td style="padding:6px 12px;font-family:{font};font-size:14px;color:{overdue_color};font-weight:{overdue_weight};text-align:center;border-bottom:1px solid {border};">
             {overdue_count}
           </td>
-        </tr>"""
-        # Show up to 3 overdue tasks inline
-        for t in info["overdue"][:3]:
-            tasks_rows += f"""
+        </tr>""").bind(font=_FONT, border=_C_BORDER)
+
+_TASKS_OVERDUE_ROW = register_template("digest_tasks_overdue_row", """
         <tr style="background:#fff8f8;">
-          <td colspan="3" style="padding:4px 28px;font-family:{_FONT};font-size:12px;color:{_C_RED};text-align:right;border-bottom:1px solid #fde;direction:rtl;">
-            &nbsp;&nbsp;↳ [{t['type']}] {t['description']} — מועד סיום המשימה חלף: {t['due']}
+          <td colspan="3" style="padding:4px 28px;font-family:{font};font-size:12px;color:{red};text-align:right;border-bottom:1px solid #fde;direction:rtl;">
+            &nbsp;&nbsp;↳ [{type}] {description} — מועד סיום המשימה חלף: {due}
           </td>
-        </tr>"""
-        if len(info["overdue"]) > 3:
-            tasks_rows += f"""
+        </tr>""").bind(font=_FONT, red=_C_RED)
+
+_TASKS_MORE_ROW = register_template("digest_tasks_more_row", """
         <tr style="background:#fff8f8;">
-          <td colspan="3" style="padding:4px 28px;font-family:{_FONT};font-size:12px;color:{_C_RED};text-align:right;border-bottom:1px solid #fde;">
-            &nbsp;&nbsp;ועוד {len(info['overdue'])-3} משימות באיחור נוספות...
+          <td colspan="3" style="padding:4px 28px;font-family:{font};font-size:12px;color:{red};text-align:right;border-bottom:1px solid #fde;">
+            &nbsp;&nbsp;ועוד {count} משימות באיחור נוספות...
           </td>
-        </tr>"""
-
-    tasks_section = f"""
-    <tr><td style="padding:0 0 2px 0;">
-    <table width="100%" cellpadding="0" cellspacing="0" style="border-collapse:collapse;">
-      {_section_header('משימות פתוחות לפי רכז', _C_ORANGE, '📋')}
-      <tr style="background:{_C_BGLIGHT};">
-        <td style="padding:6px 12px;font-family:{_FONT};font-size:13px;font-weight:700;color:{_C_PRIMARY};text-align:right;">רכז/ת</td>
-        <td style="padding:6px 12px;font-family:{_FONT};font-size:13px;font-weight:700;color:{_C_PRIMARY};text-align:center;">פתוחות</td>
-        <td style="padding:6px 12px;font-family:{_FONT};font-size:13px;font-weight:700;color:{_C_RED};text-align:center;">באיחור</td>
-      </tr>
-      {tasks_rows if tasks_rows else '<tr><td colspan="3" style="padding:14px;text-align:center;color:#aaa;font-family:Arial;font-size:14px;">✅ אין משימות פתוחות</td></tr>'}
-    </table>
-    </td></tr>"""
-
-    # ── Waiting families ────────────────────────────────────────────────────
-    wait_rows = ""
-    tutoring_labels = {
-        "למצוא_חונך": "צריך חונך",
-        "למצוא_חונך_אין_באיזור_שלו": "אין חונך באיזור",
-        "למצוא_חונך_בעדיפות_גבוה": "עדיפות גבוהה",
-        "שידוך_בסימן_שאלה": "שידוך בספק",
-    }
-    for i, f in enumerate(data["waiting_families"][:15]):
-        bg = "#fff" if i % 2 == 0 else _C_BGROW
-        reg = f["registrationdate"]
-        reg_str = reg.strftime("%d/%m/%Y") if hasattr(reg, "strftime") else str(reg)[:10]
-        status_label = tutoring_labels.get(f["tutoring_status"], f["tutoring_status"])
-        wait_rows += _small_table_row(
-            f"{f['childfirstname']} {f['childsurname']}",
-            f["city"] or "—",
-            _badge(status_label, _C_BLUE),
-            reg_str,
-            bg=bg,
-        )
-    if data["waiting_families_count"] > 15:
-        wait_rows += f"""<tr><td colspan="4" style="text-align:center;padding:8px;font-size:13px;color:#888;font-family:{_FONT};">...ועוד {data['waiting_families_count']-15} משפחות</td></tr>"""
-
-    waiting_section = f"""
-    <tr><td style="padding:0 0 2px 0;">
-    <table width="100%" cellpadding="0" cellspacing="0" style="border-collapse:collapse;">
-      {_section_header(f'משפחות הממתינות לחונך ({data["waiting_families_count"]})', _C_BLUE, '👨‍👩‍👧')}
-      {_small_table_header('שם ילד', 'עיר', 'סטטוס', 'תאריך רישום')}
-      {wait_rows if wait_rows else '<tr><td colspan="4" style="padding:14px;text-align:center;color:#aaa;font-family:Arial;font-size:14px;">✅ אין משפחות ממתינות</td></tr>'}
-    </table>
-    </td></tr>"""
+        </tr>""").bind(font=_FONT, red=_C_RED)
 
-    # ── New families this week ───────────────────────────────────────────────
-    new_fam_rows = ""
-    for i, f in enumerate(new_fams[:10]):
-        bg = "#fff" if i % 2 == 0 else _C_BGROW
-        reg = f["registrationdate"]
-        reg_str = reg.strftime("%d/%m/%Y") if hasattr(reg, "strftime") else str(reg)[:10]
-        new_fam_rows += _small_table_row(
-            f"{f['childfirstname']} {f['childsurname']}",
-            f["city"] or "—",
-            reg_str,
-            bg=bg,
-        )
+_WAITING_MORE_ROW = register_template(
+    "digest_waiting_more_row",
+    '<tr><td colspan="4" style="text-align:center;padding:8px;font-size:13px;color:#888;font-family:{font};">...ועוד {count} משפחות</td></tr>',
+).bind(font=_FONT)
 
-    new_fam_section = f"""
-    <tr><td style="padding:0 0 2px 0;">
-    <table width="100%" cellpadding="0" cellspacing="0" style="border-collapse:collapse;">
-      {_section_header(f'משפחות חדשות השבוע ({len(new_fams)})', _C_GREEN, '🆕')}
-      {_small_table_header('שם ילד', 'עיר', 'תאריך הוספה') if new_fams else ''}
-      {new_fam_rows if new_fam_rows else '<tr><td colspan="3" style="padding:14px;text-align:center;color:#aaa;font-family:Arial;font-size:14px;">לא נוספו משפחות חדשות השבוע</td></tr>'}
-    </table>
-    </td></tr>"""
-
-    # ── New volunteers this week ─────────────────────────────────────────────
-    new_vol_rows = ""
-    for i, s in enumerate(new_vols[:10]):
-        bg = "#fff" if i % 2 == 0 else _C_BGROW
-        created = s["created_at"]
-        created_str = created.strftime("%d/%m/%Y") if hasattr(created, "strftime") else str(created)[:10]
-        new_vol_rows += _small_table_row(
-            f"{s['first_name']} {s['last_name']}",
-            s["email"],
-            created_str,
-            bg=bg,
-        )
-
-    new_vol_section = f"""
-    <tr><td style="padding:0 0 2px 0;">
-    <table width="100%" cellpadding="0" cellspacing="0" style="border-collapse:collapse;">
-      {_section_header(f'מתנדבים חדשים השבוע ({len(new_vols)})', _C_GREEN, '👤')}
-      {_small_table_header('שם', 'אימייל', 'תאריך הצטרפות') if new_vols else ''}
-      {new_vol_rows if new_vol_rows else '<tr><td colspan="3" style="padding:14px;text-align:center;color:#aaa;font-family:Arial;font-size:14px;">לא נרשמו מתנדבים חדשים השבוע</td></tr>'}
-    </table>
-    </td></tr>"""
-
-    # ── Completed tasks this week ────────────────────────────────────────────
-    completed_rows = ""
-    for sid, info in sorted(completed_by_staff.items(), key=lambda x: -x[1]["count"]):
-        completed_rows += _small_table_row(
-            info["name"],
-            f"{info['count']} שיחות ביקורת",
-        )
-
-    completed_section = f"""
-    <tr><td style="padding:0 0 2px 0;">
-    <table width="100%" cellpadding="0" cellspacing="0" style="border-collapse:collapse;">
-      {_section_header(f'שיחות ביקורת שהושלמו השבוע ({total_completed})', _C_GREEN, '✅')}
-      {_small_table_header('רכז/ת', 'שיחות ביקורת שהושלמו') if completed_by_staff else ''}
-      {completed_rows if completed_rows else '<tr><td colspan="2" style="padding:14px;text-align:center;color:#aaa;font-family:Arial;font-size:14px;">לא הושלמו שיחות ביקורת השבוע</td></tr>'}
-    </table>
-    </td></tr>"""
-
-    # ── Git changes section ──────────────────────────────────────────────────
-    # git_changes is a flat sorted list of Hebrew feature descriptions for the week
-    git_rows = ""
-    for desc in git_changes:
-        git_rows += f"""
+_GIT_ROW = register_template("digest_git_row", """
         <tr>
-          <td style="padding:6px 20px;font-family:{_FONT};font-size:13px;color:#444;text-align:right;border-bottom:1px solid {_C_BORDER};direction:rtl;">
+          <td style="padding:6px 20px;font-family:{font};font-size:13px;color:#444;text-align:right;border-bottom:1px solid {border};direction:rtl;">
             • {desc}
           </td>
-        </tr>"""
+        </tr>""").bind(font=_FONT, border=_C_BORDER)
 
-    git_section = f"""
-    <tr><td style="padding:0 0 2px 0;">
-    <table width="100%" cellpadding="0" cellspacing="0" style="border-collapse:collapse;">
-      {_section_header('שינויים במערכת השבוע', _C_PRIMARY, '⚙️')}
-      {git_rows if git_rows else '<tr><td colspan="2" style="padding:14px;text-align:center;color:#aaa;font-family:Arial;font-size:14px;">לא בוצעו שינויים קוד השבוע</td></tr>'}
-    </table>
-    </td></tr>"""
-
-    # ── Assemble full email ──────────────────────────────────────────────────
-    html = f"""<!DOCTYPE html>
+DIGEST_EMAIL = register_template("weekly_digest", """<!DOCTYPE html>
 <html dir="rtl" lang="he">
 <head>
   <meta charset="UTF-8">
@@ -771,15 +648,15 @@ def build_digest_html(data):
 
           <!-- LOGO / HEADER -->
           <tr>
-            <td style="background:linear-gradient(135deg,{_C_PRIMARY} 0%,#143852 100%);
+            <td style="background:linear-gradient(135deg,{primary} 0%,#143852 100%);
                         padding:28px 24px;text-align:center;">
-              <div style="font-family:{_FONT};font-size:26px;font-weight:900;
+              <div style="font-family:{font};font-size:26px;font-weight:900;
                            color:#fff;letter-spacing:-0.5px;">
                 😊 חיוך של ילד
               </div>
-              <div style="font-family:{_FONT};font-size:15px;color:rgba(255,255,255,0.85);
+              <div style="font-family:{font};font-size:15px;color:rgba(255,255,255,0.85);
                            margin-top:6px;">
-                סיכום שבועי &nbsp;|&nbsp; {week_start} – {generated[:10]}
+                סיכום שבועי &nbsp;|&nbsp; {week_start} – {generated_date}
               </div>
             </td>
           </tr>
@@ -787,7 +664,7 @@ def build_digest_html(data):
           <!-- INTRO -->
           <tr>
             <td style="background:#fff;padding:20px 24px 12px 24px;
-                        font-family:{_FONT};font-size:15px;color:#444;
+                        font-family:{font};font-size:15px;color:#444;
                         text-align:right;direction:rtl;line-height:1.6;">
               שלום,<br>
               להלן סיכום השבועי של פעילות המערכת. הדוח נוצר אוטומטית ב-{generated}.
@@ -795,13 +672,13 @@ def build_digest_html(data):
           </tr>
 
           <!-- DIVIDER -->
-          <tr><td style="padding:0 24px;"><hr style="border:none;border-top:2px solid {_C_BORDER};margin:0;"></td></tr>
+          <tr><td style="padding:0 24px;"><hr style="border:none;border-top:2px solid {border};margin:0;"></td></tr>
 
           <!-- KPI ROW -->
           {kpi_html}
 
           <!-- DIVIDER -->
-          <tr><td style="padding:0 24px;"><hr style="border:none;border-top:2px solid {_C_BORDER};margin:4px 0;"></td></tr>
+          <tr><td style="padding:0 24px;"><hr style="border:none;border-top:2px solid {border};margin:4px 0;"></td></tr>
 
           <!-- SPACER -->
           <tr><td style="height:8px;"></td></tr>
@@ -825,9 +702,9 @@ def build_digest_html(data):
 
           <!-- FOOTER -->
           <tr>
-            <td style="background:{_C_BGLIGHT};padding:18px 24px;
-                        text-align:center;font-family:{_FONT};
-                        font-size:12px;color:#999;border-top:2px solid {_C_BORDER};">
+            <td style="background:{bglight};padding:18px 24px;
+                        text-align:center;font-family:{font};
+                        font-size:12px;color:#999;border-top:2px solid {border};">
               זוהי הודעה אוטומטית — נשלחה מדי שבוע על ידי מערכת חיוך של ילד.<br>
               אנא אל תשיב לאימייל זה.
             </td>
@@ -839,18 +716,194 @@ def build_digest_html(data):
   </table>
   <!--[if mso]></td></tr></table></center><![endif]-->
 </body>
-</html>"""
+</html>""").bind(**_STYLE)
+
+
+def _section_header(title, bg_color, emoji=""):
+    return _SECTION_HEADER.render(title=title, bg_color=bg_color, emoji=emoji)
+
+
+def _small_table_header(*cols):
+    return "<tr>" + "".join(_HEADER_CELL.render(cell=c) for c in cols) + "</tr>"
+
+
+def _small_table_row(*cells, bg="#fff"):
+    # Rows alternate between two backgrounds — the bound cell template is cached per colour
+    cell = bind_template("digest_row_cell", bg=bg, font=_FONT, border=_C_BORDER)
+    return "<tr>" + "".join(cell.render(cell=c) for c in cells) + "</tr>"
 
-    return html
+
+def _badge(text, color):
+    return _BADGE.render(text=text, color=color)
+
+
+def _section(header, rows, empty_text, colspan, columns=""):
+    return _SECTION.render(
+        header=header,
+        columns=columns,
+        rows=rows or _EMPTY_ROW.render(colspan=colspan, text=empty_text),
+    )
+
+
+def build_digest_html(data):
+    generated   = data["generated_at"]
+    week_start  = data["week_start"]
+    total_open  = data["total_open_tasks"]
+    total_over  = data["total_overdue"]
+    wait_count  = data["waiting_families_count"]
+    tasks_staff = data["tasks_by_staff"]
+    git_changes = data["git_changes"]
+    new_fams    = data["new_families"]
+    new_vols    = data["new_volunteers"]
+    completed_by_staff = data["completed_by_staff"]
+    total_completed    = data["total_completed"]
+
+    # Rows are collected in lists and joined once (no repeated string +=)
+
+    # ── KPI bar ─────────────────────────────────────────────────────────────
+    kpi_html = _KPI.render(total_open=total_open, total_over=total_over, wait_count=wait_count)
+
+    # ── Open / Overdue tasks per staff ───────────────────────────────────────
+    tasks_rows = []
+    for sid, info in sorted(tasks_staff.items(), key=lambda x: -len(x[1]["overdue"])):
+        overdue_count = len(info["overdue"])
+        open_count    = len(info["open"])
+        if not overdue_count and not open_count:
+            continue
+        name_badge = (
+            _badge(f"⚠️ {overdue_count} באיחור", _C_RED) if overdue_count else ""
+        )
+        tasks_rows.append(_TASKS_STAFF_ROW.render(
+            name=info['name'],
+            name_badge=name_badge,
+            open_count=open_count,
+            overdue_count=overdue_count,
+            overdue_color=_C_RED if overdue_count else '#555',
+            overdue_weight='700' if overdue_count else '400',
+        ))
+        # Show up to 3 overdue tasks inline
+        for t in info["overdue"][:3]:
+            tasks_rows.append(_TASKS_OVERDUE_ROW.render(type=t['type'], description=t['description'], due=t['due']))
+        if len(info["overdue"]) > 3:
+            tasks_rows.append(_TASKS_MORE_ROW.render(count=len(info['overdue']) - 3))
+
+    tasks_section = _section(
+        _section_header('משימות פתוחות לפי רכז', _C_ORANGE, '📋'),
+        "".join(tasks_rows), '✅ אין משימות פתוחות', 3, columns=_TASKS_COLUMNS,
+    )
+
+    # ── Waiting families ────────────────────────────────────────────────────
+    wait_rows = []
+    tutoring_labels = {
+        "למצוא_חונך": "צריך חונך",
+        "למצוא_חונך_אין_באיזור_שלו": "אין חונך באיזור",
+        "למצוא_חונך_בעדיפות_גבוה": "עדיפות גבוהה",
+        "שידוך_בסימן_שאלה": "שידוך בספק",
+    }
+    for i, f in enumerate(data["waiting_families"][:15]):
+        bg = "#fff" if i % 2 == 0 else _C_BGROW
+        reg = f["registrationdate"]
+        reg_str = reg.strftime("%d/%m/%Y") if hasattr(reg, "strftime") else str(reg)[:10]
+        status_label = tutoring_labels.get(f["tutoring_status"], f["tutoring_status"])
+        wait_rows.append(_small_table_row(
+            f"{f['childfirstname']} {f['childsurname']}",
+            f["city"] or "—",
+            _badge(status_label, _C_BLUE),
+            reg_str,
+            bg=bg,
+        ))
+    if data["waiting_families_count"] > 15:
+        wait_rows.append(_WAITING_MORE_ROW.render(count=data['waiting_families_count'] - 15))
+
+    waiting_section = _section(
+        _section_header(f'משפחות הממתינות לחונך ({data["waiting_families_count"]})', _C_BLUE, '👨‍👩‍👧'),
+        "".join(wait_rows), '✅ אין משפחות ממתינות', 4,
+        columns=_small_table_header('שם ילד', 'עיר', 'סטטוס', 'תאריך רישום'),
+    )
+
+    # ── New families this week ───────────────────────────────────────────────
+    new_fam_rows = []
+    for i, f in enumerate(new_fams[:10]):
+        bg = "#fff" if i % 2 == 0 else _C_BGROW
+        reg = f["registrationdate"]
+        reg_str = reg.strftime("%d/%m/%Y") if hasattr(reg, "strftime") else str(reg)[:10]
+        new_fam_rows.append(_small_table_row(
+            f"{f['childfirstname']} {f['childsurname']}",
+            f["city"] or "—",
+            reg_str,
+            bg=bg,
+        ))
+
+    new_fam_section = _section(
+        _section_header(f'משפחות חדשות השבוע ({len(new_fams)})', _C_GREEN, '🆕'),
+        "".join(new_fam_rows), 'לא נוספו משפחות חדשות השבוע', 3,
+        columns=_small_table_header('שם ילד', 'עיר', 'תאריך הוספה') if new_fams else '',
+    )
+
+    # ── New volunteers this week ─────────────────────────────────────────────
+    new_vol_rows = []
+    for i, s in enumerate(new_vols[:10]):
+        bg = "#fff" if i % 2 == 0 else _C_BGROW
+        created = s["created_at"]
+        created_str = created.strftime("%d/%m/%Y") if hasattr(created, "strftime") else str(created)[:10]
+        new_vol_rows.append(_small_table_row(
+            f"{s['first_name']} {s['last_name']}",
+            s["email"],
+            created_str,
+            bg=bg,
+        ))
+
+    new_vol_section = _section(
+        _section_header(f'מתנדבים חדשים השבוע ({len(new_vols)})', _C_GREEN, '👤'),
+        "".join(new_vol_rows), 'לא נרשמו מתנדבים חדשים השבוע', 3,
+        columns=_small_table_header('שם', 'אימייל', 'תאריך הצטרפות') if new_vols else '',
+    )
+
+    # ── Completed tasks this week ────────────────────────────────────────────
+    completed_rows = [
+        _small_table_row(info["name"], f"{info['count']} שיחות ביקורת")
+        for sid, info in sorted(completed_by_staff.items(), key=lambda x: -x[1]["count"])
+    ]
+
+    completed_section = _section(
+        _section_header(f'שיחות ביקורת שהושלמו השבוע ({total_completed})', _C_GREEN, '✅'),
+        "".join(completed_rows), 'לא הושלמו שיחות ביקורת השבוע', 2,
+        columns=_small_table_header('רכז/ת', 'שיחות ביקורת שהושלמו') if completed_by_staff else '',
+    )
+
+    # ── Git changes section ──────────────────────────────────────────────────
+    # git_changes is a flat sorted list of Hebrew feature descriptions for the week
+    git_section = _section(
+        _section_header('שינויים במערכת השבוע', _C_PRIMARY, '⚙️'),
+        "".join(_GIT_ROW.render(desc=desc) for desc in git_changes), 'לא בוצעו שינויים קוד השבוע', 2,
+    )
+
+    # ── Assemble full email ──────────────────────────────────────────────────
+    return DIGEST_EMAIL.render(
+        week_start=week_start,
+        generated_date=generated[:10],
+        generated=generated,
+        kpi_html=kpi_html,
+        tasks_section=tasks_section,
+        completed_section=completed_section,
+        waiting_section=waiting_section,
+        new_fam_section=new_fam_section,
+        new_vol_section=new_vol_section,
+        git_section=git_section,
+    )
 
 
 # ---------------------------------------------------------------------------
 # Send
 # ---------------------------------------------------------------------------
 
-def send_weekly_digest():
+def send_weekly_digest(wake=True):
     """
     Build and send the weekly digest to all active staff members.
+    :param wake: wake the email dispatcher. The management command passes False
+        and delivers the rows itself with flush_email_outbox() — a dispatcher
+        thread started in that short-lived process would claim them and die
+        mid-send when it exits.
     Returns a dict with stats.
     """
     try:
@@ -867,24 +920,20 @@ def send_weekly_digest():
 
         api_logger.info(f"weekly_digest: sending to {len(emails)} coordinators/admins: {emails}")
 
-        sent = 0
-        failed = 0
-        for email in emails:
-            try:
-                send_mail(
-                    subject=subject,
-                    message="",        # plain-text fallback (empty — HTML only)
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=[email],
-                    fail_silently=False,
-                    html_message=html,
-                )
-                sent += 1
-            except Exception as e:
-                api_logger.error(f"weekly_digest: failed to send to {email}: {e}")
-                failed += 1
-
-        api_logger.info(f"✅ weekly_digest sent to {sent} staff members ({failed} failed)")
+        # One outbox row per recipient — the email dispatcher sends them all
+        # over a single SMTP connection (email_outbox).
+        queued = enqueue_email(
+            emails,
+            subject,
+            "",        # plain-text fallback (empty — HTML only)
+            html_message=html,
+            source='weekly_digest',
+            wake=wake,
+        )
+        sent = len(queued)
+        failed = len(emails) - sent
+
+        api_logger.info(f"✅ weekly_digest queued for {sent} staff members ({failed} skipped)")
         return {"sent": sent, "failed": failed, "error": None}
 
     except Exception as e:
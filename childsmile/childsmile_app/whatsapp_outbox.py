@@ -0,0 +1,312 @@
+"""
+whatsapp_outbox.py
+
+Durable outbox and background dispatcher for WhatsApp notifications.
+
+Bulk notifications (meeting reminders / events, coordinator chat broadcasts,
+weekly coordinator requests, refund notifications, security alerts) used to
+call Twilio once per recipient, serially, with a blocking 10 s request and a
+new connection each time — inside the HTTP request or the scheduler thread.
+A broadcast to 50 coordinators was 50 round-trips before the response.
+
+Now:
+  - enqueue_whatsapp() validates the phones and INSERTs one outbox row per
+    recipient (add_whatsapp_outbox_table.sql) in the caller's transaction, so
+    a rolled-back request sends nothing. The dispatcher is woken on commit.
+  - WHATSAPP_DISPATCH_WORKERS threads per process claim due rows (SELECT ...
+    FOR UPDATE SKIP LOCKED) and send them concurrently over the pooled Twilio
+    session (whatsapp_utils.post_whatsapp), at most WHATSAPP_RATE_LIMIT
+    messages per second per process.
+  - 429 / 5xx / network errors are retried with exponential backoff
+    (WHATSAPP_RETRY_BASE * 2^attempt, or Twilio's Retry-After) up to
+    WHATSAPP_MAX_ATTEMPTS; other 4xx errors fail the message at once.
+  - The Twilio message SID and status are recorded on the row; the status
+    callback webhook (whatsapp_webhook.whatsapp_status_callback) updates
+    delivery_status when WHATSAPP_STATUS_CALLBACK_URL is set.
+  - sweep_whatsapp_outbox() — scheduler — re-queues rows whose worker died
+    mid-send, deletes old rows and wakes the dispatcher after a restart.
+
+Environment:
+  WHATSAPP_DISPATCH_WORKERS       concurrent sender threads per process (default 4)
+  WHATSAPP_RATE_LIMIT             max messages per second per process (default 10)
+  WHATSAPP_MAX_ATTEMPTS           attempts before a message is failed (default 5)
+  WHATSAPP_RETRY_BASE             seconds before the first retry, doubled per attempt (default 5)
+  WHATSAPP_POLL_INTERVAL          seconds between idle outbox polls (default 10)
+  WHATSAPP_OUTBOX_RETENTION_DAYS  days sent / failed rows are kept (default 30)
+  WHATSAPP_STATUS_CALLBACK_URL    public URL of /api/webhooks/whatsapp-status/ (optional)
+"""
+
+import os
+import threading
+import time
+from datetime import timedelta
+import requests
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from .models import WhatsAppOutbox
+from .job_workers import JobWorkerPool
+from .logger import api_logger
+from .whatsapp_utils import (
+    MISSING_CREDENTIALS_ERROR,
+    _clean_phone_number,
+    _twilio_credentials,
+    post_whatsapp,
+    safe_template_variables,
+)
+
+SENDING_TIMEOUT = timedelta(minutes=2)  # a 'sending' row older than this lost its worker
+MAX_RETRY_DELAY = 900  # seconds
+
+# Order of Twilio delivery statuses (record_delivery_status only moves forward);
+# failed / undelivered / canceled are terminal. Unknown statuses rank 0.
+DELIVERY_STATUS_RANK = {
+    'accepted': 1,
+    'scheduled': 1,
+    'queued': 1,
+    'sending': 2,
+    'sent': 3,
+    'delivered': 4,
+    'read': 5,
+    'failed': 6,
+    'undelivered': 6,
+    'canceled': 6,
+}
+
+
+def _env_int(name, default):
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+class _RateLimiter:
+    """Spaces calls at least 1/rate seconds apart across all threads of the process."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / max(1, rate)
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+_limiter = None
+
+
+def _rate_limiter():
+    global _limiter
+    if _limiter is None:
+        _limiter = _RateLimiter(_env_int('WHATSAPP_RATE_LIMIT', 10))
+    return _limiter
+
+
+def enqueue_whatsapp(recipient_phones, message_body=None, template_sid=None, template_variables=None, source=None):
+    """
+    Queue one WhatsApp message per recipient.
+
+    :param recipient_phones: phone numbers in any format
+    :param message_body: text of a plain message (ignored if template_sid is set)
+    :param template_sid: Twilio content template SID
+    :param template_variables: template variables (stringified here)
+    :param source: caller name, stored for the logs
+    :return: one result dict per recipient, in order —
+        {"success": True, "queued": True, "outbox_id": ..., "phone": ...} or
+        {"success": False, "error": ..., "phone": ...}
+    """
+    if _twilio_credentials() is None:
+        api_logger.error(f"WhatsApp Error: {MISSING_CREDENTIALS_ERROR}")
+        return [{"success": False, "error": MISSING_CREDENTIALS_ERROR, "phone": phone} for phone in recipient_phones]
+
+    variables = safe_template_variables(template_variables) if template_sid else None
+    results = []
+    rows = []
+    for phone in recipient_phones:
+        clean_phone = _clean_phone_number(phone)
+        if not clean_phone:
+            results.append({"success": False, "error": "Invalid phone number format", "phone": phone})
+            continue
+        row = WhatsAppOutbox(
+            to_phone=clean_phone,
+            body=None if template_sid else message_body,
+            template_sid=template_sid,
+            template_variables=variables,
+            source=(source or '')[:50] or None,
+        )
+        rows.append(row)
+        results.append(row)
+
+    if rows:
+        WhatsAppOutbox.objects.bulk_create(rows)
+        transaction.on_commit(get_whatsapp_dispatcher().wake)
+        api_logger.debug(f"DEBUG: Queued {len(rows)} WhatsApp message(s) ({source or 'unknown source'})")
+
+    return [
+        {"success": True, "queued": True, "outbox_id": item.id, "phone": item.to_phone}
+        if isinstance(item, WhatsAppOutbox) else item
+        for item in results
+    ]
+
+
+def _due():
+    now = timezone.now()
+    return Q(status=WhatsAppOutbox.STATUS_QUEUED, next_attempt_at__lte=now) | Q(
+        status=WhatsAppOutbox.STATUS_SENDING, locked_at__lt=now - SENDING_TIMEOUT,
+    )
+
+
+def claim_next_whatsapp():
+    """Mark the oldest due message as sending and return it (None if nothing is due)."""
+    with transaction.atomic():
+        message = (
+            WhatsAppOutbox.objects.select_for_update(skip_locked=True)
+            .filter(_due())
+            .order_by('next_attempt_at', 'id')
+            .first()
+        )
+        if message is None:
+            return None
+        message.status = WhatsAppOutbox.STATUS_SENDING
+        message.locked_at = timezone.now()
+        message.attempts += 1
+        message.save(update_fields=['status', 'locked_at', 'attempts'])
+    return message
+
+
+def _retry_delay(message, response=None):
+    delay = _env_int('WHATSAPP_RETRY_BASE', 5) * (2 ** (message.attempts - 1))
+    if response is not None:
+        try:
+            delay = max(delay, int(response.headers.get('Retry-After', 0)))
+        except (TypeError, ValueError):
+            pass
+    return min(delay, MAX_RETRY_DELAY)
+
+
+def _retry_or_fail(message, error, response=None):
+    message.last_error = error[:1000]
+    if message.attempts >= _env_int('WHATSAPP_MAX_ATTEMPTS', 5):
+        message.status = WhatsAppOutbox.STATUS_FAILED
+        api_logger.error(f"❌ WhatsApp #{message.id} to {message.to_phone} failed after {message.attempts} attempts: {error[:200]}")
+    else:
+        message.status = WhatsAppOutbox.STATUS_QUEUED
+        message.next_attempt_at = timezone.now() + timedelta(seconds=_retry_delay(message, response))
+        api_logger.warning(f"⚠️ WhatsApp #{message.id} to {message.to_phone} will be retried ({error[:200]})")
+
+
+def deliver_whatsapp(message):
+    """Send one claimed message and record the outcome on its row."""
+    credentials = _twilio_credentials()
+    response = None
+    try:
+        if credentials is None:
+            message.status = WhatsAppOutbox.STATUS_FAILED
+            message.last_error = MISSING_CREDENTIALS_ERROR
+        else:
+            _rate_limiter().wait()
+            response = post_whatsapp(
+                message.to_phone,
+                message_body=message.body,
+                template_sid=message.template_sid,
+                template_variables=message.template_variables,
+                credentials=credentials,
+            )
+            if response.status_code == 201:
+                data = response.json()
+                message.status = WhatsAppOutbox.STATUS_SENT
+                message.message_sid = data.get('sid')
+                message.delivery_status = data.get('status')
+                message.sent_at = timezone.now()
+                message.last_error = None
+                api_logger.debug(f"WhatsApp message sent successfully to {message.to_phone} (SID: {message.message_sid})")
+            elif response.status_code == 429 or response.status_code >= 500:
+                _retry_or_fail(message, f"Twilio API error {response.status_code} - {response.text}", response)
+            else:
+                try:
+                    message.error_code = str(response.json().get('code') or '')[:20] or None
+                except ValueError:
+                    pass
+                message.status = WhatsAppOutbox.STATUS_FAILED
+                message.last_error = f"Twilio API error {response.status_code} - {response.text}"[:1000]
+                api_logger.error(f"WhatsApp API error for {message.to_phone}: {response.status_code} - {response.text}")
+    except requests.exceptions.RequestException as e:
+        _retry_or_fail(message, f"Request error: {str(e)}")
+    except Exception as e:
+        message.status = WhatsAppOutbox.STATUS_FAILED
+        message.last_error = f"Unexpected error: {str(e)}"[:1000]
+        api_logger.error(f"WhatsApp Error for {message.to_phone}: {message.last_error}")
+
+    message.locked_at = None
+    message.save(update_fields=[
+        'status', 'next_attempt_at', 'locked_at', 'message_sid', 'delivery_status',
+        'error_code', 'last_error', 'sent_at',
+    ])
+    return message
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_whatsapp_dispatcher():
+    """Process-wide WhatsApp JobWorkerPool (created on first use)."""
+    global _dispatcher
+    if _dispatcher is None:
+        with _dispatcher_lock:
+            if _dispatcher is None:
+                _dispatcher = JobWorkerPool(
+                    'whatsapp-dispatcher', claim_next_whatsapp, deliver_whatsapp,
+                    workers=_env_int('WHATSAPP_DISPATCH_WORKERS', 4),
+                    poll_interval=_env_int('WHATSAPP_POLL_INTERVAL', 10),
+                )
+    return _dispatcher
+
+
+def record_delivery_status(message_sid, delivery_status, error_code=None):
+    """
+    Store a Twilio status callback on the outbox row.
+
+    Twilio does not guarantee callback order, so the status only moves
+    forward (queued < sending < sent < delivered < read; failed / undelivered
+    / canceled are terminal): a late 'sent' never overwrites 'delivered'.
+    The check is part of the UPDATE, so concurrent callbacks can't race it.
+    :return: number of rows updated (0 for messages sent with
+             send_whatsapp_message, or a callback older than the stored status)
+    """
+    delivery_status = (delivery_status or '')[:20] or None
+    rank = DELIVERY_STATUS_RANK.get(delivery_status, 0)
+    behind = [status for status, status_rank in DELIVERY_STATUS_RANK.items() if status_rank < rank]
+    fields = {'delivery_status': delivery_status}
+    if error_code:
+        fields['error_code'] = str(error_code)[:20]
+    return WhatsAppOutbox.objects.filter(
+        Q(delivery_status__isnull=True) | Q(delivery_status__in=behind),
+        message_sid=message_sid,
+    ).update(**fields)
+
+
+def sweep_whatsapp_outbox():
+    """
+    Periodic housekeeping (scheduler, WHATSAPP_OUTBOX_SWEEP_INTERVAL):
+      - delete sent / failed rows older than WHATSAPP_OUTBOX_RETENTION_DAYS
+      - wake the dispatcher if messages are due — queued after a restart,
+        retries whose backoff expired, or rows whose worker died mid-send
+    :return: Dictionary with the counts per step
+    """
+    now = timezone.now()
+    result = {'deleted': 0, 'due': 0}
+    result['deleted'], _ = WhatsAppOutbox.objects.filter(
+        status__in=[WhatsAppOutbox.STATUS_SENT, WhatsAppOutbox.STATUS_FAILED],
+        created_at__lt=now - timedelta(days=_env_int('WHATSAPP_OUTBOX_RETENTION_DAYS', 30)),
+    ).delete()
+    result['due'] = WhatsAppOutbox.objects.filter(_due()).count()
+    if result['due']:
+        get_whatsapp_dispatcher().wake()
+    return result
@@ -1,11 +1,18 @@
 """
 WhatsApp notification utilities - sends WhatsApp messages via Twilio API.
 Provides generic functions for sending WhatsApp messages to single or multiple recipients.
+
+send_whatsapp_message sends at once (codes, interactive replies);
+queue_whatsapp_message / send_whatsapp_to_multiple only queue the messages in
+the WhatsApp outbox, sent in the background by whatsapp_outbox's dispatcher.
+All Twilio requests share one pooled HTTP session per process.
 """
 
 import os
 import json
+import threading
 import requests
+import requests.adapters
 from .logger import api_logger
 
 
@@ -13,9 +20,97 @@ from .logger import api_logger
 # GENERIC WHATSAPP UTILITIES
 # ============================================================================
 
+def _twilio_credentials():
+    """(account_sid, auth_token, whatsapp_from), or None if any of them is missing."""
+    # All WhatsApp credentials come from GitHub Secrets
+    # These are NOT set in Azure - only stored in GitHub Secrets
+    account_sid = os.getenv('TWILIO_ACCOUNT_SID')
+    auth_token = os.getenv('TWILIO_AUTH_TOKEN')
+    twilio_from = os.getenv('TWILIO_WHATSAPP_FROM')
+    if not all([account_sid, auth_token, twilio_from]):
+        return None
+    return account_sid, auth_token, twilio_from
+
+
+MISSING_CREDENTIALS_ERROR = "Missing Twilio credentials (TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN, or TWILIO_WHATSAPP_FROM)"
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+
+def _twilio_session():
+    """
+    Process-wide requests.Session for the Twilio API — keeps the TLS
+    connections alive between messages instead of a new handshake per send.
+    Re-created after a fork (gunicorn preload).
+    """
+    global _session, _session_pid
+    if _session is None or _session_pid != os.getpid():
+        with _session_lock:
+            if _session is None or _session_pid != os.getpid():
+                pool_size = max(4, int(os.getenv('WHATSAPP_DISPATCH_WORKERS', '4') or 4))
+                session = requests.Session()
+                session.mount('https://', requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+                _session, _session_pid = session, os.getpid()
+    return _session
+
+
+def safe_template_variables(template_variables):
+    """All values MUST be strings — Twilio rejects integers/None (error 21656)."""
+    return {k: str(v) if v is not None else "" for k, v in (template_variables or {}).items()}
+
+
+def post_whatsapp(clean_phone, message_body=None, template_sid=None, template_variables=None, credentials=None):
+    """
+    One POST to the Twilio Messages API over the pooled session.
+
+    Args:
+        clean_phone (str): whatsapp:+972... (see _clean_phone_number)
+        message_body (str): Message text (ignored if template_sid is set)
+        template_sid (str): Twilio content template SID
+        template_variables (dict): Template variables (already safe_template_variables)
+        credentials (tuple): _twilio_credentials() — must not be None
+
+    Returns:
+        requests.Response (raises requests exceptions on network errors / timeout)
+    """
+    account_sid, auth_token, twilio_from = credentials
+    url = f"https://api.twilio.com/2010-04-01/Accounts/{account_sid}/Messages.json"
+
+    # Build payload
+    if template_sid:
+        # Using Twilio content template
+        variables_json = json.dumps(template_variables or {})
+        api_logger.debug(f"📤 WhatsApp template payload — SID={template_sid} vars={variables_json} to={clean_phone}")
+        payload = {
+            "From": twilio_from,
+            "To": clean_phone,
+            "ContentSid": template_sid,
+            "ContentVariables": variables_json
+        }
+    else:
+        # Sending plain text message
+        payload = {
+            "From": twilio_from,
+            "To": clean_phone,
+            "Body": message_body
+        }
+    status_callback = os.getenv('WHATSAPP_STATUS_CALLBACK_URL')
+    if status_callback:
+        payload["StatusCallback"] = status_callback
+
+    return _twilio_session().post(url, data=payload, auth=(account_sid, auth_token), timeout=10)
+
+
 def send_whatsapp_message(recipient_phone, message_body, use_template=False, template_sid=None, template_variables=None):
     """
-    Send a WhatsApp message to a single recipient via Twilio API.
+    Send a WhatsApp message to a single recipient via Twilio API, right now.
+
+    Use this only when the caller needs the result (login / registration codes,
+    a single chat message whose failure is shown to the user). Notifications
+    should go through queue_whatsapp_message / send_whatsapp_to_multiple,
+    which only insert into the WhatsApp outbox.
     
     Args:
         recipient_phone (str): Recipient phone number (auto-formatted to whatsapp:+972...)
@@ -30,48 +125,25 @@ def send_whatsapp_message(recipient_phone, message_body, use_template=False, tem
         Example: {"success": False, "error": "Invalid credentials", "phone": "whatsapp:+972542652949"}
     """
     try:
-        # All WhatsApp credentials come from GitHub Secrets
-        # These are NOT set in Azure - only stored in GitHub Secrets
-        account_sid = os.getenv('TWILIO_ACCOUNT_SID')
-        auth_token = os.getenv('TWILIO_AUTH_TOKEN')
-        twilio_from = os.getenv('TWILIO_WHATSAPP_FROM')
-        
         # Validate credentials
-        if not all([account_sid, auth_token, twilio_from]):
-            error_msg = "Missing Twilio credentials (TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN, or TWILIO_WHATSAPP_FROM)"
-            api_logger.error(f"WhatsApp Error: {error_msg}")
-            return {"success": False, "error": error_msg, "phone": recipient_phone}
+        credentials = _twilio_credentials()
+        if credentials is None:
+            api_logger.error(f"WhatsApp Error: {MISSING_CREDENTIALS_ERROR}")
+            return {"success": False, "error": MISSING_CREDENTIALS_ERROR, "phone": recipient_phone}
         
         # Clean and validate phone number (converts to whatsapp:+972... format)
         clean_phone = _clean_phone_number(recipient_phone)
         if not clean_phone:
             return {"success": False, "error": "Invalid phone number format", "phone": recipient_phone}
         
-        url = f"https://api.twilio.com/2010-04-01/Accounts/{account_sid}/Messages.json"
-        
-        # Build payload
+        # Send request
         if use_template and template_sid:
-            # Using Twilio content template
-            # All values MUST be strings — Twilio rejects integers/None (error 21656)
-            safe_variables = {k: str(v) if v is not None else "" for k, v in (template_variables or {}).items()}
-            variables_json = json.dumps(safe_variables)
-            api_logger.debug(f"📤 WhatsApp template payload — SID={template_sid} vars={variables_json} to={clean_phone}")
-            payload = {
-                "From": twilio_from,
-                "To": clean_phone,
-                "ContentSid": template_sid,
-                "ContentVariables": variables_json
-            }
+            response = post_whatsapp(
+                clean_phone, template_sid=template_sid,
+                template_variables=safe_template_variables(template_variables), credentials=credentials,
+            )
         else:
-            # Sending plain text message
-            payload = {
-                "From": twilio_from,
-                "To": clean_phone,
-                "Body": message_body
-            }
-        
-        # Send request
-        response = requests.post(url, data=payload, auth=(account_sid, auth_token), timeout=10)
+            response = post_whatsapp(clean_phone, message_body=message_body, credentials=credentials)
         
         if response.status_code == 201:
             data = response.json()
@@ -106,9 +178,34 @@ def send_whatsapp_message(recipient_phone, message_body, use_template=False, tem
         return {"success": False, "error": error_msg, "phone": recipient_phone}
 
 
-def send_whatsapp_to_multiple(recipient_phones, message_body=None, use_template=False, template_sid=None, template_variables=None):
+def queue_whatsapp_message(recipient_phone, message_body, use_template=False, template_sid=None, template_variables=None, source=None):
+    """
+    Queue a WhatsApp message in the outbox (whatsapp_outbox) instead of sending it now.
+    The message is sent by the dispatcher after the caller's transaction commits.
+
+    Same arguments as send_whatsapp_message, plus source (caller name for the logs).
+
+    Returns:
+        dict: {"success": True, "queued": True, "outbox_id": 17, "phone": "whatsapp:+972..."},
+        or {"success": False, "error": ..., "phone": ...} if the message can't be queued
+    """
+    return send_whatsapp_to_multiple(
+        [recipient_phone],
+        message_body=message_body,
+        use_template=use_template,
+        template_sid=template_sid,
+        template_variables=template_variables,
+        source=source,
+    )["results"][0]
+
+
+def send_whatsapp_to_multiple(recipient_phones, message_body=None, use_template=False, template_sid=None, template_variables=None, source=None):
     """
     Send WhatsApp messages to multiple recipients.
+
+    Only queues one outbox row per recipient (one INSERT); the dispatcher sends
+    them concurrently under WHATSAPP_RATE_LIMIT. "successful" counts the
+    queued messages — delivery is recorded on the outbox rows.
     
     Args:
         recipient_phones (list): List of phone numbers (any format, auto-formatted)
@@ -116,6 +213,7 @@ def send_whatsapp_to_multiple(recipient_phones, message_body=None, use_template=
         use_template (bool): Whether to use a Twilio content template
         template_sid (str): Twilio content template SID
         template_variables (dict): Variables for template
+        source (str): Caller name, stored on the outbox rows for the logs
     
     Returns:
         dict: Summary of results
@@ -124,35 +222,29 @@ def send_whatsapp_to_multiple(recipient_phones, message_body=None, use_template=
             "successful": 2,
             "failed": 1,
             "results": [
-                {"success": True, "message_sid": "SMxxx", "phone": "whatsapp:+972542652949"},
-                {"success": False, "error": "Invalid number", "phone": "invalid"}
+                {"success": True, "queued": True, "outbox_id": 17, "phone": "whatsapp:+972542652949"},
+                {"success": False, "error": "Invalid phone number format", "phone": "invalid"}
             ]
         }
     """
-    results = {
+    from .whatsapp_outbox import enqueue_whatsapp
+
+    results = enqueue_whatsapp(
+        recipient_phones,
+        message_body=message_body,
+        template_sid=template_sid if use_template else None,
+        template_variables=template_variables,
+        source=source,
+    )
+    summary = {
         "total": len(recipient_phones),
-        "successful": 0,
-        "failed": 0,
-        "results": []
+        "successful": sum(1 for result in results if result.get("success")),
+        "failed": sum(1 for result in results if not result.get("success")),
+        "results": results
     }
     
-    for phone in recipient_phones:
-        result = send_whatsapp_message(
-            phone,
-            message_body,
-            use_template=use_template,
-            template_sid=template_sid,
-            template_variables=template_variables
-        )
-        results["results"].append(result)
-        
-        if result.get("success"):
-            results["successful"] += 1
-        else:
-            results["failed"] += 1
-    
-    api_logger.debug(f"WhatsApp bulk send completed: {results['successful']}/{results['total']} successful")
-    return results
+    api_logger.debug(f"WhatsApp bulk send queued: {summary['successful']}/{summary['total']} messages")
+    return summary
 
 
 def _clean_phone_number(phone):
@@ -1014,7 +1106,8 @@ def send_meeting_reminder_whatsapp(phones, reminder_type, meeting_title, date_st
                 "1": var1,
                 "2": location,
                 "3": meeting_title,
-            }
+            },
+            source='meeting_reminder',
         )
     else:
         api_logger.warning(
@@ -1029,7 +1122,7 @@ def send_meeting_reminder_whatsapp(phones, reminder_type, meeting_title, date_st
             f"{(urgency + chr(10)) if urgency else ''}"
             f"\nמערכת חיוך של ילד"
         )
-        return send_whatsapp_to_multiple(phones, message_body=freeform)
+        return send_whatsapp_to_multiple(phones, message_body=freeform, source='meeting_reminder')
 
 
 def send_meeting_event_notification_whatsapp(phones, event_type, meeting_title, date_str, location, urgency):
@@ -1075,7 +1168,8 @@ def send_meeting_event_notification_whatsapp(phones, event_type, meeting_title,
                 "1": date_str,
                 "2": location,
                 "3": meeting_title,
-            }
+            },
+            source='meeting_event',
         )
     else:
         api_logger.warning(
@@ -1099,7 +1193,7 @@ def send_meeting_event_notification_whatsapp(phones, event_type, meeting_title,
             f"📍 מיקום: {location}\n"
             f"\nמערכת חיוך של ילד"
         )
-        return send_whatsapp_to_multiple(phones, message_body=freeform)
+        return send_whatsapp_to_multiple(phones, message_body=freeform, source='meeting_event')
 
 
 def send_admin_approval_task_notification_whatsapp(liam_phone, user_name, user_phone, created_at):
@@ -1182,7 +1276,7 @@ def send_refund_new_request_to_admin_whatsapp(admin_phone, volunteer_full_name,
         requested_amount (str|Decimal): Requested reimbursement amount in ₪
 
     Returns:
-        dict: send_whatsapp_message result
+        dict: queue_whatsapp_message result
     """
     template_sid = os.getenv('REFUND_NEW_REQUEST_SID')
 
@@ -1195,12 +1289,13 @@ def send_refund_new_request_to_admin_whatsapp(admin_phone, volunteer_full_name,
         "2": str(requested_amount),
     }
     api_logger.info(f"Sending new refund request WhatsApp to admin: {admin_phone}")
-    return send_whatsapp_message(
+    return queue_whatsapp_message(
         admin_phone,
         message_body=None,
         use_template=True,
         template_sid=template_sid,
-        template_variables=template_variables
+        template_variables=template_variables,
+        source='refund_new_request',
     )
 
 
@@ -1226,7 +1321,7 @@ def send_refund_status_update_to_volunteer_whatsapp(volunteer_phone, volunteer_f
         admin_comment (str|None): Admin's comment / rejection reason
 
     Returns:
-        dict: send_whatsapp_message result
+        dict: queue_whatsapp_message result
     """
     template_sid = os.getenv('REFUND_STATUS_UPDATE_SID')
 
@@ -1256,12 +1351,13 @@ def send_refund_status_update_to_volunteer_whatsapp(volunteer_phone, volunteer_f
         "3": details,
     }
     api_logger.info(f"Sending refund status update WhatsApp to volunteer: {volunteer_phone}")
-    return send_whatsapp_message(
+    return queue_whatsapp_message(
         volunteer_phone,
         message_body=None,
         use_template=True,
         template_sid=template_sid,
-        template_variables=template_variables
+        template_variables=template_variables,
+        source='refund_status_update',
     )
 
 
@@ -1296,7 +1392,7 @@ def send_refund_payment_required_whatsapp(uri_phone, volunteer_full_name, approv
         status (str): New status — 'אושר' or 'אושר חלקית'
 
     Returns:
-        dict: send_whatsapp_message result
+        dict: queue_whatsapp_message result
     """
     template_sid = os.getenv('REFUND_PAYMENT_REQUIRED_SID')
 
@@ -1344,12 +1440,13 @@ def send_refund_payment_required_whatsapp(uri_phone, volunteer_full_name, approv
         "6": status_display,
     }
     api_logger.info(f"Sending refund payment required WhatsApp to Uri: {uri_phone}")
-    return send_whatsapp_message(
+    return queue_whatsapp_message(
         uri_phone,
         message_body=None,
         use_template=True,
         template_sid=template_sid,
-        template_variables=template_variables
+        template_variables=template_variables,
+        source='refund_payment_required',
     )
 
 
@@ -1540,5 +1637,6 @@ def send_security_breach_alert_whatsapp(endpoint, ip_address, timestamp=None):
             # \u202a…\u202c = LTR embedding — prevents BiDi reordering of
             # the IP address digits/dots inside a Hebrew (RTL) WhatsApp bubble
             "ip_address": f"\u202a{ip_address}\u202c",
-        }
+        },
+        source='security_alert',
     )
@@ -4,6 +4,7 @@ whatsapp_webhook.py - Incoming webhook handler for Twilio WhatsApp messages
 Handles:
   - Incoming messages from coordinators (weekly progress updates)
   - Other incoming messages (for routing if needed later)
+  - Delivery status callbacks of the messages sent by the WhatsApp outbox
 """
 
 import json
@@ -15,6 +16,7 @@ import os
 
 from .logger import api_logger
 from .weekly_coordinator_reports import handle_coordinator_response
+from .whatsapp_outbox import record_delivery_status
 from .utils import conditional_csrf
 
 
@@ -97,3 +99,40 @@ def whatsapp_incoming(request):
     except Exception as e:
         api_logger.error(f"[WHATSAPP_WEBHOOK] Exception handling incoming message: {e}")
         return JsonResponse({"error": "Internal error"}, status=500)
+
+
+@conditional_csrf
+@api_view(["POST"])
+def whatsapp_status_callback(request):
+    """
+    POST: Twilio message status callback (StatusCallback of the messages sent
+    by the WhatsApp outbox, set when WHATSAPP_STATUS_CALLBACK_URL is configured).
+
+    Twilio sends:
+      - MessageSid: the sent message's ID
+      - MessageStatus: queued / sent / delivered / read / undelivered / failed
+      - ErrorCode: set for undelivered / failed
+    """
+    if not validate_twilio_request(request):
+        api_logger.warning(f"[WHATSAPP_STATUS] Invalid signature for {request.POST.get('MessageSid')}")
+        return JsonResponse({"error": "Invalid signature"}, status=403)
+
+    try:
+        message_sid = request.POST.get("MessageSid", "")
+        message_status = request.POST.get("MessageStatus", "")
+        error_code = request.POST.get("ErrorCode")
+        if not message_sid or not message_status:
+            return JsonResponse({"error": "Missing required fields"}, status=400)
+
+        updated = record_delivery_status(message_sid, message_status, error_code)
+        if message_status in ("undelivered", "failed"):
+            api_logger.warning(f"[WHATSAPP_STATUS] Message {message_sid} {message_status} (error {error_code})")
+        else:
+            api_logger.debug(f"[WHATSAPP_STATUS] Message {message_sid} → {message_status} (outbox rows: {updated})")
+
+        # Twilio expects 200 OK
+        return JsonResponse({"success": True}, status=200)
+
+    except Exception as e:
+        api_logger.error(f"[WHATSAPP_STATUS] Exception handling status callback: {e}")
+        return JsonResponse({"error": "Internal error"}, status=500)
@@ -55,6 +55,7 @@ const AIChatBot = () => {
             if (statusResponse.data.status === 'completed') {
               // Video is ready!
               clearInterval(checkVideoInterval);
+              clearTimeout(checkVideoTimeout);
               
               // Remove the loading message and add ready message
               setMessages(prev => {
@@ -103,6 +104,13 @@ const AIChatBot = () => {
               }, 100);
               
               toast.success('הסרטון מוכן!');
+            } else if (statusResponse.data.status === 'failed' || statusResponse.data.status === 'expired') {
+              clearInterval(checkVideoInterval);
+              clearTimeout(checkVideoTimeout);
+              setMessages(prev => [...prev.filter(msg => !msg.showSpinner), {
+                type: 'bot',
+                text: 'מצטער, אירעה שגיאה ביצירת הסרטון. אנא נסה שוב.'
+              }]);
             }
           } catch (err) {
             console.error('Error checking video status:', err);
@@ -111,7 +119,7 @@ const AIChatBot = () => {
         }, 5000);
 
         // Timeout after 5 minutes
-        setTimeout(() => {
+        const checkVideoTimeout = setTimeout(() => {
           clearInterval(checkVideoInterval);
           setMessages(prev => [...prev, {
             type: 'bot',
@@ -3,6 +3,11 @@ import axios from '../axiosConfig';
 import DOMPurify from 'dompurify';
 import './AIVideoGenerator.css';
 
+// Status polling while the video renders: every 5 s for up to 20 minutes
+// (queue wait + RENDER_JOB_TIMEOUT of 15 minutes on the server)
+const VIDEO_POLL_INTERVAL_MS = 5000;
+const VIDEO_POLL_MAX_ATTEMPTS = 240;
+
 const AIVideoGenerator = () => {
   const [chatMessages, setChatMessages] = useState([
     {
@@ -106,11 +111,25 @@ const AIVideoGenerator = () => {
       });
 
       if (response.data.success) {
+        // The video is rendered in the background - poll until it is ready,
+        // giving up on failure or after VIDEO_POLL_MAX_ATTEMPTS polls
+        let status = response.data.status;
+        let attempts = 0;
+        while (status !== 'completed') {
+          if (attempts >= VIDEO_POLL_MAX_ATTEMPTS) {
+            throw new Error('Video generation timed out');
+          }
+          attempts += 1;
+          await new Promise(resolve => setTimeout(resolve, VIDEO_POLL_INTERVAL_MS));
+          const statusResponse = await axios.get(response.data.status_url);
+          status = statusResponse.data.status;
+          if (status === 'failed' || status === 'expired') {
+            throw new Error(statusResponse.data.error || 'Video generation failed');
+          }
+        }
         setVideoUrl(response.data.download_url);
-        setTimeout(() => {
-          setShowVideoModal(true);
-          setGenerating(false);
-        }, 500);
+        setShowVideoModal(true);
+        setGenerating(false);
       }
     } catch (error) {
       console.error('Error generating video:', error);
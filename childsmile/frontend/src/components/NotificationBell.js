@@ -1,5 +1,6 @@
 import React, { useState, useEffect, useRef, useCallback } from 'react';
 import axios from '../axiosConfig';
+import { subscribeRealtime } from './realtimeFeed';
 import '../styles/notificationBell.css';
 
 const TYPE_ICONS = {
@@ -51,6 +52,27 @@ const NotificationBell = () => {
     return () => clearInterval(interval);
   }, [fetchMessages]);
 
+  // Live updates: new / edited / removed notifications arrive through the
+  // shared long poll; the slow timer above is only needed for the birthday rows.
+  useEffect(() => subscribeRealtime((update) => {
+    if (update.reset) {
+      fetchMessages();
+      return;
+    }
+    if (!update.notifications.length && !update.notifications_removed.length) return;
+    setMessages(prev => {
+      const replaced = new Set([
+        ...update.notifications_removed,
+        ...update.notifications.map(m => m.id),
+      ]);
+      const merged = [...prev.filter(m => !replaced.has(m.id)), ...update.notifications];
+      // Same order as GET /api/notifications/: birthdays first, then newest first
+      const rows = merged.filter(m => !m.virtual)
+        .sort((a, b) => (b.created_at || '').localeCompare(a.created_at || ''));
+      return [...merged.filter(m => m.virtual), ...rows];
+    });
+  }), [fetchMessages]);
+
   const activeMessages = messages.filter(m => m.is_active);  const unseenCount = activeMessages.reduce((n, m) => n + (seenIds.includes(m.id) ? 0 : 1), 0);
 
   // Mark all currently-active notifications as "seen" while the panel is open, and
@@ -965,7 +965,7 @@ export const exportPossibleMatchesToExcel = async (matches, t) => {
       match.tutor_age,
       match.child_gender ? t('Female') : t('Male'),
       match.tutor_gender ? t('Female') : t('Male'),
-      match.distance_between_cities,
+      match.distance_between_cities ?? "-",
       match.grade,
     ]);
 
@@ -1055,7 +1055,7 @@ export const exportPossibleMatchesToPDF = async (matches, t) => {
       match.tutor_age, // Keep numbers as is
       reverseText(match.child_gender ? t('Female') : t('Male')), // Reverse for RTL
       reverseText(match.tutor_gender ? t('Female') : t('Male')), // Reverse for RTL
-      match.distance_between_cities, // Keep numbers as is
+      match.distance_between_cities ?? "-", // Keep numbers as is ("-" = pending)
       match.grade, // Keep numbers as is
     ]).map(row => row.reverse()); // <-- הפיכת כל שורה
 
@@ -0,0 +1,161 @@
+import axios from '../axiosConfig';
+
+/**
+ * Shared long-poll loop on GET /api/updates/ (see realtime_views.py).
+ *
+ * Every subscriber (notification bell, coordinator chat page) shares ONE
+ * request loop per browser: the open tabs elect a leader through a localStorage
+ * lease, only the leader polls, and it relays every response to the other tabs
+ * over a BroadcastChannel. When the leader tab closes (or stops renewing the
+ * lease) another tab takes over. Browsers without BroadcastChannel poll per tab.
+ *
+ * The server holds each request until a chat message or notification changes
+ * (or ~25 s pass) and answers with the changed rows and the next cursor, so
+ * idle pages cost no list reloads.
+ *
+ * Listeners receive the response body:
+ *   { cursor, reset, notifications, notifications_removed, chat, chat_deleted, retry_in }
+ * reset=true means the cursor was too old — reload everything.
+ * The first response only sets the cursor: subscribers load their own data on mount.
+ */
+
+const RETRY_MS = 5000;
+const MAX_RETRY_MS = 60000;
+const LEASE_KEY = 'childsmile_realtime_leader';
+const LEASE_MS = 10000;
+const LEASE_RENEW_MS = 3000;
+const CHANNEL_NAME = 'childsmile_realtime';
+
+const TAB_ID = `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+
+const listeners = new Set();
+let running = false;
+let channel = null;
+let leaseTimer = null;
+let leading = false;
+let loggedOut = false;
+let lastCursor = null; // newest cursor seen in this tab (polled or relayed) — a new leader resumes from it
+
+const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+
+const notify = (update) => {
+  listeners.forEach(listener => {
+    try { listener(update); } catch (err) { console.error('Realtime listener error:', err); }
+  });
+};
+
+const readLease = () => {
+  try {
+    return JSON.parse(localStorage.getItem(LEASE_KEY)) || null;
+  } catch (err) {
+    return null;
+  }
+};
+
+/** Take or renew the leader lease; returns whether this tab is the leader. */
+const claimLease = () => {
+  const lease = readLease();
+  const now = Date.now();
+  if (lease && lease.tab !== TAB_ID && lease.expires > now) return false;
+  try {
+    localStorage.setItem(LEASE_KEY, JSON.stringify({ tab: TAB_ID, expires: now + LEASE_MS }));
+  } catch (err) {
+    return true; // storage unavailable — poll in this tab
+  }
+  // Two tabs may write at once: the last write wins
+  return readLease()?.tab === TAB_ID;
+};
+
+const releaseLease = () => {
+  if (readLease()?.tab === TAB_ID) {
+    try { localStorage.removeItem(LEASE_KEY); } catch (err) { /* ignore */ }
+  }
+};
+
+const pollLoop = async () => {
+  let cursor = lastCursor;
+  let failures = 0;
+  while (listeners.size > 0 && leading) {
+    // Re-check the lease before every request: a throttled background tab may have lost it
+    if (channel && !claimLease()) break;
+    try {
+      const res = await axios.get('/api/updates/', {
+        params: cursor === null ? {} : { cursor },
+      });
+      const update = res.data;
+      const first = cursor === null;
+      cursor = update.cursor;
+      lastCursor = cursor;
+      failures = 0;
+      if (!first) {
+        notify(update);
+        if (channel) channel.postMessage(update);
+      }
+      // The server answers without waiting when it is busy — back off as told
+      if (update.retry_in) await sleep(update.retry_in * 1000);
+    } catch (error) {
+      const status = error.response?.status;
+      if (status === 401 || status === 403) { // logged out — the next subscribe restarts the loop
+        loggedOut = true;
+        releaseLease();
+        break;
+      }
+      // Rejected (429 / 5xx / network): back off exponentially, reset after a success
+      failures += 1;
+      await sleep(Math.min(RETRY_MS * 2 ** (failures - 1), MAX_RETRY_MS));
+    }
+  }
+  leading = false;
+  running = false;
+};
+
+/** Lease heartbeat: renew while leading, take over when the leader is gone. */
+const checkLease = () => {
+  if (listeners.size === 0 || loggedOut) return;
+  leading = channel ? claimLease() : true;
+  if (leading && !running) {
+    running = true;
+    pollLoop();
+  }
+};
+
+const start = () => {
+  if (typeof BroadcastChannel !== 'undefined' && !channel) {
+    channel = new BroadcastChannel(CHANNEL_NAME);
+    channel.onmessage = (event) => {
+      if (leading) return;
+      lastCursor = event.data.cursor;
+      notify(event.data);
+    };
+    window.addEventListener('beforeunload', releaseLease);
+  }
+  checkLease();
+  if (channel && !leaseTimer) leaseTimer = setInterval(checkLease, LEASE_RENEW_MS);
+};
+
+const stop = () => {
+  if (leaseTimer) clearInterval(leaseTimer);
+  leaseTimer = null;
+  leading = false; // the running poll ends after its current request
+  releaseLease();
+  if (channel) {
+    channel.close();
+    channel = null;
+    window.removeEventListener('beforeunload', releaseLease);
+  }
+};
+
+/**
+ * Subscribe to the realtime feed.
+ * @param {(update: Object) => void} listener called with every response after the first
+ * @returns {() => void} unsubscribe (use as the useEffect cleanup)
+ */
+export const subscribeRealtime = (listener) => {
+  listeners.add(listener);
+  loggedOut = false;
+  start();
+  return () => {
+    listeners.delete(listener);
+    if (listeners.size === 0) stop();
+  };
+};
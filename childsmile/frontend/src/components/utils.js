@@ -234,4 +234,43 @@ export const isGuestUser = () => {
   } catch (error) {
     return false;
   }
-};
\ No newline at end of file
+};
+
+/**
+ * Poll a background Excel import job (/api/import/jobs/<id>/) until it finishes.
+ * onProgress gets every status payload (progress %, processed / total rows).
+ * Resolves with the final payload (completed / cancelled), throws if the job failed.
+ */
+export const pollImportJob = async (job, onProgress) => {
+  let status = job;
+  while (status.status === 'queued' || status.status === 'running') {
+    await new Promise(resolve => setTimeout(resolve, 1500));
+    status = (await axios.get(status.status_url)).data;
+    if (onProgress) onProgress(status);
+  }
+  if (status.status === 'failed') {
+    throw new Error(status.error_message || 'Import failed');
+  }
+  return status;
+};
+
+/**
+ * Download the result / preview workbook of a finished import job.
+ */
+export const downloadImportResult = async (job) => {
+  if (!job.result_url) return;
+  const response = await axios.get(job.result_url, { responseType: 'blob' });
+  const url = window.URL.createObjectURL(new Blob([response.data]));
+  const link = document.createElement('a');
+  link.href = url;
+  link.setAttribute('download', job.result_filename);
+  document.body.appendChild(link);
+  link.click();
+  link.parentNode.removeChild(link);
+  window.URL.revokeObjectURL(url);
+};
+
+/**
+ * Ask a running import job to stop after its current chunk.
+ */
+export const cancelImportJob = (job) => axios.post(`/api/import/jobs/${job.job_id}/cancel/`);
@@ -304,6 +304,8 @@ const resources = {
       "Select Excel File": "Select Excel File",
       "Dry Run (Preview Only)": "Dry Run (Preview Only)",
       "Importing...": "Importing...",
+      "Stop Import": "Stop Import",
+      "Import stopped. Rows processed before stopping were kept - see the results file.": "Import stopped. Rows processed before stopping were kept - see the results file.",
       // Staff Profile Fields Translations
       "Israeli ID": "Israeli ID",
       "Birth Date": "Birth Date",
@@ -963,6 +965,8 @@ const resources = {
       "Refresh Now": "רענן עכשיו",
       "Some distances between cities are still being calculated. Please refresh in a few seconds.": "טרם ניתן להציג חלק מהמרחקים. נא לרענן בעוד מספר שניות.",
       "All distances are ready.": "כל המרחקים מוכנים.",
+      "Some distances between cities are not known yet (the city is located overnight). These matches are listed last.": "חלק מהמרחקים בין הערים עדיין לא ידועים (מיקום העיר יאותר במהלך הלילה). התאמות אלו מוצגות בסוף.",
+      "Distance pending": "המרחק טרם חושב",
       'Please enter both username and password.': "חובה למלא שם משתמש וסיסמה.",
       'Username and password cannot contain spaces.': "שם משתמש וסיסמה לא יכולים להכיל רווחים.",
       'All Urgencies': "כל הדחיפויות",
@@ -1328,6 +1332,10 @@ const resources = {
       "Backup file": "קובץ גיבוי",
       "Old records permanently removed from database": "רשומות ישנות נוקו לצמיתות מהמערכת",
       'Purge failed': 'ניקוי נכשל',
+      "Loaded": "נטענו",
+      "Failed to export audit logs": "ייצוא יומן המערכת נכשל",
+      "Failed to download the backup file": "הורדת קובץ הגיבוי נכשלה",
+      "Logs are deleted by whole months: only months that ended before the cutoff date": "הרשומות נמחקות לפי חודשים שלמים: רק חודשים שהסתיימו לפני תאריך החיתוך",
       "Import Volunteers": "ייבא מתנדבים",
       "Select a file": "בחר קובץ",
       "Please select a file": "אנא בחר קובץ",
@@ -1371,6 +1379,8 @@ const resources = {
       "Select Excel File": "בחר קובץ Excel",
       "Dry Run (Preview Only)": "בדיקה (תצוגה מקדימה בלבד)",
       "Importing...": "מייבא...",
+      "Stop Import": "עצור ייבוא",
+      "Import stopped. Rows processed before stopping were kept - see the results file.": "הייבוא נעצר. השורות שעובדו לפני העצירה נשמרו - ראה את קובץ התוצאות.",
       // Staff Profile Fields Translations
       "Israeli ID": "תעודת זהות",
       "Birth Date": "תאריך לידה",
@@ -1,4 +1,4 @@
-import React, { useEffect, useState } from 'react';
+import React, { useEffect, useRef, useState } from 'react';
 import Sidebar from '../components/Sidebar';
 import InnerPageHeader from '../components/InnerPageHeader';
 import '../styles/common.css';
@@ -241,66 +241,132 @@ const AUDIT_ROLE_LABELS = new Set([
   'Previous roles', 'Restored roles', 'Staff Roles of attempted Deletion',
 ]);
 
+// Rows per request to the paginated audit API (GET /api/audit-logs/?limit=&cursor=)
+const AUDIT_PAGE_LIMIT = 100;
+// Most pages one "jump" may fetch before it stops at the rows loaded so far
+const AUDIT_MAX_PAGES_PER_LOAD = 10;
+// Delay before a typed search is sent to the server
+const SEARCH_DEBOUNCE_MS = 400;
+
 const AuditLog = () => {
   const { t } = useTranslation(); // Initialize translation
   const hasPermissionOnAuditLog = hasAllPermissions(requiredPermissions);
 
-  // State for audit logs
+  // State for audit logs. The server filters, sorts and pages: auditLogs holds
+  // the pages loaded so far for the current filters, nextCursor the next page.
   const [auditLogs, setAuditLogs] = useState([]);
-  const [filteredLogs, setFilteredLogs] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [searchQuery, setSearchQuery] = useState('');
+  const [debouncedSearch, setDebouncedSearch] = useState('');
   const [selectedAction, setSelectedAction] = useState('');
   const [startDate, setStartDate] = useState('');
   const [endDate, setEndDate] = useState('');
   const [sortBy, setSortBy] = useState('desc'); // 'asc' or 'desc'
   const [page, setPage] = useState(1);
   const [pageSize] = useState(1);
-  const [totalCount, setTotalCount] = useState(0);
   const [pageJumpInput, setPageJumpInput] = useState('');
   const [timeJumpInput, setTimeJumpInput] = useState('');
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [actions, setActions] = useState([]);
   const [selectedLogs, setSelectedLogs] = useState(new Set());
   const [actionTranslations, setActionTranslations] = useState({}); // Store action translations
-  
+  // Bumped on every filter change so responses of an older query are dropped
+  const queryIdRef = useRef(0);
+
   // Purge modal state
   const [showPurgeModal, setShowPurgeModal] = useState(false);
   const [purgeData, setPurgeData] = useState(null);
   const [purgeCheckboxChecked, setPurgeCheckboxChecked] = useState(false);
   const [purgeLoading, setPurgeLoading] = useState(false);
 
-  // Fetch audit logs on component mount
+  // Send the search text to the server once the user stops typing
+  useEffect(() => {
+    const timer = setTimeout(() => setDebouncedSearch(searchQuery.trim()), SEARCH_DEBOUNCE_MS);
+    return () => clearTimeout(timer);
+  }, [searchQuery]);
+
+  // Fetch the first page on mount and whenever a filter or the sort changes
   useEffect(() => {
     if (hasPermissionOnAuditLog) {
       fetchAuditLogs();
     } else {
       setLoading(false);
     }
-  }, [hasPermissionOnAuditLog]);
+  }, [hasPermissionOnAuditLog, debouncedSearch, selectedAction, startDate, endDate, sortBy]);
+
+  // Query parameters for the current filters (see audit_query_utils.parse_audit_filters)
+  const buildFilterParams = () => {
+    const params = { order: sortBy };
+    if (selectedAction) params.action = selectedAction;
+    if (startDate) params.from = startDate;
+    if (endDate) params.to = endDate; // inclusive: the server takes the whole end day
+    if (debouncedSearch) params.q = debouncedSearch;
+    return params;
+  };
+
+  const fetchAuditPage = (cursor = null) => axios.get('/api/audit-logs/', {
+    params: { ...buildFilterParams(), limit: AUDIT_PAGE_LIMIT, ...(cursor ? { cursor } : {}) },
+  });
 
-  // Fetch audit logs and extract unique actions
+  // Keep every action seen so far in the filter dropdown (the translation
+  // table lists the known ones; loaded rows add any that are missing there)
+  const rememberActions = (logs, translations = actionTranslations) => {
+    setActions(prev => [...new Set([...prev, ...Object.keys(translations), ...logs.map(log => log.action)])].sort());
+  };
+
+  // Fetch the first page for the current filters
   const fetchAuditLogs = async () => {
-    setLoading(true);
+    const queryId = ++queryIdRef.current;
     try {
-      const response = await axios.get('/api/audit-logs/');
+      const response = await fetchAuditPage();
+      if (queryId !== queryIdRef.current) return; // a newer query is in flight
       const logs = response.data.audit_logs || [];
       const translations = response.data.action_translations || {};
-      
+
       setAuditLogs(logs);
-      setFilteredLogs(logs);
-      setTotalCount(logs.length);
+      setNextCursor(response.data.next_cursor || null);
+      setPage(1);
       setSelectedLogs(new Set()); // Clear selections on refresh
       setActionTranslations(translations); // Store translations
-      
-      // Extract unique actions from logs
-      const uniqueActions = [...new Set(logs.map(log => log.action))].sort();
-      setActions(uniqueActions);
-      
+      rememberActions(logs, translations);
+
     } catch (error) {
       console.error('Error fetching audit logs:', error);
       showErrorToast(t, t('Failed to fetch audit logs'), error);
     } finally {
-      setLoading(false);
+      if (queryId === queryIdRef.current) setLoading(false);
+    }
+  };
+
+  // Append further pages until `wantMore(logs)` is false, there are no more
+  // rows, or AUDIT_MAX_PAGES_PER_LOAD pages were fetched. Returns the loaded
+  // rows (null when the filters changed meanwhile or the request failed).
+  const loadMoreLogs = async (wantMore = () => false) => {
+    if (!nextCursor || loadingMore) return auditLogs;
+    const queryId = queryIdRef.current;
+    let logs = auditLogs;
+    let cursor = nextCursor;
+    setLoadingMore(true);
+    try {
+      let pages = 0;
+      do {
+        const response = await fetchAuditPage(cursor);
+        if (queryId !== queryIdRef.current) return null;
+        logs = [...logs, ...(response.data.audit_logs || [])];
+        cursor = response.data.next_cursor || null;
+        pages += 1;
+      } while (cursor && pages < AUDIT_MAX_PAGES_PER_LOAD && wantMore(logs));
+      setAuditLogs(logs);
+      setNextCursor(cursor);
+      rememberActions(logs);
+      return logs;
+    } catch (error) {
+      console.error('Error fetching audit logs:', error);
+      showErrorToast(t, t('Failed to fetch audit logs'), error);
+      return null;
+    } finally {
+      setLoadingMore(false);
     }
   };
 
@@ -505,58 +571,6 @@ const AuditLog = () => {
     );
   };
 
-  // Apply filters and sorting
-  useEffect(() => {
-    applyFilters();
-  }, [searchQuery, selectedAction, startDate, endDate, sortBy, auditLogs]);
-
-  // Apply all filters and sorting
-  const applyFilters = () => {
-    let filtered = auditLogs;
-
-    // Filter by search query (description)
-    if (searchQuery.trim()) {
-      filtered = filtered.filter(log =>
-        log.description && log.description.toLowerCase().includes(searchQuery.toLowerCase())
-      );
-    }
-
-    // Filter by action
-    if (selectedAction) {
-      filtered = filtered.filter(log => log.action === selectedAction);
-    }
-
-    // Filter by date range
-    if (startDate) {
-      const start = new Date(startDate);
-      filtered = filtered.filter(log => {
-        const logDate = new Date(log.timestamp);
-        return logDate >= start;
-      });
-    }
-
-    if (endDate) {
-      const end = new Date(endDate);
-      end.setHours(23, 59, 59, 999); // Include entire end date
-      filtered = filtered.filter(log => {
-        const logDate = new Date(log.timestamp);
-        return logDate <= end;
-      });
-    }
-
-    // Sort by timestamp
-    filtered.sort((a, b) => {
-      const dateA = new Date(a.timestamp);
-      const dateB = new Date(b.timestamp);
-      return sortBy === 'desc' ? dateB - dateA : dateA - dateB;
-    });
-
-    setFilteredLogs(filtered);
-    setTotalCount(filtered.length);
-    setPage(1); // Reset to page 1 when filters change
-    setSelectedLogs(new Set()); // Clear selections when filtering
-  };
-
   // Handle checkbox change
   const handleCheckboxChange = (logId) => {
     const newSelected = new Set(selectedLogs);
@@ -569,12 +583,12 @@ const AuditLog = () => {
   };
 
   // Handle select all checkbox (header). pageSize is 1, so a per-page "select
-  // all" would be a single row — select every filtered row across all pages so
+  // all" would be a single row — select every loaded row across all pages so
   // this also arms the monthly regulatory export + purge dialog.
   const handleSelectAll = (isChecked) => {
     if (isChecked) {
       const allLogIds = new Set();
-      filteredLogs.forEach((log, globalIndex) => {
+      auditLogs.forEach((log, globalIndex) => {
         const pageNum = Math.floor(globalIndex / pageSize) + 1;
         const indexInPage = globalIndex % pageSize;
         allLogIds.add(`${pageNum}-${indexInPage}`);
@@ -585,28 +599,88 @@ const AuditLog = () => {
     }
   };
 
-  // Handle refresh - reset filters and selections
+  // Handle refresh - reset filters and selections. With the filters already
+  // at their defaults no effect fires, so fetch the first page directly.
   const handleRefresh = () => {
+    const filtersChanged = debouncedSearch || selectedAction || startDate || endDate || sortBy !== 'desc';
     setSearchQuery('');
+    setDebouncedSearch('');
     setSelectedAction('');
     setStartDate('');
     setEndDate('');
     setSortBy('desc');
     setPage(1);
     setSelectedLogs(new Set());
-    fetchAuditLogs();
+    if (!filtersChanged) fetchAuditLogs();
   };
 
   // Map the cross-page selection (a Set of `${page}-${index}` keys) back to the
-  // actual logs in filtered order, so a selection made across several pages is
+  // actual logs in loaded order, so a selection made across several pages is
   // exported in full — not just the rows on the current page.
   const getSelectedLogsInOrder = () =>
-    filteredLogs.filter((log, globalIndex) => {
+    auditLogs.filter((log, globalIndex) => {
       const pageNum = Math.floor(globalIndex / pageSize) + 1;
       const indexInPage = globalIndex % pageSize;
       return selectedLogs.has(`${pageNum}-${indexInPage}`);
     });
 
+  // Every loaded row is selected ("Select all rows"): the selection stands for
+  // every row matching the filters, including pages not loaded yet.
+  const isSelectAllSelection = () =>
+    selectedLogs.size > 0 && selectedLogs.size === auditLogs.length;
+
+  // Export every row matching the filters as the server's streamed CSV, for a
+  // "select all" that reaches past the loaded pages — the rows are never
+  // loaded into the page.
+  const downloadServerCSV = async (filename) => {
+    const { order, ...filters } = buildFilterParams();
+    const response = await axios.get('/api/audit-logs/export/', {
+      params: {
+        ...filters,
+        file_format: 'csv',
+        fields: 'timestamp,description,user_email,user_roles,action,ip_address,success',
+      },
+      responseType: 'blob',
+    });
+    const url = window.URL.createObjectURL(new Blob([response.data], { type: 'text/csv;charset=utf-8' }));
+    const link = document.createElement('a');
+    link.href = url;
+    link.setAttribute('download', `${filename}.csv`);
+    document.body.appendChild(link);
+    link.click();
+    link.parentNode.removeChild(link);
+    window.URL.revokeObjectURL(url);
+    toast.success(t('Audit log exported successfully'));
+    return true;
+  };
+
+  // Purge preview from the server: what purge_old_audit_logs would delete now
+  const openPurgePreview = async (filename) => {
+    const { data } = await axios.get('/api/purge-old-audit-logs/preview/');
+    if (!data.record_count) {
+      // Show info toast ONCE - no purge needed
+      setTimeout(() => {
+        toast.dismiss('audit-no-old-logs');
+        toast.info(
+          `ℹ️ אין רשומות ישנות מ-90 ימים למחיקה. תאריך יום סף: ${data.cutoff_date}`,
+          { toastId: 'audit-no-old-logs', autoClose: 4000 }
+        );
+      }, 100);
+      return;
+    }
+    // Set purge data and show modal - NO PURGE YET
+    setPurgeData({
+      record_count: data.record_count,
+      cutoff_date: data.cutoff_date,
+      first_log_date: data.first_log_date || 'N/A',
+      last_log_date: data.last_log_date || 'N/A',
+      partitioned: data.partitioned,
+      filename: filename
+    });
+    setShowPurgeModal(true);
+    setPurgeCheckboxChecked(false);
+  };
+
   // Build the CSV description: the general (translated) text, plus the field
   // changes as a pipe-delimited mini-table inside the cell. A CSV/Excel cell
   // cannot hold a real table, so this aligned text is the closest readable
@@ -631,9 +705,9 @@ const AuditLog = () => {
   // Handle export to CSV
   const handleExportCSV = async () => {
     try {
-      // "Select all rows" was used when EVERY filtered row is selected → this is
+      // "Select all rows" was used when EVERY loaded row is selected → this is
       // the monthly regulatory backup, so the export is followed by the purge dialog.
-      const isSelectAllClickExport = selectedLogs.size > 0 && selectedLogs.size === filteredLogs.length;
+      const isSelectAllClickExport = isSelectAllSelection();
 
       // Logs to export = the full cross-page selection (persists between pages).
       let logsToExport = selectedLogs.size > 0 ? getSelectedLogsInOrder() : [];
@@ -658,55 +732,36 @@ const AuditLog = () => {
         filename = `audit_log_${firstDateStr}_to_${lastDateStr}_${timeStamp}`;
       }
 
-      // Format logs for export
-      const formattedLogs = logsToExport.map(log => ({
-        Timestamp: new Date(log.timestamp).toLocaleString('he-IL'),
-        Description: formatDescriptionForCsv(log),
-        'User Email': log.user_email,
-        'User Roles': Array.isArray(log.user_roles)
-          ? log.user_roles.map(role => t(role)).join(', ')
-          : t(log.user_roles || ''),
-        Action: actionTranslations[log.action] || t(log.action) || log.action,
-        'Source IP': log.ip_address,
-        Status: log.success ? t('Success') : t('Failed'),
-      }));
-
-      // Call export utility - ALWAYS show success toast from util (never skip)
-      const exportSuccess = await exportAuditToCSV(formattedLogs, t, filename, false);
-      
+      let exportSuccess;
+      if (isSelectAllClickExport && nextCursor) {
+        // More rows match on the server than are loaded - export them all there
+        exportSuccess = await downloadServerCSV(filename);
+      } else {
+        // Format logs for export
+        const formattedLogs = logsToExport.map(log => ({
+          Timestamp: new Date(log.timestamp).toLocaleString('he-IL'),
+          Description: formatDescriptionForCsv(log),
+          'User Email': log.user_email,
+          'User Roles': Array.isArray(log.user_roles)
+            ? log.user_roles.map(role => t(role)).join(', ')
+            : t(log.user_roles || ''),
+          Action: actionTranslations[log.action] || t(log.action) || log.action,
+          'Source IP': log.ip_address,
+          Status: log.success ? t('Success') : t('Failed'),
+        }));
+
+        // Call export utility - ALWAYS show success toast from util (never skip)
+        exportSuccess = await exportAuditToCSV(formattedLogs, t, filename, false);
+      }
+
       // ONLY if export was successful AND user clicked "Select all rows", check for purge
-      if (exportSuccess && isSelectAllClickExport && selectedLogs.size === filteredLogs.length) {
-        // Just get cutoff info to show in the modal, don't actually call purge API yet
-        const cutoffDate = new Date(new Date().getTime() - (90 * 24 * 60 * 60 * 1000)); // 90 days ago
-        const oldLogs = auditLogs.filter(log => new Date(log.timestamp) < cutoffDate);
-        
-        if (oldLogs.length === 0) {
-          // Show info toast ONCE - no purge needed
-          setTimeout(() => {
-            toast.dismiss('audit-no-old-logs');
-            toast.info(
-              `ℹ️ אין רשומות ישנות מ-90 ימים למחיקה. תאריך יום סף: ${cutoffDate.toLocaleDateString('he-IL')}`,
-              { toastId: 'audit-no-old-logs', autoClose: 4000 }
-            );
-          }, 100);
-        } else {
-          // Set purge data and show modal - NO API CALL YET
-          setPurgeData({
-            record_count: oldLogs.length,
-            cutoff_date: cutoffDate.toLocaleDateString('he-IL'),
-            first_log_date: oldLogs.length > 0 ? new Date(oldLogs[0].timestamp).toLocaleDateString('he-IL') : 'N/A',
-            last_log_date: oldLogs.length > 0 ? new Date(oldLogs[oldLogs.length - 1].timestamp).toLocaleDateString('he-IL') : 'N/A',
-            logsToExport: oldLogs,
-            filename: filename
-          });
-          setShowPurgeModal(true);
-          setPurgeCheckboxChecked(false);
-        }
+      if (exportSuccess && isSelectAllClickExport) {
+        await openPurgePreview(filename);
       }
       
     } catch (error) {
       console.error('Error in handleExportCSV:', error);
-      // Don't show error toast here - let export_utils.js handle all error messages
+      showErrorToast(t, t('Failed to export audit logs'), error);
     }
   };
 
@@ -773,8 +828,9 @@ const AuditLog = () => {
   // Handle select all rows across all pages
   const handleSelectAllRows = () => {
     const allLogIds = new Set();
-    // Iterate through ALL filtered logs and create IDs for each page
-    filteredLogs.forEach((log, globalIndex) => {
+    // Iterate through ALL loaded logs and create IDs for each page (the CSV
+    // export also covers the matching rows not loaded yet)
+    auditLogs.forEach((log, globalIndex) => {
       // Calculate which page this log would be on
       const pageNum = Math.floor(globalIndex / pageSize) + 1;
       // Calculate the index within that page
@@ -785,7 +841,25 @@ const AuditLog = () => {
     // Don't show toast here - export will show success toast
   };
 
-  // Handle confirm purge (after checkbox is checked) - performs CSV export + ZIP
+  // Download one server-side purge archive (.ndjson.gz) through its download_url
+  const downloadAuditArchive = async (archive) => {
+    try {
+      const response = await axios.get(archive.download_url, { responseType: 'blob' });
+      const url = window.URL.createObjectURL(new Blob([response.data], { type: 'application/gzip' }));
+      const link = document.createElement('a');
+      link.href = url;
+      link.setAttribute('download', archive.file);
+      document.body.appendChild(link);
+      link.click();
+      link.parentNode.removeChild(link);
+      window.URL.revokeObjectURL(url);
+    } catch (error) {
+      console.error('Error downloading audit archive:', error);
+      showErrorToast(t, t('Failed to download the backup file'), error);
+    }
+  };
+
+  // Handle confirm purge (after checkbox is checked) - server archives + deletes
   const handleConfirmPurge = async () => {
     if (!purgeCheckboxChecked) {
       toast.warning(t('Please check the safety checkbox to confirm'));
@@ -795,40 +869,28 @@ const AuditLog = () => {
     try {
       setPurgeLoading(true);
       
-      // Step 1: Export logs to CSV/ZIP (skip success toast since purge has its own success message)
-      if (purgeData && purgeData.logsToExport && purgeData.logsToExport.length > 0) {
-        const formattedLogs = purgeData.logsToExport.map(log => ({
-          Timestamp: new Date(log.timestamp).toLocaleString('he-IL'),
-          Description: formatDescriptionForCsv(log),
-          'User Email': log.user_email,
-          'User Roles': Array.isArray(log.user_roles)
-            ? log.user_roles.map(role => t(role)).join(', ')
-            : t(log.user_roles || ''),
-          Action: actionTranslations[log.action] || t(log.action) || log.action,
-          'Source IP': log.ip_address,
-          Status: log.success ? t('Success') : t('Failed'),
-        }));
-        
-        // Use export utility with custom filename - skip success toast for purge
-        const exportSuccess = await exportAuditToCSV(formattedLogs, t, purgeData.filename, true);
-        if (!exportSuccess) {
-          // Export failed, don't continue with purge
-          setPurgeLoading(false);
-          return;
-        }
-      }
-
-      // Step 2: NOW call the backend to DELETE the old logs
+      // The backend archives the old logs to a server-side file (gzip NDJSON)
+      // and then drops them - no need to hold them in the browser first
       const purgeResponse = await axios.post('/api/purge-old-audit-logs/');
       
       if (purgeResponse.data.success) {
-        // Show success message with deletion confirmation
+        // Show success message with deletion confirmation and the archive
+        // download links - stays open until the admin closes it
+        const archives = (purgeResponse.data.archives || []).filter(archive => archive.rows);
         toast.success(
           <div>
             <div>✅ {purgeResponse.data.deleted_count} {t('audit logs exported and DELETED')}</div>
-            <div style={{ marginTop: '8px' }}>📁 {t('Backup file')}: {purgeData.filename}.zip</div>
+            <div style={{ marginTop: '8px' }}>📁 {t('Backup file')}:</div>
+            {archives.map(archive => (
+              <div key={archive.file} style={{ marginTop: '4px' }}>
+                <button type="button" className="audit-archive-link" onClick={() => downloadAuditArchive(archive)}>
+                  ⬇️ {archive.file}
+                </button>
+              </div>
+            ))}
             <div style={{ marginTop: '8px' }}>�️ {t('Old records permanently removed from database')}</div>
-          </div>
+          </div>,
+          { autoClose: false, closeOnClick: false }
         );
       } else {
         showErrorToast(t, t('Purge failed'), new Error(purgeResponse.data.message || 'Unknown error'));
@@ -856,9 +918,10 @@ const AuditLog = () => {
     setPurgeData(null);
   };
 
-  // Paginate filtered logs
-  const paginatedLogs = filteredLogs.slice((page - 1) * pageSize, page * pageSize);
-  const totalPages = Math.ceil(totalCount / pageSize);
+  // Paginate the loaded logs; the last page fetches the next one from the server
+  const paginatedLogs = auditLogs.slice((page - 1) * pageSize, page * pageSize);
+  const totalPages = Math.ceil(auditLogs.length / pageSize);
+  const hasMore = nextCursor !== null;
 
   // Get page numbers to display (1, 2, 3 or 2, 3, 4, etc.)
   const getPageNumbers = () => {
@@ -881,26 +944,53 @@ const AuditLog = () => {
     return pages;
   };
 
+  // Next page; past the loaded rows this fetches the next server page first
+  const handleNextPage = async () => {
+    if (page < totalPages) {
+      setPage(page + 1);
+      return;
+    }
+    const logs = await loadMoreLogs();
+    if (logs && logs.length > page * pageSize) setPage(page + 1);
+  };
+
   // Jump straight to a page number (pageSize is 1, so page N == entry N).
-  // Called live from the input's onChange, so it takes the raw value.
-  const handleJumpToPage = (value) => {
+  // Called live from the input's onChange, so it takes the raw value. Pages
+  // past the loaded rows are fetched (up to AUDIT_MAX_PAGES_PER_LOAD per jump).
+  const handleJumpToPage = async (value) => {
     const n = parseInt(value, 10);
     if (Number.isNaN(n)) return;
-    setPage(Math.min(Math.max(1, n), totalPages || 1));
+    let loadedPages = totalPages;
+    if (n > loadedPages && hasMore) {
+      const logs = await loadMoreLogs(loaded => loaded.length < n * pageSize);
+      if (!logs) return;
+      loadedPages = Math.ceil(logs.length / pageSize);
+    }
+    setPage(Math.min(Math.max(1, n), loadedPages || 1));
   };
 
   // Jump the pagination to the log entry closest to a chosen time TODAY,
-  // within the currently filtered + sorted set. value is "HH:MM".
-  const handleJumpToTime = (value) => {
-    if (!value || filteredLogs.length === 0) return;
+  // within the current filters + sort. value is "HH:MM". Pages are fetched
+  // until the loaded rows reach past that time.
+  const handleJumpToTime = async (value) => {
+    if (!value || auditLogs.length === 0) return;
     const [hh, mm] = value.split(':').map(Number);
     if (Number.isNaN(hh) || Number.isNaN(mm)) return;
     const targetDate = new Date();
     targetDate.setHours(hh, mm, 0, 0);
     const target = targetDate.getTime();
+    const beforeTarget = (logs) => {
+      const last = new Date(logs[logs.length - 1].timestamp).getTime();
+      return sortBy === 'desc' ? last > target : last < target;
+    };
+    let logs = auditLogs;
+    if (hasMore && beforeTarget(logs)) {
+      logs = await loadMoreLogs(beforeTarget);
+      if (!logs) return;
+    }
     let closestIdx = 0;
     let closestDiff = Infinity;
-    filteredLogs.forEach((log, i) => {
+    logs.forEach((log, i) => {
       const diff = Math.abs(new Date(log.timestamp).getTime() - target);
       if (diff < closestDiff) {
         closestDiff = diff;
@@ -1004,7 +1094,7 @@ const AuditLog = () => {
 
           {/* Data Grid Section */}
           <div className="audit-log-grid-container">
-            {filteredLogs.length === 0 ? (
+            {auditLogs.length === 0 ? (
               <div className="no-data">{t('No audit logs to display')}</div>
             ) : (
               <>
@@ -1041,7 +1131,7 @@ const AuditLog = () => {
                         <input
                           type="checkbox" className='audit-checkbox'
                           onChange={(e) => handleSelectAll(e.target.checked)}
-                          checked={selectedLogs.size > 0 && selectedLogs.size === filteredLogs.length}
+                          checked={isSelectAllSelection()}
                         />
                       </th>
                       <th>
@@ -1112,8 +1202,8 @@ const AuditLog = () => {
                   ))}
 
                   <button
-                    onClick={() => setPage(page + 1)}
-                    disabled={page === totalPages || totalPages <= 1}
+                    onClick={handleNextPage}
+                    disabled={(page === totalPages && !hasMore) || loadingMore}
                     className="pagination-arrow"
                   >
                     &rsaquo;
@@ -1125,6 +1215,10 @@ const AuditLog = () => {
                   >
                     &raquo;
                   </button>
+                  {/* Loaded so far; "+" while the server has more rows */}
+                  <span className="audit-loaded-count">
+                    {t('Loaded')}: {auditLogs.length}{hasMore ? '+' : ''}
+                  </span>
                 </div>
               </>
             )}
@@ -1171,6 +1265,9 @@ const AuditLog = () => {
                   <li>{t('Check the 1st and last items in the CSV to verify the correct date range')}</li>
                   <li>{t('The exported dates MUST match the filename dates shown above')}</li>
                   <li>{t('Only logs OLDER than 90 days will be affected')}</li>
+                  {purgeData.partitioned && (
+                    <li>{t('Logs are deleted by whole months: only months that ended before the cutoff date')}</li>
+                  )}
                   <li>
                     <strong>{t('Upload the exported ZIP to Google Drive immediately for backup')}</strong>
                   </li>
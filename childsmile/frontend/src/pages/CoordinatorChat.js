@@ -5,6 +5,7 @@ import { toast } from 'react-toastify';
 import { showErrorToast } from '../components/toastUtils';
 import Sidebar from '../components/Sidebar';
 import InnerPageHeader from '../components/InnerPageHeader';
+import { subscribeRealtime } from '../components/realtimeFeed';
 import '../styles/common.css';
 import '../styles/CoordinatorChat.css';
 
@@ -41,22 +42,36 @@ const CoordinatorChat = () => {
     return '';
   };
 
-  // Load conversations on mount and every 5 seconds
+  // Load conversations on mount, then again whenever a chat message changes
+  // (shared long poll on /api/updates/ — replaces the 5 second refresh)
   useEffect(() => {
     loadConversations();
-    const interval = setInterval(loadConversations, 5000); // Refresh every 5 seconds
-    return () => clearInterval(interval);
+    return subscribeRealtime((update) => {
+      if (update.reset || update.chat.length || update.chat_deleted.length) {
+        loadConversations();
+      }
+    });
   }, []);
 
-  // Auto-refresh chat history every 3 seconds when a coordinator is selected
+  // Live chat history for the selected coordinator (replaces the 3 second refresh)
   useEffect(() => {
-    if (!selectedCoordinator || messageText.trim()) return; // Don't auto-refresh while user is typing
-    
-    const interval = setInterval(() => {
-      loadChatHistory(selectedCoordinator.id);
-    }, 3000); // Refresh chat every 3 seconds
-    
-    return () => clearInterval(interval);
+    if (!selectedCoordinator) return;
+
+    return subscribeRealtime((update) => {
+      const changed = update.chat.filter(msg => msg.coordinator_id === selectedCoordinator.id);
+      if (!update.reset && !changed.length && !update.chat_deleted.length) return;
+
+      if (!messageText.trim()) {
+        loadChatHistory(selectedCoordinator.id); // also marks the replies as read
+        return;
+      }
+      // Don't reload while the user is typing — merge the changes in place
+      setChatHistory(prev => {
+        const replaced = new Set([...update.chat_deleted, ...changed.map(msg => msg.id)]);
+        return [...prev.filter(msg => !replaced.has(msg.id)), ...changed]
+          .sort((a, b) => a.created_at.localeCompare(b.created_at));
+      });
+    });
   }, [selectedCoordinator, messageText]);
 
   // Scroll to bottom when chat updates
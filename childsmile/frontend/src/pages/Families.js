@@ -3,7 +3,7 @@ import { createPortal } from 'react-dom';
 import axios from '../axiosConfig';
 import Sidebar from '../components/Sidebar';
 import InnerPageHeader from '../components/InnerPageHeader';
-import { isGuestUser, hasUpdatePermissionForTable, hasDeletePermissionForTable, hasCreatePermissionForTable, hasViewPermissionForTable } from '../components/utils';
+import { isGuestUser, hasUpdatePermissionForTable, hasDeletePermissionForTable, hasCreatePermissionForTable, hasViewPermissionForTable, pollImportJob, downloadImportResult, cancelImportJob } from '../components/utils';
 import { toast } from 'react-toastify';
 import { useTranslation } from 'react-i18next';
 import '../styles/common.css';
@@ -118,6 +118,7 @@ const Families = () => {
   const [importFile, setImportFile] = useState(null);
   const [importDryRun, setImportDryRun] = useState(true);
   const [isImporting, setIsImporting] = useState(false);
+  const [importJob, setImportJob] = useState(null); // status of the running background import job
   
   // Settlements and streets data from API
   const [settlementsAndStreets, setSettlementsAndStreets] = useState({});
@@ -577,47 +578,23 @@ const Families = () => {
     formData.append('dry_run', importDryRun.toString());
 
     try {
+      // The import runs as a background job - poll it for progress, then download the results
       const response = await axios.post('/api/import/families/', formData, {
-        headers: { 'Content-Type': 'multipart/form-data' },
-        responseType: importDryRun ? 'blob' : 'json'
+        headers: { 'Content-Type': 'multipart/form-data' }
       });
-
-      if (importDryRun) {
-        // Dry-run: Download the preview file
-        const url = window.URL.createObjectURL(new Blob([response.data]));
-        const link = document.createElement('a');
-        link.href = url;
-        link.setAttribute('download', `import_preview_families_${new Date().getTime()}.xlsx`);
-        document.body.appendChild(link);
-        link.click();
-        link.parentNode.removeChild(link);
-        window.URL.revokeObjectURL(url);
+      setImportJob(response.data);
+      const job = await pollImportJob(response.data, setImportJob);
+      await downloadImportResult(job);
+
+      if (job.status === 'cancelled') {
+        toast.info(t("Import stopped. Rows processed before stopping were kept - see the results file."), { autoClose: 5000 });
+        if (!job.dry_run) fetchFamilies();
+      } else if (job.dry_run) {
         toast.success(t("Preview file downloaded. Review and upload again without dry-run to import."));
       } else {
         // Real import - show success with detailed breakdown
-        const data = response.data;
-        const { success, error, skipped, total, result_file, result_filename, message } = data;
-        
-        // Show success toast
-        toast.success(message || t("Import completed successfully"), { autoClose: 5000 });
-        
-        // Download the results file if it exists
-        if (result_file && result_filename) {
-          const binary = atob(result_file);
-          const array = new Uint8Array(binary.length);
-          for (let i = 0; i < binary.length; i++) {
-            array[i] = binary.charCodeAt(i);
-          }
-          const url = window.URL.createObjectURL(new Blob([array]));
-          const link = document.createElement('a');
-          link.href = url;
-          link.setAttribute('download', result_filename);
-          document.body.appendChild(link);
-          link.click();
-          link.parentNode.removeChild(link);
-          window.URL.revokeObjectURL(url);
-        }
-        
+        toast.success(job.message || t("Import completed successfully"), { autoClose: 5000 });
+
         setImportFile(null);
         setShowImportModal(false);
         setImportDryRun(true);
@@ -631,6 +608,16 @@ const Families = () => {
       }
     } finally {
       setIsImporting(false);
+      setImportJob(null);
+    }
+  };
+
+  const handleStopImport = async () => {
+    try {
+      const response = await cancelImportJob(importJob);
+      setImportJob(response.data);
+    } catch (error) {
+      showErrorToast(t, "Import failed", error);
     }
   };
 
@@ -2387,11 +2374,17 @@ const Families = () => {
                 </div>
                 <div className="modal-buttons">
                   <button type="submit" disabled={isImporting}>
-                    {isImporting ? t('Importing...') : t('Import')}
-                  </button>
-                  <button type="button" onClick={() => setShowImportModal(false)}>
-                    {t('Cancel')}
+                    {isImporting ? `${t('Importing...')} ${importJob?.progress ?? 0}%` : t('Import')}
                   </button>
+                  {isImporting ? (
+                    <button type="button" onClick={handleStopImport} disabled={!importJob || importJob.cancel_requested}>
+                      {t('Stop Import')}
+                    </button>
+                  ) : (
+                    <button type="button" onClick={() => setShowImportModal(false)}>
+                      {t('Cancel')}
+                    </button>
+                  )}
                 </div>
               </form>
             </div>
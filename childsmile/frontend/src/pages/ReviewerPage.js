@@ -189,6 +189,7 @@ const ReviewerPage = () => {
           end_date: tomorrow.toISOString().slice(0, 10),
         },
       });
+      if (res.data?.error) throw new Error(res.data.error); // feed broke off mid-stream
       const allTasks = res.data?.tasks      || [];
       const allTypes = res.data?.task_types || [];
       const reviewTypeId = allTypes.find(ty => ty.name === REVIEW_TASK_TYPE_NAME)?.id;
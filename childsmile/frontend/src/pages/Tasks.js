@@ -246,6 +246,10 @@ const Tasks = () => {
         }),
       ]);
 
+      if (tasksResponse.data.error) {
+        // The feed broke off mid-stream — the list below is incomplete
+        showErrorToast(t, 'Error fetching tasks', { response: tasksResponse });
+      }
       const newTasks = tasksResponse.data.tasks || [];
       const newTaskTypes = tasksResponse.data.task_types || [];
       const cachedPermissions = JSON.parse(localStorage.getItem('permissions')) || [];
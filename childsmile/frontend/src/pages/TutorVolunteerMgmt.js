@@ -10,6 +10,7 @@ import { toast } from "react-toastify";
 import { useTranslation } from "react-i18next";
 import axios from "../axiosConfig";
 import { showErrorToast } from "../components/toastUtils";
+import { pollImportJob, downloadImportResult, cancelImportJob } from "../components/utils";
 
 // 5 rows per page on mobile, 7 on desktop (matches the <=767 breakpoint used elsewhere)
 const PAGE_SIZE = window.innerWidth <= 767 ? 5 : 7;
@@ -51,6 +52,7 @@ const TutorVolunteerMgmt = () => {
   const [importFile, setImportFile] = useState(null);
   const [importDryRun, setImportDryRun] = useState(true);
   const [importLoading, setImportLoading] = useState(false);
+  const [importJob, setImportJob] = useState(null); // status of the running background import job
 
   const startEdit = (entity, field, type) => {
     const rowId = entity.id; // Always use id for tutors and volunteers
@@ -653,27 +655,6 @@ const TutorVolunteerMgmt = () => {
     }
   };
 
-  const downloadResultsFile = (base64Data, filename) => {
-    // Convert base64 to blob
-    const byteCharacters = atob(base64Data);
-    const byteNumbers = new Array(byteCharacters.length);
-    for (let i = 0; i < byteCharacters.length; i++) {
-      byteNumbers[i] = byteCharacters.charCodeAt(i);
-    }
-    const byteArray = new Uint8Array(byteNumbers);
-    const blob = new Blob([byteArray], { type: 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet' });
-    
-    // Create download link
-    const url = window.URL.createObjectURL(blob);
-    const link = document.createElement('a');
-    link.href = url;
-    link.setAttribute('download', filename);
-    document.body.appendChild(link);
-    link.click();
-    link.parentNode.removeChild(link);
-    window.URL.revokeObjectURL(url);
-  };
-
   const handleImportSubmit = async () => {
     if (!importFile) {
       toast.error(t("Please select a file"));
@@ -686,26 +667,22 @@ const TutorVolunteerMgmt = () => {
     formData.append('dry_run', importDryRun.toString());
 
     try {
+      // The import runs as a background job - poll it for progress, then download the results
       const response = await axios.post("/api/import/volunteers/", formData, {
-        headers: { 'Content-Type': 'multipart/form-data' },
-        responseType: importDryRun ? 'blob' : 'json'
+        headers: { 'Content-Type': 'multipart/form-data' }
       });
+      setImportJob(response.data);
+      const job = await pollImportJob(response.data, setImportJob);
+      await downloadImportResult(job);
 
-      if (importDryRun) {
-        // Download the preview file
-        const url = window.URL.createObjectURL(new Blob([response.data]));
-        const link = document.createElement('a');
-        link.href = url;
-        link.setAttribute('download', `import_preview_${new Date().getTime()}.xlsx`);
-        document.body.appendChild(link);
-        link.click();
-        link.parentNode.removeChild(link);
-        window.URL.revokeObjectURL(url);
+      if (job.status === 'cancelled') {
+        toast.info(t("Import stopped. Rows processed before stopping were kept - see the results file."), { autoClose: 5000 });
+        if (!job.dry_run) fetchGridData();
+      } else if (job.dry_run) {
         toast.success(t("Preview file downloaded. Review and upload again without dry-run to import."));
       } else {
         // Real import - show success with detailed breakdown
-        const data = response.data;
-        const { success, error, skipped, total, breakdown, result_file, result_filename, message } = data;
+        const { breakdown, message } = job;
         
         // Show detailed success toast
         toast.success(
@@ -713,11 +690,6 @@ const TutorVolunteerMgmt = () => {
           { autoClose: 5000 }
         );
         
-        // Download the results file if it exists
-        if (result_file && result_filename) {
-          downloadResultsFile(result_file, result_filename);
-        }
-        
         setImportFile(null);
         setShowImportModal(false);
         fetchGridData();
@@ -730,6 +702,16 @@ const TutorVolunteerMgmt = () => {
       }
     } finally {
       setImportLoading(false);
+      setImportJob(null);
+    }
+  };
+
+  const handleStopImport = async () => {
+    try {
+      const response = await cancelImportJob(importJob);
+      setImportJob(response.data);
+    } catch (error) {
+      showErrorToast(t, "Import failed", error);
     }
   };
 
@@ -1495,19 +1477,28 @@ const TutorVolunteerMgmt = () => {
             </div>
 
             <div className="tutor-vol-modal-footer">
-              <button 
-                className="tutor-vol-btn-cancel" 
-                onClick={() => setShowImportModal(false)}
-                disabled={importLoading}
-              >
-                {t("Cancel")}
-              </button>
+              {importLoading ? (
+                <button 
+                  className="tutor-vol-btn-cancel" 
+                  onClick={handleStopImport}
+                  disabled={!importJob || importJob.cancel_requested}
+                >
+                  {t("Stop Import")}
+                </button>
+              ) : (
+                <button 
+                  className="tutor-vol-btn-cancel" 
+                  onClick={() => setShowImportModal(false)}
+                >
+                  {t("Cancel")}
+                </button>
+              )}
               <button 
                 className="tutor-vol-btn-confirm" 
                 onClick={handleImportSubmit}
                 disabled={!importFile || importLoading}
               >
-                {importLoading ? `${t("Processing")}...` : (importDryRun ? t("Validate") : t("Import"))}
+                {importLoading ? `${t("Processing")}... ${importJob?.progress ?? 0}%` : (importDryRun ? t("Validate") : t("Import"))}
               </button>
             </div>
           </div>
@@ -1600,7 +1600,7 @@ const Tutorships = () => {
             {showPendingDistancesWarning && (
               <div className="pending-distances-warning" style={{ display: 'flex', alignItems: 'center', gap: 8 }}>
                 <HourglassSpinner />
-                <span>{t("Some distances between cities are still being calculated. Please refresh in a few seconds.")}</span>
+                <span>{t("Some distances between cities are not known yet (the city is located overnight). These matches are listed last.")}</span>
                 {/* {distancesReady && ( */}
                 <button onClick={handleRefreshMatches} className="refresh-now-btn visible">
                   {t("Refresh Now")}
@@ -1948,7 +1948,11 @@ const Tutorships = () => {
                     </tr>
                     <tr>
                       <td><strong>{t('Distance')}:</strong></td>
-                      <td>{manualMatchResult.distance_between_cities} {t('km')}</td>
+                      <td>
+                        {manualMatchResult.distance_between_cities === null
+                          ? t('Distance pending')
+                          : `${manualMatchResult.distance_between_cities} ${t('km')}`}
+                      </td>
                     </tr>
                     <tr>
                       <td><strong>{t('Child City')}:</strong></td>
@@ -60,7 +60,8 @@ const PossibleTutorshipMatchesReport = () => {
         const allMatches = response.data.possible_tutorship_matches || [];
         const normalizedMatches = allMatches.map((match) => ({
           ...match,
-          distance_between_cities: parseFloat(match.distance_between_cities), // Convert to number
+          // Convert to number; null = distance not known yet (never passes the distance filter)
+          distance_between_cities: match.distance_between_cities === null ? null : parseFloat(match.distance_between_cities),
           child_gender_label: match.child_gender ? t("Female") : t("Male"), // Pre-compute gender labels
           tutor_gender_label: match.tutor_gender ? t("Female") : t("Male"), // Pre-compute gender labels
         }));
@@ -81,6 +82,7 @@ const PossibleTutorshipMatchesReport = () => {
     setMaxDistance(distance); // Update the slider value
     setCurrentPage(1);
     const filtered = matches.filter((match) => {
+      if (match.distance_between_cities === null) return false; // Pending distance
       const distanceValue = parseFloat(match.distance_between_cities); // Convert to number
       return distanceValue <= parseFloat(distance); // Compare as numbers
     });
@@ -216,7 +218,7 @@ const PossibleTutorshipMatchesReport = () => {
                         <td>{match.tutor_age}</td>
                         <td>{match.child_gender_label}</td>
                         <td>{match.tutor_gender_label}</td>
-                        <td>{match.distance_between_cities}</td>
+                        <td>{match.distance_between_cities === null ? t("Distance pending") : match.distance_between_cities}</td>
                         <td>{match.grade}</td>
                       </tr>
                     ))}
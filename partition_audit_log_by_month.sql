@@ -0,0 +1,138 @@
+-- ============================================================
+-- Month-partitioned audit_log — Raw PostgreSQL DDL
+-- Execute directly on the database cluster (during a quiet window — the
+-- conversion copies the table once).
+-- No Django migration required (same convention as add_petty_cash_table.sql).
+--
+-- purge_old_audit_logs used to count / first / last and then DELETE every
+-- row older than 90 days in one request: a long, row-by-row delete holding
+-- locks on the whole table and bloating it afterwards.
+--
+-- audit_log becomes a table PARTITIONED BY RANGE ("timestamp"), one partition
+-- per calendar month (UTC), named audit_log_pYYYY_MM, plus audit_log_default
+-- as a safety net for rows outside every partition. Retention now works on
+-- whole months (audit_archive_utils.purge_expired_audit_partitions):
+--   1. the month is streamed to a gzip NDJSON archive on local disk,
+--   2. ALTER TABLE ... DETACH PARTITION + DROP TABLE — metadata only, O(1),
+--      no matter how many rows the month holds.
+-- New monthly partitions are created ahead of time by the scheduler
+-- (AUDIT_PARTITION_TIME) and by audit_archive_utils.ensure_audit_partitions().
+--
+-- Notes:
+--   * A partitioned table's primary key must include the partition key, so
+--     the PK becomes (audit_id, "timestamp"). audit_id stays unique — it is
+--     still filled from one sequence. The Django model is unchanged.
+--   * The identity column is replaced by a plain sequence default
+--     (audit_log_id_seq), which every supported Postgres version allows on a
+--     partitioned table.
+--   * Re-creates every index of the old table (incl. idx_auditlog_ts_id and
+--     idx_auditlog_search) on the partitioned parent; run this AFTER
+--     add_audit_log_keyset_index.sql and add_audit_log_search_index.sql.
+-- Fully re-runnable: step 1 is skipped when audit_log is already partitioned.
+-- ============================================================
+
+-- 1. Convert audit_log into a partitioned table (one-time)
+-- ============================================================
+DO $$
+DECLARE
+    first_month DATE;
+    last_month  DATE;
+    month       DATE;
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_partitioned_table pt
+               JOIN pg_class c ON c.oid = pt.partrelid
+               WHERE c.relname = 'audit_log') THEN
+        RAISE NOTICE 'audit_log is already partitioned — skipping conversion';
+        RETURN;
+    END IF;
+
+    ALTER TABLE audit_log RENAME TO audit_log_unpartitioned;
+
+    CREATE SEQUENCE IF NOT EXISTS audit_log_id_seq AS INTEGER;
+    PERFORM setval('audit_log_id_seq',
+                   COALESCE((SELECT MAX(audit_id) FROM audit_log_unpartitioned), 0) + 1, false);
+
+    CREATE TABLE audit_log (
+        audit_id        INTEGER NOT NULL DEFAULT nextval('audit_log_id_seq'),
+        user_email      VARCHAR(255) NOT NULL,
+        username        VARCHAR(150) NOT NULL,
+        "timestamp"     TIMESTAMP WITH TIME ZONE NOT NULL,
+        action          VARCHAR(100) NOT NULL,
+        endpoint        VARCHAR(255) NOT NULL,
+        method          VARCHAR(10) NOT NULL,
+        affected_tables JSONB NOT NULL,
+        user_roles      JSONB NOT NULL,
+        permissions     JSONB NOT NULL,
+        entity_type     VARCHAR(100),
+        entity_ids      JSONB NOT NULL,
+        ip_address      INET,
+        user_agent      TEXT,
+        status_code     INTEGER,
+        success         BOOLEAN NOT NULL,
+        error_message   TEXT,
+        additional_data JSONB,
+        report_name     VARCHAR(255),
+        description     TEXT,
+        PRIMARY KEY (audit_id, "timestamp")
+    ) PARTITION BY RANGE ("timestamp");
+
+    ALTER SEQUENCE audit_log_id_seq OWNED BY audit_log.audit_id;
+
+    -- One partition per month from the oldest row up to 3 months ahead
+    first_month := date_trunc('month', COALESCE(
+        (SELECT MIN("timestamp") FROM audit_log_unpartitioned), NOW()) AT TIME ZONE 'UTC')::date;
+    last_month := (date_trunc('month', NOW() AT TIME ZONE 'UTC') + INTERVAL '3 months')::date;
+    month := first_month;
+    WHILE month <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF audit_log FOR VALUES FROM (%L) TO (%L)',
+            'audit_log_p' || to_char(month, 'YYYY_MM'),
+            month::timestamp AT TIME ZONE 'UTC',
+            (month + INTERVAL '1 month')::timestamp AT TIME ZONE 'UTC');
+        month := (month + INTERVAL '1 month')::date;
+    END LOOP;
+    CREATE TABLE IF NOT EXISTS audit_log_default PARTITION OF audit_log DEFAULT;
+
+    INSERT INTO audit_log SELECT
+        audit_id, user_email, username, "timestamp", action, endpoint, method,
+        affected_tables, user_roles, permissions, entity_type, entity_ids,
+        ip_address, user_agent, status_code, success, error_message,
+        additional_data, report_name, description
+    FROM audit_log_unpartitioned;
+
+    DROP TABLE audit_log_unpartitioned;
+END $$;
+
+-- 2. Indexes (created on the parent → one per partition, inherited by new ones)
+-- ============================================================
+CREATE INDEX IF NOT EXISTS audit_log_timestamp_6bfa7e69 ON audit_log ("timestamp");
+CREATE INDEX IF NOT EXISTS audit_log_action_08e6a0d9 ON audit_log (action);
+CREATE INDEX IF NOT EXISTS audit_log_action_08e6a0d9_like ON audit_log (action varchar_pattern_ops);
+CREATE INDEX IF NOT EXISTS audit_log_user_email_06529efb ON audit_log (user_email);
+CREATE INDEX IF NOT EXISTS audit_log_user_email_06529efb_like ON audit_log (user_email varchar_pattern_ops);
+CREATE INDEX IF NOT EXISTS audit_log_username_be68be4f ON audit_log (username);
+CREATE INDEX IF NOT EXISTS audit_log_username_be68be4f_like ON audit_log (username varchar_pattern_ops);
+CREATE INDEX IF NOT EXISTS childsmile_app_auditlog_timestamp_user_email_idx ON audit_log ("timestamp", user_email);
+CREATE INDEX IF NOT EXISTS childsmile_app_auditlog_action_timestamp_idx ON audit_log (action, "timestamp");
+CREATE INDEX IF NOT EXISTS childsmile_app_auditlog_entity_type_timestamp_idx ON audit_log (entity_type, "timestamp");
+CREATE INDEX IF NOT EXISTS childsmile_app_auditlog_success_timestamp_idx ON audit_log (success, "timestamp");
+CREATE INDEX IF NOT EXISTS idx_auditlog_ts_id ON audit_log ("timestamp", audit_id);
+CREATE INDEX IF NOT EXISTS idx_auditlog_search
+    ON audit_log USING GIN (
+        to_tsvector('simple',
+            coalesce(description, '') || ' ' ||
+            coalesce(error_message, '') || ' ' ||
+            coalesce(additional_data::text, ''))
+    );
+
+-- 3. Refresh planner statistics
+-- ============================================================
+ANALYZE audit_log;
+
+-- Verify
+SELECT c.relname AS partition, pg_get_expr(c.relpartbound, c.oid) AS bounds,
+       pg_size_pretty(pg_total_relation_size(c.oid)) AS size
+FROM pg_inherits i
+JOIN pg_class c ON c.oid = i.inhrelid
+WHERE i.inhparent = 'audit_log'::regclass
+ORDER BY c.relname;